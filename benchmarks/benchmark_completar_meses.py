@@ -0,0 +1,106 @@
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : benchmark_completar_meses
+ARCHIVOS  DESTINO  : ---
+ARCHIVOS  FUENTES  : ---
+OBJETIVO           : Comparar los motores de completar_meses (cruce vs reindex)
+TIPO               : PY
+OBSERVACION        : Ejecutar desde la raíz del repositorio: python -m benchmarks.benchmark_completar_meses (o python benchmarks/benchmark_completar_meses.py)
+SCHEDULER          : ---
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Benchmark de tiempo y memoria pico de GestorPreparacionDatos.completar_meses sobre un
+histórico sintético de 20k SKUs x 36 meses.
+"""
+
+# RAÍZ DEL REPOSITORIO EN EL PATH, PARA PODER EJECUTAR EL SCRIPT TAMBIÉN COMO ARCHIVO
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Librerías Propias
+from classes._02_preparedata import GestorPreparacionDatos
+
+# Librerías Básicas
+import argparse
+import tracemalloc
+import time
+
+# Librerías para Datos
+import pandas as pd
+import numpy as np
+
+GROUP_COLS = ["CLASIFICACION", "CODSOCIEDAD", "CODCENTRO", "CODMATERIAL", "CODUNIDADMEDIDABASE"]
+
+###################################################################################
+# FUNCIÓN PARA GENERAR UN HISTÓRICO MENSUAL SINTÉTICO CON MESES FALTANTES
+###################################################################################
+def generar_historico(num_skus, num_meses, densidad, semilla = 0):
+    """
+    Función para generar un histórico mensual sintético, donde solo una fracción (densidad) de los SKU-mes tiene ventas.
+    """
+    rng = np.random.default_rng(semilla)
+    meses = pd.date_range(end = "2025-11-01", periods = num_meses, freq = "MS")
+
+    skus = pd.DataFrame({
+        "CLASIFICACION": "CEMENTO",
+        "CODSOCIEDAD": rng.choice(["6012", "6052"], num_skus),
+        "CODCENTRO": rng.choice([f"C{i:03d}" for i in range(60)], num_skus),
+        "CODMATERIAL": [f"{i:08d}" for i in range(num_skus)],
+        "CODUNIDADMEDIDABASE": rng.choice(["BLS", "TN"], num_skus)
+    })
+
+    # ELEGIR SOLO ALGUNAS COMBINACIONES SKU-MES Y ASEGURAR AL MENOS UNA VENTA POR SKU
+    mascara = rng.random((num_skus, num_meses)) < densidad
+    mascara[:, -1] = True
+    fila_sku, columna_mes = np.nonzero(mascara)
+
+    df = skus.iloc[fila_sku].reset_index(drop = True)
+    df["MES"] = meses[columna_mes]
+    df["CTDCONSUMO"] = rng.gamma(2.0, 50.0, len(df)).round()
+    return df, meses
+
+###################################################################################
+# FUNCIÓN PARA MEDIR TIEMPO Y MEMORIA PICO DE UN MOTOR
+###################################################################################
+def medir_motor(gestor, df, meses, motor):
+    """
+    Función para medir el tiempo y la memoria pico (tracemalloc) de un motor de completar_meses.
+    """
+    df_entrada = df.copy()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    df_completo = gestor.completar_meses(df_entrada, meses[0], meses[-1], date_col = "MES", val_cols = ["CTDCONSUMO"], group_cols = GROUP_COLS, motor = motor)
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df_completo, segundos, pico / 1024 ** 2
+
+###################################################################################
+# LÓGICA PRINCIPAL DEL BENCHMARK
+###################################################################################
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark de completar_meses")
+    parser.add_argument("--skus", type = int, default = 20000)
+    parser.add_argument("--meses", type = int, default = 36)
+    parser.add_argument("--densidad", type = float, default = 0.6)
+    args = parser.parse_args()
+
+    df, meses = generar_historico(args.skus, args.meses, args.densidad)
+    gestor = GestorPreparacionDatos("CTDCONSUMO")
+    print(f"Histórico sintético: {args.skus} SKUs x {args.meses} meses, {len(df)} filas con ventas")
+
+    resultados = {}
+    for motor in ["cruce", "reindex"]:
+        df_completo, segundos, pico_mb = medir_motor(gestor, df, meses, motor)
+        resultados[motor] = df_completo
+        print(f"{motor:>8}: {segundos:8.3f} s | memoria pico {pico_mb:9.1f} MB | {len(df_completo)} filas")
+
+    pd.testing.assert_frame_equal(resultados["cruce"], resultados["reindex"])
+    print("Los dos motores producen el mismo resultado.")
+
+if __name__ == "__main__":
+    main()
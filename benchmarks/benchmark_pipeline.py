@@ -0,0 +1,203 @@
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : benchmark_pipeline
+ARCHIVOS  DESTINO  : Reporte JSON (opcional)
+ARCHIVOS  FUENTES  : Datos sintéticos en una carpeta temporal
+OBJETIVO           : Medir de punta a punta la preparación, segmentación y proyección de un mes con datos sintéticos
+TIPO               : PY
+OBSERVACION        : Ejecutar desde la raíz del repositorio: python -m benchmarks.benchmark_pipeline (o python benchmarks/benchmark_pipeline.py)
+SCHEDULER          : ---
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Benchmark de tiempo, CPU y memoria pico por etapa de la cadena GestorPreparacionDatos ->
+SegmentadorDatos -> GestorProyeccion de un mes simulado, para varios tamaños de SKUs. Los datos se generan con
+generar_datos_sinteticos y se leen con los sustitutos locales de BigQuery (LectorArrowLocal) y Cloud Storage
+(ClienteStorageLocal). La inferencia con Chronos se reemplaza por la media móvil, que entrega las mismas columnas de
+cuantiles; el post-proceso de las predicciones del modelo sí es el de producción.
+"""
+
+# RAÍZ DEL REPOSITORIO EN EL PATH, PARA PODER EJECUTAR EL SCRIPT TAMBIÉN COMO ARCHIVO
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Librerías Propias
+from benchmarks.generar_datos_sinteticos import generar_consumo_demanda, generar_sku_analizados, guardar_datos_sinteticos
+from classes._01_managedbstorages import GestorAlmacenDatos, LectorArrowLocal
+from classes._02_preparedata import GestorPreparacionDatos
+from classes._04_managemodel import GestorModelo
+from classes._05_forecastmonthly import GestorProyeccion
+from classes._07_simulateforecast import GestorSimulacion, IDENTIFICADORES_ENTRENAMIENTO
+from classes._08_skuregistry import RegistroSKU
+from classes._11_gcstransfer import ClienteStorageLocal
+from classes._15_instrumentation import RegistroMetricas, contar_filas
+from utils.utils import readJsonFile
+
+# Librerías Básicas
+import tracemalloc
+import argparse
+import tempfile
+import json
+
+from types import SimpleNamespace
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+
+# Librerías para Datos
+import pandas as pd
+
+PATH_CONSUMO_DEMANDA = "proyecto.dataset.F_CONSUMOMENSUALPT_DEMANDA"
+BUCKET_SKU_ANALIZADOS = "bucket"
+
+###################################################################################
+# FUNCIÓN PARA ARMAR EL CONTEXTO DEL PLANIFICADOR CON SUSTITUTOS LOCALES
+###################################################################################
+def crear_contexto(parameters, ruta_base):
+    """
+    Función para armar, con la configuración de config/parameters.json, lo que GestorSimulacion necesita del
+    planificador, con gestores sobre la carpeta local en lugar de BigQuery y Cloud Storage.
+    """
+    entrada = parameters['variables_input_demanda_comercial']
+    rangos = parameters['variables_rangos_meses']
+    umbrales = parameters['variables_umbrales_segmentacion']
+    informativas = parameters['variables_informativas']
+
+    columnas = [entrada['CLASIFICACION'], entrada['SOCIEDAD'], entrada['CENTRO'], entrada['MATERIAL'], entrada['MEDIDA'], entrada['FECHA_ULTIMO_CONSUMO'], entrada['FECHA'], entrada['CANTIDAD']]
+    registro_sku = RegistroSKU(columnas[:5])
+    gestor_modelo = GestorModelo(None, rangos['SEGMENTACION'], rangos['PROYECCION'], "", registro_sku = registro_sku, ventanas_adicionales = rangos['SEGMENTACION_ADICIONAL'])
+
+    contexto = SimpleNamespace(
+        clase_producto = informativas['TIPO_PRODUCTO_TABLA'],
+        clase_producto_log = informativas['TIPO_PRODUCTO_LOG'],
+        TIPO_MODELO_ML = informativas['TIPO_MODELO_ML'],
+        mes_col = parameters['variables_generales']['COLUMNA_AGRUPACION_MES'],
+        PATH_CONSUMO_DEMANDA = PATH_CONSUMO_DEMANDA,
+        PATH_PROYECCION_DEMANDA = "proyecto.dataset.PROYECCION",
+        PATH_MONITOREO = "proyecto.dataset.MONITOREO",
+        COLUMNA_PERIODO_OUTPUT = parameters['variables_output_proyeccion_demanda']['PERIODO'],
+        COLUMNA_PERIODO_MONITOREO = parameters['variables_output_monitoreo_demanda']['PERIODO'],
+        COLUMNAS_CONSUMO_DEMANDA = columnas,
+        COLUMNAS_CONSUMO_DEMANDA_QUERY = ",\n\t".join(columnas),
+        COLUMNA_FECHA_CONSUMO_DEMANDA = entrada['FECHA'],
+        COLUMNA_CONSUMO_DEMANDA = entrada['CANTIDAD'],
+        ventana_historico = rangos['HISTORICO'],
+        ventana_segmentacion = rangos['SEGMENTACION'],
+        ventanas_segmentacion_adicional = rangos['SEGMENTACION_ADICIONAL'],
+        num_meses_proyeccion = rangos['PROYECCION'],
+        abc_umb_inf = umbrales['ABC_INFERIOR'], abc_umb_sup = umbrales['ABC_SUPERIOR'],
+        xyz_umb_inf = umbrales['XYZ_INFERIOR'], xyz_umb_sup = umbrales['XYZ_SUPERIOR'],
+        fsn_umb_inf = umbrales['FSN_INFERIOR'], fsn_umb_sup = umbrales['FSN_SUPERIOR'],
+        DataManager = GestorAlmacenDatos(None, ClienteStorageLocal(ruta_base), lector_local = LectorArrowLocal(ruta_base)),
+        PreManager = GestorPreparacionDatos(entrada['CANTIDAD'], registro_sku = registro_sku),
+        ModelManager = gestor_modelo,
+        ForecastManager = GestorProyeccion(entrada['FECHA'], rangos['PROYECCION'], rangos['VENTAS'], None, informativas['TIPO_MODELO_ML'], informativas['TIPO_MODELO_SIMPLE'], informativas['TIPO_MODELO_0'], gestor_modelo, clase_producto = informativas['TIPO_PRODUCTO_TABLA'], registro_sku = registro_sku)
+    )
+    return contexto
+
+###################################################################################
+# FUNCIÓN PARA MEDIR UNA ETAPA
+###################################################################################
+def medir_etapa(metricas, nombre, funcion):
+    """
+    Función para ejecutar una etapa midiendo tiempo, CPU y filas (RegistroMetricas) y memoria pico (tracemalloc).
+    """
+    with metricas.medir(nombre) as medicion:
+        tracemalloc.start()
+        try:
+            resultado = funcion()
+        finally:
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        medicion["filas_salida"] = contar_filas(resultado)
+        medicion["pico_mb"] = round(pico / 1024 ** 2, 1)
+    return resultado
+
+###################################################################################
+# FUNCIÓN PARA EJECUTAR LA CADENA DE UN MES SOBRE DATOS SINTÉTICOS
+###################################################################################
+def ejecutar_cadena(parameters, num_skus, args):
+    """
+    Función para generar los datos de un tamaño, guardarlos en una carpeta temporal y medir cada etapa del mes
+    siguiente al último mes generado.
+    """
+    metricas = RegistroMetricas(id_ejecucion = f"benchmark_{num_skus}")
+    fecha_final = pd.Timestamp(args.fecha_final)
+
+    with tempfile.TemporaryDirectory() as ruta_base:
+        df_consumo = generar_consumo_demanda(num_skus, args.almacenes, args.meses, args.intermitencia, args.estacionalidad, fecha_final = fecha_final, semilla = args.semilla)
+        df_sku = generar_sku_analizados(df_consumo, semilla = args.semilla)
+        archivo_sku = parameters['variables_input_skus_analizados']['RUTA_ARCHIVO']
+        hoja_sku = parameters['variables_input_skus_analizados']['HOJA_ARCHIVO']
+        _, ruta_sku = guardar_datos_sinteticos(df_consumo, df_sku, ruta_base, PATH_CONSUMO_DEMANDA, BUCKET_SKU_ANALIZADOS, archivo_sku, sheet_name = hoja_sku)
+
+        contexto = crear_contexto(parameters, ruta_base)
+        simulacion = GestorSimulacion(contexto)
+        simulacion.ajustar_queries(datetime.combine(fecha_final.date(), datetime.min.time()) + relativedelta(months = 1, days = 14))
+        ids, mes_col, val_col = IDENTIFICADORES_ENTRENAMIENTO, contexto.mes_col, contexto.COLUMNA_CONSUMO_DEMANDA
+
+        # LECTURA (PARQUET LOCAL CON LOS FILTROS DEL MES) Y PREPARACIÓN
+        df_36_meses = medir_etapa(metricas, "lectura", lambda: simulacion.leer_consumo_demanda(contexto.filtros_planificacion_demanda, None))
+        df_sku_leido = medir_etapa(metricas, "lectura_sku", lambda: (
+            contexto.DataManager.obtener_sku_analizados(BUCKET_SKU_ANALIZADOS, archivo_sku, hoja_sku) if ruta_sku.endswith(".xlsx") else pd.read_parquet(ruta_sku)
+        ))
+        df_procesado = medir_etapa(metricas, "preparacion", lambda: simulacion.procesar_historico_mes(df_36_meses))
+
+        # SKUS CONOCIDOS / DESCONOCIDOS Y SEGMENTACIÓN ABC-XYZ-FSN
+        datos = medir_etapa(metricas, "conocidos", lambda: simulacion.separar_conocidos_mes(df_procesado, df_sku_leido))
+        datos.update(medir_etapa(metricas, "segmentacion", lambda: simulacion.segmentar_mes(df_procesado)))
+
+        # PROYECCIÓN SIN MODELO DE LOS NO PROYECTABLES
+        proyecciones_simples = medir_etapa(metricas, "proyeccion_sin_modelo", lambda: simulacion.proyectar_simple_mes(datos))
+
+        # PROYECTABLES: VARIABLES DE TIEMPO, PREDICCIÓN SUSTITUTA Y POST-PROCESO DEL MODELO
+        df_sp = datos["df_sp"]
+        proyecciones_modelo = []
+        if not df_sp.empty:
+            medir_etapa(metricas, "time_features", lambda: contexto.ModelManager.crear_time_features(df_sp, id_cols = ids, date_col = mes_col, value_col = val_col, num_month = contexto.num_meses_proyeccion))
+            predicciones = medir_etapa(metricas, "prediccion_sustituta", lambda: contexto.ForecastManager.proyectar_demanda_simple(df_sp, ids, mes_col, val_col, algoritmo = "Media_Movil", fecha_final = df_sp[mes_col].max()))
+            proyecciones_modelo.append(medir_etapa(metricas, "postproceso_modelo", lambda: contexto.ForecastManager.construir_dataframe_proyeccion(
+                predicciones, df_sp, df_sp, datos["df_ca"], datos["df_ci"], datos["df_da"],
+                id_skus = ids, mes_col = mes_col, val_col = val_col, tipo_modelo = contexto.TIPO_MODELO_ML,
+                es_proyectable = True, es_activo = True
+            )))
+
+        df_final = medir_etapa(metricas, "consolidacion", lambda: contexto.PreManager.agregar_columnas_periodo(pd.concat(proyecciones_modelo + proyecciones_simples)))
+
+    resumen = pd.DataFrame(metricas.llamadas)[["nombre", "segundos", "segundos_cpu", "pico_mb", "filas_salida"]]
+    resumen.insert(0, "skus", num_skus)
+    print(f"\n{num_skus} SKUs: {len(df_consumo)} filas de consumo, {len(datos['df_sp'])} filas proyectables, {len(df_final)} filas de proyección")
+    print(resumen.drop(columns = "skus").to_string(index = False))
+    print(f"{'total':>22}: {resumen['segundos'].sum():.3f} s")
+    return resumen
+
+###################################################################################
+# LÓGICA PRINCIPAL DEL BENCHMARK
+###################################################################################
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark de punta a punta de la cadena de un mes")
+    parser.add_argument("--skus", type = int, nargs = "+", default = [1000, 10000, 100000])
+    parser.add_argument("--almacenes", type = int, default = 60)
+    parser.add_argument("--meses", type = int, default = 48)
+    parser.add_argument("--intermitencia", type = float, default = 0.4)
+    parser.add_argument("--estacionalidad", type = float, default = 0.3)
+    parser.add_argument("--fecha-final", default = "2025-10-01", help = "Último mes del histórico generado")
+    parser.add_argument("--semilla", type = int, default = 0)
+    parser.add_argument("--json", default = None, help = "Ruta donde guardar los resultados por etapa y tamaño")
+    args = parser.parse_args()
+
+    parameters = readJsonFile('./config/parameters.json')
+    resultados = pd.concat([ejecutar_cadena(parameters, num_skus, args) for num_skus in args.skus], ignore_index = True)
+
+    print("\nSegundos por etapa y número de SKUs:")
+    print(resultados.pivot(index = "nombre", columns = "skus", values = "segundos").reindex(resultados["nombre"].unique()).round(3).to_string())
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(resultados.to_dict(orient = "records"), f, indent = 2, default = str)
+        print(f"Resultados guardados en {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : benchmark_time_features
+ARCHIVOS  DESTINO  : ---
+ARCHIVOS  FUENTES  : ---
+OBJETIVO           : Comparar los motores de crear_time_features (pandas vs vectorizado)
+TIPO               : PY
+OBSERVACION        : Ejecutar desde la raíz del repositorio: python -m benchmarks.benchmark_time_features (o python benchmarks/benchmark_time_features.py)
+SCHEDULER          : ---
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Benchmark de tiempo y memoria pico de GestorModelo.crear_time_features sobre un histórico
+sintético completo (todos los SKU con todos los meses).
+"""
+
+# RAÍZ DEL REPOSITORIO EN EL PATH, PARA PODER EJECUTAR EL SCRIPT TAMBIÉN COMO ARCHIVO
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Librerías Propias
+from benchmarks.benchmark_completar_meses import generar_historico
+from classes._04_managemodel import GestorModelo
+
+# Librerías Básicas
+import argparse
+import tracemalloc
+import time
+
+# Librerías para Datos
+import numpy as np
+
+ID_COLS = ["CODSOCIEDAD", "CODCENTRO", "CODMATERIAL", "CODUNIDADMEDIDABASE"]
+
+###################################################################################
+# FUNCIÓN PARA MEDIR TIEMPO Y MEMORIA PICO DE UN MOTOR
+###################################################################################
+def medir_motor(gestor, df, num_meses, motor):
+    """
+    Función para medir el tiempo y la memoria pico (tracemalloc) de un motor de crear_time_features.
+    """
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    df_features = gestor.crear_time_features(df, id_cols = ID_COLS, date_col = "MES", value_col = "CTDCONSUMO", num_month = num_meses, motor = motor)
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df_features, segundos, pico / 1024 ** 2
+
+###################################################################################
+# LÓGICA PRINCIPAL DEL BENCHMARK
+###################################################################################
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark de crear_time_features")
+    parser.add_argument("--skus", type = int, default = 20000)
+    parser.add_argument("--meses", type = int, default = 36)
+    parser.add_argument("--features", type = int, default = 18, help = "num_month (meses de proyección)")
+    args = parser.parse_args()
+
+    # HISTÓRICO COMPLETO, COMO EL QUE SALE DE completar_meses
+    df, _ = generar_historico(args.skus, args.meses, densidad = 1.0)
+    gestor = GestorModelo(None, 30, args.features, "")
+    print(f"Histórico sintético: {args.skus} SKUs x {args.meses} meses, {len(df)} filas")
+
+    resultados = {}
+    for motor in ["pandas", "vectorizado"]:
+        df_features, segundos, pico_mb = medir_motor(gestor, df, args.features, motor)
+        resultados[motor] = df_features
+        print(f"{motor:>12}: {segundos:8.3f} s | memoria pico {pico_mb:9.1f} MB")
+
+    # LOS DOS MOTORES SOLO DIFIEREN EN LOS PRIMEROS MESES DE CADA SKU, DONDE EL MOTOR PANDAS MEZCLABA SKUS
+    columnas = [col for col in resultados["vectorizado"].columns if "_LAG" in col or "_MEAN" in col]
+    posicion = resultados["vectorizado"].groupby(ID_COLS).cumcount().to_numpy()
+    con_historia = posicion >= args.features - 1
+    diferencia = np.abs(resultados["pandas"][columnas].to_numpy()[con_historia] - resultados["vectorizado"][columnas].to_numpy()[con_historia]).max(initial = 0.0)
+    print(f"Máxima diferencia en meses con historia completa: {diferencia:.3e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : generar_datos_sinteticos
+ARCHIVOS  DESTINO  : Parquet con la forma de F_CONSUMOMENSUALPT_DEMANDA, Excel / Parquet de SKUs analizados
+ARCHIVOS  FUENTES  : ---
+OBJETIVO           : Generar históricos de demanda sintéticos para medir el rendimiento sin BigQuery de producción
+TIPO               : PY
+OBSERVACION        : Ejecutar desde la raíz del repositorio: python -m benchmarks.generar_datos_sinteticos
+SCHEDULER          : ---
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Generador de históricos mensuales de consumo con SKUs, almacenes, intermitencia, estacionalidad,
+altas y bajas de SKUs configurables, y de la hoja de SKUs analizados. Se guardan con la estructura de carpetas que lee
+LectorArrowLocal (ruta_base/proyecto/dataset/tabla) y ClienteStorageLocal (ruta_base/bucket/archivo).
+"""
+
+# Librerías Básicas
+import argparse
+import logging
+import os
+
+# Librerías para Datos
+import pandas as pd
+import numpy as np
+
+IDENTIFICADORES = ["CLASIFICACION", "CODSOCIEDAD", "CODCENTRO", "CODMATERIAL", "CODUNIDADMEDIDABASE"]
+
+###################################################################################
+# FUNCIÓN PARA GENERAR LOS SKUS (MATERIAL EN UN ALMACÉN) Y SU PERFIL DE DEMANDA
+###################################################################################
+def generar_skus(num_skus, num_almacenes, intermitencia, estacionalidad, rng, clase_producto = "CEMENTO"):
+    """
+    Función para generar los SKUs y su perfil: nivel de demanda (lognormal, pocos SKUs concentran el volumen),
+    probabilidad de consumo en un mes (mezcla de SKUs regulares e intermitentes según intermitencia), amplitud y fase
+    estacional, tendencia, y el mes en que el SKU empieza y deja de consumir.
+    """
+    # LAS SOCIEDADES SON LAS DEL FILTRO DE LA QUERY DEL MES (SIN CEROS A LA IZQUIERDA, SOBREVIVEN A LEER EL EXCEL COMO ENTEROS)
+    almacenes = pd.DataFrame({
+        "CODSOCIEDAD": rng.choice(["6012", "6052"], num_almacenes, p = [0.7, 0.3]),
+        "CODCENTRO": [f"C{i:03d}" for i in range(num_almacenes)]
+    })
+
+    # UN MISMO MATERIAL SE VENDE EN VARIOS ALMACENES: CADA SKU ES UNA COMBINACIÓN (ALMACÉN, MATERIAL) DISTINTA
+    num_materiales = int(np.ceil(num_skus / num_almacenes)) * 4
+    almacen, material = np.divmod(rng.choice(num_almacenes * num_materiales, num_skus, replace = False), num_materiales)
+    unidad_material = rng.choice(["BLS", "TN", "UN"], num_materiales, p = [0.8, 0.15, 0.05])
+
+    skus = pd.DataFrame({
+        "CLASIFICACION": clase_producto,
+        "CODSOCIEDAD": almacenes["CODSOCIEDAD"].to_numpy()[almacen],
+        "CODCENTRO": almacenes["CODCENTRO"].to_numpy()[almacen],
+        # MATERIAL NO NUMÉRICO: LA HOJA DE SKUS SE LEE DEL EXCEL SIN DTYPE Y "00000070" VOLVERÍA COMO EL ENTERO 70
+        "CODMATERIAL": np.char.add("M", np.char.zfill(material.astype(str), 8)),
+        "CODUNIDADMEDIDABASE": unidad_material[material]
+    })
+
+    # UNA FRACCIÓN (intermitencia) DE LOS SKUS CONSUME SOLO EN ALGUNOS MESES; EL RESTO CASI TODOS LOS MESES
+    es_intermitente = rng.random(num_skus) < intermitencia
+    perfil = pd.DataFrame({
+        "nivel": rng.lognormal(mean = 4.0, sigma = 1.5, size = num_skus),
+        "probabilidad": np.where(es_intermitente, rng.uniform(0.05, 0.5, num_skus), rng.uniform(0.85, 1.0, num_skus)),
+        "amplitud": estacionalidad * rng.uniform(0.5, 1.0, num_skus),
+        "fase": rng.integers(0, 12, num_skus),
+        "tendencia": rng.normal(0.0, 0.01, num_skus)
+    })
+    return skus, perfil
+
+###################################################################################
+# FUNCIÓN PARA GENERAR EL HISTÓRICO DE CONSUMO CON LA FORMA DE F_CONSUMOMENSUALPT_DEMANDA
+###################################################################################
+def generar_consumo_demanda(num_skus = 10000, num_almacenes = 60, num_meses = 48, intermitencia = 0.4, estacionalidad = 0.3, fecha_final = "2025-11-01", fraccion_altas = 0.1, fraccion_bajas = 0.1, semilla = 0, clase_producto = "CEMENTO"):
+    """
+    Función para generar un histórico mensual de consumo: una fila por SKU y mes con consumo, con las columnas de
+    F_CONSUMOMENSUALPT_DEMANDA (FECHA es el primer día del mes y FECULTIMOCONSUMO el último mes con consumo del SKU).
+    Una fracción de SKUs empieza a consumir a mitad del histórico (altas) y otra deja de consumir (bajas).
+    """
+    rng = np.random.default_rng(semilla)
+    skus, perfil = generar_skus(num_skus, num_almacenes, intermitencia, estacionalidad, rng, clase_producto = clase_producto)
+    meses = pd.date_range(end = fecha_final, periods = num_meses, freq = "MS")
+
+    # DEMANDA ESPERADA SKU x MES: NIVEL * ESTACIONALIDAD * TENDENCIA
+    t = np.arange(num_meses)
+    mes_del_anio = meses.month.to_numpy() - 1
+    estacional = 1 + perfil["amplitud"].to_numpy()[:, None] * np.sin(2 * np.pi * (mes_del_anio[None, :] - perfil["fase"].to_numpy()[:, None]) / 12)
+    tendencia = np.exp(perfil["tendencia"].to_numpy()[:, None] * t[None, :])
+    esperado = perfil["nivel"].to_numpy()[:, None] * estacional * tendencia
+
+    # MESES CON CONSUMO: INTERMITENCIA Y VIDA DEL SKU (ALTAS Y BAJAS)
+    consume = rng.random((num_skus, num_meses)) < perfil["probabilidad"].to_numpy()[:, None]
+    inicio = np.where(rng.random(num_skus) < fraccion_altas, rng.integers(num_meses // 2, num_meses, num_skus), 0)
+    fin = np.where(rng.random(num_skus) < fraccion_bajas, rng.integers(1, num_meses // 2, num_skus), num_meses)
+    consume &= (t[None, :] >= inicio[:, None]) & (t[None, :] < fin[:, None])
+
+    fila_sku, columna_mes = np.nonzero(consume)
+    cantidades = rng.poisson(esperado[fila_sku, columna_mes]).astype(float)
+    cantidades = np.maximum(cantidades, 1.0)
+
+    # ÚLTIMO MES CON CONSUMO DE CADA SKU
+    ultimo_mes = np.full(num_skus, -1)
+    np.maximum.at(ultimo_mes, fila_sku, columna_mes)
+
+    df = skus.iloc[fila_sku].reset_index(drop = True)
+    df["FECULTIMOCONSUMO"] = meses[ultimo_mes[fila_sku]].date
+    df["FECHA"] = meses[columna_mes].date
+    df["CTDCONSUMO"] = cantidades
+    return df
+
+###################################################################################
+# FUNCIÓN PARA GENERAR LA HOJA DE SKUS ANALIZADOS
+###################################################################################
+def generar_sku_analizados(df_consumo, fraccion_analizados = 0.8, fraccion_inactivos = 0.05, semilla = 0):
+    """
+    Función para generar la hoja de SKUs analizados en el desarrollo: una fracción de los SKUs del histórico (los demás
+    serán SKUs desconocidos) más algunos SKUs que no aparecen en el histórico (conocidos inactivos).
+    """
+    rng = np.random.default_rng(semilla + 1)
+    skus = df_consumo[IDENTIFICADORES].drop_duplicates().reset_index(drop = True)
+    analizados = skus[rng.random(len(skus)) < fraccion_analizados]
+
+    num_inactivos = int(len(skus) * fraccion_inactivos)
+    inactivos = skus.sample(n = num_inactivos, random_state = semilla, replace = True).reset_index(drop = True) if num_inactivos else skus.head(0)
+    inactivos["CODMATERIAL"] = [f"I{i:08d}" for i in range(num_inactivos)]
+    return pd.concat([analizados, inactivos], ignore_index = True)
+
+###################################################################################
+# FUNCIÓN PARA GUARDAR LOS DATOS CON LA ESTRUCTURA DE LOS LECTORES LOCALES
+###################################################################################
+def guardar_datos_sinteticos(df_consumo, df_sku, ruta_base, path_tabla, bucket_name, file_path_sku, sheet_name = "analizados"):
+    """
+    Función para guardar el histórico como Parquet en ruta_base/proyecto/dataset/tabla (LectorArrowLocal) y la hoja
+    de SKUs analizados como Excel en ruta_base/bucket/archivo (ClienteStorageLocal). Si no está instalado el motor de
+    Excel, la hoja se guarda como Parquet junto al archivo. Devuelve las rutas escritas.
+    """
+    ruta_tabla = os.path.join(ruta_base, *path_tabla.split("."))
+    os.makedirs(ruta_tabla, exist_ok = True)
+    ruta_parquet = os.path.join(ruta_tabla, "part-0.parquet")
+    df_consumo.to_parquet(ruta_parquet, index = False)
+
+    ruta_sku = os.path.join(ruta_base, bucket_name, file_path_sku)
+    os.makedirs(os.path.dirname(ruta_sku), exist_ok = True)
+    try:
+        with pd.ExcelWriter(ruta_sku) as writer:
+            df_sku.to_excel(writer, sheet_name = sheet_name, index = False)
+    except ImportError:
+        ruta_sku = os.path.splitext(ruta_sku)[0] + ".parquet"
+        df_sku.to_parquet(ruta_sku, index = False)
+        logging.warning(f"No hay motor de Excel instalado; la hoja de SKUs analizados se guardó en {ruta_sku}")
+    return ruta_parquet, ruta_sku
+
+###################################################################################
+# LÓGICA PRINCIPAL DEL GENERADOR
+###################################################################################
+def main():
+    parser = argparse.ArgumentParser(description = "Generador de datos sintéticos de demanda")
+    parser.add_argument("--skus", type = int, default = 10000)
+    parser.add_argument("--almacenes", type = int, default = 60)
+    parser.add_argument("--meses", type = int, default = 48)
+    parser.add_argument("--intermitencia", type = float, default = 0.4, help = "Fracción de SKUs intermitentes")
+    parser.add_argument("--estacionalidad", type = float, default = 0.3, help = "Amplitud estacional máxima")
+    parser.add_argument("--fecha-final", default = "2025-11-01", help = "Último mes del histórico (AAAA-MM-01)")
+    parser.add_argument("--semilla", type = int, default = 0)
+    parser.add_argument("--ruta", default = "datos_sinteticos", help = "Carpeta base (RUTA_LOCAL_ARROW y RUTA_STORAGE_LOCAL)")
+    parser.add_argument("--tabla", default = "proyecto.dataset.F_CONSUMOMENSUALPT_DEMANDA")
+    parser.add_argument("--bucket", default = "bucket")
+    parser.add_argument("--archivo-sku", default = "planificacion_demanda_comercial/evalmetrics_202505.xlsx")
+    args = parser.parse_args()
+
+    df_consumo = generar_consumo_demanda(args.skus, args.almacenes, args.meses, args.intermitencia, args.estacionalidad, fecha_final = args.fecha_final, semilla = args.semilla)
+    df_sku = generar_sku_analizados(df_consumo, semilla = args.semilla)
+    ruta_parquet, ruta_sku = guardar_datos_sinteticos(df_consumo, df_sku, args.ruta, args.tabla, args.bucket, args.archivo_sku)
+    print(f"Histórico sintético: {args.skus} SKUs, {len(df_consumo)} filas -> {ruta_parquet}")
+    print(f"SKUs analizados: {len(df_sku)} -> {ruta_sku}")
+
+if __name__ == "__main__":
+    main()
@@ -1,202 +1,569 @@
-"""_summary_.
-
-PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
-NOMBRE             : 01_managedatastorages
-ARCHIVOS  DESTINO  : ---
-ARCHIVOS  FUENTES  : ---
-OBJETIVO           : Definir procesos para obtener y manejar data y sus fuentes
-TIPO               : PY
-OBSERVACION        : -
-SCHEDULER          : CLOUD RUN
-VERSION            : 1.0
-DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
-PROVEEDOR          : MINSAIT
-FECHA              : 10/12/2025
-DESCRIPCION        : Paquete que contiene procesos para obtener y manejar data y sus fuentes
-"""
-
-# Librerías Básicas
-import logging
-import io
-
-# Librerías para Datos
-import pandas as pd
-import pandas_gbq
-
-# Librerías de GCP
-from google.cloud import bigquery
-from google.cloud import storage
-from google.api_core import exceptions as google_exceptions
-
-class GestorAlmacenDatos:
-    """Clase para la gestión de datos y sus fuentes."""
-
-    def __init__(self, bq_cliente, cs_cliente):
-        """
-        Inicializa la clase.
-        """
-        logging.info("Inicializando la clase de Gestor de Fuentes de Datos...")
-
-        self.bq_cliente = bq_cliente
-        self.cs_cliente = cs_cliente
-    
-    ###################################################################################
-    # FUNCIÓN PARA CONFIRMAR SI UNA QUERY SE EJECUTA CORRECTAMENTE O NO
-    ###################################################################################
-    def verificar_tabla(self, query_validation):
-        """
-        Función para verificar si una tabla existe.
-        """
-
-        # ACCEDEMOS AL CLIENTE DE BIGQUERY E INTENTAMOS VER SI HAY RESULTADOS DEL MES
-        try:
-            query_validation_client = self.bq_cliente.query(query_validation)
-            results = query_validation_client.result()
-            first_result = next(iter(results), None)
-            return True
-        except google_exceptions.NotFound:
-            return False
-        except google_exceptions.Forbidden as e:
-            return False
-        except Exception as e:
-            raise Exception("Error al intentar validar si existe alguna tabla.") from e
-
-      ###################################################################################
-    # FUNCIÓN PARA CONFIRMAR SI UNA QUERY TIENE RESULTADOS O NO
-    ###################################################################################
-    def verificar_resultados_tabla(self, query_validation):
-        """
-        Función para verificar si una tabla y sus resultados de query existen.
-        """
-
-        # ACCEDEMOS AL CLIENTE DE BIGQUERY E INTENTAMOS VER SI HAY RESULTADOS DEL MES
-        try:
-            query_validation_client = self.bq_cliente.query(query_validation)
-            results = query_validation_client.result()
-            first_result = next(iter(results), None)
-            return True if first_result is not None else False
-        except google_exceptions.NotFound:
-            raise Exception("No existe la tabla.") from e
-        except google_exceptions.Forbidden as e:
-            raise Exception("No existe la tabla.") from e
-        except Exception as e:
-            raise Exception("Error al intentar validar si existe alguna tabla.") from e
-
-    ###################################################################################
-    # FUNCIÓN PARA CONFIRMAR SI UN ARCHIVO EN UN BUCKET EXISTE O NO
-    ###################################################################################
-    def verificar_archivo_gcs(self, bucket_name, file_path):
-        """
-        Función para verificar si un archivo existe o no en un bucket/ ruta de cloud storage
-        """
-        # CREAR OBJETO BUCKET Y ARCHIVO
-        bucket = self.cs_cliente.bucket(bucket_name)     
-        blob = bucket.blob(file_path)
-
-        # INTENTAR CONFIRMAR SI EXISTE EL ARCHIVO
-        try:
-            return blob.exists()    
-        except google_exceptions.NotFound:
-            return False
-        except Exception as e:
-            raise Exception("Error al intentar validar si existe el archivo.") from e
-
-    ###################################################################################
-    # FUNCIÓN PARA CONVERTIR XLSX UBICADO EN CLOUD STORAGE EN UN DATAFRAME DE LOS SKUS DE DESARROLLO
-    ###################################################################################
-    def obtener_sku_analizados(self, bucket_name, file_path, sheet_name):
-        """
-        Función para obtener los SKU analizados en desarrolllo almacenados en un xlsx en Cloud Storage
-        """
-        # CREAR OBJETO BUCKET Y ARCHIVO
-        bucket = self.cs_cliente.bucket(bucket_name)     
-        blob = bucket.blob(file_path)
-
-        # DESCARGAR EL ARCHIVO DE GCS EN BYTES
-        try:
-            excel_bytes = blob.download_as_bytes()
-        except Exception as e:
-            print(f"Error al descargar el archivo desde GCS: {e}")
-            raise
-        
-        # SIMULAR BYTES COMO ARCHIVO EN DISCO
-        excel_file = io.BytesIO(excel_bytes)
-
-        # LEER ARCHIVO EXCEL Y CONVERTIR EN DATAFRAME
-        df = pd.read_excel(excel_file, sheet_name=sheet_name)
-        
-        return df
-    
-    ###################################################################################
-    # FUNCIÓN PARA OBTENER ESQUEMA DE BIGQUERY A PARTIR DE DATAFRAME
-    ###################################################################################
-    def obtener_esquema_de_dataframe(self, df):
-        """
-        Función para generar la lista de bigquery.SchemaField mapeando los dtypes de Pandas de un dataframe.
-        """
-        dtype_mapping = {
-            'object': 'STRING',
-            'int64': 'INT64',
-            'float64': 'FLOAT64',
-            'bool': 'BOOL',
-            'boolean': 'BOOL',
-            'datetime64[ns]': 'TIMESTAMP', 
-            'datetime64[us, UTC]': 'TIMESTAMP',
-            'int32': 'INT64'
-        }
-        
-        schema = []
-        
-        for column, dtype in df.dtypes.items():
-            dtype_str = str(dtype)
-            bq_type = dtype_mapping.get(dtype_str)
-            
-            if bq_type is None:
-                if dtype_str[:13] == "datetime64[us":
-                    bq_type = "TIMESTAMP"
-                else:
-                    bq_type = "STRING"
-                
-            schema.append(
-                bigquery.SchemaField(column, bq_type)
-            )
-            
-        return schema
-    
-    ###################################################################################
-    # FUNCIÓN PARA CREAR TABLA PARTICIONADA
-    ###################################################################################
-    def crear_tabla_particionada(self, nueva_tabla, df_schema, columna_particionada):
-        """
-        Función para crear tablas particionadas en caso no existan.
-        """
-        #CONFIGURAR PARTICIÓN POR RANGO DE ENTEROS
-        range_config = bigquery.RangePartitioning(
-            field=columna_particionada,
-            range_=bigquery.PartitionRange(
-                start = 202301,    
-                end = 211812,
-                interval = 1,
-            )
-        )
-
-        # CREAR LA TABLA PARTICIONADA
-        schema = self.obtener_esquema_de_dataframe(df_schema)
-        table = bigquery.Table(nueva_tabla, schema=schema)
-        table.range_partitioning = range_config
-        self.bq_cliente.create_table(table) 
-
-    ###################################################################################
-    # CARGAR DATOS EN BIGQUERY
-    ###################################################################################
-    def cargar_datos_bigquery(self, df, path_table, project_exe, if_exists = 'replace'):
-        """
-        Cargar Datos en Bigquery.
-        """
-        # CARGAR LA DATA
-        pandas_gbq.to_gbq(
-            df,
-            destination_table=path_table,
-            project_id=project_exe,
-            if_exists=if_exists
-        )
\ No newline at end of file
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : 01_managedatastorages
+ARCHIVOS  DESTINO  : ---
+ARCHIVOS  FUENTES  : ---
+OBJETIVO           : Definir procesos para obtener y manejar data y sus fuentes
+TIPO               : PY
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene procesos para obtener y manejar data y sus fuentes
+"""
+
+# Librerías Básicas
+import datetime
+import logging
+import random
+import time
+import uuid
+import io
+import os
+
+# Librerías para Datos
+import pandas as pd
+import pandas_gbq
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Librerías de GCP
+from google.cloud import bigquery
+from google.cloud import bigquery_storage
+from google.cloud import storage
+from google.api_core import exceptions as google_exceptions
+
+class GestorAlmacenDatos:
+    """Clase para la gestión de datos y sus fuentes."""
+
+    def __init__(self, bq_cliente, cs_cliente, bqs_cliente = None, lector_local = None, max_streams_lectura = 4, metodo_carga = "pandas_gbq", reintentos_transaccion = 6, espera_base_transaccion = 2.0):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Gestor de Fuentes de Datos...")
+
+        self.bq_cliente = bq_cliente
+        self.cs_cliente = cs_cliente
+        self.bqs_cliente = bqs_cliente
+        self.lector_local = lector_local
+        self.max_streams_lectura = max_streams_lectura
+        self.metodo_carga = metodo_carga
+
+        # REINTENTOS DE LA TRANSACCIÓN DE REEMPLAZO CUANDO BIGQUERY LA ABORTA POR OTRA QUE MODIFICA LA MISMA TABLA
+        self.reintentos_transaccion = reintentos_transaccion
+        self.espera_base_transaccion = espera_base_transaccion
+    
+    ###################################################################################
+    # FUNCIÓN PARA CONFIRMAR SI UNA QUERY SE EJECUTA CORRECTAMENTE O NO
+    ###################################################################################
+    def verificar_tabla(self, query_validation):
+        """
+        Función para verificar si una tabla existe.
+        """
+
+        # ACCEDEMOS AL CLIENTE DE BIGQUERY E INTENTAMOS VER SI HAY RESULTADOS DEL MES
+        try:
+            query_validation_client = self.bq_cliente.query(query_validation)
+            results = query_validation_client.result()
+            first_result = next(iter(results), None)
+            return True
+        except google_exceptions.NotFound:
+            return False
+        except google_exceptions.Forbidden as e:
+            return False
+        except Exception as e:
+            raise Exception("Error al intentar validar si existe alguna tabla.") from e
+
+      ###################################################################################
+    # FUNCIÓN PARA CONFIRMAR SI UNA QUERY TIENE RESULTADOS O NO
+    ###################################################################################
+    def verificar_resultados_tabla(self, query_validation):
+        """
+        Función para verificar si una tabla y sus resultados de query existen.
+        """
+
+        # ACCEDEMOS AL CLIENTE DE BIGQUERY E INTENTAMOS VER SI HAY RESULTADOS DEL MES
+        try:
+            query_validation_client = self.bq_cliente.query(query_validation)
+            results = query_validation_client.result()
+            first_result = next(iter(results), None)
+            return True if first_result is not None else False
+        except google_exceptions.NotFound:
+            raise Exception("No existe la tabla.") from e
+        except google_exceptions.Forbidden as e:
+            raise Exception("No existe la tabla.") from e
+        except Exception as e:
+            raise Exception("Error al intentar validar si existe alguna tabla.") from e
+
+    ###################################################################################
+    # FUNCIÓN PARA CONFIRMAR SI UN ARCHIVO EN UN BUCKET EXISTE O NO
+    ###################################################################################
+    def verificar_archivo_gcs(self, bucket_name, file_path):
+        """
+        Función para verificar si un archivo existe o no en un bucket/ ruta de cloud storage
+        """
+        # CREAR OBJETO BUCKET Y ARCHIVO
+        bucket = self.cs_cliente.bucket(bucket_name)     
+        blob = bucket.blob(file_path)
+
+        # INTENTAR CONFIRMAR SI EXISTE EL ARCHIVO
+        try:
+            return blob.exists()    
+        except google_exceptions.NotFound:
+            return False
+        except Exception as e:
+            raise Exception("Error al intentar validar si existe el archivo.") from e
+
+    ###################################################################################
+    # FUNCIÓN PARA CONVERTIR XLSX UBICADO EN CLOUD STORAGE EN UN DATAFRAME DE LOS SKUS DE DESARROLLO
+    ###################################################################################
+    def obtener_sku_analizados(self, bucket_name, file_path, sheet_name):
+        """
+        Función para obtener los SKU analizados en desarrolllo almacenados en un xlsx en Cloud Storage
+        """
+        # CREAR OBJETO BUCKET Y ARCHIVO
+        bucket = self.cs_cliente.bucket(bucket_name)     
+        blob = bucket.blob(file_path)
+
+        # DESCARGAR EL ARCHIVO DE GCS EN BYTES
+        try:
+            excel_bytes = blob.download_as_bytes()
+        except Exception as e:
+            print(f"Error al descargar el archivo desde GCS: {e}")
+            raise
+        
+        # SIMULAR BYTES COMO ARCHIVO EN DISCO
+        excel_file = io.BytesIO(excel_bytes)
+
+        # LEER ARCHIVO EXCEL Y CONVERTIR EN DATAFRAME
+        df = pd.read_excel(excel_file, sheet_name=sheet_name)
+        
+        return df
+    
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER ESQUEMA DE BIGQUERY A PARTIR DE DATAFRAME
+    ###################################################################################
+    def obtener_esquema_de_dataframe(self, df):
+        """
+        Función para generar la lista de bigquery.SchemaField mapeando los dtypes de Pandas de un dataframe.
+        """
+        dtype_mapping = {
+            'object': 'STRING',
+            'int64': 'INT64',
+            'float64': 'FLOAT64',
+            'bool': 'BOOL',
+            'boolean': 'BOOL',
+            'datetime64[ns]': 'TIMESTAMP', 
+            'datetime64[us, UTC]': 'TIMESTAMP',
+            'int32': 'INT64'
+        }
+        
+        schema = []
+        
+        for column, dtype in df.dtypes.items():
+            dtype_str = str(dtype)
+            bq_type = dtype_mapping.get(dtype_str)
+            
+            if bq_type is None:
+                if dtype_str[:13] == "datetime64[us":
+                    bq_type = "TIMESTAMP"
+                else:
+                    bq_type = "STRING"
+                
+            schema.append(
+                bigquery.SchemaField(column, bq_type)
+            )
+            
+        return schema
+    
+    ###################################################################################
+    # FUNCIÓN PARA CREAR TABLA PARTICIONADA
+    ###################################################################################
+    def crear_tabla_particionada(self, nueva_tabla, df_schema, columna_particionada):
+        """
+        Función para crear tablas particionadas en caso no existan.
+        """
+        #CONFIGURAR PARTICIÓN POR RANGO DE ENTEROS
+        range_config = bigquery.RangePartitioning(
+            field=columna_particionada,
+            range_=bigquery.PartitionRange(
+                start = 202301,    
+                end = 211812,
+                interval = 1,
+            )
+        )
+
+        # CREAR LA TABLA PARTICIONADA
+        schema = self.obtener_esquema_de_dataframe(df_schema)
+        table = bigquery.Table(nueva_tabla, schema=schema)
+        table.range_partitioning = range_config
+        self.bq_cliente.create_table(table, exists_ok = True)
+
+    ###################################################################################
+    # CARGAR DATOS EN BIGQUERY
+    ###################################################################################
+    def cargar_datos_bigquery(self, df, path_table, project_exe, if_exists = 'replace', metodo = None):
+        """
+        Cargar Datos en Bigquery.
+        El método de carga ("pandas_gbq" o "parquet") se toma de la configuración si no se indica.
+        """
+        metodo = metodo or self.metodo_carga
+        # pandas_gbq SOLO ESCRIBE EN BIGQUERY: CON EL BACKEND LOCAL SE CARGA SIEMPRE COMO PARQUET
+        if metodo == "parquet" or getattr(self.bq_cliente, "es_local", False):
+            return self.cargar_datos_bigquery_parquet(df, path_table, if_exists = if_exists)
+
+        # CARGAR LA DATA
+        inicio = time.perf_counter()
+        pandas_gbq.to_gbq(
+            df,
+            destination_table=path_table,
+            project_id=project_exe,
+            if_exists=if_exists
+        )
+        segundos = time.perf_counter() - inicio
+
+        metricas_carga = {
+            "metodo": "pandas_gbq",
+            "filas": len(df),
+            "bytes": None,
+            "segundos": round(segundos, 3),
+            "filas_por_segundo": round(len(df) / segundos, 1) if segundos > 0 else None
+        }
+        logging.info(f"Carga a {path_table} con pandas_gbq: {metricas_carga['filas']} filas en {metricas_carga['segundos']} s ({metricas_carga['filas_por_segundo']} filas/s)")
+        return metricas_carga
+
+    ###################################################################################
+    # FUNCIÓN PARA ADAPTAR UN DATAFRAME A UN ESQUEMA DE BIGQUERY
+    ###################################################################################
+    def adaptar_dataframe_a_esquema(self, df, schema):
+        """
+        Función para convertir las columnas de un dataframe a los tipos del esquema de BigQuery, de forma que
+        el Parquet generado coincida con el esquema explícito del job de carga.
+        """
+        df_esquema = df[[campo.name for campo in schema]].copy()
+
+        for campo in schema:
+            serie = df_esquema[campo.name]
+            if campo.field_type == "STRING" and not pd.api.types.is_string_dtype(serie):
+                df_esquema[campo.name] = serie.astype("string")
+            elif campo.field_type == "TIMESTAMP" and pd.api.types.is_datetime64_any_dtype(serie):
+                # PARQUET NECESITA TIMESTAMP AJUSTADO A UTC PARA QUE BIGQUERY LO LEA COMO TIMESTAMP (Y NO DATETIME)
+                df_esquema[campo.name] = serie.dt.tz_localize("UTC") if serie.dt.tz is None else serie.dt.tz_convert("UTC")
+            elif campo.field_type == "INT64" and pd.api.types.is_integer_dtype(serie):
+                df_esquema[campo.name] = serie.astype("int64")
+
+        return df_esquema
+
+    ###################################################################################
+    # CARGAR DATOS EN BIGQUERY CON UN JOB DE CARGA DE PARQUET
+    ###################################################################################
+    def cargar_datos_bigquery_parquet(self, df, path_table, if_exists = 'append', schema = None):
+        """
+        Cargar Datos en Bigquery escribiendo el dataframe en un buffer Parquet en memoria y enviando un único
+        job de carga (load_table_from_file) con esquema explícito. Si no se indica el esquema, se usa el de la tabla
+        destino (así una columna que la tabla tiene como STRING no se carga como TIMESTAMP) y, si la tabla aún no
+        existe, el que resulta de los dtypes del dataframe. Retorna métricas de filas/segundo y bytes escritos.
+        """
+        disposiciones = {
+            "append": bigquery.WriteDisposition.WRITE_APPEND,
+            "replace": bigquery.WriteDisposition.WRITE_TRUNCATE,
+            "fail": bigquery.WriteDisposition.WRITE_EMPTY
+        }
+        inicio = time.perf_counter()
+
+        # ESCRIBIR EL DATAFRAME EN PARQUET EN MEMORIA CON LOS TIPOS DEL ESQUEMA
+        if schema is None:
+            try:
+                schema = self.bq_cliente.get_table(path_table.split("$")[0]).schema
+            except google_exceptions.NotFound:
+                schema = self.obtener_esquema_de_dataframe(df)
+        tabla_arrow = pa.Table.from_pandas(self.adaptar_dataframe_a_esquema(df, schema), preserve_index = False)
+        buffer = io.BytesIO()
+        pq.write_table(tabla_arrow, buffer, compression = "snappy", coerce_timestamps = "us", allow_truncated_timestamps = True)
+        bytes_escritos = buffer.tell()
+        buffer.seek(0)
+        segundos_serializacion = time.perf_counter() - inicio
+
+        # ENVIAR UN SOLO JOB DE CARGA
+        job_config = bigquery.LoadJobConfig(
+            source_format = bigquery.SourceFormat.PARQUET,
+            schema = schema,
+            write_disposition = disposiciones[if_exists]
+        )
+        load_job = self.bq_cliente.load_table_from_file(buffer, path_table, job_config = job_config)
+        load_job.result()
+        segundos = time.perf_counter() - inicio
+
+        metricas_carga = {
+            "metodo": "parquet",
+            "filas": len(df),
+            "bytes": bytes_escritos,
+            "segundos": round(segundos, 3),
+            "segundos_serializacion": round(segundos_serializacion, 3),
+            "filas_por_segundo": round(len(df) / segundos, 1) if segundos > 0 else None
+        }
+        logging.info(f"Carga a {path_table} con Parquet: {metricas_carga['filas']} filas, {bytes_escritos} bytes en {metricas_carga['segundos']} s ({metricas_carga['filas_por_segundo']} filas/s)")
+        return metricas_carga
+
+    ###################################################################################
+    # CARGAR LAS FILAS DE UN PERIODO Y CLASE EN BIGQUERY (SOBRESCRITURA IDEMPOTENTE)
+    ###################################################################################
+    def cargar_particion_bigquery(self, df, path_table, columna_particionada, columnas_reemplazo = ["CLASIFICACION"], schema = None):
+        """
+        Cargar Datos en Bigquery reemplazando, dentro de la partición del periodo del dataframe, solo las filas con los
+        valores de columnas_reemplazo que trae el dataframe (por defecto, su CLASIFICACION): las filas de otras clases de
+        producto del mismo mes se conservan. El dataframe se carga en una tabla de staging y el DELETE + INSERT se
+        ejecuta en una sola transacción, así volver a cargar el mismo periodo no deja duplicados ni cargas a medias.
+        Si BigQuery aborta la transacción porque otra (otra tarea u otra clase de producto) modifica la misma tabla,
+        se reintenta con espera exponencial.
+        """
+        # ASEGURAR QUE EL DATAFRAME PERTENECE A UNA SOLA PARTICIÓN
+        periodos = df[columna_particionada].dropna().unique()
+        if len(periodos) != 1:
+            raise ValueError(f"Se esperaba un único valor de {columna_particionada} para cargar la partición, se encontraron: {list(periodos)}")
+        periodo = int(periodos[0])
+
+        # USAR EL ESQUEMA DE LA TABLA DESTINO PARA QUE EL JOB DE CARGA SEA COMPATIBLE CON ELLA
+        if schema is None:
+            schema = self.bq_cliente.get_table(path_table).schema
+
+        # FILAS A REEMPLAZAR: LAS DEL PERIODO CON LOS VALORES DEL DATAFRAME (LOS NULOS TAMBIÉN, PARA NO DUPLICARLOS)
+        condiciones = [self.construir_restriccion_filas([(columna_particionada, "=", periodo)])]
+        for columna in columnas_reemplazo:
+            valores = [valor for valor in df[columna].dropna().unique().tolist()]
+            condicion = self.construir_restriccion_filas([(columna, "in", valores)]) if valores else "FALSE"
+            if df[columna].isna().any():
+                condicion = f"({condicion} OR {columna} IS NULL)"
+            condiciones.append(condicion)
+
+        # CARGAR EN STAGING Y REEMPLAZAR LAS FILAS EN UNA SOLA TRANSACCIÓN
+        tabla_staging = f"{path_table.replace('`', '')}_staging_{periodo}_{uuid.uuid4().hex[:8]}"
+        columnas = ", ".join(campo.name for campo in schema)
+        logging.info(f"Reemplazando en {path_table} las filas de {' AND '.join(condiciones)}")
+        metricas_carga = self.cargar_datos_bigquery_parquet(df, tabla_staging, if_exists = "replace", schema = schema)
+        try:
+            for intento in range(self.reintentos_transaccion + 1):
+                try:
+                    self.bq_cliente.query(f"""
+                        BEGIN TRANSACTION;
+                        DELETE FROM `{path_table}` WHERE {' AND '.join(condiciones)};
+                        INSERT INTO `{path_table}` ({columnas}) SELECT {columnas} FROM `{tabla_staging}`;
+                        COMMIT TRANSACTION;
+                    """).result()
+                    break
+                except google_exceptions.GoogleAPICallError as e:
+                    if "concurrent update" not in str(e).lower() or intento == self.reintentos_transaccion:
+                        raise
+                    # ESPERA ALEATORIA PARA QUE LAS TAREAS QUE CHOCARON NO VUELVAN A INTENTAR A LA VEZ
+                    espera = self.espera_base_transaccion * 2 ** intento * random.uniform(0.5, 1.5)
+                    logging.warning(f"Transacción sobre {path_table} abortada por una actualización concurrente; reintento {intento + 1} en {espera:.1f} s")
+                    time.sleep(espera)
+        finally:
+            self.bq_cliente.delete_table(tabla_staging, not_found_ok = True)
+        return metricas_carga
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER EL CLIENTE DE BIGQUERY STORAGE READ API
+    ###################################################################################
+    def obtener_cliente_bqstorage(self):
+        """
+        Función para obtener (y crear solo la primera vez) el cliente de la BigQuery Storage Read API.
+        """
+        if self.bqs_cliente is None:
+            self.bqs_cliente = bigquery_storage.BigQueryReadClient()
+        return self.bqs_cliente
+
+    ###################################################################################
+    # FUNCIÓN PARA CONVERTIR FILTROS EN UNA RESTRICCIÓN DE FILAS SQL
+    ###################################################################################
+    def construir_restriccion_filas(self, filtros):
+        """
+        Función para convertir una lista de filtros [(columna, operador, valor), ...] en la restricción de filas
+        (cláusula WHERE sin la palabra WHERE) que entiende la BigQuery Storage Read API.
+        """
+        def formatear_valor(valor):
+            if isinstance(valor, datetime.datetime):
+                return f"TIMESTAMP '{valor.strftime('%Y-%m-%d %H:%M:%S')}'"
+            if isinstance(valor, datetime.date):
+                return f"DATE '{valor.strftime('%Y-%m-%d')}'"
+            if isinstance(valor, bool):
+                return "TRUE" if valor else "FALSE"
+            if isinstance(valor, (int, float)):
+                return str(valor)
+            valor_str = str(valor).replace("\\", "\\\\").replace("'", "\\'")
+            return f"'{valor_str}'"
+
+        condiciones = []
+        for columna, operador, valor in (filtros or []):
+            operador = operador.strip().lower()
+            if operador in ("in", "not in"):
+                valores = ", ".join(formatear_valor(v) for v in valor)
+                condiciones.append(f"{columna} {operador.upper()} ({valores})")
+            elif operador in ("=", "=="):
+                condiciones.append(f"{columna} = {formatear_valor(valor)}")
+            elif operador in ("!=", "<", "<=", ">", ">="):
+                condiciones.append(f"{columna} {operador} {formatear_valor(valor)}")
+            else:
+                raise ValueError(f"Operador de filtro no soportado: {operador}")
+
+        return " AND ".join(condiciones)
+
+    ###################################################################################
+    # FUNCIÓN PARA LEER UNA TABLA COMO LOTES ARROW CON LA BIGQUERY STORAGE READ API
+    ###################################################################################
+    def iterar_lotes_arrow(self, tabla, columnas = None, filtros = None):
+        """
+        Función para leer una tabla de BigQuery como lotes Arrow (pyarrow.RecordBatch) usando la BigQuery Storage Read API,
+        proyectando solo las columnas pedidas y empujando los filtros de filas al servidor.
+        Si se configuró un lector local, los lotes se leen de Parquet en disco.
+        """
+        # LECTURA LOCAL (PARQUET) CUANDO NO SE TRABAJA CONTRA BIGQUERY
+        if self.lector_local is not None:
+            yield from self.lector_local.iterar_lotes_arrow(tabla, columnas = columnas, filtros = filtros)
+            return
+
+        # CREAR LA SESIÓN DE LECTURA CON PROYECCIÓN DE COLUMNAS Y RESTRICCIÓN DE FILAS
+        project_id, dataset_id, table_id = tabla.replace("`", "").split(".")
+        read_options = bigquery_storage.types.ReadSession.TableReadOptions(
+            selected_fields = list(columnas or []),
+            row_restriction = self.construir_restriccion_filas(filtros)
+        )
+        requested_session = bigquery_storage.types.ReadSession(
+            table = f"projects/{project_id}/datasets/{dataset_id}/tables/{table_id}",
+            data_format = bigquery_storage.types.DataFormat.ARROW,
+            read_options = read_options
+        )
+        bqs_cliente = self.obtener_cliente_bqstorage()
+        read_session = bqs_cliente.create_read_session(
+            parent = f"projects/{self.bq_cliente.project}",
+            read_session = requested_session,
+            max_stream_count = self.max_streams_lectura
+        )
+
+        # LEER LOS LOTES DE CADA STREAM
+        for stream in read_session.streams:
+            reader = bqs_cliente.read_rows(stream.name)
+            for page in reader.rows(read_session).pages:
+                yield page.to_arrow()
+
+    ###################################################################################
+    # FUNCIÓN PARA LEER UNA TABLA COMPLETA COMO ARROW / DATAFRAME
+    ###################################################################################
+    def leer_tabla_arrow(self, tabla, columnas = None, filtros = None, como_dataframe = True):
+        """
+        Función para leer una tabla de BigQuery (o su equivalente local) con proyección de columnas y filtros,
+        uniendo los lotes Arrow en una sola tabla. Por defecto retorna un DataFrame de Pandas.
+        """
+        lotes = list(self.iterar_lotes_arrow(tabla, columnas = columnas, filtros = filtros))
+
+        if lotes:
+            tabla_arrow = pa.Table.from_batches(lotes)
+        elif self.lector_local is not None:
+            tabla_arrow = self.lector_local.leer_esquema(tabla, columnas = columnas).empty_table()
+        else:
+            # SIN FILAS: SOLO SE OBTIENE EL ESQUEMA PARA RETORNAR UNA TABLA VACÍA CON LOS TIPOS CORRECTOS
+            tabla_bq = self.bq_cliente.get_table(tabla.replace("`", ""))
+            campos = [campo for campo in tabla_bq.schema if not columnas or campo.name in columnas]
+            tabla_arrow = self.bq_cliente.list_rows(tabla_bq, selected_fields = campos, max_results = 0).to_arrow()
+
+        logging.info(f"Leídas {tabla_arrow.num_rows} filas de {tabla} en formato Arrow")
+        return tabla_arrow.to_pandas() if como_dataframe else tabla_arrow
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER LA VERSIÓN DE UNA TABLA (SIN LEER SUS FILAS)
+    ###################################################################################
+    def obtener_version_tabla(self, tabla):
+        """
+        Función para obtener un texto que cambia cada vez que cambian los datos de la tabla (fecha de modificación y
+        número de filas en BigQuery, o fecha y tamaño de los archivos locales). Sirve como huella del input.
+        """
+        if self.lector_local is not None:
+            return self.lector_local.obtener_version(tabla)
+
+        tabla_bq = self.bq_cliente.get_table(tabla.replace("`", ""))
+        return f"{tabla_bq.modified.isoformat()}|{tabla_bq.num_rows}"
+
+    ###################################################################################
+    # FUNCIÓN PARA LEER EL RESULTADO DE UNA QUERY COMO ARROW / DATAFRAME
+    ###################################################################################
+    def leer_query_arrow(self, query, como_dataframe = True):
+        """
+        Función para ejecutar una query y descargar su resultado en formato Arrow con la BigQuery Storage Read API.
+        Se usa para las lecturas que no se pueden expresar como tabla + filtros (subconsultas, LIMIT, etc.).
+        Con el backend local, la query se ejecuta con DuckDB sobre los mismos Parquet del lector local.
+        """
+        es_local = getattr(self.bq_cliente, "es_local", False)
+        if self.lector_local is not None and not es_local:
+            raise ValueError("La lectura por query no está disponible con el lector local, utilice leer_tabla_arrow o el backend local.")
+
+        resultados = self.bq_cliente.query(query).result()
+        tabla_arrow = resultados.to_arrow(bqstorage_client = None if es_local else self.obtener_cliente_bqstorage())
+
+        return tabla_arrow.to_pandas() if como_dataframe else tabla_arrow
+
+
+class LectorArrowLocal:
+    """Clase para leer en local tablas guardadas como Parquet, imitando la lectura Arrow de BigQuery (pruebas offline)."""
+
+    def __init__(self, ruta_base):
+        """
+        Inicializa la clase. Una tabla "proyecto.dataset.tabla" se busca en "ruta_base/proyecto/dataset/tabla"
+        (directorio de Parquet, con o sin particiones hive) o en "ruta_base/proyecto/dataset/tabla.parquet".
+        """
+        logging.info("Inicializando la clase de Lector Arrow Local...")
+
+        self.ruta_base = ruta_base
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER EL DATASET DE PARQUET DE UNA TABLA
+    ###################################################################################
+    def obtener_dataset(self, tabla):
+        """
+        Función para obtener el dataset de pyarrow asociado a una tabla.
+        """
+        ruta_tabla = os.path.join(self.ruta_base, *tabla.replace("`", "").split("."))
+        if not os.path.exists(ruta_tabla) and os.path.exists(ruta_tabla + ".parquet"):
+            ruta_tabla = ruta_tabla + ".parquet"
+        if not os.path.exists(ruta_tabla):
+            raise google_exceptions.NotFound(f"No existe la tabla local: {ruta_tabla}")
+
+        return ds.dataset(ruta_tabla, format = "parquet", partitioning = "hive")
+
+    ###################################################################################
+    # FUNCIÓN PARA LEER EL ESQUEMA DE UNA TABLA
+    ###################################################################################
+    def leer_esquema(self, tabla, columnas = None):
+        """
+        Función para obtener el esquema Arrow de una tabla, proyectado a las columnas pedidas.
+        """
+        esquema = self.obtener_dataset(tabla).schema
+        if columnas:
+            esquema = pa.schema([esquema.field(columna) for columna in columnas])
+        return esquema
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER LA VERSIÓN DE UNA TABLA LOCAL
+    ###################################################################################
+    def obtener_version(self, tabla):
+        """
+        Función para obtener la versión de una tabla local: nombre, fecha de modificación y tamaño de cada archivo.
+        """
+        archivos = sorted(self.obtener_dataset(tabla).files)
+        return "|".join(f"{os.path.basename(archivo)}:{os.stat(archivo).st_mtime_ns}:{os.stat(archivo).st_size}" for archivo in archivos)
+
+    ###################################################################################
+    # FUNCIÓN PARA LEER UNA TABLA COMO LOTES ARROW
+    ###################################################################################
+    def iterar_lotes_arrow(self, tabla, columnas = None, filtros = None):
+        """
+        Función para leer una tabla local como lotes Arrow con proyección de columnas y filtros.
+        """
+        filtros_pyarrow = [(c, "==" if o.strip() == "=" else o.strip().lower(), v) for c, o, v in (filtros or [])]
+        expresion = pq.filters_to_expression(filtros_pyarrow) if filtros_pyarrow else None
+
+        dataset = self.obtener_dataset(tabla)
+        yield from dataset.to_batches(columns = list(columnas) if columnas else None, filter = expresion)
@@ -1,335 +1,412 @@
-"""_summary_.
-
-PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
-NOMBRE             : 02_preparedata
-ARCHIVOS  DESTINO  : ---
-ARCHIVOS  FUENTES  : ---
-OBJETIVO           : Definir procesos para preprocesar los datos
-TIPO               : PY
-OBSERVACION        : -
-SCHEDULER          : CLOUD RUN
-VERSION            : 1.0
-DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
-PROVEEDOR          : MINSAIT
-FECHA              : 10/12/2025
-DESCRIPCION        : Paquete que contiene procesos para preprocesar los datos
-"""
-
-# Librerías Propias
-from classes._03_segmentdata import SegmentadorDatos
-
-# Librerías Básicas
-import logging
-
-# Librerías para Datos
-import pandas as pd
-
-class GestorPreparacionDatos:
-    """Clase para la gestión de los procesos de preparación de los datos para distintos objetivos."""
-
-    def __init__(self, val_col):
-        """
-        Inicializa la clase.
-        """
-        logging.info("Inicializando la clase de Gestor de Preparación de Datos...")
-
-        self.Segmentador = SegmentadorDatos()
-        self.COLUMNA_CONSUMO_DEMANDA = val_col
-
-
-    ###################################################################################
-    # AGREGAR COLUMNAS DE FECHA AL DATAFRAME
-    ###################################################################################
-    def agregar_columnas_periodo(self, df):
-        # AGREGAR VARIABLES DE FECHA DE CARGA Y DE ELIMINACION
-        ahora = pd.to_datetime(self.fecha_base).tz_localize('America/Lima', ambiguous='NaT', nonexistent='NaT')
-        df_carga = df.copy()
-        df_carga["FECHASEGMENTACION"] = ahora.strftime("%d-%m-%Y")
-        df_carga["PERIODOSEGMENTACION"] = int(ahora.strftime("%Y%m"))
-        df_carga["FECCARGA"] = ahora
-        df_carga["FLGELIMINADO"] = False
-        df_carga["FECELIMINACION"] = df_carga["FECCARGA"]
-    
-        return df_carga
-
-    ###################################################################################
-    # FUNCIÓN PARA TRANSFORMAR UN DATAFRAME A LA FORMA DEL OUTPUT DE PROYECCIÓN
-    ###################################################################################
-    def transformar_a_output(self, df_demanda):
-        """
-        Función para transformar un dataframe a la forma del Output de Proyección.
-        """
-        # ELIMINAMOS LAS COLUMNAS QUE NO INTERESAN EN EL OUTPUT
-        df_m_o = df_demanda.copy()
-        columnas_a_eliminar = ["FECULTIMOCONSUMO", self.COLUMNA_CONSUMO_DEMANDA]
-        df_m_o.drop(columns=columnas_a_eliminar, axis=1, inplace=True)
-
-        # AGREGAR COLUMNAS DE PROYECCION
-        nuevas_columnas_entero = [
-            "CTDCONSUMORIESGO05",
-            "CTDCONSUMORIESGO25",
-            "CTDCONSUMORIESGO50",
-            "CTDCONSUMORIESGO75",
-            "CTDCONSUMORIESGO95"
-        ]
-
-        for col in nuevas_columnas_entero:
-            df_m_o[col] = 0
-            df_m_o[col] = df_m_o[col].astype(int)
-
-        # AGREGAR COLUMNAS DE DESCRIPCION
-        nuevas_columnas_string = [
-            "TIPOMODELOPROYECCION"
-        ]
-        
-        for col in nuevas_columnas_string:
-            df_m_o[col] = ""
-            df_m_o[col] = df_m_o[col].astype(str)
-
-        # AGREGAR COLUMNAS BANDERAS DE TIPO
-        nuevas_columnas_bool = [
-            "SKUCONVENTAS",
-            "SKUPROYECTABLE",
-            "SKUCONOCIDO",
-            "SKUACTIVO"
-        ]
-        
-        for col in nuevas_columnas_bool:
-            df_m_o[col] = False
-            df_m_o[col] = df_m_o[col].astype(bool)
-
-        # AGREGAR COLUMNAS DE PERIODO
-        df_m_o_p = self.agregar_columnas_periodo(df_m_o)
-        return df_m_o_p
-
-    ###################################################################################
-    # FUNCIÓN PARA TRANSFORMAR UN DATAFRAME A LA FORMA DEL OUTPUT DE PROYECCIÓN
-    ###################################################################################
-    def transformar_a_monitoreo(self, df_demanda):
-        """
-        Función para transformar un dataframe a la forma del Output de Proyección.
-        """
-        # ELIMINAMOS LAS COLUMNAS QUE NO INTERESAN EN EL OUTPUT
-        df_m_m = df_demanda.copy()
-        columnas_a_eliminar = ["FECULTIMOCONSUMO"]
-        df_m_m.drop(columns=columnas_a_eliminar, axis=1, inplace=True)
-
-        # ASEGURAR COLUMNA DE CANTIDAD DE VENTAS COMO ENTERO
-        df_m_m[self.COLUMNA_CONSUMO_DEMANDA] = df_m_m[self.COLUMNA_CONSUMO_DEMANDA].astype(int)
-
-        # AGREGAR COLUMNAS DE PROYECCION
-        nuevas_columnas_entero = [
-            "CTDCONSUMORIESGO05",
-            "CTDCONSUMORIESGO25",
-            "CTDCONSUMORIESGO50",
-            "CTDCONSUMORIESGO75",
-            "CTDCONSUMORIESGO95",
-            "ERRORCONSUMORIESGO05",
-            "ERRORCONSUMORIESGO25",
-            "ERRORCONSUMORIESGO50",
-            "ERRORCONSUMORIESGO75",
-            "ERRORCONSUMORIESGO95"
-        ]
-
-        for col in nuevas_columnas_entero:
-            df_m_m[col] = 0
-            df_m_m[col] = df_m_m[col].astype(int)
-
-        # AGREGAR COLUMNAS DE DESCRIPCION
-        nuevas_columnas_string = [
-            "TIPOMODELOPROYECCION"
-        ]
-        
-        for col in nuevas_columnas_string:
-            df_m_m[col] = ""
-            df_m_m[col] = df_m_m[col].astype(str)
-
-        # AGREGAR COLUMNAS BANDERAS DE TIPO
-        nuevas_columnas_bool = [
-            "SKUCONVENTAS",
-            "SKUPROYECTABLE",
-            "SKUCONOCIDO",
-            "SKUACTIVO"
-        ]
-        
-        for col in nuevas_columnas_bool:
-            df_m_m[col] = False
-            df_m_m[col] = df_m_m[col].astype(bool)
-
-        # AGREGAR COLUMNAS DE PERIODO
-        df_m_m_p = self.agregar_columnas_periodo(df_m_m)
-        return df_m_m_p
-    
-    ###################################################################################
-    # FUNCIÓN PARA COMPLETAR LOS MESES FALTANTES DE VENTAS DE TODOS LOS PRODUCTOS
-    ###################################################################################
-    def completar_meses(self, df, fecha_inicio, fecha_final, date_col = "FECHA", val_cols = ["MTOVENTAS"], group_cols = ["CLASIFICACION", "CODSOCIEDAD", "CODCENTRO", "CODMATERIAL"]):
-        """
-        Función para completar los meses faltantes de ventas de todos los productos.
-        """
-        # ASEGURAR COLUMNA DE PERIODO
-        df[date_col] = pd.to_datetime(df[date_col])
-
-        # OBTENER TODAS LAS COMBINACIONES ÚNICAS DE ALMACEN COMERCIAL - PRODUCTO
-        combinaciones = df[group_cols].drop_duplicates()
-
-        # OBTENER TODAS LAS FECHAS DE LA VENTANA
-        rango_fechas = pd.date_range(start=fecha_inicio, end=fecha_final, freq='MS')
-
-        # OBTENER TODAS LAS FECHAS PARA TODAS LAS COMBINACIONES DE ALMACÉN COMERCIAL - PRODUCTO
-        esqueleto = combinaciones.merge(pd.DataFrame({date_col: rango_fechas}), how='cross')
-        df_agregado = df.groupby(group_cols + [date_col]).agg(
-            ventas_existentes = (date_col, 'count')
-        ).reset_index()
-
-        # HACER UN CRUCE CON LA DATA ORIGINAL PARA MANTENER LOS DATOS EXISTENTES Y AGREGAR LOS MESES FALTANTES
-        esqueleto_completo = esqueleto.merge(
-            df_agregado,
-            on = group_cols + [date_col],
-            how = 'left'
-        )
-
-        # IMPUTACIÓN CON 0 AQUELLOS MESES DONDE NO HAY VENTAS
-        df_faltantes = esqueleto_completo[esqueleto_completo['ventas_existentes'].isna()].copy()
-        df_faltantes[val_cols] = 0.0
-
-        # ELIMINAR COLUMNAS AUXILIARES
-        df_faltantes = df_faltantes.drop(columns=['ventas_existentes'])
-        #df = df.drop(columns=['FECHA_MES'])
-
-        # ORDENAR POR FECHA LA SALIDA
-        df_final = pd.concat([df, df_faltantes], ignore_index=True)
-        return df_final.sort_values(by=group_cols + [date_col]).reset_index(drop = True)
-
-    ###################################################################################
-    # FUNCIÓN PARA PROCESAR LOS DATOS HISTÓRICOS PARA QUE SEAN ÚTILES EN PLANIFICACION
-    ###################################################################################
-    def procesar_datos_para_planificacion(self, df_input, date_col = "FECHA", val_cols = ["MTOVENTAS"], group_cols = ["CLASIFICACION", "CODSOCIEDAD", "CODCENTRO", "CODMATERIAL"], filters = {}, group_by_month = False, complete_months = False, num_meses = 0):
-        """
-        Función para procesar los datos históricos para que sean útiles en planificación.
-        """
-        # ASEGURAND COLUMNA DE FECHA
-        df_cliente = df_input.copy()
-        df_cliente[date_col] = pd.to_datetime(df_cliente[date_col])
-
-        # DEFINIR PERIODO
-        df_cliente["PERIODO"] = df_cliente[date_col].dt.strftime('%Y%m')
-        df_cliente["MES"] = pd.to_datetime(df_cliente["PERIODO"] + "01", format="%Y%m%d")
-
-        for val_col in val_cols:
-            # ASEGURAR TIPO DE DATOS DE VARIABLES NUMÉRICAS
-            df_cliente[val_col] = df_cliente[val_col].astype(float)
-
-            # IMPUTACIÓN DE 0 CUANDO NO HAY VENTAS
-            df_cliente[val_col] = df_cliente[val_col].fillna(0)
-
-        # FILTROS (POR DEFECTO ASEGURAR SOLO PRODUCTO TERMINADO Y ALMACENES COMERCIALES)
-        for columna, lista_valores in filters.items():
-            df_cliente = df_cliente[df_cliente[columna].isin(lista_valores)].reset_index(drop = True)
-
-        # SUMAR VENTAS POR MES
-        if group_by_month:
-            df_mes = df_cliente.groupby(group_cols + ["MES"])[val_cols].sum().reset_index()
-
-            if complete_months:
-                ultimo_mes = df_mes["MES"].max()
-                ini_ventana = ultimo_mes - pd.DateOffset(months=(num_meses-1))
-                df_completo = self.completar_meses(df_mes, ini_ventana, ultimo_mes, date_col = "MES", val_cols = val_cols, group_cols = group_cols)
-                return df_completo
-            else:
-                return df_mes
-        else:
-            return df_cliente
-        
-    ###################################################################################
-    # FUNCIÓN PARA SEPARAR SKU'S CONOCIDOS Y DESCONOCIDOS
-    ###################################################################################
-    def obtener_skus_conocidos_desconocidos(self, df, df_sku, identificadores):
-        """
-        Función para separar sku's conocidos y desconocidos.
-        """
-        df_general = df.copy()
-        df_skus = df_sku.copy()
-
-        # CREAR UNA COLUMNA DE IDENTIFICADOR ÚNICO
-        df_general['_sku_id_combinado'] = df_general[identificadores].astype(str).agg('_'.join, axis=1)
-        df_skus['_sku_id_combinado'] = df_skus[identificadores].astype(str).agg('_'.join, axis=1)
-
-        # OBTENER LOS SKUS ÚNICOS PARA CADA DATAFRAME
-        skus_en_general = set(df_general['_sku_id_combinado'].unique())
-        skus_en_skus = set(df_skus['_sku_id_combinado'].unique())
-
-        # OBTENER LOS SKUS CONOCIDOS POR EL ANÁLISIS QUE NECESITAN PROYECCIÓN ACTUAL
-        df_conocidos_activos = df_general[df_general['_sku_id_combinado'].isin(skus_en_skus)].copy()
-
-        # OBTENER LOS SKUS DESCONOCIDOS POR EL ANÁLISIS QUE NECESITAN PROYECCIÓN ACTUAL
-        df_desconocidos = df_general[~df_general['_sku_id_combinado'].isin(skus_en_skus)].copy()
-
-        # OBTENER LOS SKUS QUE YA NO NECESITAN PROYECCIÓN ACTUAL
-        df_conocidos_inactivos = df_skus[~df_skus['_sku_id_combinado'].isin(skus_en_general)].copy()
-
-        # ELIMINAR COLUMNA DE IDENTIFICADORES UNIFICADOS
-        df_conocidos_activos = df_conocidos_activos.drop(columns=['_sku_id_combinado'])
-        df_desconocidos = df_desconocidos.drop(columns=['_sku_id_combinado'])
-        df_conocidos_inactivos = df_conocidos_inactivos.drop(columns=['_sku_id_combinado'])
-        
-        return df_conocidos_activos, df_desconocidos, df_conocidos_inactivos
-    
-    ###################################################################################
-    # FUNCIÓN PARA SEPARAR SKU'S QUE SON PROYECTABLES Y LOS QUE NO SON PROYECTABLES
-    ###################################################################################
-    def obtener_skus_proyectables(self, df, ventana_segmentacion, mes_col, val_col, group_cols_mes, group_cols_product, group_cols_warehouse, prefix_str = None, abc_umb = (0.80, 0.95), xyz_umb = (0.35, 0.80), fsn_umb = (2, 6), condiciones_proyectables = {}, segmentos_proyectables = {"ABC": ["A", "B", "C"], "XYZ": ["X", "Y", "Z"], "FSN": ["F", "S", "N"]}):
-        """
-        Función para separar sku's que son proyectables y no proyectables
-        """
-        df_general = df.copy()
-
-        # REALIZAR SEGMENTACIÓN DE DEMANDA
-        df_segmentado = self.Segmentador.segmentar_abc_xyz_fsn(
-            df_general,
-            ventana_segmentacion,
-            mes_col = mes_col,
-            val_col = val_col,
-            group_cols_mes = group_cols_mes,
-            group_cols_product = group_cols_product,
-            group_cols_warehouse = group_cols_warehouse,
-            prefix_str = prefix_str,
-            abc_umb = abc_umb,
-            xyz_umb = xyz_umb,
-            fsn_umb = fsn_umb
-        )
-
-        # AGREGAR LOS SEGMENTOS AL DATAFRAME ORIGINAL
-        df_general = pd.merge(
-            df_general,
-            df_segmentado,
-            on = group_cols_product,
-            how = 'left'
-        )
-
-        # AGREGAR FILTROS PARA DEFINIR PROYECTABLES SEGÚN SEGMENTOS
-        ventana_segmentacion_str = str(ventana_segmentacion).zfill(2)
-        if not prefix_str:
-            prefix_str = val_col
-        abc_col_demanda = f"ABC{prefix_str}{ventana_segmentacion_str}M"
-        xyz_col_demanda = f"XYZ{prefix_str}{ventana_segmentacion_str}M"
-        fsn_col_demanda = f"FSN{prefix_str}{ventana_segmentacion_str}M"
-        condiciones_segmentos_proyectables = {
-            abc_col_demanda: segmentos_proyectables["ABC"],
-            xyz_col_demanda: segmentos_proyectables["XYZ"],
-            fsn_col_demanda: segmentos_proyectables["FSN"]
-        }
-
-        condiciones_proyectables.update(condiciones_segmentos_proyectables)
-
-        # CREANDO UNA MÁSCARA DE PROYECTABLES Y NO PROYECTABLES EN BASE A CONDICIONES DE USUARIO Y DE SEGMENTOS
-        mascara_total_proyectable = pd.Series(True, index=df_general.index)
-        for columna, lista_valores in condiciones_proyectables.items():
-            mascara_filtro_actual = df_general[columna].isin(lista_valores)
-            mascara_total_proyectable = mascara_total_proyectable & mascara_filtro_actual
-
-        # FILTRAR DATAFRAME EN PROYECTABLES Y NO PROYECTABLES
-        df_no_proyectables = df_general[~mascara_total_proyectable].reset_index(drop=True)
-        df_proyectables = df_general[mascara_total_proyectable].reset_index(drop=True)
-
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : 02_preparedata
+ARCHIVOS  DESTINO  : ---
+ARCHIVOS  FUENTES  : ---
+OBJETIVO           : Definir procesos para preprocesar los datos
+TIPO               : PY
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene procesos para preprocesar los datos
+"""
+
+# Librerías Propias
+from classes._03_segmentdata import SegmentadorDatos
+from classes._08_skuregistry import RegistroSKU
+
+# Librerías Básicas
+import logging
+
+# Librerías para Datos
+import pandas as pd
+import numpy as np
+
+class GestorPreparacionDatos:
+    """Clase para la gestión de los procesos de preparación de los datos para distintos objetivos."""
+
+    def __init__(self, val_col, registro_sku = None):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Gestor de Preparación de Datos...")
+
+        self.Segmentador = SegmentadorDatos()
+        self.SkuRegistry = registro_sku if registro_sku is not None else RegistroSKU()
+        self.COLUMNA_CONSUMO_DEMANDA = val_col
+
+
+    ###################################################################################
+    # AGREGAR COLUMNAS DE FECHA AL DATAFRAME
+    ###################################################################################
+    def agregar_columnas_periodo(self, df):
+        # AGREGAR VARIABLES DE FECHA DE CARGA Y DE ELIMINACION
+        ahora = pd.to_datetime(self.fecha_base).tz_localize('America/Lima', ambiguous='NaT', nonexistent='NaT')
+        df_carga = df.copy()
+        df_carga["FECHASEGMENTACION"] = ahora.strftime("%d-%m-%Y")
+        df_carga["PERIODOSEGMENTACION"] = int(ahora.strftime("%Y%m"))
+        df_carga["FECCARGA"] = ahora
+        df_carga["FLGELIMINADO"] = False
+        df_carga["FECELIMINACION"] = df_carga["FECCARGA"]
+    
+        return df_carga
+
+    ###################################################################################
+    # FUNCIÓN PARA TRANSFORMAR UN DATAFRAME A LA FORMA DEL OUTPUT DE PROYECCIÓN
+    ###################################################################################
+    def transformar_a_output(self, df_demanda):
+        """
+        Función para transformar un dataframe a la forma del Output de Proyección.
+        """
+        # ELIMINAMOS LAS COLUMNAS QUE NO INTERESAN EN EL OUTPUT
+        df_m_o = df_demanda.copy()
+        columnas_a_eliminar = ["FECULTIMOCONSUMO", self.COLUMNA_CONSUMO_DEMANDA]
+        df_m_o.drop(columns=columnas_a_eliminar, axis=1, inplace=True)
+
+        # AGREGAR COLUMNAS DE PROYECCION
+        nuevas_columnas_entero = [
+            "CTDCONSUMORIESGO05",
+            "CTDCONSUMORIESGO25",
+            "CTDCONSUMORIESGO50",
+            "CTDCONSUMORIESGO75",
+            "CTDCONSUMORIESGO95"
+        ]
+
+        for col in nuevas_columnas_entero:
+            df_m_o[col] = 0
+            df_m_o[col] = df_m_o[col].astype(int)
+
+        # AGREGAR COLUMNAS DE DESCRIPCION
+        nuevas_columnas_string = [
+            "TIPOMODELOPROYECCION"
+        ]
+        
+        for col in nuevas_columnas_string:
+            df_m_o[col] = ""
+            df_m_o[col] = df_m_o[col].astype(str)
+
+        # AGREGAR COLUMNAS BANDERAS DE TIPO
+        nuevas_columnas_bool = [
+            "SKUCONVENTAS",
+            "SKUPROYECTABLE",
+            "SKUCONOCIDO",
+            "SKUACTIVO"
+        ]
+        
+        for col in nuevas_columnas_bool:
+            df_m_o[col] = False
+            df_m_o[col] = df_m_o[col].astype(bool)
+
+        # AGREGAR COLUMNAS DE PERIODO
+        df_m_o_p = self.agregar_columnas_periodo(df_m_o)
+        return df_m_o_p
+
+    ###################################################################################
+    # FUNCIÓN PARA TRANSFORMAR UN DATAFRAME A LA FORMA DEL OUTPUT DE PROYECCIÓN
+    ###################################################################################
+    def transformar_a_monitoreo(self, df_demanda):
+        """
+        Función para transformar un dataframe a la forma del Output de Proyección.
+        """
+        # ELIMINAMOS LAS COLUMNAS QUE NO INTERESAN EN EL OUTPUT
+        df_m_m = df_demanda.copy()
+        columnas_a_eliminar = ["FECULTIMOCONSUMO"]
+        df_m_m.drop(columns=columnas_a_eliminar, axis=1, inplace=True)
+
+        # ASEGURAR COLUMNA DE CANTIDAD DE VENTAS COMO ENTERO
+        df_m_m[self.COLUMNA_CONSUMO_DEMANDA] = df_m_m[self.COLUMNA_CONSUMO_DEMANDA].astype(int)
+
+        # AGREGAR COLUMNAS DE PROYECCION
+        nuevas_columnas_entero = [
+            "CTDCONSUMORIESGO05",
+            "CTDCONSUMORIESGO25",
+            "CTDCONSUMORIESGO50",
+            "CTDCONSUMORIESGO75",
+            "CTDCONSUMORIESGO95",
+            "ERRORCONSUMORIESGO05",
+            "ERRORCONSUMORIESGO25",
+            "ERRORCONSUMORIESGO50",
+            "ERRORCONSUMORIESGO75",
+            "ERRORCONSUMORIESGO95"
+        ]
+
+        for col in nuevas_columnas_entero:
+            df_m_m[col] = 0
+            df_m_m[col] = df_m_m[col].astype(int)
+
+        # AGREGAR COLUMNAS DE DESCRIPCION
+        nuevas_columnas_string = [
+            "TIPOMODELOPROYECCION"
+        ]
+        
+        for col in nuevas_columnas_string:
+            df_m_m[col] = ""
+            df_m_m[col] = df_m_m[col].astype(str)
+
+        # AGREGAR COLUMNAS BANDERAS DE TIPO
+        nuevas_columnas_bool = [
+            "SKUCONVENTAS",
+            "SKUPROYECTABLE",
+            "SKUCONOCIDO",
+            "SKUACTIVO"
+        ]
+        
+        for col in nuevas_columnas_bool:
+            df_m_m[col] = False
+            df_m_m[col] = df_m_m[col].astype(bool)
+
+        # AGREGAR COLUMNAS DE PERIODO
+        df_m_m_p = self.agregar_columnas_periodo(df_m_m)
+        return df_m_m_p
+    
+    ###################################################################################
+    # FUNCIÓN PARA COMPLETAR LOS MESES FALTANTES DE VENTAS DE TODOS LOS PRODUCTOS
+    ###################################################################################
+    def completar_meses(self, df, fecha_inicio, fecha_final, date_col = "FECHA", val_cols = ["MTOVENTAS"], group_cols = ["CLASIFICACION", "CODSOCIEDAD", "CODCENTRO", "CODMATERIAL"], motor = "reindex"):
+        """
+        Función para completar los meses faltantes de ventas de todos los productos.
+        El motor "reindex" lo hace en una sola pasada con un MultiIndex; el motor "cruce" es la implementación original.
+        """
+        # ASEGURAR COLUMNA DE PERIODO
+        df[date_col] = pd.to_datetime(df[date_col])
+
+        if motor == "reindex":
+            df_completo = self.completar_meses_reindex(df, fecha_inicio, fecha_final, date_col = date_col, val_cols = val_cols, group_cols = group_cols)
+            if df_completo is not None:
+                return df_completo
+
+        # OBTENER TODAS LAS COMBINACIONES ÚNICAS DE ALMACEN COMERCIAL - PRODUCTO
+        combinaciones = df[group_cols].drop_duplicates()
+
+        # OBTENER TODAS LAS FECHAS DE LA VENTANA
+        rango_fechas = pd.date_range(start=fecha_inicio, end=fecha_final, freq='MS')
+
+        # OBTENER TODAS LAS FECHAS PARA TODAS LAS COMBINACIONES DE ALMACÉN COMERCIAL - PRODUCTO
+        esqueleto = combinaciones.merge(pd.DataFrame({date_col: rango_fechas}), how='cross')
+        df_agregado = df.groupby(group_cols + [date_col]).agg(
+            ventas_existentes = (date_col, 'count')
+        ).reset_index()
+
+        # HACER UN CRUCE CON LA DATA ORIGINAL PARA MANTENER LOS DATOS EXISTENTES Y AGREGAR LOS MESES FALTANTES
+        esqueleto_completo = esqueleto.merge(
+            df_agregado,
+            on = group_cols + [date_col],
+            how = 'left'
+        )
+
+        # IMPUTACIÓN CON 0 AQUELLOS MESES DONDE NO HAY VENTAS
+        df_faltantes = esqueleto_completo[esqueleto_completo['ventas_existentes'].isna()].copy()
+        df_faltantes[val_cols] = 0.0
+
+        # ELIMINAR COLUMNAS AUXILIARES
+        df_faltantes = df_faltantes.drop(columns=['ventas_existentes'])
+        #df = df.drop(columns=['FECHA_MES'])
+
+        # ORDENAR POR FECHA LA SALIDA
+        df_final = pd.concat([df, df_faltantes], ignore_index=True)
+        return df_final.sort_values(by=group_cols + [date_col]).reset_index(drop = True)
+
+    ###################################################################################
+    # FUNCIÓN PARA COMPLETAR LOS MESES FALTANTES CON UN REINDEX SOBRE MULTIINDEX
+    ###################################################################################
+    def completar_meses_reindex(self, df, fecha_inicio, fecha_final, date_col = "FECHA", val_cols = ["MTOVENTAS"], group_cols = ["CLASIFICACION", "CODSOCIEDAD", "CODCENTRO", "CODMATERIAL"]):
+        """
+        Función para completar los meses faltantes factorizando las llaves de SKU y reindexando contra el producto
+        SKU x meses de la ventana en una sola pasada, imputando 0 directamente en las columnas de valor.
+        Retorna None si hay llaves nulas o filas repetidas por SKU-mes (en ese caso aplica la implementación por cruce).
+        """
+        # FACTORIZAR LAS LLAVES DE SKU (CÓDIGOS EN EL MISMO ORDEN QUE LAS LLAVES ORDENADAS)
+        codigos_fila = df.groupby(group_cols, sort = True).ngroup().to_numpy()
+        if (codigos_fila < 0).any():
+            return None
+        num_skus = codigos_fila.max() + 1 if len(codigos_fila) else 0
+        primera_fila = np.empty(num_skus, dtype = np.int64)
+        primera_fila[codigos_fila[::-1]] = np.arange(len(codigos_fila))[::-1]
+        df_skus = df[group_cols].take(primera_fila).reset_index(drop = True)
+
+        # UBICAR CADA FILA EN LA GRILLA SKU x MES DE LA VENTANA (LAS FILAS FUERA DE LA VENTANA SE CONSERVAN APARTE)
+        rango_fechas = pd.date_range(start=fecha_inicio, end=fecha_final, freq='MS')
+        num_meses = len(rango_fechas)
+        fechas_fila = df[date_col].to_numpy()
+        mes_fila = rango_fechas.get_indexer(fechas_fila)
+        en_ventana = mes_fila >= 0
+        posicion_grilla = codigos_fila[en_ventana] * num_meses + mes_fila[en_ventana]
+        if np.bincount(posicion_grilla, minlength = num_skus * num_meses).max(initial = 0) > 1:
+            return None
+
+        # ÍNDICE FINAL: GRILLA COMPLETA + FILAS FUERA DE LA VENTANA, ORDENADO POR SKU Y FECHA
+        fuente_grilla = np.full(num_skus * num_meses, -1, dtype = np.int64)
+        fuente_grilla[posicion_grilla] = np.flatnonzero(en_ventana)
+        filas_fuera = np.flatnonzero(~en_ventana)
+        codigos_final = np.concatenate([np.repeat(np.arange(num_skus), num_meses), codigos_fila[filas_fuera]])
+        fechas_final = np.concatenate([np.tile(rango_fechas.to_numpy(), num_skus), fechas_fila[filas_fuera]])
+        fuente_final = np.concatenate([fuente_grilla, filas_fuera])
+        if len(filas_fuera):
+            orden = np.lexsort((fechas_final, codigos_final))
+            codigos_final, fechas_final, fuente_final = codigos_final[orden], fechas_final[orden], fuente_final[orden]
+
+        # CONSTRUIR EL DATAFRAME FINAL (VALORES EN 0 DONDE NO HAY VENTAS, NULOS EN EL RESTO DE COLUMNAS)
+        existe = fuente_final >= 0
+        df_final = df_skus.take(codigos_final).reset_index(drop = True)
+        df_final[date_col] = fechas_final
+        for col in df.columns:
+            if col in group_cols or col == date_col:
+                continue
+            valores = df[col].to_numpy()
+            if col in val_cols:
+                df_final[col] = np.where(existe, valores[np.where(existe, fuente_final, 0)], 0.0)
+            else:
+                df_final[col] = pd.api.extensions.take(valores, fuente_final, allow_fill = True)
+
+        return df_final[df.columns.tolist()]
+
+    ###################################################################################
+    # FUNCIÓN PARA PROCESAR LOS DATOS HISTÓRICOS PARA QUE SEAN ÚTILES EN PLANIFICACION
+    ###################################################################################
+    def procesar_datos_para_planificacion(self, df_input, date_col = "FECHA", val_cols = ["MTOVENTAS"], group_cols = ["CLASIFICACION", "CODSOCIEDAD", "CODCENTRO", "CODMATERIAL"], filters = {}, group_by_month = False, complete_months = False, num_meses = 0):
+        """
+        Función para procesar los datos históricos para que sean útiles en planificación.
+        """
+        # ASEGURAND COLUMNA DE FECHA
+        df_cliente = df_input.copy()
+        df_cliente[date_col] = pd.to_datetime(df_cliente[date_col])
+
+        # DEFINIR PERIODO
+        df_cliente["PERIODO"] = df_cliente[date_col].dt.strftime('%Y%m')
+        df_cliente["MES"] = pd.to_datetime(df_cliente["PERIODO"] + "01", format="%Y%m%d")
+
+        for val_col in val_cols:
+            # ASEGURAR TIPO DE DATOS DE VARIABLES NUMÉRICAS
+            df_cliente[val_col] = df_cliente[val_col].astype(float)
+
+            # IMPUTACIÓN DE 0 CUANDO NO HAY VENTAS
+            df_cliente[val_col] = df_cliente[val_col].fillna(0)
+
+        # FILTROS (POR DEFECTO ASEGURAR SOLO PRODUCTO TERMINADO Y ALMACENES COMERCIALES)
+        for columna, lista_valores in filters.items():
+            df_cliente = df_cliente[df_cliente[columna].isin(lista_valores)].reset_index(drop = True)
+
+        # SUMAR VENTAS POR MES
+        if group_by_month:
+            df_mes = df_cliente.groupby(group_cols + ["MES"])[val_cols].sum().reset_index()
+
+            if complete_months:
+                ultimo_mes = df_mes["MES"].max()
+                ini_ventana = ultimo_mes - pd.DateOffset(months=(num_meses-1))
+                df_completo = self.completar_meses(df_mes, ini_ventana, ultimo_mes, date_col = "MES", val_cols = val_cols, group_cols = group_cols)
+                return df_completo
+            else:
+                return df_mes
+        else:
+            return df_cliente
+        
+    ###################################################################################
+    # FUNCIÓN PARA SEPARAR SKU'S CONOCIDOS Y DESCONOCIDOS
+    ###################################################################################
+    def obtener_skus_conocidos_desconocidos(self, df, df_sku, identificadores):
+        """
+        Función para separar sku's conocidos y desconocidos.
+        """
+        # USAR EL REGISTRO COMPARTIDO SI SUS IDENTIFICADORES COINCIDEN, SI NO UNO LOCAL
+        registro = self.SkuRegistry if list(identificadores) == self.SkuRegistry.identificadores else RegistroSKU(identificadores)
+
+        # OBTENER EL CÓDIGO ENTERO DE SKU DE CADA FILA
+        codigos_general = registro.codificar(df)
+        codigos_skus = registro.codificar(df_sku)
+
+        # OBTENER LOS SKUS CONOCIDOS POR EL ANÁLISIS QUE NECESITAN PROYECCIÓN ACTUAL
+        en_skus = np.isin(codigos_general, codigos_skus)
+        df_conocidos_activos = df[en_skus].copy()
+
+        # OBTENER LOS SKUS DESCONOCIDOS POR EL ANÁLISIS QUE NECESITAN PROYECCIÓN ACTUAL
+        df_desconocidos = df[~en_skus].copy()
+
+        # OBTENER LOS SKUS QUE YA NO NECESITAN PROYECCIÓN ACTUAL
+        df_conocidos_inactivos = df_sku[~np.isin(codigos_skus, codigos_general)].copy()
+        
+        return df_conocidos_activos, df_desconocidos, df_conocidos_inactivos
+    
+    ###################################################################################
+    # FUNCIÓN PARA SEPARAR SKU'S QUE SON PROYECTABLES Y LOS QUE NO SON PROYECTABLES
+    ###################################################################################
+    def obtener_skus_proyectables(self, df, ventana_segmentacion, mes_col, val_col, group_cols_mes, group_cols_product, group_cols_warehouse, prefix_str = None, abc_umb = (0.80, 0.95), xyz_umb = (0.35, 0.80), fsn_umb = (2, 6), condiciones_proyectables = {}, segmentos_proyectables = {"ABC": ["A", "B", "C"], "XYZ": ["X", "Y", "Z"], "FSN": ["F", "S", "N"]}, ventanas_adicionales = []):
+        """
+        Función para separar sku's que son proyectables y no proyectables.
+        Si se indican ventanas adicionales, sus segmentos se calculan en la misma pasada y se agregan al dataframe.
+        """
+        df_general = df.copy()
+
+        # REALIZAR SEGMENTACIÓN DE DEMANDA (VENTANA PRINCIPAL Y ADICIONALES EN UNA SOLA PASADA)
+        ventanas = [ventana_segmentacion] + [ventana for ventana in ventanas_adicionales if ventana != ventana_segmentacion]
+        segmentaciones = None
+        if len(ventanas) > 1:
+            segmentaciones = self.Segmentador.segmentar_abc_xyz_fsn_multiventana(
+                df_general,
+                ventanas,
+                mes_col = mes_col,
+                val_col = val_col,
+                group_cols_product = group_cols_product,
+                group_cols_warehouse = group_cols_warehouse,
+                prefix_str = prefix_str,
+                abc_umb = abc_umb,
+                xyz_umb = xyz_umb,
+                fsn_umb = fsn_umb
+            )
+
+        if segmentaciones is None:
+            segmentaciones = {
+                ventana: self.Segmentador.segmentar_abc_xyz_fsn(
+                    df_general,
+                    ventana,
+                    mes_col = mes_col,
+                    val_col = val_col,
+                    group_cols_mes = group_cols_mes,
+                    group_cols_product = group_cols_product,
+                    group_cols_warehouse = group_cols_warehouse,
+                    prefix_str = prefix_str,
+                    abc_umb = abc_umb,
+                    xyz_umb = xyz_umb,
+                    fsn_umb = fsn_umb
+                )
+                for ventana in ventanas
+            }
+
+        # AGREGAR LOS SEGMENTOS AL DATAFRAME ORIGINAL
+        for ventana in ventanas:
+            df_general = pd.merge(
+                df_general,
+                segmentaciones[ventana],
+                on = group_cols_product,
+                how = 'left'
+            )
+
+        # AGREGAR FILTROS PARA DEFINIR PROYECTABLES SEGÚN SEGMENTOS
+        ventana_segmentacion_str = str(ventana_segmentacion).zfill(2)
+        if not prefix_str:
+            prefix_str = val_col
+        abc_col_demanda = f"ABC{prefix_str}{ventana_segmentacion_str}M"
+        xyz_col_demanda = f"XYZ{prefix_str}{ventana_segmentacion_str}M"
+        fsn_col_demanda = f"FSN{prefix_str}{ventana_segmentacion_str}M"
+        condiciones_segmentos_proyectables = {
+            abc_col_demanda: segmentos_proyectables["ABC"],
+            xyz_col_demanda: segmentos_proyectables["XYZ"],
+            fsn_col_demanda: segmentos_proyectables["FSN"]
+        }
+
+        condiciones_proyectables.update(condiciones_segmentos_proyectables)
+
+        # CREANDO UNA MÁSCARA DE PROYECTABLES Y NO PROYECTABLES EN BASE A CONDICIONES DE USUARIO Y DE SEGMENTOS
+        mascara_total_proyectable = pd.Series(True, index=df_general.index)
+        for columna, lista_valores in condiciones_proyectables.items():
+            mascara_filtro_actual = df_general[columna].isin(lista_valores)
+            mascara_total_proyectable = mascara_total_proyectable & mascara_filtro_actual
+
+        # FILTRAR DATAFRAME EN PROYECTABLES Y NO PROYECTABLES
+        df_no_proyectables = df_general[~mascara_total_proyectable].reset_index(drop=True)
+        df_proyectables = df_general[mascara_total_proyectable].reset_index(drop=True)
+
         return df_proyectables, df_no_proyectables
\ No newline at end of file
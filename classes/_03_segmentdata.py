@@ -1,185 +1,408 @@
-"""_summary_.
-
-PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
-NOMBRE             : 03_segmentdata
-ARCHIVOS  DESTINO  : ---
-ARCHIVOS  FUENTES  : ---
-OBJETIVO           : Definir procesos para segmentar los datos según ABC-XYZ-FSN
-TIPO               : PY
-OBSERVACION        : -
-SCHEDULER          : CLOUD RUN
-VERSION            : 1.0
-DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
-PROVEEDOR          : MINSAIT
-FECHA              : 10/12/2025
-DESCRIPCION        : Paquete que contiene procesos para segmentar los datos según ABC-XYZ-FSN
-"""
-
-# Librerías Básicas
-import logging
-
-# Librerías para Datos
-import pandas as pd
-import numpy as np
-
-class SegmentadorDatos:
-    """Clase para la segmentación de la data según ABC-XYZ-FSN."""
-
-    def __init__(self):
-        """
-        Inicializa la clase.
-        """
-        logging.info("Inicializando la clase de Segmentador de Datos...")
-
-    ###################################################################################
-    # FUNCIÓN PARA CALCULAR EL COEFICIENTE DE VARIACIÓN / DESVIACIÓN RELATIVA A LA MEDIA
-    ###################################################################################
-    def cv(self, s):
-        """
-        Función para calcular el coeficiente de variación / desviación relativa a la media.
-        """
-        # ASEGURAR TOMAR EN CUENTA MESES DONDE HAY VENTAS
-        x = s[s > 0]
-        
-        # EN CASO SOLO HAYA UNA VENTA O NINGUNA, SIMPLEMENTE NO SE PUEDE CALCULAR LA VARIACIÓN
-        if len(x) <= 1 or x.mean() == 0:
-            return 0
-        
-        # CALCULAR FINALMENTE EL COEFICIENTE DE VARIACIÓN
-        return round(x.std()/ x.mean(), 4)
-
-    ###################################################################################
-    # FUNCIÓN PARA CALCULAR LA ROTACIÓN O NÚMERO DE MESES DONDE HAY UN VALOR DIFERENTE A 0
-    ###################################################################################
-    def rotacion(self, s):
-        """
-        Función para calcular la rotación o número de meses donde hay un valor diferente a 0 en ventas.
-        """
-        # MANTENER SOLO MESES CON VENTAS
-        x = s[s > 0]
-
-        # CALCULAR CUÁNTOS MESES TIENEN VENTAS RESPECTO AL TOTAL DE MESES
-        return round(len(x)*12/len(s), 4)
-
-    ###################################################################################
-    # FUNCIÓN PARA SEGMENTACIÓN ABC
-    ###################################################################################
-    def segmentar_abc_por_acumulado(self, df, value_col, new_col, breaks=(0.80, 0.95)):
-        """
-        Función para la segmentación ABC.
-        """
-        a, b = breaks
-        # ASEGURAMOS DATOS ORDENADOS POR VALORIZADO
-        g = df.sort_values(value_col, ascending=False).copy()
-        
-        # CALCULAMOS EL TOTAL DEL VALORIZADO DEL GRUPO
-        tot = g[value_col].sum()
-        
-        # SI NO HAY VALORIZADO, DEFINIMOS TODOS LOS PRODUCTOS COMO "C"
-        if tot <= 0:
-            g[new_col] = "C"
-
-        # SI HAY VALORIZADO, EVALUAMOS EL ACUMULADO
-        else:
-            g["ACUMULADO"] = g[value_col].cumsum() / tot
-            
-            # DEFINIMOS EL SEGMENTO DEL PRODUCTO SEGÚN EL ACUMULADO
-            g[new_col] = np.where(g["ACUMULADO"] <= a, "A",
-                        np.where(g["ACUMULADO"] <= b, "B", "C"))
-
-            # ASEGURAMOS SEGMENTO B EN CASOS DONDE SOLO HAYA SEGMENTOS A Y C (CUANDO LOS UMBRALES SON CERCANOS)
-            if (g[new_col] == "B").sum() == 0 and (g[new_col] == "A").any() and (g[new_col] == "C").any():
-                idx = g.index[g["ACUMULADO"] > a][0]
-                g.loc[idx, new_col] = "B"
-
-            # ELIMINAMOS COLUMNAS AUXILIARES
-            g = g.drop(columns=["ACUMULADO"])
-        return g
-
-    ###################################################################################
-    # FUNCIÓN PARA SEGMENTACIÓN XYZ
-    ###################################################################################
-    def segmentar_xyz(self, cv, breaks=(0.35, 0.80)):
-        """
-        Función para la segmentación XYZ.
-        """
-        a, b = breaks
-        # SI EL COEFICIENTE DE VARIACIÓN ES NAN, SIGNIFICA QUE VENTAS EN 0 (LO TOMAMOS COMO ESTABLE)
-        if pd.isna(cv): return "X"
-        # SI EL COEFICIENTE DE VARIACION ES CERCANO A 0 SE TOMA COMO ESTABLE
-        if cv <= a: return "X"
-        # SI EL COEFICIENTE DE VARIACION SE VA ALEJANDO DE 0 SE TOMA COMO VARIABLE
-        if cv <= b: return "Y"
-        # SI EL COEFICIENTE SE ALEJA MUCHO DEL 0 SE TOMA COMO ERRÁTICO
-        return "Z"
-
-    ###################################################################################
-    # FUNCIÓN PARA SEGMENTACIÓN FSN
-    ###################################################################################
-    def segmentar_fsn(self, rot, breaks=(2, 6)):
-        """
-        Función para la segmentación FSN.
-        """
-        a, b = breaks
-        # SI LA ROTACION OCURRE MÁS DE LA MITAD DE LA VENTANA SE CONSIDERA RÁPIDO
-        if rot >= b: return "F"
-        # SI LA ROTACIÓN OCURRE MÁS DE LA SEXTA PARTE DE LA VENTANA SE CONSIDERA LENTO
-        if rot >= a: return "S"
-        # SI LA ROTACIÓN OCURRE SOLO UNA VEZ O NINGUNA, SE CONSIDERA SIN ROTACIÓN
-        return "N"
-
-    ###################################################################################
-    # FUNCIÓN PARA CONSTRUIR LA SEGMENTACIÓN ABC-XYZ-FSN
-    ###################################################################################
-    def segmentar_abc_xyz_fsn(self, df_mes, ventana_segmentacion, mes_col, val_col, group_cols_mes, group_cols_product, group_cols_warehouse, prefix_str = None, abc_umb = (0.80, 0.95), xyz_umb = (0.35, 0.80), fsn_umb = (2, 6)):
-        """
-        Función para construir la segmentación ABC-XYZ-FSN.
-        """
-        ventana_segmentacion_str = str(ventana_segmentacion).zfill(2)
-
-        if not prefix_str:
-            prefix_str = val_col
-
-        # VARIABLES - NOMBRES DE NUEVAS VARIABLES DE SEGMENTACIÓN
-        val_col_demanda = f"VALORIZADO{prefix_str}{ventana_segmentacion_str}M"
-        cv_col_demanda = f"CV{prefix_str}{ventana_segmentacion_str}M"
-        rot_col_demanda = f"ROTACION{prefix_str}{ventana_segmentacion_str}M"
-
-        abc_col_demanda = f"ABC{prefix_str}{ventana_segmentacion_str}M"
-        xyz_col_demanda = f"XYZ{prefix_str}{ventana_segmentacion_str}M"
-        fsn_col_demanda = f"FSN{prefix_str}{ventana_segmentacion_str}M"
-
-        # OBTENER MES FINAL Y MES INICIAL DE LA VENTANA DE SEGMENTACIÓN
-        df = df_mes.copy()
-        ultimo_mes = df[mes_col].max()
-        ini_ventana = ultimo_mes - pd.DateOffset(months=(ventana_segmentacion-1))
-
-        # OBTENER VENTANA DE TIEMPO DE LA DATA
-        df_ventana = df[(df[mes_col] >= ini_ventana) & (df[mes_col] <= ultimo_mes)].copy()
-
-        # ASEGURAR ORDENAMIENTO POR PERIODO PARA CADA ALMACÉN COMERCIAL - PRODUCTO
-        df_tipo = df_ventana.sort_values(group_cols_mes).reset_index(drop = True).copy()
-
-        # VALORIZADO DE LA DEMANDA
-        valorizado_demanda = df_tipo.groupby(group_cols_product)[val_col].sum().rename(val_col_demanda)
-
-        # COEFICIENTE DE VARIACIÓN (CV) DE LA DEMANDA
-        variabilidad_demanda = df_tipo.groupby(group_cols_product)[val_col].apply(self.cv).rename(cv_col_demanda)
-
-        # ROTACIÓN SEGÚN CAMBIOS EN LA DEMANDA
-        rotacion_demanda = df_tipo.groupby(group_cols_product)[val_col].apply(self.rotacion).rename(rot_col_demanda)
-
-        metricas = pd.concat([valorizado_demanda, variabilidad_demanda, rotacion_demanda], axis=1)
-        metricas[val_col_demanda] = metricas[val_col_demanda].fillna(0)
-
-        # SEGMENTACIÓN ABC
-        metricas = metricas.groupby(group_cols_warehouse, group_keys=False).apply(lambda g: self.segmentar_abc_por_acumulado(g, value_col=val_col_demanda, new_col=abc_col_demanda, breaks = (abc_umb[0], abc_umb[1])))
-
-        # SEGMENTACIÓN XYZ
-        metricas[xyz_col_demanda] = metricas.groupby(group_cols_warehouse)[cv_col_demanda].transform(lambda s: s.apply(self.segmentar_xyz, breaks = (xyz_umb[0], xyz_umb[1])))
-
-        # SEGMENTACIÓN FSN
-        metricas[fsn_col_demanda] = metricas.groupby(group_cols_warehouse)[rot_col_demanda].transform(lambda s: s.apply(self.segmentar_fsn, breaks = (fsn_umb[0], fsn_umb[1])))
-
-        df_segmentado = metricas.reset_index().copy()
-        return df_segmentado
\ No newline at end of file
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : 03_segmentdata
+ARCHIVOS  DESTINO  : ---
+ARCHIVOS  FUENTES  : ---
+OBJETIVO           : Definir procesos para segmentar los datos según ABC-XYZ-FSN
+TIPO               : PY
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene procesos para segmentar los datos según ABC-XYZ-FSN
+"""
+
+# Librerías Propias
+from utils.utils import construir_matriz_sku_mes
+
+# Librerías Básicas
+import logging
+
+# Librerías para Datos
+import pandas as pd
+import numpy as np
+
+class SegmentadorDatos:
+    """Clase para la segmentación de la data según ABC-XYZ-FSN."""
+
+    def __init__(self):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Segmentador de Datos...")
+
+    ###################################################################################
+    # FUNCIÓN PARA CALCULAR EL COEFICIENTE DE VARIACIÓN / DESVIACIÓN RELATIVA A LA MEDIA
+    ###################################################################################
+    def cv(self, s):
+        """
+        Función para calcular el coeficiente de variación / desviación relativa a la media.
+        """
+        # ASEGURAR TOMAR EN CUENTA MESES DONDE HAY VENTAS
+        x = s[s > 0]
+        
+        # EN CASO SOLO HAYA UNA VENTA O NINGUNA, SIMPLEMENTE NO SE PUEDE CALCULAR LA VARIACIÓN
+        if len(x) <= 1 or x.mean() == 0:
+            return 0
+        
+        # CALCULAR FINALMENTE EL COEFICIENTE DE VARIACIÓN
+        return round(x.std()/ x.mean(), 4)
+
+    ###################################################################################
+    # FUNCIÓN PARA CALCULAR LA ROTACIÓN O NÚMERO DE MESES DONDE HAY UN VALOR DIFERENTE A 0
+    ###################################################################################
+    def rotacion(self, s):
+        """
+        Función para calcular la rotación o número de meses donde hay un valor diferente a 0 en ventas.
+        """
+        # MANTENER SOLO MESES CON VENTAS
+        x = s[s > 0]
+
+        # CALCULAR CUÁNTOS MESES TIENEN VENTAS RESPECTO AL TOTAL DE MESES
+        return round(len(x)*12/len(s), 4)
+
+    ###################################################################################
+    # FUNCIÓN PARA SEGMENTACIÓN ABC
+    ###################################################################################
+    def segmentar_abc_por_acumulado(self, df, value_col, new_col, breaks=(0.80, 0.95)):
+        """
+        Función para la segmentación ABC.
+        """
+        a, b = breaks
+        # ASEGURAMOS DATOS ORDENADOS POR VALORIZADO (ORDEN ESTABLE: LOS EMPATES QUEDAN EN EL ORDEN DE LA LLAVE DEL SKU)
+        g = df.sort_values(value_col, ascending=False, kind="mergesort").copy()
+        
+        # CALCULAMOS EL TOTAL DEL VALORIZADO DEL GRUPO
+        tot = g[value_col].sum()
+        
+        # SI NO HAY VALORIZADO, DEFINIMOS TODOS LOS PRODUCTOS COMO "C"
+        if tot <= 0:
+            g[new_col] = "C"
+
+        # SI HAY VALORIZADO, EVALUAMOS EL ACUMULADO
+        else:
+            g["ACUMULADO"] = g[value_col].cumsum() / tot
+            
+            # DEFINIMOS EL SEGMENTO DEL PRODUCTO SEGÚN EL ACUMULADO
+            g[new_col] = np.where(g["ACUMULADO"] <= a, "A",
+                        np.where(g["ACUMULADO"] <= b, "B", "C"))
+
+            # ASEGURAMOS SEGMENTO B EN CASOS DONDE SOLO HAYA SEGMENTOS A Y C (CUANDO LOS UMBRALES SON CERCANOS)
+            if (g[new_col] == "B").sum() == 0 and (g[new_col] == "A").any() and (g[new_col] == "C").any():
+                idx = g.index[g["ACUMULADO"] > a][0]
+                g.loc[idx, new_col] = "B"
+
+            # ELIMINAMOS COLUMNAS AUXILIARES
+            g = g.drop(columns=["ACUMULADO"])
+        return g
+
+    ###################################################################################
+    # FUNCIÓN PARA SEGMENTACIÓN XYZ
+    ###################################################################################
+    def segmentar_xyz(self, cv, breaks=(0.35, 0.80)):
+        """
+        Función para la segmentación XYZ.
+        """
+        a, b = breaks
+        # SI EL COEFICIENTE DE VARIACIÓN ES NAN, SIGNIFICA QUE VENTAS EN 0 (LO TOMAMOS COMO ESTABLE)
+        if pd.isna(cv): return "X"
+        # SI EL COEFICIENTE DE VARIACION ES CERCANO A 0 SE TOMA COMO ESTABLE
+        if cv <= a: return "X"
+        # SI EL COEFICIENTE DE VARIACION SE VA ALEJANDO DE 0 SE TOMA COMO VARIABLE
+        if cv <= b: return "Y"
+        # SI EL COEFICIENTE SE ALEJA MUCHO DEL 0 SE TOMA COMO ERRÁTICO
+        return "Z"
+
+    ###################################################################################
+    # FUNCIÓN PARA SEGMENTACIÓN FSN
+    ###################################################################################
+    def segmentar_fsn(self, rot, breaks=(2, 6)):
+        """
+        Función para la segmentación FSN.
+        """
+        a, b = breaks
+        # SI LA ROTACION OCURRE MÁS DE LA MITAD DE LA VENTANA SE CONSIDERA RÁPIDO
+        if rot >= b: return "F"
+        # SI LA ROTACIÓN OCURRE MÁS DE LA SEXTA PARTE DE LA VENTANA SE CONSIDERA LENTO
+        if rot >= a: return "S"
+        # SI LA ROTACIÓN OCURRE SOLO UNA VEZ O NINGUNA, SE CONSIDERA SIN ROTACIÓN
+        return "N"
+
+    ###################################################################################
+    # FUNCIÓN PARA CONSTRUIR LA SEGMENTACIÓN ABC-XYZ-FSN
+    ###################################################################################
+    def segmentar_abc_xyz_fsn(self, df_mes, ventana_segmentacion, mes_col, val_col, group_cols_mes, group_cols_product, group_cols_warehouse, prefix_str = None, abc_umb = (0.80, 0.95), xyz_umb = (0.35, 0.80), fsn_umb = (2, 6), motor = "vectorizado"):
+        """
+        Función para construir la segmentación ABC-XYZ-FSN.
+        El motor "vectorizado" trabaja sobre la matriz densa SKU x mes; si no se puede construir (SKU-mes duplicados),
+        o si se pide el motor "pandas", se usa el cálculo original por grupos.
+        """
+        if motor == "vectorizado":
+            df_segmentado = self.segmentar_abc_xyz_fsn_vectorizado(df_mes, ventana_segmentacion, mes_col, val_col, group_cols_product, group_cols_warehouse, prefix_str, abc_umb, xyz_umb, fsn_umb)
+            if df_segmentado is not None:
+                return df_segmentado
+            logging.info("Hay SKU-mes duplicados en la ventana, se usa el motor pandas de segmentación.")
+
+        ventana_segmentacion_str = str(ventana_segmentacion).zfill(2)
+
+        if not prefix_str:
+            prefix_str = val_col
+
+        # VARIABLES - NOMBRES DE NUEVAS VARIABLES DE SEGMENTACIÓN
+        val_col_demanda = f"VALORIZADO{prefix_str}{ventana_segmentacion_str}M"
+        cv_col_demanda = f"CV{prefix_str}{ventana_segmentacion_str}M"
+        rot_col_demanda = f"ROTACION{prefix_str}{ventana_segmentacion_str}M"
+
+        abc_col_demanda = f"ABC{prefix_str}{ventana_segmentacion_str}M"
+        xyz_col_demanda = f"XYZ{prefix_str}{ventana_segmentacion_str}M"
+        fsn_col_demanda = f"FSN{prefix_str}{ventana_segmentacion_str}M"
+
+        # OBTENER MES FINAL Y MES INICIAL DE LA VENTANA DE SEGMENTACIÓN
+        df = df_mes.copy()
+        ultimo_mes = df[mes_col].max()
+        ini_ventana = ultimo_mes - pd.DateOffset(months=(ventana_segmentacion-1))
+
+        # OBTENER VENTANA DE TIEMPO DE LA DATA
+        df_ventana = df[(df[mes_col] >= ini_ventana) & (df[mes_col] <= ultimo_mes)].copy()
+
+        # ASEGURAR ORDENAMIENTO POR PERIODO PARA CADA ALMACÉN COMERCIAL - PRODUCTO
+        df_tipo = df_ventana.sort_values(group_cols_mes).reset_index(drop = True).copy()
+
+        # VALORIZADO DE LA DEMANDA
+        valorizado_demanda = df_tipo.groupby(group_cols_product)[val_col].sum().rename(val_col_demanda)
+
+        # COEFICIENTE DE VARIACIÓN (CV) DE LA DEMANDA
+        variabilidad_demanda = df_tipo.groupby(group_cols_product)[val_col].apply(self.cv).rename(cv_col_demanda)
+
+        # ROTACIÓN SEGÚN CAMBIOS EN LA DEMANDA
+        rotacion_demanda = df_tipo.groupby(group_cols_product)[val_col].apply(self.rotacion).rename(rot_col_demanda)
+
+        metricas = pd.concat([valorizado_demanda, variabilidad_demanda, rotacion_demanda], axis=1)
+        metricas[val_col_demanda] = metricas[val_col_demanda].fillna(0)
+
+        # SEGMENTACIÓN ABC
+        metricas = metricas.groupby(group_cols_warehouse, group_keys=False).apply(lambda g: self.segmentar_abc_por_acumulado(g, value_col=val_col_demanda, new_col=abc_col_demanda, breaks = (abc_umb[0], abc_umb[1])))
+
+        # SEGMENTACIÓN XYZ
+        metricas[xyz_col_demanda] = metricas.groupby(group_cols_warehouse)[cv_col_demanda].transform(lambda s: s.apply(self.segmentar_xyz, breaks = (xyz_umb[0], xyz_umb[1])))
+
+        # SEGMENTACIÓN FSN
+        metricas[fsn_col_demanda] = metricas.groupby(group_cols_warehouse)[rot_col_demanda].transform(lambda s: s.apply(self.segmentar_fsn, breaks = (fsn_umb[0], fsn_umb[1])))
+
+        df_segmentado = metricas.reset_index().copy()
+        return df_segmentado
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER LOS NOMBRES DE LAS COLUMNAS DE SEGMENTACIÓN DE UNA VENTANA
+    ###################################################################################
+    def nombrar_columnas_segmentacion(self, ventana_segmentacion, val_col, prefix_str = None):
+        """
+        Función para obtener los nombres de las columnas de segmentación de una ventana (valorizado, cv, rotación, abc, xyz, fsn).
+        """
+        ventana_segmentacion_str = str(ventana_segmentacion).zfill(2)
+        if not prefix_str:
+            prefix_str = val_col
+        return [f"{metrica}{prefix_str}{ventana_segmentacion_str}M" for metrica in ["VALORIZADO", "CV", "ROTACION", "ABC", "XYZ", "FSN"]]
+
+    ###################################################################################
+    # FUNCIÓN PARA ASIGNAR EL SEGMENTO ABC DE FORMA VECTORIZADA
+    ###################################################################################
+    def asignar_abc_vectorizado(self, grupo, valorizado, breaks = (0.80, 0.95)):
+        """
+        Función para la segmentación ABC de todos los almacenes a la vez.
+        Recibe el código de almacén y el valorizado de cada SKU; devuelve el orden (almacén, valorizado descendente) y el
+        segmento de cada SKU en ese orden. Los empates de valorizado se desempatan por el orden de entrada (orden estable),
+        que es el de la llave del SKU, igual que en segmentar_abc_por_acumulado.
+        """
+        a, b = breaks
+
+        # ORDENAR POR ALMACÉN Y VALORIZADO DESCENDENTE
+        orden = np.lexsort((-valorizado, grupo))
+        grupo_ord = grupo[orden]
+        valor_ord = valorizado[orden]
+
+        # INICIO DE CADA ALMACÉN Y TOTAL DEL VALORIZADO DEL ALMACÉN
+        inicios = np.flatnonzero(np.r_[True, grupo_ord[1:] != grupo_ord[:-1]])
+        id_almacen = np.repeat(np.arange(len(inicios)), np.diff(np.r_[inicios, len(grupo_ord)]))
+        tot = np.add.reduceat(valor_ord, inicios)[id_almacen]
+
+        # ACUMULADO DEL VALORIZADO DENTRO DE CADA ALMACÉN
+        acumulado = pd.Series(valor_ord).groupby(id_almacen).cumsum().to_numpy() / np.where(tot > 0, tot, 1)
+        segmento = np.select([tot <= 0, acumulado <= a, acumulado <= b], ["C", "A", "B"], "C").astype(object)
+
+        # ASEGURAMOS SEGMENTO B EN ALMACENES DONDE SOLO HAYA SEGMENTOS A Y C (CUANDO LOS UMBRALES SON CERCANOS)
+        num_almacenes = len(inicios)
+        hay_a = np.bincount(id_almacen, weights = segmento == "A", minlength = num_almacenes) > 0
+        hay_b = np.bincount(id_almacen, weights = segmento == "B", minlength = num_almacenes) > 0
+        hay_c = np.bincount(id_almacen, weights = segmento == "C", minlength = num_almacenes) > 0
+        posiciones = np.arange(len(grupo_ord))
+        primera_sobre_a = np.minimum.reduceat(np.where((tot > 0) & (acumulado > a), posiciones, len(grupo_ord)), inicios)
+        forzar = (~hay_b) & hay_a & hay_c & (primera_sobre_a < len(grupo_ord))
+        segmento[primera_sobre_a[forzar]] = "B"
+
+        return orden, segmento
+
+    ###################################################################################
+    # FUNCIÓN PARA ASIGNAR EL SEGMENTO XYZ DE FORMA VECTORIZADA
+    ###################################################################################
+    def asignar_xyz_vectorizado(self, cv, breaks = (0.35, 0.80)):
+        """
+        Función para la segmentación XYZ de un arreglo de coeficientes de variación.
+        """
+        a, b = breaks
+        return np.select([np.isnan(cv) | (cv <= a), cv <= b], ["X", "Y"], "Z").astype(object)
+
+    ###################################################################################
+    # FUNCIÓN PARA ASIGNAR EL SEGMENTO FSN DE FORMA VECTORIZADA
+    ###################################################################################
+    def asignar_fsn_vectorizado(self, rot, breaks = (2, 6)):
+        """
+        Función para la segmentación FSN de un arreglo de rotaciones.
+        """
+        a, b = breaks
+        return np.select([rot >= b, rot >= a], ["F", "S"], "N").astype(object)
+
+    ###################################################################################
+    # FUNCIÓN PARA CALCULAR VALORIZADO, CV Y ROTACIÓN SOBRE LA MATRIZ DENSA SKU X MES
+    ###################################################################################
+    def calcular_metricas_matriz(self, matriz, presente):
+        """
+        Función para calcular valorizado, coeficiente de variación y rotación de cada fila de la matriz SKU x mes.
+        Replica cv() y rotacion(): solo los meses con ventas (> 0) cuentan para el CV, y la rotación se mide respecto a
+        los meses con registro del SKU.
+        """
+        positivo = np.nan_to_num(matriz, nan = 0.0) > 0
+        valores_positivos = np.where(positivo, matriz, 0.0)
+        num_positivos = positivo.sum(axis = 1)
+        num_presentes = presente.sum(axis = 1)
+
+        # MEDIA Y DESVIACIÓN MUESTRAL (DOS PASADAS) DE LOS MESES CON VENTAS
+        media = valores_positivos.sum(axis = 1) / np.maximum(num_positivos, 1)
+        desviacion = np.where(positivo, valores_positivos - media[:, None], 0.0)
+        std = np.sqrt((desviacion ** 2).sum(axis = 1) / np.maximum(num_positivos - 1, 1))
+        cv = np.where((num_positivos > 1) & (media != 0), np.round(std / np.where(media != 0, media, 1), 4), 0.0)
+
+        rotacion = np.round(num_positivos * 12 / np.maximum(num_presentes, 1), 4)
+        return cv, rotacion
+
+    ###################################################################################
+    # FUNCIÓN PARA CONSTRUIR LA SEGMENTACIÓN ABC-XYZ-FSN DE FORMA VECTORIZADA
+    ###################################################################################
+    def segmentar_abc_xyz_fsn_vectorizado(self, df_mes, ventana_segmentacion, mes_col, val_col, group_cols_product, group_cols_warehouse, prefix_str = None, abc_umb = (0.80, 0.95), xyz_umb = (0.35, 0.80), fsn_umb = (2, 6)):
+        """
+        Función para construir la segmentación ABC-XYZ-FSN sobre la matriz densa SKU x mes.
+        Devuelve las mismas columnas y orden que segmentar_abc_xyz_fsn, o None si hay SKU-mes duplicados.
+        """
+        val_col_demanda, cv_col_demanda, rot_col_demanda, abc_col_demanda, xyz_col_demanda, fsn_col_demanda = self.nombrar_columnas_segmentacion(ventana_segmentacion, val_col, prefix_str)
+
+        # OBTENER VENTANA DE TIEMPO DE LA DATA
+        ultimo_mes = df_mes[mes_col].max()
+        ini_ventana = ultimo_mes - pd.DateOffset(months=(ventana_segmentacion-1))
+        df_ventana = df_mes[(df_mes[mes_col] >= ini_ventana) & (df_mes[mes_col] <= ultimo_mes)]
+
+        # CONSTRUIR LA MATRIZ DENSA SKU X MES DE LA VENTANA
+        matriz_sku_mes = construir_matriz_sku_mes(df_ventana, group_cols_product, mes_col, val_col)
+        if matriz_sku_mes is None:
+            return None
+        claves, _, matriz, presente, fila_sku, columna_mes = matriz_sku_mes
+
+        # VALORIZADO DE LA DEMANDA (SUMA EN ORDEN SKU - MES, IGUAL QUE EL GROUPBY ORIGINAL)
+        validas = np.flatnonzero(fila_sku >= 0)
+        validas = validas[np.lexsort((columna_mes[validas], fila_sku[validas]))]
+        valores = pd.Series(df_ventana[val_col].to_numpy()[validas])
+        valorizado = valores.groupby(fila_sku[validas]).sum().reindex(range(len(claves)), fill_value = 0)
+
+        # COEFICIENTE DE VARIACIÓN (CV) Y ROTACIÓN DE LA DEMANDA
+        cv, rotacion = self.calcular_metricas_matriz(matriz, presente)
+
+        # SEGMENTACIÓN ABC, XYZ Y FSN
+        grupo = claves.groupby(group_cols_warehouse, sort = True).ngroup().to_numpy()
+        nombres = [val_col_demanda, cv_col_demanda, rot_col_demanda, abc_col_demanda, xyz_col_demanda, fsn_col_demanda]
+        return self.armar_segmentacion(claves, grupo, valorizado.to_numpy(), cv, rotacion, nombres, abc_umb, xyz_umb, fsn_umb)
+
+    ###################################################################################
+    # FUNCIÓN PARA ARMAR EL DATAFRAME DE SEGMENTACIÓN A PARTIR DE LAS MÉTRICAS POR SKU
+    ###################################################################################
+    def armar_segmentacion(self, claves, grupo, valorizado, cv, rotacion, nombres, abc_umb = (0.80, 0.95), xyz_umb = (0.35, 0.80), fsn_umb = (2, 6)):
+        """
+        Función para asignar los segmentos ABC-XYZ-FSN a partir de las métricas por SKU y armar el dataframe de salida,
+        ordenado por almacén y valorizado descendente.
+        """
+        val_col_demanda, cv_col_demanda, rot_col_demanda, abc_col_demanda, xyz_col_demanda, fsn_col_demanda = nombres
+        orden, segmento_abc = self.asignar_abc_vectorizado(grupo, np.asarray(valorizado, dtype = np.float64), breaks = (abc_umb[0], abc_umb[1]))
+
+        df_segmentado = claves.iloc[orden].reset_index(drop = True)
+        df_segmentado[val_col_demanda] = valorizado[orden]
+        df_segmentado[cv_col_demanda] = cv[orden]
+        df_segmentado[rot_col_demanda] = rotacion[orden]
+        df_segmentado[abc_col_demanda] = segmento_abc
+        df_segmentado[xyz_col_demanda] = self.asignar_xyz_vectorizado(cv[orden], breaks = (xyz_umb[0], xyz_umb[1]))
+        df_segmentado[fsn_col_demanda] = self.asignar_fsn_vectorizado(rotacion[orden], breaks = (fsn_umb[0], fsn_umb[1]))
+        return df_segmentado
+
+    ###################################################################################
+    # FUNCIÓN PARA CONSTRUIR LA SEGMENTACIÓN ABC-XYZ-FSN DE VARIAS VENTANAS EN UNA SOLA PASADA
+    ###################################################################################
+    def segmentar_abc_xyz_fsn_multiventana(self, df_mes, ventanas, mes_col, val_col, group_cols_product, group_cols_warehouse, prefix_str = None, abc_umb = (0.80, 0.95), xyz_umb = (0.35, 0.80), fsn_umb = (2, 6)):
+        """
+        Función para construir la segmentación ABC-XYZ-FSN de varias ventanas (todas terminan en el último mes).
+        Se arma una sola matriz SKU x mes para la ventana más larga y se acumulan desde el último mes hacia atrás los
+        conteos y sumas; cada ventana solo lee la columna de su primer mes. Devuelve un diccionario {ventana: dataframe}
+        con las mismas columnas que segmentar_abc_xyz_fsn, o None si hay SKU-mes duplicados.
+        """
+        ultimo_mes = df_mes[mes_col].max()
+        ini_ventana_maxima = ultimo_mes - pd.DateOffset(months=(max(ventanas)-1))
+        df_ventana = df_mes[(df_mes[mes_col] >= ini_ventana_maxima) & (df_mes[mes_col] <= ultimo_mes)]
+
+        # CONSTRUIR LA MATRIZ DENSA SKU X MES DE LA VENTANA MÁS LARGA
+        matriz_sku_mes = construir_matriz_sku_mes(df_ventana, group_cols_product, mes_col, val_col)
+        if matriz_sku_mes is None:
+            return None
+        claves, fechas, matriz, presente, _, _ = matriz_sku_mes
+        grupo = claves.groupby(group_cols_warehouse, sort = True).ngroup().to_numpy()
+
+        # DESPLAZAR LOS VALORES POSITIVOS POR SU MEDIA PARA QUE LA VARIANZA POR SUMAS SEA ESTABLE
+        valores = np.nan_to_num(matriz, nan = 0.0)
+        positivo = valores > 0
+        centro = np.where(positivo, valores, 0.0).sum(axis = 1) / np.maximum(positivo.sum(axis = 1), 1)
+        desplazado = np.where(positivo, valores - centro[:, None], 0.0)
+
+        # SUMAS Y CONTEOS ACUMULADOS DESDE EL ÚLTIMO MES HACIA ATRÁS
+        def acumular_desde_el_final(m):
+            return np.cumsum(m[:, ::-1], axis = 1)[:, ::-1]
+        suma_valores = acumular_desde_el_final(valores)
+        conteo_positivos = acumular_desde_el_final(positivo.astype(np.int64))
+        conteo_presentes = acumular_desde_el_final(presente.astype(np.int64))
+        suma_desplazada = acumular_desde_el_final(desplazado)
+        suma_cuadrados = acumular_desde_el_final(desplazado ** 2)
+
+        segmentaciones = {}
+        for ventana in ventanas:
+            nombres = self.nombrar_columnas_segmentacion(ventana, val_col, prefix_str)
+            primer_mes = np.searchsorted(fechas, ultimo_mes - pd.DateOffset(months=(ventana-1)))
+
+            # SOLO LOS SKUS CON REGISTROS DENTRO DE LA VENTANA
+            en_ventana = conteo_presentes[:, primer_mes] > 0
+            n = conteo_positivos[en_ventana, primer_mes]
+            presentes = conteo_presentes[en_ventana, primer_mes]
+            s1 = suma_desplazada[en_ventana, primer_mes]
+            s2 = suma_cuadrados[en_ventana, primer_mes]
+
+            # MEDIA, DESVIACIÓN MUESTRAL, CV Y ROTACIÓN DE LOS MESES CON VENTAS
+            n_seguro = np.maximum(n, 1)
+            media = centro[en_ventana] + s1 / n_seguro
+            std = np.sqrt(np.maximum(s2 - s1 ** 2 / n_seguro, 0.0) / np.maximum(n - 1, 1))
+            cv = np.where((n > 1) & (media != 0), np.round(std / np.where(media != 0, media, 1), 4), 0.0)
+            rotacion = np.round(n * 12 / presentes, 4)
+
+            valorizado = suma_valores[en_ventana, primer_mes]
+            if pd.api.types.is_integer_dtype(df_mes[val_col]):
+                valorizado = valorizado.astype(df_mes[val_col].dtype)
+
+            claves_ventana = claves[en_ventana].reset_index(drop = True)
+            segmentaciones[ventana] = self.armar_segmentacion(claves_ventana, grupo[en_ventana], valorizado, cv, rotacion, nombres, abc_umb, xyz_umb, fsn_umb)
+
+        return segmentaciones
\ No newline at end of file
@@ -1,405 +1,456 @@
-"""_summary_.
-
-PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
-NOMBRE             : 04_managemodel
-ARCHIVOS  DESTINO  : ---
-ARCHIVOS  FUENTES  : ---
-OBJETIVO           : Definir procesos para manejar las distintas necesidades de utilizar un modelo de machine learning
-TIPO               : PY
-OBSERVACION        : -
-SCHEDULER          : CLOUD RUN
-VERSION            : 1.0
-DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
-PROVEEDOR          : MINSAIT
-FECHA              : 10/12/2025
-DESCRIPCION        : Paquete que contiene procesos para manejar las distintas necesidades de utilizar un modelo de machine learning
-"""
-
-# Librerías Básicas
-from urllib.parse import urlparse
-import logging
-import os
-
-# Librerías para Datos
-import pandas as pd
-import numpy as np
-
-# Librerías para Auto Selección de Modelos
-from autogluon.timeseries import TimeSeriesPredictor
-from autogluon.timeseries import TimeSeriesDataFrame
-
-# Librerías de GCP
-from google.cloud import aiplatform
-
-class GestorModelo:
-    """Clase para la gestión de los procesos que manejan las distintas necesidades de utilizar un modelo de machine learning."""
-
-    def __init__(self, cs_cliente, window, months, temp_path):
-        """
-        Inicializa la clase.
-        """
-        logging.info("Inicializando la clase de Gestor de Modelo...")
-
-        self.cs_cliente = cs_cliente
-        self.ventana_segmentacion = window
-        self.num_meses_proyeccion = months
-        self.MODEL_TEMP_PATH = temp_path
-
-    ###################################################################################
-    # FUNCIÓN PARA VERIFICAR LA EXISTENCIA DEL MODELO BASE Y SU VERSIÓN DE MES ACTUAL
-    ###################################################################################
-    def verificar_modelo(self, model_name, version_label, version_model, project_id, region):
-        """
-        Función para verificar la existencia del modelo base y la versión del mes actual
-        """
-        aiplatform.init(project = project_id, location = region)
-        all_versions = []
-
-        # BUSCAR LA EXISTENCIA DEL MODELO EN SÍ
-        try:
-            models = aiplatform.Model.list(filter=f"display_name={model_name}")
-
-            # SI NO SE ENCUENTRA MODELO CON EL NOMBRE, SE RETORNA FALSE Y LISTA VACÍA DE VERSIONES
-            if not models:
-                return False, []
-
-            # ELEGIR EL PRIMER MODELO QUE COINCIDE CON EL NOMBRE Y OBTENER LA LISTA DE TODAS LAS VERSIONES
-            base_model = models[0].resource_name
-            modelo_padre = aiplatform.models.ModelRegistry(model=base_model)
-            all_versions = modelo_padre.list_versions()
-
-            # VERIFICAR SI EXISTE LA VERSIÓN DEL MES ACTUAL DEL MODELO
-            version_del_mes_actual_existe = False
-
-            for version in all_versions:
-                version_id = version.version_id
-                version_resource_name = f"{base_model}@{version_id}"
-                model_version = aiplatform.Model(version_resource_name)
-                labels = model_version.labels
-                if labels and labels.get(version_label) == version_model:
-                    version_del_mes_actual_existe = True
-                    break
-            return version_del_mes_actual_existe, all_versions
-
-        except Exception as e:
-            raise Exception("Error al intentar validar modelo.") from e
-
-    ###################################################################################
-    # FUNCIÓN PARA DESCARGAR EN EL ENTORNO LOCAL DE CLOUD STORAGE
-    ###################################################################################
-    def descargar_modelo_de_gcs(self, gcs_uri, local_dir):
-        """
-        Función para descargar en el entorno local de Cloud Storage
-        """
-        if not gcs_uri.startswith("gs://"):
-            raise ValueError(f"Ruta GCS inválida: {gcs_uri}")
-
-        # SEPARAR EN NOMBRE DE BUCKET Y EL RESTO DE LA URI
-        bucket_name, prefix = gcs_uri.replace("gs://", "").split("/", 1)
-
-        # CREAR LISTA DE ARCHIVOS DEL BUCKET
-        blobs = self.cs_cliente.list_blobs(bucket_name, prefix=prefix)
-
-        for blob in blobs:
-            # DESCARGAR EL CONTENIDO
-            rel_path = blob.name[len(prefix):].lstrip("/")
-            local_path = os.path.join(local_dir, rel_path)
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
-            blob.download_to_filename(local_path)
-
-    ###################################################################################
-    # FUNCIÓN PARA OBTENER EL MODELO DE LA VERSIÓN ACTUAL
-    ###################################################################################
-    def obtener_modelo(self, model_name, version_label, version_model, project_id, region):
-        """
-        Función para obtener el modelo de la versión del mes actual
-        """
-        LOCAL_MODEL_DIR = "/temp_propio/cemento_chronos_model"
-
-        aiplatform.init(project = project_id, location = region)
-
-        # OBTENER MODELO POR EL NOMBRE CON TODAS SUS VERSIONES
-        models = aiplatform.Model.list(filter=f"display_name={model_name}")
-        base_model = models[0].resource_name
-
-        modelo_padre = aiplatform.models.ModelRegistry(model=base_model)
-        all_versions = modelo_padre.list_versions()
-
-        for version in all_versions:
-            version_id = version.version_id
-            version_resource_name = f"{base_model}@{version_id}"
-            model_version = aiplatform.Model(version_resource_name)
-            labels = model_version.labels
-            if labels and labels.get(version_label) == version_model:
-                break
-    
-        version_model_uri = model_version.uri
-
-        self.descargar_modelo_de_gcs(
-            gcs_uri = version_model_uri,
-            local_dir = self.MODEL_TEMP_PATH
-        )
-
-        modelo_autogluon = TimeSeriesPredictor.load(self.MODEL_TEMP_PATH)
-        return modelo_autogluon
-    
-    ###################################################################################
-    # FUNCIÓN PARA CREAR FEATURES DE TIEMPO QUE CAPTEN CICLOS, PERIODOS, ETC
-    ###################################################################################
-    def crear_time_features(self, data, id_cols, date_col, value_col, num_month = 12, there_is_period = False):
-        df_copy = data.copy()
-
-        # ASEGURAMOS EL ORDEN PARA CREAR VARIABLES DE LAGS DE TIEMPO CORRECTAMENTE
-        df_copy = df_copy.sort_values(by = id_cols + [date_col])
-
-        # CREAR VARIABLES DE LAGS DE TIEMPO
-        for lag in range(1, num_month):
-            df_copy[f'{value_col}_LAG{str(lag)}'] = df_copy.groupby(id_cols)[value_col].shift(lag).interpolate(method='linear').fillna(method='ffill').fillna(method='bfill')
-
-        # CREAR VARIABLES DE PROMEDIO DE VENTANAS DE TIEMPO
-        for window in range(2, num_month):
-            df_copy[f'{value_col}_MEAN{str(window)}'] = df_copy.groupby(id_cols)[value_col].shift(1).rolling(window=window).mean().interpolate(method='linear').fillna(method='ffill').fillna(method='bfill')
-
-        # SEPARAR LA FECHA EN VARIABLES DE MES Y AÑO
-        if there_is_period:
-            df_copy['MES'] = (df_copy[date_col] - pd.DateOffset(months=1)).dt.month.interpolate(method='linear').fillna(method='ffill').fillna(method='bfill')
-            df_copy['ANIO'] = (df_copy[date_col] - pd.DateOffset(months=1)).dt.year.interpolate(method='linear').fillna(method='ffill').fillna(method='bfill')
-
-        return df_copy
-
-    ###################################################################################
-    # FUNCIÓN PARA PREPARAR DATAFRAME COMPATIBLE CON AUTOGLUON
-    ###################################################################################
-    def preparar_para_autogluon(self, df, id_skus, mes_col, val_col, prefix_str, need_dynamic_time_features = False, need_known_time_features = False, need_static_segment_features = False):
-        """
-        Función para preparar dataframe compatible con Autogluon
-        """
-        # ADAPTAR COLUMNAS QUE ENTIENDE LA LIBRERÍA AUTOGLUON PARA ENTRENAR MODELO
-        df['item_id'] = df[id_skus].astype(str).agg('_'.join, axis=1)
-        df[mes_col] = pd.to_datetime(df[mes_col])
-        df = df.rename(columns={
-            mes_col: 'timestamp',
-            val_col: 'target'
-        })
-
-        # DEFINIR VARIABLES ESTÁNDAR, DE LAG Y PROMEDIOS DE VENTANAS DE TIEMPO
-        col_autogluon_ini = ['item_id', 'timestamp', 'target']
-        features_base_num = []
-        if need_dynamic_time_features:
-            features_base_num = features_base_num + [f"{val_col}_LAG{str(i)}" for i in range(1, self.num_meses_proyeccion)]
-            features_base_num = features_base_num + [f"{val_col}_MEAN{str(i)}" for i in range(2, self.num_meses_proyeccion)]
-        
-        # VARIABLES DINÁMICAS EN EL TIEMPO NO CONOCIDAS EN EL FUTURO
-        dynamic_covariates = col_autogluon_ini + features_base_num
-
-        # DEFINIR VARIABLES DESCRIPTIVAS DEL TIEMPO
-        df_ag = df[dynamic_covariates].copy()
-
-        known_covariates = []
-        if need_known_time_features:
-            # ESTACIONALIDAD MENSUAL (CICLO DE 12 MESES)
-            df_ag['mes'] = df_ag['timestamp'].dt.month
-            df_ag['mes_sin'] = np.sin(2 * np.pi * df_ag['mes'] / 12)
-            df_ag['mes_cos'] = np.cos(2 * np.pi * df_ag['mes'] / 12)
-
-            # ESTACIONALIDAD TRIMESTRAL (CICLO DE 4 TRIMESTRES)
-            df_ag['trimestre'] = df_ag['timestamp'].dt.quarter
-            df_ag['trim_sin'] = np.sin(2 * np.pi * df_ag['trimestre'] / 4)
-            df_ag['trim_cos'] = np.cos(2 * np.pi * df_ag['trimestre'] / 4)
-
-            # ESTACIONALIDAD SEMESTRAL (CICLO DE 2 SEMESTRES)
-            df_ag['semestre'] = np.where(df_ag['mes'] <= 6, 1, 2)
-            df_ag['sem_sin'] = np.sin(2 * np.pi * df_ag['semestre'] / 2)
-            df_ag['sem_cos'] = np.cos(2 * np.pi * df_ag['semestre'] / 2)
-
-            # CONTADOR DE MESES LINEAL
-            fecha_min = df_ag['timestamp'].min()
-            df_ag['contador_lineal'] = (
-                (df_ag['timestamp'].dt.year - fecha_min.year) * 12 +
-                (df_ag['timestamp'].dt.month - fecha_min.month)
-            )
-
-            # CONTADOR DE MESES CUADRÁTICO
-            df_ag['contador_cuadratico'] = df_ag['contador_lineal']**2
-
-            # CONTADOR DE MESES LOGARÍTMICO
-            df_ag['contador_log'] = np.log1p(df_ag['contador_lineal'])
-
-            # VARIABLES CONOCIDAS EN EL FUTURO
-            known_covariates = ["mes", "mes_sin", "mes_cos", "trimestre", "trim_sin", "trim_cos", "semestre", "sem_sin", "sem_cos", "contador_lineal", "contador_cuadratico", "contador_log"]
-
-        df_ag = df_ag.reset_index(drop = True)
-        
-        if need_static_segment_features:
-            # VARIABLES ESTÁTICAS EN EL TIEMPO NO CONOCIDAS EN EL FUTURO
-            ventana_segmentacion_str = str(self.ventana_segmentacion).zfill(2)
-    
-            if not prefix_str:
-                prefix_str = val_col
-
-            abc_col_demanda = f"ABC{prefix_str}{ventana_segmentacion_str}M"
-            xyz_col_demanda = f"XYZ{prefix_str}{ventana_segmentacion_str}M"
-            fsn_col_demanda = f"FSN{prefix_str}{ventana_segmentacion_str}M"
-            static_covariates_df = df[["item_id", abc_col_demanda, xyz_col_demanda, fsn_col_demanda]].drop_duplicates(subset=["item_id"]).reset_index(drop = True)
-
-            # CREAR DATAFRAME DE SERIES DE TIEMPO PARA AUTOGLUON CON VARIABLES ESTÁTICAS
-            df_ts_ag = TimeSeriesDataFrame.from_data_frame(
-                df = df_ag[dynamic_covariates + known_covariates],
-                id_column = "item_id",
-                timestamp_column = "timestamp",
-                static_features_df = static_covariates_df,
-            )
-
-        else:
-            # CREAR DATAFRAME DE SERIES DE TIEMPO PARA AUTOGLUON SIN VARIABLES ESTÁTICAS
-            df_ts_ag = TimeSeriesDataFrame.from_data_frame(
-                df = df_ag[dynamic_covariates + known_covariates],
-                id_column = "item_id",
-                timestamp_column = "timestamp"
-            )
-
-        return df_ts_ag, known_covariates
-
-    ###################################################################################
-    # FUNCIÓN PARA ENTRENAR UN MODELO DE AUTOGLUON
-    ###################################################################################
-    def entrenar_modelo_autogluon(self, df_entrenamiento, id_skus, mes_col, val_col, prefix_str):
-        """
-        Función para entrenar modelo de Autogluon
-        """
-        df = df_entrenamiento.copy()
-
-        # PREPARAR DATAFRAME DE AUTOGLUON COMPATIBLE CON EL ENTRENAMIENTO
-        df_ts_ag, known_covariates = self.preparar_para_autogluon(
-            df, 
-            id_skus = id_skus, 
-            mes_col = mes_col, 
-            val_col = val_col, 
-            prefix_str = prefix_str,
-            need_dynamic_time_features = True, 
-            need_known_time_features = True, 
-            need_static_segment_features = True
-        )
-
-        # SE CONFIGURA EL PREDICTOR
-        predictor_mae_18_time = TimeSeriesPredictor(
-            prediction_length = self.num_meses_proyeccion,
-            label = 'target',
-            eval_metric = self.MODELO_AUTOGLUON_METRICA_EVALUACION,
-            path = self.MODEL_TEMP_PATH,
-            known_covariates_names=known_covariates,
-            quantile_levels = [0.05, 0.25, 0.5, 0.75, 0.95]
-        )
-
-        # SE ENTRENA EL PREDICTOR CON EL DATAFRAME SERIE DE TIEMPO DE AUTOGLUON
-        predictor_mae_18_time.fit(
-            train_data = df_ts_ag,
-            time_limit = self.TIEMPO_ENTRENAMIENTO_MAXIMO,
-            num_val_windows = 12,
-            presets='high_quality',
-            hyperparameters = self.CONFIGURACION_AUTOGLUON,
-            verbosity = 0
-        )
-
-        return predictor_mae_18_time
-    
-    ###################################################################################
-    # FUNCIÓN PARA GUARDAR EL MODELO EN GOOGLE CLOUD STORAGE
-    ###################################################################################
-    def guardar_modelo_gcs(self, gcs_uri):
-        """
-        Función para guardar el modelo en Google Cloud Storage
-        """
-        parsed_uri = urlparse(gcs_uri)
-        bucket_name = parsed_uri.netloc
-        path_gcs_sin_bucket = parsed_uri.path.lstrip('/')
-
-        bucket = self.cs_cliente.bucket(bucket_name)
-
-        for root, _, files in os.walk(self.MODEL_TEMP_PATH):
-            for file in files:
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, self.MODEL_TEMP_PATH)
-                blob_path = os.path.join(path_gcs_sin_bucket, relative_path)
-                
-                blob = bucket.blob(blob_path)
-                blob.upload_from_filename(file_path)
-
-    ###################################################################################
-    # FUNCIÓN PARA ACTUALIZAR EL MODELO AL MES ACTUAL
-    ###################################################################################
-    def actualizar_modelo(self, df_entrenamiento, id_skus, mes_col, val_col, prefix_str, versiones, model_name, version_label, version_model, project_id, region, uri_gcs, prefix_gcs):
-        """
-        Función para actualizar el modelo al mes actual
-        """
-        version_aliases = ["last-training", version_model]
-        version_description = f"Modelo Chronos para Cemento - Versión Mensual {version_model}"
-
-        aiplatform.init(project = project_id, location = region)
-        current_version_artifact_uri = os.path.join(uri_gcs, f"{version_model}") + "/"
-
-        # DEFINIR LOS DATOS PARA ENTRENAMIENTO Y AGREGAR VARIABLES DE TIEMPO
-        df_train = df_entrenamiento.copy()
-        df_sf_time = self.crear_time_features(
-            data = df_train,
-            id_cols = id_skus,
-            date_col = mes_col,
-            value_col = val_col,
-            num_month = self.num_meses_proyeccion
-        )      
-
-        # ENTRENAR MODELO DE AUTOGLUON CON LA NUEVA DATA Y GUARDARLO EN GCS
-        modelo_entrenado = self.entrenar_modelo_autogluon(
-            df_sf_time, 
-            id_skus = id_skus, 
-            mes_col = mes_col, 
-            val_col = val_col, 
-            prefix_str = prefix_str
-        )
-
-        # GUARDAR MODELO EN GOOGLE CLOUD STORAGE
-        self.guardar_modelo_gcs(current_version_artifact_uri)
-        
-        
-        # CUANDO NO HAY NINGÚN MODELO CON EL NOMBRE INDICADO
-        if not versiones: 
-            # REGISTRAR EL MODELO POR PRIMERA VEZ CUANDO NO HAY NINGÚN MODELO
-            try:
-                model = aiplatform.Model.upload(
-                    display_name = model_name,
-                    artifact_uri = current_version_artifact_uri,
-                    serving_container_image_uri = "gcr.io/deeplearning-platform-release/base-cpu",
-                    is_default_version = True,
-                    version_aliases = version_aliases,
-                    version_description = version_description,
-                    labels = {version_label: version_model},          # útil para filtrar en el registry
-                    sync = True
-                )
-
-                return modelo_entrenado
-            except Exception as e:
-                raise("No se pudo registrar Modelo Por Primera Vez")
-
-        # CUANDO SI HAY MODELO CON EL NOMBRE INDICADO PERO NO VERSIÓN ACTUALIZADA
-        else:
-            # OBTENEMOS EL NOMBRE DEL MODELO PADRE
-            models = list(aiplatform.Model.list(filter=f'display_name="{model_name}"'))
-            parent_model_name = models[0].resource_name if models else None
-            
-            # REGISTRAR LA NUEVA VERSIÓN DEL MODELO ACTUALIZADO AL MES
-            try:
-                model = aiplatform.Model.upload(
-                    display_name = model_name,
-                    artifact_uri = current_version_artifact_uri,
-                    serving_container_image_uri = "gcr.io/deeplearning-platform-release/base-cpu",
-                    parent_model = parent_model_name,
-                    is_default_version = True,
-                    version_aliases = version_aliases,
-                    version_description = version_description,
-                    labels = {version_label: version_model},          # útil para filtrar en el registry
-                    sync = True
-                )
-
-                return modelo_entrenado
-            except Exception as e:
-                raise("No se pudo registrar el Modelo Actualizado")
\ No newline at end of file
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : 04_managemodel
+ARCHIVOS  DESTINO  : ---
+ARCHIVOS  FUENTES  : ---
+OBJETIVO           : Definir procesos para manejar las distintas necesidades de utilizar un modelo de machine learning
+TIPO               : PY
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene procesos para manejar las distintas necesidades de utilizar un modelo de machine learning
+"""
+
+# Librerías Propias
+from classes._08_skuregistry import RegistroSKU
+from classes._09_modelregistry import IndiceRegistroModelos, ProveedorRegistroVertex
+from classes._11_gcstransfer import GestorTransferenciaGCS
+
+# Librerías Básicas
+import logging
+import os
+
+# Librerías para Datos
+import pandas as pd
+import numpy as np
+
+# Librerías para Auto Selección de Modelos
+from autogluon.timeseries import TimeSeriesPredictor
+from autogluon.timeseries import TimeSeriesDataFrame
+
+# VARIABLES DE CALENDARIO CONOCIDAS EN EL FUTURO (SOLO DEPENDEN DEL MES)
+COVARIABLES_CALENDARIO = ["mes", "mes_sin", "mes_cos", "trimestre", "trim_sin", "trim_cos", "semestre", "sem_sin", "sem_cos", "contador_lineal", "contador_cuadratico", "contador_log"]
+
+class GestorModelo:
+    """Clase para la gestión de los procesos que manejan las distintas necesidades de utilizar un modelo de machine learning."""
+
+    def __init__(self, cs_cliente, window, months, temp_path, registro_sku = None, ventanas_adicionales = [], indice_registro = None, cache_artefactos = None, transferencia_gcs = None, metrica_evaluacion = "MAE", tiempo_entrenamiento_maximo = None, configuracion_autogluon = None):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Gestor de Modelo...")
+
+        self.cs_cliente = cs_cliente
+        self.ventana_segmentacion = window
+        self.ventanas_segmentacion_adicional = ventanas_adicionales
+        self.IndiceRegistro = indice_registro if indice_registro is not None else IndiceRegistroModelos(ProveedorRegistroVertex())
+        self.CacheArtefactos = cache_artefactos
+        self.TransferenciaGCS = transferencia_gcs if transferencia_gcs is not None else GestorTransferenciaGCS(cs_cliente)
+        self.num_meses_proyeccion = months
+        self.MODEL_TEMP_PATH = temp_path
+        self.SkuRegistry = registro_sku if registro_sku is not None else RegistroSKU()
+        self.calendarios_covariables = {}
+
+        # CONFIGURACIÓN DEL ENTRENAMIENTO DE AUTOGLUON
+        self.MODELO_AUTOGLUON_METRICA_EVALUACION = metrica_evaluacion
+        self.TIEMPO_ENTRENAMIENTO_MAXIMO = tiempo_entrenamiento_maximo
+        self.CONFIGURACION_AUTOGLUON = configuracion_autogluon
+
+    ###################################################################################
+    # FUNCIÓN PARA VERIFICAR LA EXISTENCIA DEL MODELO BASE Y SU VERSIÓN DE MES ACTUAL
+    ###################################################################################
+    def verificar_modelo(self, model_name, version_label, version_model, project_id, region):
+        """
+        Función para verificar la existencia del modelo base y la versión del mes actual
+        """
+        # BUSCAR LA VERSIÓN DEL MES ACTUAL EN EL ÍNDICE DEL REGISTRO (UNA SOLA LLAMADA DE LISTADO SI NO ESTÁ EN CACHÉ)
+        try:
+            version_del_mes_actual, all_versions = self.IndiceRegistro.buscar_version(model_name, version_label, version_model, project_id, region)
+            return version_del_mes_actual is not None, all_versions
+
+        except Exception as e:
+            raise Exception("Error al intentar validar modelo.") from e
+
+    ###################################################################################
+    # FUNCIÓN PARA DESCARGAR EN EL ENTORNO LOCAL DE CLOUD STORAGE
+    ###################################################################################
+    def descargar_modelo_de_gcs(self, gcs_uri, local_dir, blobs = None):
+        """
+        Función para descargar en el entorno local de Cloud Storage (en paralelo, con reintentos)
+        """
+        if not gcs_uri.startswith("gs://"):
+            raise ValueError(f"Ruta GCS inválida: {gcs_uri}")
+
+        return self.TransferenciaGCS.descargar_prefijo(gcs_uri, local_dir, blobs = blobs)
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER EL MODELO DE LA VERSIÓN ACTUAL
+    ###################################################################################
+    def obtener_modelo(self, model_name, version_label, version_model, project_id, region):
+        """
+        Función para obtener el modelo de la versión del mes actual
+        """
+        LOCAL_MODEL_DIR = "/temp_propio/cemento_chronos_model"
+
+        # OBTENER LA URI DE LA VERSIÓN DEL MES DESDE EL ÍNDICE DEL REGISTRO
+        version_del_mes_actual, _ = self.IndiceRegistro.buscar_version(model_name, version_label, version_model, project_id, region)
+        if version_del_mes_actual is None:
+            raise Exception(f"No existe la versión {version_model} del modelo {model_name}.")
+        version_model_uri = version_del_mes_actual["uri"]
+
+        # SIN CACHÉ DE ARTEFACTOS, DESCARGAR TODO EL PREDICTOR EN LA CARPETA TEMPORAL
+        if self.CacheArtefactos is None:
+            self.descargar_modelo_de_gcs(
+                gcs_uri = version_model_uri,
+                local_dir = self.MODEL_TEMP_PATH
+            )
+            return TimeSeriesPredictor.load(self.MODEL_TEMP_PATH)
+
+        # CON CACHÉ, IDENTIFICAR LOS ARTEFACTOS POR VERSIÓN Y GENERACIÓN / MD5 DE SUS BLOBS
+        bucket_name, prefix = version_model_uri.replace("gs://", "").split("/", 1)
+        blobs = [blob for blob in self.cs_cliente.list_blobs(bucket_name, prefix=prefix) if not blob.name.endswith("/")]
+        huella = self.CacheArtefactos.calcular_huella(version_model, blobs, prefix)
+
+        # DESCARGAR SOLO SI LOS ARTEFACTOS NO ESTÁN EN CACHÉ O CAMBIARON
+        ruta_modelo = self.CacheArtefactos.obtener_ruta(huella)
+        if ruta_modelo is None:
+            logging.info(f"Descargando artefactos del modelo {version_model} a la caché local...")
+            ruta_modelo = self.CacheArtefactos.guardar(
+                huella,
+                version_model,
+                lambda destino: self.descargar_modelo_de_gcs(version_model_uri, destino, blobs = blobs)
+            )
+        else:
+            logging.info(f"Usando artefactos en caché del modelo {version_model}.")
+
+        modelo_autogluon = TimeSeriesPredictor.load(ruta_modelo)
+        return modelo_autogluon
+    
+    ###################################################################################
+    # FUNCIÓN PARA CREAR FEATURES DE TIEMPO QUE CAPTEN CICLOS, PERIODOS, ETC
+    ###################################################################################
+    def crear_time_features(self, data, id_cols, date_col, value_col, num_month = 12, there_is_period = False, motor = "vectorizado"):
+        """
+        Función para crear las variables de lags y promedios móviles de cada SKU.
+        El motor "vectorizado" las calcula todas a la vez sobre la matriz SKU x mes; el motor "pandas" es el cálculo
+        original por columna. Si la columna de valores tiene nulos se usa el motor "pandas".
+        """
+        if motor == "vectorizado" and not data[value_col].isna().any():
+            return self.crear_time_features_vectorizado(data, id_cols, date_col, value_col, num_month, there_is_period)
+
+        df_copy = data.copy()
+
+        # ASEGURAMOS EL ORDEN PARA CREAR VARIABLES DE LAGS DE TIEMPO CORRECTAMENTE
+        df_copy = df_copy.sort_values(by = id_cols + [date_col])
+
+        # CREAR VARIABLES DE LAGS DE TIEMPO
+        for lag in range(1, num_month):
+            df_copy[f'{value_col}_LAG{str(lag)}'] = df_copy.groupby(id_cols)[value_col].shift(lag).interpolate(method='linear').fillna(method='ffill').fillna(method='bfill')
+
+        # CREAR VARIABLES DE PROMEDIO DE VENTANAS DE TIEMPO
+        for window in range(2, num_month):
+            df_copy[f'{value_col}_MEAN{str(window)}'] = df_copy.groupby(id_cols)[value_col].shift(1).rolling(window=window).mean().interpolate(method='linear').fillna(method='ffill').fillna(method='bfill')
+
+        # SEPARAR LA FECHA EN VARIABLES DE MES Y AÑO
+        if there_is_period:
+            df_copy['MES'] = (df_copy[date_col] - pd.DateOffset(months=1)).dt.month.interpolate(method='linear').fillna(method='ffill').fillna(method='bfill')
+            df_copy['ANIO'] = (df_copy[date_col] - pd.DateOffset(months=1)).dt.year.interpolate(method='linear').fillna(method='ffill').fillna(method='bfill')
+
+        return df_copy
+
+    ###################################################################################
+    # FUNCIÓN PARA CREAR FEATURES DE TIEMPO DE FORMA VECTORIZADA
+    ###################################################################################
+    def crear_time_features_vectorizado(self, data, id_cols, date_col, value_col, num_month = 12, there_is_period = False):
+        """
+        Función para crear todas las variables de lags y promedios móviles en un solo paso vectorizado.
+        Cada SKU es una fila de la matriz (una columna por mes, en el orden de sus registros) rellenada a la izquierda con
+        su primer valor, de modo que ningún lag ni promedio mezcla meses de otro SKU. Los lags salen de
+        sliding_window_view y los promedios de sumas acumuladas.
+        """
+        df_copy = data.copy()
+
+        # ASEGURAMOS EL ORDEN PARA CREAR VARIABLES DE LAGS DE TIEMPO CORRECTAMENTE
+        df_copy = df_copy.sort_values(by = id_cols + [date_col])
+        if df_copy.empty:
+            return self.crear_time_features(df_copy, id_cols, date_col, value_col, num_month, there_is_period, motor = "pandas")
+
+        # POSICIÓN DE CADA FILA EN LA MATRIZ SKU X MES
+        agrupado = df_copy.groupby(id_cols, sort = False, dropna = False)
+        fila_sku = agrupado.ngroup().to_numpy()
+        posicion = agrupado.cumcount().to_numpy()
+        valores = df_copy[value_col].to_numpy(dtype = np.float64)
+        num_skus = fila_sku.max() + 1
+        relleno = max(num_month, 1)
+
+        # MATRIZ RELLENADA A LA IZQUIERDA CON EL PRIMER VALOR DE CADA SKU
+        primer_valor = np.zeros(num_skus)
+        primer_valor[fila_sku[posicion == 0]] = valores[posicion == 0]
+        matriz = np.repeat(primer_valor[:, None], relleno + posicion.max() + 1, axis = 1)
+        matriz[fila_sku, relleno + posicion] = valores
+
+        columnas_lags = [f'{value_col}_LAG{str(lag)}' for lag in range(1, num_month)]
+        columnas_medias = [f'{value_col}_MEAN{str(window)}' for window in range(2, num_month)]
+        features = np.empty((len(df_copy), len(columnas_lags) + len(columnas_medias)))
+
+        # VARIABLES DE LAGS DE TIEMPO: VENTANA DE LOS MESES ANTERIORES A CADA FILA (LAG1 ES EL ÚLTIMO DE LA VENTANA)
+        ventanas = np.lib.stride_tricks.sliding_window_view(matriz, relleno, axis = 1)
+        features[:, :len(columnas_lags)] = ventanas[fila_sku, posicion][:, :0:-1][:, :len(columnas_lags)]
+
+        # VARIABLES DE PROMEDIO DE VENTANAS DE TIEMPO: DIFERENCIA DE SUMAS ACUMULADAS
+        acumulado = np.zeros((num_skus, matriz.shape[1] + 1))
+        np.cumsum(matriz, axis = 1, out = acumulado[:, 1:])
+        fin = relleno + posicion
+        for i, window in enumerate(range(2, num_month)):
+            features[:, len(columnas_lags) + i] = (acumulado[fila_sku, fin] - acumulado[fila_sku, fin - window]) / window
+
+        columnas = columnas_lags + columnas_medias
+        df_copy = df_copy.drop(columns = [col for col in columnas if col in df_copy.columns])
+        df_copy = pd.concat([df_copy, pd.DataFrame(features, index = df_copy.index, columns = columnas)], axis = 1)
+
+        # SEPARAR LA FECHA EN VARIABLES DE MES Y AÑO
+        if there_is_period:
+            df_copy['MES'] = (df_copy[date_col] - pd.DateOffset(months=1)).dt.month
+            df_copy['ANIO'] = (df_copy[date_col] - pd.DateOffset(months=1)).dt.year
+
+        return df_copy
+
+    ###################################################################################
+    # FUNCIÓN PARA CONSTRUIR LA TABLA DE COVARIABLES DE CALENDARIO
+    ###################################################################################
+    def construir_calendario_covariables(self, fecha_min, num_meses):
+        """
+        Función para construir la tabla de variables de calendario: una fila por mes desde el mes de fecha_min.
+        Es la única definición de estas variables, compartida por el entrenamiento y el dataframe futuro.
+        """
+        clave = (pd.Timestamp(fecha_min).to_period('M'), num_meses)
+        if clave not in self.calendarios_covariables:
+            calendario = pd.DataFrame({'timestamp': pd.date_range(start = clave[0].to_timestamp(), periods = num_meses, freq = 'MS')})
+
+            # ESTACIONALIDAD MENSUAL (CICLO DE 12 MESES)
+            calendario['mes'] = calendario['timestamp'].dt.month
+            calendario['mes_sin'] = np.sin(2 * np.pi * calendario['mes'] / 12)
+            calendario['mes_cos'] = np.cos(2 * np.pi * calendario['mes'] / 12)
+
+            # ESTACIONALIDAD TRIMESTRAL (CICLO DE 4 TRIMESTRES)
+            calendario['trimestre'] = calendario['timestamp'].dt.quarter
+            calendario['trim_sin'] = np.sin(2 * np.pi * calendario['trimestre'] / 4)
+            calendario['trim_cos'] = np.cos(2 * np.pi * calendario['trimestre'] / 4)
+
+            # ESTACIONALIDAD SEMESTRAL (CICLO DE 2 SEMESTRES)
+            calendario['semestre'] = np.where(calendario['mes'] <= 6, 1, 2)
+            calendario['sem_sin'] = np.sin(2 * np.pi * calendario['semestre'] / 2)
+            calendario['sem_cos'] = np.cos(2 * np.pi * calendario['semestre'] / 2)
+
+            # CONTADOR DE MESES LINEAL, CUADRÁTICO Y LOGARÍTMICO
+            calendario['contador_lineal'] = (
+                (calendario['timestamp'].dt.year - fecha_min.year) * 12 +
+                (calendario['timestamp'].dt.month - fecha_min.month)
+            )
+            calendario['contador_cuadratico'] = calendario['contador_lineal']**2
+            calendario['contador_log'] = np.log1p(calendario['contador_lineal'])
+
+            self.calendarios_covariables[clave] = calendario[COVARIABLES_CALENDARIO]
+
+        return self.calendarios_covariables[clave]
+
+    ###################################################################################
+    # FUNCIÓN PARA AGREGAR LAS COVARIABLES DE CALENDARIO A CADA FILA
+    ###################################################################################
+    def agregar_covariables_calendario(self, df, fecha_min):
+        """
+        Función para agregar a cada fila las variables de calendario de su mes. El código de mes (meses desde fecha_min)
+        es la posición en la tabla de calendario, así que las funciones trigonométricas se calculan una vez por mes.
+        """
+        # CÓDIGO DE MES CALCULADO SOLO SOBRE LAS FECHAS DISTINTAS
+        posicion_fecha, fechas = pd.factorize(df['timestamp'])
+        fechas = pd.DatetimeIndex(fechas)
+        codigo_mes = ((fechas.year - fecha_min.year) * 12 + (fechas.month - fecha_min.month)).to_numpy()[posicion_fecha]
+        calendario = self.construir_calendario_covariables(fecha_min, int(np.max(codigo_mes, initial = -1)) + 1)
+
+        covariables = calendario.take(codigo_mes)
+        covariables.index = df.index
+        return pd.concat([df.drop(columns = [col for col in COVARIABLES_CALENDARIO if col in df.columns]), covariables], axis = 1, copy = False)
+
+    ###################################################################################
+    # FUNCIÓN PARA PREPARAR DATAFRAME COMPATIBLE CON AUTOGLUON
+    ###################################################################################
+    def preparar_para_autogluon(self, df, id_skus, mes_col, val_col, prefix_str, need_dynamic_time_features = False, need_known_time_features = False, need_static_segment_features = False):
+        """
+        Función para preparar dataframe compatible con Autogluon
+        """
+        # ADAPTAR COLUMNAS QUE ENTIENDE LA LIBRERÍA AUTOGLUON PARA ENTRENAR MODELO
+        df['item_id'] = self.SkuRegistry.obtener_item_ids(self.SkuRegistry.codificar(df), id_skus)
+        df[mes_col] = pd.to_datetime(df[mes_col])
+        df = df.rename(columns={
+            mes_col: 'timestamp',
+            val_col: 'target'
+        })
+
+        # DEFINIR VARIABLES ESTÁNDAR, DE LAG Y PROMEDIOS DE VENTANAS DE TIEMPO
+        col_autogluon_ini = ['item_id', 'timestamp', 'target']
+        features_base_num = []
+        if need_dynamic_time_features:
+            features_base_num = features_base_num + [f"{val_col}_LAG{str(i)}" for i in range(1, self.num_meses_proyeccion)]
+            features_base_num = features_base_num + [f"{val_col}_MEAN{str(i)}" for i in range(2, self.num_meses_proyeccion)]
+        
+        # VARIABLES DINÁMICAS EN EL TIEMPO NO CONOCIDAS EN EL FUTURO
+        dynamic_covariates = col_autogluon_ini + features_base_num
+
+        # DEFINIR VARIABLES DESCRIPTIVAS DEL TIEMPO
+        df_ag = df[dynamic_covariates].copy()
+
+        known_covariates = []
+        if need_known_time_features:
+            # VARIABLES CONOCIDAS EN EL FUTURO, TOMADAS DE LA TABLA DE CALENDARIO POR MES
+            df_ag = self.agregar_covariables_calendario(df_ag, df_ag['timestamp'].min())
+            known_covariates = list(COVARIABLES_CALENDARIO)
+
+        df_ag = df_ag.reset_index(drop = True)
+        
+        if need_static_segment_features:
+            # VARIABLES ESTÁTICAS EN EL TIEMPO NO CONOCIDAS EN EL FUTURO
+            ventana_segmentacion_str = str(self.ventana_segmentacion).zfill(2)
+    
+            if not prefix_str:
+                prefix_str = val_col
+
+            abc_col_demanda = f"ABC{prefix_str}{ventana_segmentacion_str}M"
+            xyz_col_demanda = f"XYZ{prefix_str}{ventana_segmentacion_str}M"
+            fsn_col_demanda = f"FSN{prefix_str}{ventana_segmentacion_str}M"
+            static_covariates = [abc_col_demanda, xyz_col_demanda, fsn_col_demanda]
+
+            # AGREGAR LOS SEGMENTOS DE LAS VENTANAS ADICIONALES QUE VENGAN EN EL DATAFRAME
+            for ventana in self.ventanas_segmentacion_adicional:
+                ventana_str = str(ventana).zfill(2)
+                columnas_ventana = [f"ABC{prefix_str}{ventana_str}M", f"XYZ{prefix_str}{ventana_str}M", f"FSN{prefix_str}{ventana_str}M"]
+                static_covariates = static_covariates + [col for col in columnas_ventana if col in df.columns and col not in static_covariates]
+
+            static_covariates_df = df[["item_id"] + static_covariates].drop_duplicates(subset=["item_id"]).reset_index(drop = True)
+
+            # CREAR DATAFRAME DE SERIES DE TIEMPO PARA AUTOGLUON CON VARIABLES ESTÁTICAS
+            df_ts_ag = TimeSeriesDataFrame.from_data_frame(
+                df = df_ag[dynamic_covariates + known_covariates],
+                id_column = "item_id",
+                timestamp_column = "timestamp",
+                static_features_df = static_covariates_df,
+            )
+
+        else:
+            # CREAR DATAFRAME DE SERIES DE TIEMPO PARA AUTOGLUON SIN VARIABLES ESTÁTICAS
+            df_ts_ag = TimeSeriesDataFrame.from_data_frame(
+                df = df_ag[dynamic_covariates + known_covariates],
+                id_column = "item_id",
+                timestamp_column = "timestamp"
+            )
+
+        return df_ts_ag, known_covariates
+
+    ###################################################################################
+    # FUNCIÓN PARA ENTRENAR UN MODELO DE AUTOGLUON
+    ###################################################################################
+    def entrenar_modelo_autogluon(self, df_entrenamiento, id_skus, mes_col, val_col, prefix_str):
+        """
+        Función para entrenar modelo de Autogluon
+        """
+        df = df_entrenamiento.copy()
+
+        # PREPARAR DATAFRAME DE AUTOGLUON COMPATIBLE CON EL ENTRENAMIENTO
+        df_ts_ag, known_covariates = self.preparar_para_autogluon(
+            df, 
+            id_skus = id_skus, 
+            mes_col = mes_col, 
+            val_col = val_col, 
+            prefix_str = prefix_str,
+            need_dynamic_time_features = True, 
+            need_known_time_features = True, 
+            need_static_segment_features = True
+        )
+
+        # SE CONFIGURA EL PREDICTOR
+        predictor_mae_18_time = TimeSeriesPredictor(
+            prediction_length = self.num_meses_proyeccion,
+            label = 'target',
+            eval_metric = self.MODELO_AUTOGLUON_METRICA_EVALUACION,
+            path = self.MODEL_TEMP_PATH,
+            known_covariates_names=known_covariates,
+            quantile_levels = [0.05, 0.25, 0.5, 0.75, 0.95]
+        )
+
+        # SE ENTRENA EL PREDICTOR CON EL DATAFRAME SERIE DE TIEMPO DE AUTOGLUON
+        predictor_mae_18_time.fit(
+            train_data = df_ts_ag,
+            time_limit = self.TIEMPO_ENTRENAMIENTO_MAXIMO,
+            num_val_windows = 12,
+            presets='high_quality',
+            hyperparameters = self.CONFIGURACION_AUTOGLUON,
+            verbosity = 0
+        )
+
+        return predictor_mae_18_time
+    
+    ###################################################################################
+    # FUNCIÓN PARA GUARDAR EL MODELO EN GOOGLE CLOUD STORAGE
+    ###################################################################################
+    def guardar_modelo_gcs(self, gcs_uri):
+        """
+        Función para guardar el modelo en Google Cloud Storage (en paralelo, con reintentos)
+        """
+        return self.TransferenciaGCS.subir_carpeta(self.MODEL_TEMP_PATH, gcs_uri)
+
+    ###################################################################################
+    # FUNCIÓN PARA ACTUALIZAR EL MODELO AL MES ACTUAL
+    ###################################################################################
+    def actualizar_modelo(self, df_entrenamiento, id_skus, mes_col, val_col, prefix_str, versiones, model_name, version_label, version_model, project_id, region, uri_gcs, prefix_gcs):
+        """
+        Función para actualizar el modelo al mes actual
+        """
+        version_aliases = ["last-training", version_model]
+        version_description = f"Modelo Chronos para Cemento - Versión Mensual {version_model}"
+
+        current_version_artifact_uri = os.path.join(uri_gcs, f"{version_model}") + "/"
+
+        # DEFINIR LOS DATOS PARA ENTRENAMIENTO Y AGREGAR VARIABLES DE TIEMPO
+        df_train = df_entrenamiento.copy()
+        df_sf_time = self.crear_time_features(
+            data = df_train,
+            id_cols = id_skus,
+            date_col = mes_col,
+            value_col = val_col,
+            num_month = self.num_meses_proyeccion
+        )      
+
+        # ENTRENAR MODELO DE AUTOGLUON CON LA NUEVA DATA Y GUARDARLO EN GCS
+        modelo_entrenado = self.entrenar_modelo_autogluon(
+            df_sf_time, 
+            id_skus = id_skus, 
+            mes_col = mes_col, 
+            val_col = val_col, 
+            prefix_str = prefix_str
+        )
+
+        # GUARDAR MODELO EN GOOGLE CLOUD STORAGE
+        self.guardar_modelo_gcs(current_version_artifact_uri)
+
+        # REGISTRAR EL MODELO (POR PRIMERA VEZ SI NO HAY VERSIONES) O LA NUEVA VERSIÓN ACTUALIZADA AL MES
+        try:
+            self.IndiceRegistro.registrar_version(
+                model_name,
+                artifact_uri = current_version_artifact_uri,
+                version_label = version_label,
+                version_model = version_model,
+                project_id = project_id,
+                region = region,
+                version_aliases = version_aliases,
+                version_description = version_description
+            )
+        except Exception as e:
+            if not versiones:
+                raise Exception("No se pudo registrar Modelo Por Primera Vez") from e
+            raise Exception("No se pudo registrar el Modelo Actualizado") from e
+
+        return modelo_entrenado
\ No newline at end of file
@@ -1,388 +1,666 @@
-"""_summary_.
-
-PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
-NOMBRE             : 05_forecastmonthly
-ARCHIVOS  DESTINO  : ---
-ARCHIVOS  FUENTES  : ---
-OBJETIVO           : Definir procesos para hacer la proyección mensual
-OBSERVACION        : -
-SCHEDULER          : CLOUD RUN
-VERSION            : 1.0
-DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
-PROVEEDOR          : MINSAIT
-FECHA              : 10/12/2025
-DESCRIPCION        : Paquete que contiene procesos para hacer la proyección mensual
-"""
-
-# Librerías Básicas
-import logging
-
-# Librerías para Datos
-import pandas as pd
-import numpy as np
-
-# Librerías para Auto Selección de Modelos
-from autogluon.timeseries import TimeSeriesDataFrame
-
-class GestorProyeccion:
-    """Clase para gestionar la proyección mensual."""
-
-    def __init__(self, mes_col, months, sales, conf_ag, ml_type, sm_type, m0_type, gestor_modelo):
-        """
-        Inicializa la clase.
-        """
-        logging.info("Inicializando la clase de Gestor de la Proyección...")
-
-        self.COLUMNA_FECHA_CONSUMO_DEMANDA = mes_col
-        self.num_meses_proyeccion = months
-        self.ventana_ventas = sales
-        self.CONFIGURACION_AUTOGLUON_PREDICTOR = conf_ag
-        self.TIPO_MODELO_ML = ml_type
-        self.TIPO_MODELO_SIMPLE = sm_type
-        self.TIPO_MODELO_0 = m0_type
-        self.ModelManager = gestor_modelo
-
-    ###################################################################################
-    # FUNCIÓN PARA CONSTRUIR DATAFRAME CON DATOS CONOCIDOS EN EL FUTURO
-    ###################################################################################
-    def construir_dataframe_futuro(self, df_ag, modelo, known_covariates = [], need_known_time_features = False):
-        """
-        Función para construir el dataframe con datos conocidos en el futuro.
-        """
-        df = df_ag.copy()
-        df = df.reset_index()
-        fecha_min = df['timestamp'].min()
-
-        # OBTENER LOS IDENTIFICADORES DE LOS SKUS PARA DATAFRAME DE VARIABLES CONOCIDAS A FUTURO
-        future_df = modelo.make_future_data_frame(
-            data = df_ag
-        ).reset_index()
-
-        if need_known_time_features:
-            # VARIABLES DE CONOCIMIENTO FUTURO
-            future_df["mes"] = future_df["timestamp"].dt.month
-            future_df["mes_sin"] = np.sin(2*np.pi*future_df["mes"]/12)
-            future_df["mes_cos"] = np.cos(2*np.pi*future_df["mes"]/12)
-            future_df["trimestre"] = future_df["timestamp"].dt.quarter
-            future_df["trim_sin"] = np.sin(2*np.pi*future_df["trimestre"]/4)
-            future_df["trim_cos"] = np.cos(2*np.pi*future_df["trimestre"]/4)
-            future_df["semestre"] = np.where(future_df["mes"] <= 6, 1, 2)
-            future_df["sem_sin"] = np.sin(2*np.pi*future_df["semestre"]/2)
-            future_df["sem_cos"] = np.cos(2*np.pi*future_df["semestre"]/2)
-            future_df["contador_lineal"] = ((future_df["timestamp"].dt.year - fecha_min.year)*12 + (future_df["timestamp"].dt.month - fecha_min.month))
-            future_df["contador_cuadratico"] = future_df["contador_lineal"]**2
-            future_df["contador_log"] = np.log1p(future_df["contador_lineal"])
-
-        # CREAR DATAFRAME DE LAS VARIABLES CONOCIDAS EN EL FUTURO
-        df_future = TimeSeriesDataFrame.from_data_frame(
-            df = future_df[["item_id","timestamp"] + known_covariates],
-            id_column = "item_id",
-            timestamp_column = "timestamp",
-        )
-
-        return df_future
-
-    ###################################################################################
-    # FUNCIÓN PARA CONSTRUIR EL DATAFRAME DE PROYECCIÓN
-    ###################################################################################
-    def construir_dataframe_proyeccion(self, predicciones, df_train, df_proyectables, df_conocidos_activos, df_conocidos_inactivos, df_desconocidos, id_skus, mes_col, val_col, tipo_modelo, tiene_ventas = None, es_proyectable = None, es_conocido = None, es_activo = None):
-        """
-        Función para proyectar la demanda los próximos meses, aplicando modelo y sin aplicarlo, según cada sku.
-        """
-        if hasattr(predicciones, 'to_pandas'):
-            predicciones = predicciones.to_pandas()
-
-        df_o = df_train.copy()
-        df_p = df_proyectables.copy()
-        df_con_act = df_conocidos_activos.copy()
-        df_con_ina = df_conocidos_inactivos.copy()
-        df_des = df_desconocidos.copy()
-
-        predicciones["CLASIFICACION"] = self.clase_producto
-        split_data = predicciones['item_id'].str.split('_', expand = True)
-        split_data.columns = id_skus
-        predicciones = pd.concat([predicciones, split_data], axis = 1)
-        predicciones[self.COLUMNA_FECHA_CONSUMO_DEMANDA] = pd.to_datetime(predicciones["timestamp"])
-        nuevas_columnas_riesgos = ["CTDCONSUMORIESGO05", "CTDCONSUMORIESGO25", "CTDCONSUMORIESGO50", "CTDCONSUMORIESGO75", "CTDCONSUMORIESGO95"]
-        nuevas_columnas_riesgos_dict = {
-            "CTDCONSUMORIESGO05": '0.05',
-            "CTDCONSUMORIESGO25": '0.25',
-            "CTDCONSUMORIESGO50": '0.5',
-            "CTDCONSUMORIESGO75": '0.75',
-            "CTDCONSUMORIESGO95": '0.95'
-        }
-        for nueva_columna_riesgo in nuevas_columnas_riesgos:
-            predicciones[nueva_columna_riesgo] = np.round(predicciones[nuevas_columnas_riesgos_dict[nueva_columna_riesgo]].apply(lambda x: np.maximum(0, x))).astype(np.int64)
-
-        df_p_sp = pd.DataFrame(predicciones[["CLASIFICACION"] + id_skus + [self.COLUMNA_FECHA_CONSUMO_DEMANDA] + nuevas_columnas_riesgos].copy())
-        df_p_sp["TIPOMODELOPROYECCION"] = tipo_modelo
-        
-        df_p_sp['item_id'] = df_p_sp[id_skus].astype(str).agg('_'.join, axis=1)
-        if tiene_ventas is not None:
-            df_p_sp["SKUCONVENTAS"] = tiene_ventas
-        else:
-            df_o = df_o.reset_index()
-            if 'timestamp' not in df_o.columns:
-                df_o['timestamp'] = df_o[mes_col]
-                df_o['target'] = df_o[val_col]
-            fecha_actual = df_o['timestamp'].max()
-            fecha_anterior = fecha_actual - pd.DateOffset(months=(self.ventana_ventas-1))
-
-            tiene_ventas_recientes = df_o.groupby('item_id').apply(lambda x:
-                ((x['timestamp'] > fecha_anterior) & (x['target'] > 0)).any()
-            )
-            df_p_sp['SKUCONVENTAS'] = df_p_sp['item_id'].map(tiene_ventas_recientes)
-            df_p_sp['SKUCONVENTAS'] = df_p_sp['SKUCONVENTAS'].fillna(False)
-
-        if es_proyectable is not None:
-            df_p_sp["SKUPROYECTABLE"] = es_proyectable
-        else:
-            skus_proyectables = df_p['item_id'].unique()
-            df_p_sp['SKUPROYECTABLE'] = df_p_sp['item_id'].isin(skus_proyectables)
-
-        if es_conocido is not None:
-            df_p_sp["SKUCONOCIDO"] = es_conocido
-        else:
-            df_con_act['item_id'] = df_con_act[id_skus].astype(str).agg('_'.join, axis=1)
-            df_con_ina['item_id'] = df_con_ina[id_skus].astype(str).agg('_'.join, axis=1)
-            skus_conocidos_activos = df_con_act['item_id'].unique()
-            skus_conocidos_inactivos = df_con_ina['item_id'].unique()
-            skus_conocidos = set(skus_conocidos_activos) | set(skus_conocidos_inactivos)
-            df_p_sp['SKUCONOCIDO'] = df_p_sp['item_id'].isin(skus_conocidos)
-        
-        if es_activo is not None:
-            df_p_sp["SKUACTIVO"] = es_activo
-        else:
-            df_con_act['item_id'] = df_con_act[id_skus].astype(str).agg('_'.join, axis=1)
-            df_des['item_id'] = df_des[id_skus].astype(str).agg('_'.join, axis=1)
-            skus_conocidos_activos = df_con_act['item_id'].unique()
-            skus_desconocidos = df_des['item_id'].unique()
-            skus_activos = set(skus_conocidos_activos) | set(skus_desconocidos)
-            df_p_sp['SKUACTIVO'] = df_p_sp['item_id'].isin(skus_activos)
-
-        df_p_sp = df_p_sp.drop(columns=['item_id'])
-        return df_p_sp
-
-    ###################################################################################
-    # FUNCIÓN PARA OBTENER LOS SKUS CON VENTAS
-    ###################################################################################
-    def obtener_skus_con_ventas(self, df_pre, id_skus, mes_col, val_col):
-        """
-        Función para obtener dataframes con skus con ventas y sin ventas
-        """
-        df = df_pre.copy()
-        fecha_actual = df[mes_col].max()
-        fecha_anterior = fecha_actual - pd.DateOffset(months=(self.ventana_ventas-1))
-
-        df = df.reset_index()
-        if 'timestamp' not in df.columns:
-            df['timestamp'] = df[mes_col]
-            df['target'] = df[val_col]
-        df['item_id'] = df[id_skus].astype(str).agg('_'.join, axis=1)
-        tiene_ventas_recientes = df.groupby('item_id').apply(lambda x:
-            ((x['timestamp'] > fecha_anterior) & (x['target'] > 0)).any()
-        )
-        df['SKUCONVENTASTEMPORAL'] = df['item_id'].map(tiene_ventas_recientes)
-        df['SKUCONVENTASTEMPORAL'] = df['SKUCONVENTASTEMPORAL'].fillna(False)
-
-        df_con_ventas = df[df["SKUCONVENTASTEMPORAL"] == True]
-        df_sin_ventas = df[df["SKUCONVENTASTEMPORAL"] == False]
-        df_con_ventas = df_con_ventas.drop(columns=['item_id', 'SKUCONVENTASTEMPORAL'])
-        df_sin_ventas = df_sin_ventas.drop(columns=['item_id', 'SKUCONVENTASTEMPORAL'])
-
-        return df_con_ventas, df_sin_ventas
-
-    ###################################################################################
-    # FUNCIÓN PARA HACER PROYECCIONES SIMPLES DE DEMANDA
-    ###################################################################################
-    def proyectar_demanda_simple(self, df_simple, id_skus, mes_col, val_col, algoritmo = "Media_Movil"):
-        """
-        Función para hacer proyecciones simples de demanda
-        """
-        df = df_simple.copy()
-        df['item_id'] = df[id_skus].astype(str).agg('_'.join, axis=1)
-
-        fecha_final = df[mes_col].max()
-        unique_item_ids = df['item_id'].unique()
-
-        # GENERAR LAS 18 FECHAS FUTURAS
-        future_dates = pd.date_range(
-            start = fecha_final + pd.DateOffset(months = 1),
-            periods = self.num_meses_proyeccion,
-            freq = 'MS'
-        )
-
-        if algoritmo == "Media_Movil":
-            projection_movil_recursive_data = []
-
-            for item_id_val in unique_item_ids:
-                # DATOS HISTÓRICOS PARA EL PRESENTE SKU
-                sku_historical_data = df[df['item_id'] == item_id_val].set_index(mes_col).sort_index()
-                current_rolling_values = list(sku_historical_data[val_col].tail(self.ventana_ventas).values)
-
-                for pred_date in future_dates:
-                    # PROMEDIAR LA VENTANA
-                    if current_rolling_values:
-                        projected_value = np.mean(current_rolling_values).round().astype(int)
-                    else:
-                        projected_value = 0
-
-                    # ASEGURAR QUE LAS PROYECCIONES NO SEAN NEGATIVAS
-                    projected_value = max(0, projected_value)
-
-                    projection_movil_recursive_data.append({
-                        'item_id': item_id_val,
-                        mes_col: pred_date,
-                        'mean': projected_value
-                    })
-
-                    # ACTUALIZAR LA VENTANA CON EL NUEVO VALOR PROYECTADO
-                    current_rolling_values.pop(0)
-                    current_rolling_values.append(projected_value)
-
-            df_proyeccion_movil_recursiva = pd.DataFrame(projection_movil_recursive_data)
-            df_proyeccion_movil_recursiva['0.05'] = df_proyeccion_movil_recursiva['mean']
-            df_proyeccion_movil_recursiva['0.25'] = df_proyeccion_movil_recursiva['mean']
-            df_proyeccion_movil_recursiva['0.5'] = df_proyeccion_movil_recursiva['mean']
-            df_proyeccion_movil_recursiva['0.75'] = df_proyeccion_movil_recursiva['mean']
-            df_proyeccion_movil_recursiva['0.95'] = df_proyeccion_movil_recursiva['mean']
-            df_proyeccion_movil_recursiva['timestamp'] = df_proyeccion_movil_recursiva[mes_col]
-            df_proyeccion_simple = df_proyeccion_movil_recursiva.copy()
-
-        elif algoritmo == "Zero":
-            projection_cero_data = []
-
-            for item_id_val in unique_item_ids:
-                for pred_date in future_dates:
-                    projection_cero_data.append({
-                        'item_id': item_id_val,
-                        mes_col: pred_date,
-                        'mean': 0
-                    })
-
-            df_proyeccion_cero = pd.DataFrame(projection_cero_data)
-            df_proyeccion_cero['0.05'] = df_proyeccion_cero['mean']
-            df_proyeccion_cero['0.25'] = df_proyeccion_cero['mean']
-            df_proyeccion_cero['0.5'] = df_proyeccion_cero['mean']
-            df_proyeccion_cero['0.75'] = df_proyeccion_cero['mean']
-            df_proyeccion_cero['0.95'] = df_proyeccion_cero['mean']
-            df_proyeccion_cero['timestamp'] = df_proyeccion_cero[mes_col]
-            df_proyeccion_simple = df_proyeccion_cero.copy()
-
-        return df_proyeccion_simple
-        
-    ###################################################################################
-    # FUNCIÓN PARA PROYECTAR LOS PRÓXIMOS MESES DE DEMANDA
-    ###################################################################################
-    def proyectar_demanda(self, df_proyectable, df_no_proyectable, df_conocidos_activos, df_conocidos_inactivos, df_desconocidos, id_skus, mes_col, val_col, modelo):
-        """
-        Función para proyectar la demanda los próximos meses, aplicando modelo y sin aplicarlo, según cada sku.
-        """
-        if not df_proyectable.empty:
-            df_proyectable_time = self.ModelManager.crear_time_features(
-                data = df_proyectable,
-                id_cols = id_skus,
-                date_col = mes_col,
-                value_col = val_col,
-                num_month = self.num_meses_proyeccion
-            )
-            
-            # UTILIZAR MODELO PARA HALLAR PROYECCIÓN DEL DATAFRAME DE SKUS PROYECTABLES
-            df_ts_ag_p, known_covariates = self.ModelManager.preparar_para_autogluon(
-                df_proyectable_time,
-                id_skus = id_skus,
-                mes_col = mes_col,
-                val_col = val_col,
-                need_dynamic_time_features = True,
-                need_known_time_features = True,
-                need_static_segment_features = True
-            )
-
-            df_known_cov_future = self.construir_dataframe_futuro(
-                df_ts_ag_p, 
-                modelo = modelo,
-                known_covariates = known_covariates,
-                need_known_time_features = True
-            )
-
-            try:
-                predicciones = modelo.predict(
-                    data = df_ts_ag_p,
-                    model = self.CONFIGURACION_AUTOGLUON_PREDICTOR,
-                    known_covariates = df_known_cov_future
-                ).reset_index()
-            except:
-                try:
-                    predicciones = modelo.predict(
-                        data = df_ts_ag_p,
-                        known_covariates = df_known_cov_future
-                    ).reset_index()
-                except Exception as E:
-                    raise("NO SE PUEDE REALIZAR PREDICCIÓN", E)
-
-            df_p_sp = self.construir_dataframe_proyeccion(
-                predicciones, 
-                df_ts_ag_p,
-                df_proyectable,
-                df_conocidos_activos,
-                df_conocidos_inactivos, 
-                df_desconocidos,
-                id_skus = id_skus,
-                mes_col = mes_col,
-                val_col = val_col,
-                tipo_modelo = self.TIPO_MODELO_ML,
-                tiene_ventas = None,
-                es_proyectable = True,
-                es_conocido = None,
-                es_activo = True
-            )
-
-        if not df_no_proyectable.empty:
-            # SEPARAR LOS NO PROYECTABLES EN 'CON VENTAS' Y 'SIN VENTAS' EN EL ÚLTIMO AÑO
-            df_cv, df_sv = self.obtener_skus_con_ventas(df_no_proyectable, id_skus, mes_col, val_col)
-
-            # HACER UNA PROYECCIÓN SIMPLE PARA SKUS NO ROTATIVOS CON VENTAS
-            pred_cv = self.proyectar_demanda_simple(df_cv, id_skus, mes_col, val_col, algoritmo = "Media_Movil")
-            df_p_np_cv = self.construir_dataframe_proyeccion(
-                pred_cv, 
-                df_cv,
-                df_proyectable,
-                df_conocidos_activos,
-                df_conocidos_inactivos, 
-                df_desconocidos,
-                id_skus = id_skus,
-                mes_col = mes_col,
-                val_col = val_col,
-                tipo_modelo = self.TIPO_MODELO_SIMPLE,
-                tiene_ventas = True,
-                es_proyectable = False,
-                es_conocido = None,
-                es_activo = True
-            )
-
-            # HACER UNA PROYECCIÓN A 0 PARA SKUS NO ROTATIVOS SIN VENTAS
-            pred_sv = self.proyectar_demanda_simple(df_cv, id_skus, mes_col, val_col, algoritmo = "Zero")
-            df_p_np_sv = self.construir_dataframe_proyeccion(
-                pred_sv, 
-                df_sv,
-                df_proyectable,
-                df_conocidos_activos,
-                df_conocidos_inactivos, 
-                df_desconocidos,
-                id_skus = id_skus,
-                mes_col = mes_col,
-                val_col = val_col,
-                tipo_modelo = self.TIPO_MODELO_0,
-                tiene_ventas = False,
-                es_proyectable = False,
-                es_conocido = None,
-                es_activo = True
-            )
-
-        if not df_proyectable.empty and not df_no_proyectable.empty:
-            df_proyeccion_concatenado = pd.concat([df_p_sp, df_p_np_cv, df_p_np_sv])
-        elif not df_proyectable.empty:
-            df_proyeccion_concatenado = df_p_sp
-        elif not df_no_proyectable.empty:
-            df_proyeccion_concatenado = pd.concat([df_p_np_cv, df_p_np_sv])
-        return df_proyeccion_concatenado
\ No newline at end of file
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : 05_forecastmonthly
+ARCHIVOS  DESTINO  : ---
+ARCHIVOS  FUENTES  : ---
+OBJETIVO           : Definir procesos para hacer la proyección mensual
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene procesos para hacer la proyección mensual
+"""
+
+# Librerías Propias
+from classes._08_skuregistry import RegistroSKU
+from utils.utils import obtener_limite_cpu
+
+# Librerías Básicas
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import multiprocessing
+import logging
+
+# Librerías para Datos
+import pandas as pd
+import numpy as np
+
+# Librerías para Auto Selección de Modelos
+from autogluon.timeseries import TimeSeriesPredictor
+from autogluon.timeseries import TimeSeriesDataFrame
+import torch
+
+# COLUMNAS DE CANTIDAD DE RIESGO Y EL CUANTIL DE PREDICCIÓN DEL QUE SALE CADA UNA
+COLUMNAS_RIESGO = {
+    "CTDCONSUMORIESGO05": '0.05',
+    "CTDCONSUMORIESGO25": '0.25',
+    "CTDCONSUMORIESGO50": '0.5',
+    "CTDCONSUMORIESGO75": '0.75',
+    "CTDCONSUMORIESGO95": '0.95'
+}
+
+# PREDICTOR CARGADO UNA SOLA VEZ EN CADA PROCESO DEL POOL DE INFERENCIA
+MODELO_PROCESO = None
+
+###################################################################################
+# FUNCIÓN PARA CARGAR EL PREDICTOR EN UN PROCESO DEL POOL DE INFERENCIA
+###################################################################################
+def inicializar_proceso_inferencia(ruta_modelo, hilos):
+    """
+    Función para cargar el predictor desde disco al iniciar cada proceso del pool de inferencia, limitando los hilos
+    de torch para que los procesos no compitan por las mismas CPUs.
+    """
+    global MODELO_PROCESO
+    torch.set_num_threads(hilos)
+    MODELO_PROCESO = TimeSeriesPredictor.load(ruta_modelo)
+
+###################################################################################
+# FUNCIÓN PARA PREDECIR CON EL MODELO CONFIGURADO (O EL MEJOR SI NO SE PUEDE)
+###################################################################################
+def predecir_con_modelo(modelo, datos, covariables, nombre_modelo):
+    """
+    Función para predecir con el modelo configurado; si falla, se predice con el mejor modelo del predictor.
+    """
+    try:
+        return modelo.predict(data = datos, model = nombre_modelo, known_covariates = covariables)
+    except Exception as e:
+        logging.warning(f"No se pudo predecir con {nombre_modelo} ({e}); se usa el mejor modelo del predictor.")
+        return modelo.predict(data = datos, known_covariates = covariables)
+
+###################################################################################
+# FUNCIÓN PARA PREDECIR UN LOTE DE SKUS EN UN PROCESO DEL POOL DE INFERENCIA
+###################################################################################
+def predecir_lote_en_proceso(datos, covariables, nombre_modelo):
+    """
+    Función para predecir un lote de SKUs con el predictor cargado en el proceso del pool de inferencia.
+    """
+    return predecir_con_modelo(MODELO_PROCESO, datos, covariables, nombre_modelo)
+
+class GestorProyeccion:
+    """Clase para gestionar la proyección mensual."""
+
+    def __init__(self, mes_col, months, sales, conf_ag, ml_type, sm_type, m0_type, gestor_modelo, clase_producto = None, registro_sku = None, tamano_lote_inferencia = 0, procesos_inferencia = 1):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Gestor de la Proyección...")
+
+        self.COLUMNA_FECHA_CONSUMO_DEMANDA = mes_col
+        self.num_meses_proyeccion = months
+        self.ventana_ventas = sales
+        self.CONFIGURACION_AUTOGLUON_PREDICTOR = conf_ag
+        self.TIPO_MODELO_ML = ml_type
+        self.TIPO_MODELO_SIMPLE = sm_type
+        self.TIPO_MODELO_0 = m0_type
+        self.ModelManager = gestor_modelo
+        self.clase_producto = clase_producto
+        self.SkuRegistry = registro_sku if registro_sku is not None else RegistroSKU()
+
+        # INFERENCIA POR LOTES: SKUS POR LOTE (0 = UNA SOLA LLAMADA) Y PROCESOS (1 = EN EL PROCESO PRINCIPAL). CADA
+        # PROCESO CARGA SU PROPIA COPIA DEL PREDICTOR, POR LO QUE LA MEMORIA CRECE CON EL NÚMERO DE PROCESOS
+        self.tamano_lote_inferencia = tamano_lote_inferencia
+        self.procesos_inferencia = max(1, procesos_inferencia)
+        self.pool_inferencia = None
+        self.clave_pool_inferencia = None
+
+    ###################################################################################
+    # FUNCIÓN PARA CONSTRUIR DATAFRAME CON DATOS CONOCIDOS EN EL FUTURO
+    ###################################################################################
+    def construir_dataframe_futuro(self, df_ag, modelo, known_covariates = [], need_known_time_features = False):
+        """
+        Función para construir el dataframe con datos conocidos en el futuro.
+        """
+        fecha_min = df_ag.index.get_level_values('timestamp').min()
+
+        # OBTENER LOS IDENTIFICADORES DE LOS SKUS PARA DATAFRAME DE VARIABLES CONOCIDAS A FUTURO
+        future_df = modelo.make_future_data_frame(
+            data = df_ag
+        ).reset_index()
+
+        if need_known_time_features:
+            # VARIABLES DE CONOCIMIENTO FUTURO (MISMA TABLA DE CALENDARIO QUE EN EL ENTRENAMIENTO)
+            future_df = self.ModelManager.agregar_covariables_calendario(future_df, fecha_min)
+
+        # CREAR DATAFRAME DE LAS VARIABLES CONOCIDAS EN EL FUTURO
+        df_future = TimeSeriesDataFrame.from_data_frame(
+            df = future_df[["item_id","timestamp"] + known_covariates],
+            id_column = "item_id",
+            timestamp_column = "timestamp",
+        )
+
+        return df_future
+
+    ###################################################################################
+    # FUNCIÓN PARA LLEVAR LAS PREDICCIONES A LLAVES DE SKU Y CANTIDADES ENTERAS
+    ###################################################################################
+    def postprocesar_predicciones(self, predicciones, id_skus):
+        """
+        Función para llevar las predicciones (item_id, timestamp, cuantiles) a las columnas llave del SKU y a las cinco
+        cantidades de riesgo. Las llaves salen de la tabla del registro de SKUs (el item_id no se parte por el separador,
+        que puede aparecer dentro de un código) y los cinco cuantiles se recortan en 0 y se redondean a int64 en una sola
+        operación sobre el bloque 2-D. Devuelve el dataframe y el código de SKU de cada fila.
+        """
+        codigos = self.SkuRegistry.codificar_item_ids(predicciones['item_id'], id_skus)
+        if (codigos < 0).any():
+            desconocidos = pd.unique(predicciones['item_id'].to_numpy()[codigos < 0])
+            raise ValueError(f"Hay item_id de predicción que no están en el registro de SKUs: {list(desconocidos[:5])}")
+
+        # CUANTILES NO NEGATIVOS Y REDONDEADOS A ENTERO
+        cuantiles = predicciones[list(COLUMNAS_RIESGO.values())].to_numpy(dtype = np.float64)
+        if np.isnan(cuantiles).any():
+            raise ValueError("Hay cuantiles nulos en las predicciones.")
+        riesgos = np.rint(np.maximum(cuantiles, 0)).astype(np.int64)
+
+        df_p_sp = self.SkuRegistry.decodificar(codigos)[id_skus]
+        df_p_sp.index = predicciones.index
+        df_p_sp.insert(0, "CLASIFICACION", self.clase_producto)
+        df_p_sp[self.COLUMNA_FECHA_CONSUMO_DEMANDA] = pd.to_datetime(predicciones["timestamp"])
+        df_p_sp = pd.concat([df_p_sp, pd.DataFrame(riesgos, columns = list(COLUMNAS_RIESGO.keys()), index = predicciones.index)], axis = 1)
+
+        return df_p_sp, codigos
+
+    ###################################################################################
+    # FUNCIÓN PARA CONSTRUIR EL DATAFRAME DE PROYECCIÓN
+    ###################################################################################
+    def construir_dataframe_proyeccion(self, predicciones, df_train, df_proyectables, df_conocidos_activos, df_conocidos_inactivos, df_desconocidos, id_skus, mes_col, val_col, tipo_modelo, tiene_ventas = None, es_proyectable = None, es_conocido = None, es_activo = None):
+        """
+        Función para proyectar la demanda los próximos meses, aplicando modelo y sin aplicarlo, según cada sku.
+        """
+        if hasattr(predicciones, 'to_pandas'):
+            predicciones = predicciones.to_pandas()
+
+        # LOS DATAFRAMES DE ENTRADA SOLO SE LEEN, NO SE COPIAN
+        df_p = df_proyectables
+        df_con_act = df_conocidos_activos
+        df_con_ina = df_conocidos_inactivos
+        df_des = df_desconocidos
+
+        df_p_sp, codigos_p_sp = self.postprocesar_predicciones(predicciones, id_skus)
+        df_p_sp["TIPOMODELOPROYECCION"] = tipo_modelo
+
+        if tiene_ventas is not None:
+            df_p_sp["SKUCONVENTAS"] = tiene_ventas
+        else:
+            df_o = df_train.reset_index()
+            if 'timestamp' in df_o.columns:
+                codigos_o = self.SkuRegistry.codificar_item_ids(df_o['item_id'], id_skus)
+                con_ventas = self.calcular_ventas_recientes(codigos_o, df_o['timestamp'], df_o['target'])
+            else:
+                codigos_o = self.SkuRegistry.codificar(df_o, registrar = False)
+                con_ventas = self.calcular_ventas_recientes(codigos_o, df_o[mes_col], df_o[val_col])
+
+            df_p_sp['SKUCONVENTAS'] = con_ventas[codigos_p_sp]
+
+        if es_proyectable is not None:
+            df_p_sp["SKUPROYECTABLE"] = es_proyectable
+        else:
+            df_p_sp['SKUPROYECTABLE'] = np.isin(codigos_p_sp, self.SkuRegistry.codificar(df_p))
+
+        if es_conocido is not None:
+            df_p_sp["SKUCONOCIDO"] = es_conocido
+        else:
+            skus_conocidos = np.concatenate([self.SkuRegistry.codificar(df_con_act), self.SkuRegistry.codificar(df_con_ina)])
+            df_p_sp['SKUCONOCIDO'] = np.isin(codigos_p_sp, skus_conocidos)
+        
+        if es_activo is not None:
+            df_p_sp["SKUACTIVO"] = es_activo
+        else:
+            skus_activos = np.concatenate([self.SkuRegistry.codificar(df_con_act), self.SkuRegistry.codificar(df_des)])
+            df_p_sp['SKUACTIVO'] = np.isin(codigos_p_sp, skus_activos)
+
+        return df_p_sp
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER LOS SKUS CON VENTAS
+    ###################################################################################
+    def obtener_skus_con_ventas(self, df_pre, id_skus, mes_col, val_col):
+        """
+        Función para obtener dataframes con skus con ventas y sin ventas
+        """
+        df = df_pre.reset_index()
+        fecha_col, valor_col = ('timestamp', 'target') if 'timestamp' in df.columns else (mes_col, val_col)
+
+        # MARCA DE VENTAS RECIENTES POR SKU, LLEVADA A CADA FILA CON SU CÓDIGO
+        codigos = self.SkuRegistry.codificar(df)
+        con_ventas = self.calcular_ventas_recientes(codigos, df[fecha_col], df[valor_col])
+        fila_con_ventas = con_ventas[codigos]
+
+        df_con_ventas = df[fila_con_ventas]
+        df_sin_ventas = df[~fila_con_ventas]
+
+        return df_con_ventas, df_sin_ventas
+
+    ###################################################################################
+    # FUNCIÓN PARA MARCAR LOS SKUS CON VENTAS EN LOS ÚLTIMOS MESES
+    ###################################################################################
+    def calcular_ventas_recientes(self, codigos, fechas, valores):
+        """
+        Función para marcar los SKUs con alguna venta (> 0) posterior a (último mes - ventana_ventas + 1 meses), es
+        decir, con ventas en los últimos ventana_ventas meses. Se calcula con una máscara booleana y un bincount sobre los
+        códigos de SKU, sin recorrer los SKUs. Devuelve un arreglo booleano indexado por código de SKU.
+        """
+        codigos = np.asarray(codigos)
+        fechas = pd.to_datetime(fechas)
+        if len(codigos) == 0:
+            return np.zeros(len(self.SkuRegistry), dtype = bool)
+
+        fecha_anterior = fechas.max() - pd.DateOffset(months = (self.ventana_ventas - 1))
+        venta_reciente = (fechas > fecha_anterior).to_numpy() & (pd.Series(valores).to_numpy() > 0)
+
+        # LOS CÓDIGOS -1 (SKUS NO REGISTRADOS) NO CUENTAN
+        validos = codigos >= 0
+        return np.bincount(codigos[validos], weights = venta_reciente[validos], minlength = len(self.SkuRegistry)) > 0
+
+    ###################################################################################
+    # FUNCIÓN PARA HACER PROYECCIONES SIMPLES DE DEMANDA
+    ###################################################################################
+    def proyectar_demanda_simple(self, df_simple, id_skus, mes_col, val_col, algoritmo = "Media_Movil", motor = "vectorizado", fecha_final = None):
+        """
+        Función para hacer proyecciones simples de demanda (desde el mes siguiente a fecha_final, por defecto el último
+        mes de df_simple).
+        Para la media móvil, el motor "vectorizado" proyecta todos los SKUs a la vez sobre una matriz SKU x ventana;
+        el motor "pandas" es el cálculo original SKU por SKU.
+        """
+        df = df_simple.copy()
+        df['_codigo_sku'] = self.SkuRegistry.codificar(df)
+
+        if fecha_final is None:
+            fecha_final = df[mes_col].max()
+        codigos_unicos = df['_codigo_sku'].unique()
+        unique_item_ids = self.SkuRegistry.obtener_item_ids(codigos_unicos, id_skus)
+
+        # GENERAR LAS 18 FECHAS FUTURAS
+        future_dates = pd.date_range(
+            start = fecha_final + pd.DateOffset(months = 1),
+            periods = self.num_meses_proyeccion,
+            freq = 'MS'
+        )
+
+        if algoritmo == "Media_Movil" and motor == "vectorizado":
+            proyecciones = self.proyectar_media_movil_vectorizada(df, mes_col, val_col, codigos_unicos)
+
+            df_proyeccion_movil_recursiva = pd.DataFrame({
+                'item_id': np.repeat(unique_item_ids, len(future_dates)),
+                mes_col: np.tile(future_dates, len(codigos_unicos)),
+                'mean': proyecciones.ravel()
+            })
+            for quantile in ['0.05', '0.25', '0.5', '0.75', '0.95']:
+                df_proyeccion_movil_recursiva[quantile] = df_proyeccion_movil_recursiva['mean']
+            df_proyeccion_movil_recursiva['timestamp'] = df_proyeccion_movil_recursiva[mes_col]
+            df_proyeccion_simple = df_proyeccion_movil_recursiva.copy()
+
+        elif algoritmo == "Media_Movil":
+            projection_movil_recursive_data = []
+
+            for codigo_sku, item_id_val in zip(codigos_unicos, unique_item_ids):
+                # DATOS HISTÓRICOS PARA EL PRESENTE SKU
+                sku_historical_data = df[df['_codigo_sku'] == codigo_sku].set_index(mes_col).sort_index()
+                current_rolling_values = list(sku_historical_data[val_col].tail(self.ventana_ventas).values)
+
+                for pred_date in future_dates:
+                    # PROMEDIAR LA VENTANA
+                    if current_rolling_values:
+                        projected_value = np.mean(current_rolling_values).round().astype(int)
+                    else:
+                        projected_value = 0
+
+                    # ASEGURAR QUE LAS PROYECCIONES NO SEAN NEGATIVAS
+                    projected_value = max(0, projected_value)
+
+                    projection_movil_recursive_data.append({
+                        'item_id': item_id_val,
+                        mes_col: pred_date,
+                        'mean': projected_value
+                    })
+
+                    # ACTUALIZAR LA VENTANA CON EL NUEVO VALOR PROYECTADO
+                    current_rolling_values.pop(0)
+                    current_rolling_values.append(projected_value)
+
+            df_proyeccion_movil_recursiva = pd.DataFrame(projection_movil_recursive_data)
+            df_proyeccion_movil_recursiva['0.05'] = df_proyeccion_movil_recursiva['mean']
+            df_proyeccion_movil_recursiva['0.25'] = df_proyeccion_movil_recursiva['mean']
+            df_proyeccion_movil_recursiva['0.5'] = df_proyeccion_movil_recursiva['mean']
+            df_proyeccion_movil_recursiva['0.75'] = df_proyeccion_movil_recursiva['mean']
+            df_proyeccion_movil_recursiva['0.95'] = df_proyeccion_movil_recursiva['mean']
+            df_proyeccion_movil_recursiva['timestamp'] = df_proyeccion_movil_recursiva[mes_col]
+            df_proyeccion_simple = df_proyeccion_movil_recursiva.copy()
+
+        elif algoritmo == "Zero":
+            df_proyeccion_simple = self.generar_proyeccion_cero(unique_item_ids, future_dates, mes_col)
+
+        return df_proyeccion_simple
+        
+    ###################################################################################
+    # FUNCIÓN PARA GENERAR LA PROYECCIÓN EN CERO DE UNA LISTA DE SKUS
+    ###################################################################################
+    def generar_proyeccion_cero(self, item_ids, future_dates, mes_col):
+        """
+        Función para generar la proyección en cero (SKU x fechas futuras) directamente desde los arreglos. La media y los
+        cuantiles salen de un solo bloque de ceros (una columna propia y escribible para cada uno), sin copias al
+        construir el dataframe.
+        """
+        num_filas = len(item_ids) * len(future_dates)
+        nombres_ceros = ['mean', '0.05', '0.25', '0.5', '0.75', '0.95']
+        ceros = np.zeros((len(nombres_ceros), num_filas), dtype = np.int64)
+        fechas = future_dates.to_numpy()
+
+        columnas = {
+            'item_id': np.repeat(np.asarray(item_ids, dtype = object), len(future_dates)),
+            mes_col: np.tile(fechas, len(item_ids))
+        }
+        for i, nombre in enumerate(nombres_ceros):
+            columnas[nombre] = ceros[i]
+        columnas['timestamp'] = np.tile(fechas, len(item_ids))
+
+        return pd.DataFrame(columnas, copy = False)
+
+    ###################################################################################
+    # FUNCIÓN PARA PROYECTAR CON MEDIA MÓVIL RECURSIVA TODOS LOS SKUS A LA VEZ
+    ###################################################################################
+    def proyectar_media_movil_vectorizada(self, df, mes_col, val_col, codigos_sku):
+        """
+        Función para proyectar con media móvil recursiva todos los SKUs a la vez. Cada SKU es una fila con sus últimos
+        registros (hasta ventana_ventas); los SKUs se agrupan por largo de ventana y en cada horizonte se promedia la
+        ventana, se redondea a entero, se recorta en 0 y el valor se agrega al final de la fila, igual que la lista del
+        cálculo original. Devuelve una matriz (SKU x horizonte) en el orden de codigos_sku.
+        """
+        # ÚLTIMOS REGISTROS DE CADA SKU, EN ORDEN DE FECHA
+        df_orden = df.sort_values(['_codigo_sku', mes_col], kind = 'stable')
+        desde_el_final = df_orden.groupby('_codigo_sku', sort = False).cumcount(ascending = False).to_numpy()
+        df_orden = df_orden[desde_el_final < self.ventana_ventas]
+        posicion = df_orden.groupby('_codigo_sku', sort = False).cumcount().to_numpy()
+        valores = df_orden[val_col].to_numpy()
+
+        # FILA DE CADA SKU EN LA SALIDA Y LARGO DE SU VENTANA
+        fila_salida = pd.Index(codigos_sku).get_indexer(df_orden['_codigo_sku'].to_numpy())
+        largos = np.bincount(fila_salida, minlength = len(codigos_sku))
+
+        proyecciones = np.zeros((len(codigos_sku), self.num_meses_proyeccion), dtype = np.int64)
+
+        for largo in np.unique(largos):
+            filas = np.flatnonzero(largos == largo)
+            en_grupo = np.isin(fila_salida, filas)
+
+            # MATRIZ VENTANA + HORIZONTES: LAS PROYECCIONES SE ESCRIBEN A LA DERECHA DE LA VENTANA
+            matriz = np.zeros((len(filas), largo + self.num_meses_proyeccion), dtype = np.float64)
+            matriz[np.searchsorted(filas, fila_salida[en_grupo]), posicion[en_grupo]] = valores[en_grupo]
+
+            for h in range(self.num_meses_proyeccion):
+                # PROMEDIAR LA VENTANA, REDONDEAR A ENTERO Y ASEGURAR QUE NO SEA NEGATIVA
+                matriz[:, largo + h] = np.maximum(np.round(matriz[:, h:largo + h].mean(axis = 1)), 0)
+
+            proyecciones[filas] = matriz[:, largo:].astype(np.int64)
+
+        return proyecciones
+
+    ###################################################################################
+    # FUNCIÓN PARA ORDENAR LAS FILAS DE UN TIMESERIESDATAFRAME POR SKU
+    ###################################################################################
+    def ordenar_por_item(self, df_ts, item_ids):
+        """
+        Función para ordenar una sola vez las filas por la posición de su item_id en item_ids y obtener dónde empieza
+        cada serie; así cada lote se corta con un slice, sin recorrer todas las filas.
+        """
+        codigos = item_ids.get_indexer(df_ts.index.get_level_values("item_id"))
+        orden = np.argsort(codigos, kind = "stable")
+        inicios = np.searchsorted(codigos[orden], np.arange(len(item_ids) + 1))
+        return orden, inicios
+
+    ###################################################################################
+    # FUNCIÓN PARA SELECCIONAR UN LOTE DE SKUS DE UN TIMESERIESDATAFRAME
+    ###################################################################################
+    def seleccionar_lote(self, df_ts, orden, inicios, item_ids, inicio, fin):
+        """
+        Función para seleccionar las series (y sus variables estáticas) de los item_id entre inicio y fin.
+        """
+        df_lote = df_ts.iloc[orden[inicios[inicio]:inicios[fin]]]
+        if getattr(df_ts, "static_features", None) is not None:
+            df_lote.static_features = df_ts.static_features.loc[item_ids[inicio:fin]]
+        return df_lote
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER EL POOL DE PROCESOS DE INFERENCIA
+    ###################################################################################
+    def obtener_pool_inferencia(self, ruta_modelo, version_modelo = None):
+        """
+        Función para obtener el pool de inferencia del predictor. Si el modelo es la misma versión que ya cargaron
+        los procesos, el pool se reutiliza entre meses; si no, se cierra y se crea uno nuevo. Los hilos de torch de
+        cada proceso se limitan al límite de CPU del contenedor repartido entre los procesos.
+        """
+        clave = (ruta_modelo, version_modelo)
+        if self.pool_inferencia is not None and version_modelo is not None and self.clave_pool_inferencia == clave:
+            return self.pool_inferencia
+
+        self.cerrar_pool_inferencia()
+        hilos = max(1, obtener_limite_cpu() // self.procesos_inferencia)
+        self.pool_inferencia = ProcessPoolExecutor(
+            max_workers = self.procesos_inferencia,
+            mp_context = multiprocessing.get_context("spawn"),
+            initializer = inicializar_proceso_inferencia,
+            initargs = (ruta_modelo, hilos)
+        )
+        self.clave_pool_inferencia = clave
+        return self.pool_inferencia
+
+    ###################################################################################
+    # FUNCIÓN PARA CERRAR EL POOL DE PROCESOS DE INFERENCIA
+    ###################################################################################
+    def cerrar_pool_inferencia(self):
+        """
+        Función para cerrar el pool de inferencia (y liberar la copia del predictor de cada proceso).
+        """
+        if self.pool_inferencia is not None:
+            self.pool_inferencia.shutdown(wait = True, cancel_futures = True)
+        self.pool_inferencia = None
+        self.clave_pool_inferencia = None
+
+    ###################################################################################
+    # FUNCIÓN PARA ENVIAR EL GESTOR A OTRO PROCESO SIN SU POOL DE INFERENCIA
+    ###################################################################################
+    def __getstate__(self):
+        """
+        Función para enviar el gestor a otro proceso (backfill paralelo) sin el pool, que no se puede serializar.
+        """
+        estado = self.__dict__.copy()
+        estado["pool_inferencia"] = None
+        estado["clave_pool_inferencia"] = None
+        return estado
+
+    ###################################################################################
+    # FUNCIÓN PARA PREDECIR POR LOTES DE SKUS EN UN POOL DE PROCESOS
+    ###################################################################################
+    def predecir_por_lotes(self, modelo, df_ts, df_futuro, version_modelo = None):
+        """
+        Función para predecir repartiendo los SKUs en lotes de tamano_lote_inferencia, que se ejecutan en un pool de
+        procesos (cada proceso carga el predictor desde modelo.path una sola vez). Los lotes se construyen a medida que
+        se envían, con a lo sumo dos lotes en espera por proceso. Un lote que falla, o que se pierde porque el pool se
+        rompió, se reintenta solo, en el proceso principal. Con un solo lote o un solo proceso se predice en el proceso
+        principal. Sin version_modelo el pool se cierra al terminar.
+        """
+        item_ids = df_ts.index.get_level_values("item_id").unique()
+        if self.tamano_lote_inferencia <= 0 or len(item_ids) <= self.tamano_lote_inferencia:
+            return predecir_con_modelo(modelo, df_ts, df_futuro, self.CONFIGURACION_AUTOGLUON_PREDICTOR)
+
+        # ORDENAR UNA SOLA VEZ LAS FILAS POR SKU PARA CORTAR LOS LOTES CON SLICES
+        orden_ts, inicios_ts = self.ordenar_por_item(df_ts, item_ids)
+        orden_futuro, inicios_futuro = self.ordenar_por_item(df_futuro, item_ids)
+        limites = list(range(0, len(item_ids), self.tamano_lote_inferencia)) + [len(item_ids)]
+
+        def construir_lote(i):
+            return (
+                self.seleccionar_lote(df_ts, orden_ts, inicios_ts, item_ids, limites[i], limites[i + 1]),
+                self.seleccionar_lote(df_futuro, orden_futuro, inicios_futuro, item_ids, limites[i], limites[i + 1])
+            )
+
+        num_lotes = len(limites) - 1
+        predicciones = [None] * num_lotes
+        num_procesos = min(self.procesos_inferencia, num_lotes)
+        ruta_modelo = getattr(modelo, "path", None)
+        logging.info(f"Prediciendo {len(item_ids)} SKUs en {num_lotes} lotes con {num_procesos} procesos...")
+
+        if num_procesos > 1 and ruta_modelo:
+            try:
+                executor = self.obtener_pool_inferencia(ruta_modelo, version_modelo)
+                pendientes = {}
+                siguiente = 0
+                while siguiente < num_lotes or pendientes:
+                    # MANTENER A LO SUMO DOS LOTES EN ESPERA POR PROCESO
+                    while siguiente < num_lotes and len(pendientes) < 2 * num_procesos:
+                        pendientes[executor.submit(predecir_lote_en_proceso, *construir_lote(siguiente), self.CONFIGURACION_AUTOGLUON_PREDICTOR)] = siguiente
+                        siguiente += 1
+                    terminados, _ = wait(pendientes, return_when = FIRST_COMPLETED)
+                    for futuro in terminados:
+                        i = pendientes.pop(futuro)
+                        try:
+                            predicciones[i] = futuro.result()
+                        except Exception as e:
+                            logging.warning(f"Falló el lote {i + 1}/{num_lotes} de inferencia ({e}); se reintentará solo.")
+            except Exception as e:
+                logging.warning(f"Falló el pool de inferencia ({e}); los lotes pendientes se predicen en el proceso principal.")
+                self.cerrar_pool_inferencia()
+            finally:
+                if version_modelo is None:
+                    self.cerrar_pool_inferencia()
+
+        # PREDECIR EN EL PROCESO PRINCIPAL LOS LOTES SIN RESULTADO (REINTENTOS O EJECUCIÓN SIN POOL)
+        for i in range(num_lotes):
+            if predicciones[i] is None:
+                try:
+                    predicciones[i] = predecir_con_modelo(modelo, *construir_lote(i), self.CONFIGURACION_AUTOGLUON_PREDICTOR)
+                except Exception as e:
+                    raise Exception(f"No se puede realizar la predicción del lote {i + 1}/{num_lotes}.") from e
+
+        return pd.concat(predicciones)
+
+    ###################################################################################
+    # FUNCIÓN PARA PROYECTAR LOS PRÓXIMOS MESES DE DEMANDA
+    ###################################################################################
+    def proyectar_demanda(self, df_proyectable, df_no_proyectable, df_conocidos_activos, df_conocidos_inactivos, df_desconocidos, id_skus, mes_col, val_col, modelo, proyecciones_simples = None, version_modelo = None):
+        """
+        Función para proyectar la demanda los próximos meses, aplicando modelo y sin aplicarlo, según cada sku.
+        Si ya se calcularon las proyecciones sin modelo (por ejemplo, en un proceso del backfill paralelo) se reciben
+        en proyecciones_simples y no se vuelven a calcular. Con version_modelo, el pool de inferencia se reutiliza
+        mientras no cambie la versión.
+        """
+        df_proyecciones = []
+        if not df_proyectable.empty:
+            df_proyecciones.append(self.proyectar_demanda_con_modelo(df_proyectable, df_no_proyectable, df_conocidos_activos, df_conocidos_inactivos, df_desconocidos, id_skus, mes_col, val_col, modelo, version_modelo = version_modelo))
+
+        if not df_no_proyectable.empty:
+            if proyecciones_simples is None:
+                proyecciones_simples = self.proyectar_demanda_sin_modelo(df_proyectable, df_no_proyectable, df_conocidos_activos, df_conocidos_inactivos, df_desconocidos, id_skus, mes_col, val_col)
+            df_proyecciones.extend(proyecciones_simples)
+
+        return pd.concat(df_proyecciones)
+
+    ###################################################################################
+    # FUNCIÓN PARA PROYECTAR CON EL MODELO LOS SKUS PROYECTABLES
+    ###################################################################################
+    def proyectar_demanda_con_modelo(self, df_proyectable, df_no_proyectable, df_conocidos_activos, df_conocidos_inactivos, df_desconocidos, id_skus, mes_col, val_col, modelo, version_modelo = None):
+        """
+        Función para proyectar con el modelo de Machine Learning los SKUs proyectables.
+        """
+        df_proyectable_time = self.ModelManager.crear_time_features(
+            data = df_proyectable,
+            id_cols = id_skus,
+            date_col = mes_col,
+            value_col = val_col,
+            num_month = self.num_meses_proyeccion
+        )
+        
+        # UTILIZAR MODELO PARA HALLAR PROYECCIÓN DEL DATAFRAME DE SKUS PROYECTABLES
+        df_ts_ag_p, known_covariates = self.ModelManager.preparar_para_autogluon(
+            df_proyectable_time,
+            id_skus = id_skus,
+            mes_col = mes_col,
+            val_col = val_col,
+            prefix_str = "",
+            need_dynamic_time_features = True,
+            need_known_time_features = True,
+            need_static_segment_features = True
+        )
+
+        df_known_cov_future = self.construir_dataframe_futuro(
+            df_ts_ag_p, 
+            modelo = modelo,
+            known_covariates = known_covariates,
+            need_known_time_features = True
+        )
+
+        predicciones = self.predecir_por_lotes(modelo, df_ts_ag_p, df_known_cov_future, version_modelo = version_modelo).reset_index()
+
+        df_p_sp = self.construir_dataframe_proyeccion(
+            predicciones, 
+            df_ts_ag_p,
+            df_proyectable,
+            df_conocidos_activos,
+            df_conocidos_inactivos, 
+            df_desconocidos,
+            id_skus = id_skus,
+            mes_col = mes_col,
+            val_col = val_col,
+            tipo_modelo = self.TIPO_MODELO_ML,
+            tiene_ventas = None,
+            es_proyectable = True,
+            es_conocido = None,
+            es_activo = True
+        )
+        return df_p_sp
+
+    ###################################################################################
+    # FUNCIÓN PARA PROYECTAR SIN MODELO LOS SKUS NO PROYECTABLES
+    ###################################################################################
+    def proyectar_demanda_sin_modelo(self, df_proyectable, df_no_proyectable, df_conocidos_activos, df_conocidos_inactivos, df_desconocidos, id_skus, mes_col, val_col):
+        """
+        Función para proyectar sin modelo los SKUs no proyectables: media móvil si tuvieron ventas en el último año y
+        cero si no. Devuelve la lista de dataframes de proyección (no usa el gestor de modelos).
+        """
+        # SEPARAR LOS NO PROYECTABLES EN 'CON VENTAS' Y 'SIN VENTAS' EN EL ÚLTIMO AÑO
+        df_cv, df_sv = self.obtener_skus_con_ventas(df_no_proyectable, id_skus, mes_col, val_col)
+
+        fecha_final = df_no_proyectable[mes_col].max()
+        df_proyecciones_np = []
+
+        # HACER UNA PROYECCIÓN SIMPLE PARA SKUS NO ROTATIVOS CON VENTAS
+        if not df_cv.empty:
+            pred_cv = self.proyectar_demanda_simple(df_cv, id_skus, mes_col, val_col, algoritmo = "Media_Movil", fecha_final = fecha_final)
+            df_proyecciones_np.append(self.construir_dataframe_proyeccion(
+                pred_cv, 
+                df_cv,
+                df_proyectable,
+                df_conocidos_activos,
+                df_conocidos_inactivos, 
+                df_desconocidos,
+                id_skus = id_skus,
+                mes_col = mes_col,
+                val_col = val_col,
+                tipo_modelo = self.TIPO_MODELO_SIMPLE,
+                tiene_ventas = True,
+                es_proyectable = False,
+                es_conocido = None,
+                es_activo = True
+            ))
+
+        # HACER UNA PROYECCIÓN A 0 PARA SKUS NO ROTATIVOS SIN VENTAS
+        if not df_sv.empty:
+            pred_sv = self.proyectar_demanda_simple(df_sv, id_skus, mes_col, val_col, algoritmo = "Zero", fecha_final = fecha_final)
+            df_proyecciones_np.append(self.construir_dataframe_proyeccion(
+                pred_sv, 
+                df_sv,
+                df_proyectable,
+                df_conocidos_activos,
+                df_conocidos_inactivos, 
+                df_desconocidos,
+                id_skus = id_skus,
+                mes_col = mes_col,
+                val_col = val_col,
+                tipo_modelo = self.TIPO_MODELO_0,
+                tiene_ventas = False,
+                es_proyectable = False,
+                es_conocido = None,
+                es_activo = True
+            ))
+        return df_proyecciones_np
\ No newline at end of file
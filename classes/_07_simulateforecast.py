@@ -1,452 +1,813 @@
-"""_summary_.
-
-PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
-NOMBRE             : 07_simulateforecast
-ARCHIVOS  DESTINO  : ---
-ARCHIVOS  FUENTES  : ---
-OBJETIVO           : Definir procesos para simular la proyección en una fecha específica
-OBSERVACION        : -
-SCHEDULER          : CLOUD RUN
-VERSION            : 1.0
-DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
-PROVEEDOR          : MINSAIT
-FECHA              : 10/12/2025
-DESCRIPCION        : Paquete que contiene procesos para simular la proyección en una fecha específica
-"""
-
-# Librerías Básicas
-import logging
-
-import datetime
-from dateutil.relativedelta import relativedelta
-
-# Librerías para Datos
-import pandas_gbq
-
-class GestorSimulacion:
-    """Clase para gestionar una simulación de proyección mensual en una fecha dada."""
-
-    def __init__(self, self_planificador):
-        """
-        Inicializa la clase.
-        """
-        logging.info("Inicializando la clase de Gestor de Simulación de la Proyección...")
-
-        self.p = self_planificador
-
-    ###################################################################################
-    # FUNCIÓN PARA AJUSTAR LA QUERY A LA FECHA QUE SE DESEA
-    ###################################################################################
-    def ajustar_queries(self, fecha):
-        """
-        Función para ajustar las queries a la fecha deseada.
-        """
-        simulated_date_obj = fecha
-        simulated_date_str = simulated_date_obj.strftime('%Y-%m-%d')
-        simulated_first_day_of_prev_month_obj = simulated_date_obj.replace(day=1) - relativedelta(months=1)
-        simulated_first_day_of_prev_month_str = simulated_first_day_of_prev_month_obj.strftime('%Y-%m-%d') # Ej: '2024-02-01'
-
-        today = fecha
-        
-        hoy = today
-        mes_anterior = hoy - relativedelta(months=1)
-        mes_anterior_primer_dia = mes_anterior.replace(day = 1).strftime('%Y-%m-%d')
-
-        self.p.MODEL_VERSION = "v" + today.strftime("%Y%m")
-
-        self.p.fecha_base = datetime.strptime(simulated_date_str, '%Y-%m-%d')
-
-        # QUERYS
-        self.p.sql_planificacion_demanda_validation = f"""
-            SELECT 
-                {self.p.COLUMNAS_CONSUMO_DEMANDA_QUERY}
-            FROM `{self.p.PATH_CONSUMO_DEMANDA}`
-            WHERE CLASIFICACION = '{self.p.clase_producto}'
-            LIMIT 1
-        """
-
-        self.p.sql_planificacion_demanda = f"""
-            WITH 
-            ULTIMO_PERIODO AS (
-                SELECT
-                    DATE('{simulated_first_day_of_prev_month_str}') AS ultimo_mes_inicio
-            )
-            
-            SELECT 
-                {self.p.COLUMNAS_CONSUMO_DEMANDA_QUERY}
-            FROM `{self.p.PATH_CONSUMO_DEMANDA}` AS t, ULTIMO_PERIODO AS p
-            WHERE 
-                DATE_TRUNC({self.p.COLUMNA_FECHA_CONSUMO_DEMANDA}, MONTH) >= DATE_SUB(p.ultimo_mes_inicio, INTERVAL {str(self.p.ventana_historico)} MONTH)
-                AND DATE_TRUNC({self.p.COLUMNA_FECHA_CONSUMO_DEMANDA}, MONTH) <= p.ultimo_mes_inicio -- El último mes completo es ultimo_mes_inicio
-                AND CLASIFICACION = '{self.p.clase_producto}'
-        """
-
-        self.p.sql_proyeccion_demanda_validation = f"""
-            SELECT 1
-            FROM `{self.p.PATH_PROYECCION_DEMANDA}`
-            LIMIT 1
-        """
-
-        self.p.sql_proyeccion_demanda_mes_validation = f"""
-            SELECT 1
-            FROM `{self.p.PATH_PROYECCION_DEMANDA}`
-            WHERE {self.p.COLUMNA_PERIODO_OUTPUT} = CAST(FORMAT_DATE('%Y%m', DATE('{simulated_date_str}')) AS INT64)
-                AND CLASIFICACION = '{self.p.clase_producto}'
-            LIMIT 1
-        """
-
-        self.p.sql_proyeccion_demanda = f"""
-            SELECT *
-            FROM `{self.p.PATH_PROYECCION_DEMANDA}`
-            WHERE {self.p.COLUMNA_PERIODO_OUTPUT} = CAST(FORMAT_DATE('%Y%m', DATE('{simulated_date_str}')) AS INT64)
-                AND CLASIFICACION = '{self.p.clase_producto}'
-        """
-
-        self.p.sql_monitoreo_validation = f"""
-            SELECT 1
-            FROM `{self.p.PATH_MONITOREO}`
-            LIMIT 1
-        """
-
-        self.p.sql_monitoreo_mes_validation = f"""
-            SELECT 1
-            FROM `{self.p.PATH_MONITOREO}`
-            WHERE {self.p.COLUMNA_PERIODO_MONITOREO} = CAST(FORMAT_DATE('%Y%m', DATE('{simulated_date_str}')) AS INT64)
-                AND CLASIFICACION = '{self.p.clase_producto}'
-            LIMIT 1
-        """
-
-        self.p.sql_monitoreo = f"""
-            SELECT *
-            FROM `{self.p.PATH_MONITOREO}`
-            WHERE {self.p.COLUMNA_PERIODO_MONITOREO} = CAST(FORMAT_DATE('%Y%m', DATE('{simulated_date_str}')) AS INT64)
-                AND CLASIFICACION = '{self.p.clase_producto}'
-        """
-
-        self.p.sql_proyeccion_monitoreable = f"""
-            SELECT t.*
-            FROM `{self.p.PATH_PROYECCION_DEMANDA}` AS t
-            WHERE t.CLASIFICACION = '{self.p.clase_producto}'
-                AND t.{self.p.COLUMNA_PERIODO_OUTPUT} = (
-                    SELECT t1.{self.p.COLUMNA_PERIODO_OUTPUT}
-                    FROM `{self.p.PATH_PROYECCION_DEMANDA}` AS t1
-                    WHERE 
-                        DATE_TRUNC(PARSE_DATE('%Y-%m-%d', t1.{self.p.COLUMNA_FECHA_CONSUMO_DEMANDA}), MONTH) >= DATE_SUB(DATE('{simulated_first_day_of_prev_month_str}'), INTERVAL 24 MONTH)
-                    GROUP BY t1.{self.p.COLUMNA_PERIODO_OUTPUT}
-                    HAVING
-                        MAX(DATE_TRUNC(PARSE_DATE('%Y-%m-%d', t1.{self.p.COLUMNA_FECHA_CONSUMO_DEMANDA}), MONTH)) = DATE('{simulated_first_day_of_prev_month_str}')
-                    LIMIT 1
-                )
-        """
-
-        self.p.sql_input_monitoreable = f"""
-            SELECT {self.p.COLUMNAS_CONSUMO_DEMANDA_QUERY}
-            FROM `{self.p.PATH_CONSUMO_DEMANDA}`
-            WHERE 
-                DATE_TRUNC(FECHA, MONTH) BETWEEN 
-                    DATE_SUB(DATE_TRUNC(DATE('{simulated_date_str}'), MONTH), INTERVAL {self.p.num_meses_proyeccion} MONTH)
-                    AND DATE_SUB(DATE_TRUNC(DATE('{simulated_date_str}'), MONTH), INTERVAL 1 MONTH)
-                AND CLASIFICACION = '{self.p.clase_producto}'
-        """
-
-    ####################################################################
-    # LÓGICA PRINCIPAL POR FECHA
-    ####################################################################
-    def ejecutar_simulacion(self, fecha_simulacion):
-        identificadores = ['CLASIFICACION', 'CODSOCIEDAD', 'CODCENTRO', 'CODMATERIAL', 'CODUNIDADMEDIDABASE']
-        identificadores_almacen = ['CLASIFICACION', 'CODSOCIEDAD', 'CODCENTRO']
-        identificadores_entrenamiento = ['CODSOCIEDAD', 'CODCENTRO', 'CODMATERIAL', 'CODUNIDADMEDIDABASE']
-        logging.info(f"Iniciando Trabajo de Proyección de Demanda - {self.p.clase_producto_log} para la fecha {fecha_simulacion.strftime('%Y-%m-%d')}")
-        
-        ####################################################################
-        # 1 - AJUSTANDO QUERIES A FECHA DONDE SE DESEA HALLAR LA PLANIFICACIÓN
-        ####################################################################
-        logging.info(f"Ajustando Fechas de Queries para la Proyección de Demanda - {self.p.clase_producto_log}")
-        self.ajustar_queries(fecha_simulacion)
-
-        ####################################################################
-        # 1 - VERIFICANDO EXISTENCIA DEL INPUT DE DEMANDA
-        ####################################################################
-        logging.info(f"Verificando existencia de input con los datos de Demanda Histórica - {self.p.clase_producto_log}")
-        tabla_planificacion_demanda_existe = self.p.DataManager.verificar_tabla(self.p.sql_planificacion_demanda_validation)        
-
-        if tabla_planificacion_demanda_existe:
-            ####################################################################
-            # 1.A1 - VERIFICANDO EXISTENCIA DE TABLA DE SKU ANALIZADOS DURANTE EL DESARROLLO DEL PROYECTO
-            ####################################################################
-            logging.info(f"SE ENCONTRÓ INPUT con los datos de Demanda Histórica - {self.p.clase_producto_log}")
-
-            logging.info(f"Verificando existencia de Sheet de Excel con los datos Analizados en el Desarrollo respecto a Demanda Histórica - {self.p.clase_producto_log}")
-            tabla_sku_analizados_existe = self.p.DataManager.verificar_archivo_gcs(self.p.BUCKET_SKU_ANALIZADOS, self.p.FILE_PATH_SKU_ANALIZADOS)
-
-            if tabla_sku_analizados_existe:
-                logging.info(f"SE ENCONTRÓ Sheet de Excel con los datos Analizados en el Desarrollo respecto a Demanda Histórica - {self.clase_producto_log}")
-            
-                ####################################################################
-                # 1.A2.A1 - OBTENIENDO LOS SKU ANALIZADOS DURANTE EL DESARROLLO DEL PROYECTO
-                ####################################################################
-                logging.info(f"Obteniendo en Dataframe el Sheet de Excel con los datos Analizados en el Desarrollo respecto a Demanda Histórica - {self.clase_producto_log}")
-                df_sku = self.p.DataManager.obtener_sku_analizados(self.p.BUCKET_SKU_ANALIZADOS, self.p.FILE_PATH_SKU_ANALIZADOS, self.p.SHEET_SKU_ANALIZADOS)
-
-                ####################################################################
-                # 1.A2.A2 - OBTENIENDO MUESTRAS CON LOS ESQUEMAS DE LOS OUTPUTS
-                ####################################################################
-                logging.info(f"Obteniendo dataframes de prueba para obtener esquemas de las tablas OUTPUT de Proyección y Monitoreo")
-                df_muestra_input = pandas_gbq.read_gbq(self.p.sql_planificacion_demanda_validation, project_id=self.p.PROJECT_EXE)
-                df_muestra_output = self.p.PreManager.transformar_a_output(df_muestra_input)
-                df_muestra_monitoreo = self.p.PreManager.transformar_a_monitoreo(df_muestra_input)
-
-                ####################################################################
-                # 1.A2.A3 - VERIFICANDO EXISTENCIA DE LA TABLA OUTPUT DE PROYECCIÓN
-                ####################################################################
-                logging.info(f"Verificando existencia de tabla output de Proyección de la Demanda - {self.p.clase_producto_log}")
-                tabla_proyeccion_demanda_existe = self.p.verificar_tabla(self.p.sql_proyeccion_demanda_validation)
-
-                if tabla_proyeccion_demanda_existe:
-                    logging.info(f"SE ENCONTRÓ TABLA OUTPUT de Proyección de Demanda Histórica - {self.p.clase_producto_log}")
-
-                    ####################################################################
-                    # 1.A2.A4.A1 - VERIFICANDO EXISTENCIA DE LA PROYECCIÓN DEL MES EN LA TABLA OUTPUT
-                    ####################################################################
-                    logging.info(f"Verificando existencia de la Proyección del Mes en Output de Demanda - {self.p.clase_producto_log}")
-                    proyeccion_mes_existe = self.p.DataManager.verificar_resultados_tabla(self.p.sql_proyeccion_demanda_mes_validation)
-
-                else:
-                    ####################################################################
-                    # 1.A2.A4.B1 - INFORMANDO QUE NO EXISTE TABLA OUTPUT DE PROYECCIÓN
-                    ####################################################################
-                    logging.info(f"NO EXISTE AÚN TABLA OUTPUT de Proyección de Demanda - {self.p.clase_producto_log}")
-                    
-                    ####################################################################
-                    # 1.A2.A4.B2 - CREANDO TABLA PARTICIONADA PARA PROYECCIÓN
-                    ####################################################################
-                    logging.info(f"CREANDO Tabla Particionada de Proyección de Demanda - {self.p.clase_producto_log}")
-                    self.p.DataManager.crear_tabla_particionada(
-                        nueva_tabla = self.p.PATH_PROYECCION_DEMANDA,
-                        df_schema = df_muestra_output,
-                        columna_particionada = self.p.COLUMNA_PERIODO_OUTPUT
-                    )
-                    proyeccion_mes_existe = False
-                    logging.info(f"Tabla Particionada CREADA de Proyección de Demanda - {self.p.clase_producto_log}")
-                
-                if proyeccion_mes_existe:
-                    logging.info(f"YA EXISTE Proyección del Mes de Demanda - {self.p.clase_producto_log}")
-                    logging.info(f"No se ejecutará Proyección del Mes de Demanda - {self.p.clase_producto_log}, porque ya existe")
-
-                    ####################################################################
-                    # 1.A2.A5.A1 - OBTENIENDO PROYECCIÓN EXISTENTE
-                    ####################################################################
-                    logging.info(f"Obteniendo Proyección del Mes de Demanda - {self.p.clase_producto_log}, directamente de la tabla")
-                    df_final = pandas_gbq.read_gbq(self.p.sql_proyeccion_demanda, project_id=self.p.PROJECT_EXE)
-
-                else:
-                    ####################################################################
-                    # 1.A2.A5.B1 - INFORMANDO QUE NO EXISTE LA PROYECCIÓN DEL MES RESPECTO A LA DEMANDA
-                    ####################################################################
-                    logging.info(f"NO EXISTE AÚN Proyección del Mes de Demanda - {self.p.clase_producto_log}")
-                    
-                    ####################################################################
-                    # 1.A2.A5.B2 - OBTENER LOS DATOS HISTÓRICOS DEL INPUT PARA PROYECTAR
-                    ####################################################################
-                    logging.info(f"Obteniendo Data Input de Demanda - {self.p.clase_producto_log}, para proyección")
-                    
-                    df_36_meses_demanda = pandas_gbq.read_gbq(self.p.sql_planificacion_demanda, project_id=self.p.PROJECT_EXE)
-                    df_procesado = self.p.PreManager.procesar_datos_para_planificacion(
-                        df_36_meses_demanda,
-                        date_col = self.p.COLUMNA_FECHA_CONSUMO_DEMANDA,
-                        val_cols = [self.p.COLUMNA_CONSUMO_DEMANDA],
-                        group_cols = identificadores,
-                        filters = {
-                            "CLASIFICACION": ["CEMENTO"],
-                            "CODSOCIEDAD": ["6012", "6052"]
-                        },
-                        group_by_month = True,
-                        complete_months = True,
-                        num_meses = self.p.ventana_historico
-                    )
-                    
-                    # OBTENER SKUS CONOCIDOS A PROYECTAR, DESCONOCIDOS A PROYECTAR, CONOCIDOS QUE NO SE PROYECTARÁN
-                    df_ca, df_da, df_ci = self.p.PreManager.obtener_skus_conocidos_desconocidos(df_procesado, df_sku, identificadores)
-                    
-                    # OBTENER SKUS QUE SON PROYECTABLES CON MODELO, NO PROYECTABLES CON MODELO
-                    df_sp, df_np = self.p.PreManager.obtener_skus_proyectables(
-                        df_procesado,
-                        self.p.ventana_segmentacion,
-                        mes_col = self.p.mes_col,
-                        val_col = self.p.COLUMNA_CONSUMO_DEMANDA,
-                        group_cols_mes = identificadores + [self.p.mes_col],
-                        group_cols_product = identificadores,
-                        group_cols_warehouse = identificadores_almacen,
-                        prefix_str = "",
-                        abc_umb = (self.p.abc_umb_inf, self.p.abc_umb_sup),
-                        xyz_umb = (self.p.xyz_umb_inf, self.p.xyz_umb_sup),
-                        fsn_umb = (self.p.fsn_umb_inf, self.p.fsn_umb_sup),
-                        condiciones_proyectables = {
-                            "CODUNIDADMEDIDABASE": ["BLS"]
-                        },
-                        segmentos_proyectables = {
-                            "ABC": ["A", "B", "C"],
-                            "XYZ": ["X", "Y", "Z"],
-                            "FSN": ["F", "S"]
-                        }
-                    )
-                    
-                    ####################################################################
-                    # 1.A2.A5.B3 - VERIFICAR SI EXISTE EL MODELO ACTUALIZADO DE PROYECCIÓN
-                    ####################################################################
-                    logging.info(f"Verificando si ya existe el Modelo Actualizado del Mes de Proyección de Demanda - {self.p.clase_producto_log}")
-                    modelo_mes_existe, versiones = self.p.ModelManager.verificar_modelo(self.p.MODEL_NAME, self.p.MODEL_VERSION_LABEL, self.p.MODEL_VERSION, self.p.MODEL_PROJECT, self.p.MODEL_REGION)
-
-                    if modelo_mes_existe:
-                        logging.info(f"YA EXISTE Modelo Actualizado del Mes para Proyección de Demanda - {self.p.clase_producto_log}")
-                        
-                        ####################################################################
-                        # 1.A2.A5.B4.A1 - SI EXISTE, OBTENER EL MODELO ACTUALIZADO
-                        ####################################################################
-                        logging.info(f"Obteniendo Modelo Actualizado del Mes para Proyección de Demanda - {self.p.clase_producto_log}")
-                        modelo_actual = self.p.ModelManager.obtener_modelo(self.p.MODEL_NAME, self.p.MODEL_VERSION_LABEL, self.p.MODEL_VERSION, self.p.MODEL_PROJECT, self.p.MODEL_REGION)
-                    else:
-                        logging.info(f"NO EXISTE Modelo Actualizado del Mes para Proyección de Demanda - {self.p.clase_producto_log}")
-
-                        ####################################################################
-                        # 1.A2.A5.B4.B1 - SI NO EXISTE, ACTUALIZAR MODELO CON LA DATA ACTUAL
-                        ####################################################################
-                        if not df_sp.empty:
-                            logging.info(f"Actualizando Modelo con Histórico del Mes para Proyección de Demanda - {self.p.clase_producto_log}")
-                            modelo_actual = self.p.ModelManager.actualizar_modelo(
-                                df_sp,
-                                id_skus = identificadores_entrenamiento,
-                                mes_col = self.p.mes_col, 
-                                val_col = self.p.COLUMNA_CONSUMO_DEMANDA,
-                                prefix_str = "",
-                                versiones = versiones, 
-                                model_name = self.p.MODEL_NAME, 
-                                version_label = self.p.MODEL_VERSION_LABEL, 
-                                version_model = self.p.MODEL_VERSION, 
-                                project_id = self.p.MODEL_PROJECT, 
-                                region = self.p.MODEL_REGION, 
-                                uri_gcs = self.p.MODEL_URI_GCS_GENERAL, 
-                                prefix_gcs = self.p.MODEL_PREFIX_GCS
-                            )
-
-                    ####################################################################
-                    # 1.A2.A5.B5 - EJECUTAR PROYECCIÓN DE LA DEMANDA CON EL MODELO ACTUALIZADO
-                    ####################################################################
-                    logging.info(f"Ejecutando Proyección del Mes de la Demanda - {self.p.clase_producto_log}, por los 18 meses siguientes")
-                    df_proyeccion_demanda_18_meses = self.p.ForecastManager.proyectar_demanda(
-                        df_proyectable = df_sp, 
-                        df_no_proyectable = df_np, 
-                        df_conocidos_activos = df_ca,
-                        df_conocidos_inactivos = df_ci,
-                        df_desconocidos = df_da,
-                        id_skus = identificadores_entrenamiento,
-                        mes_col = self.p.mes_col,
-                        val_col = self.p.COLUMNA_CONSUMO_DEMANDA,
-                        modelo = modelo_actual
-                    )
-
-                    logging.info(f"Agregando Información de Periodo al Dataframe de Proyección - {self.p.clase_producto_log}")
-                    df_final = self.p.PreManager.agregar_columnas_periodo(df_proyeccion_demanda_18_meses)
-
-                    ####################################################################
-                    # 1.A2.A5.B6 - CARGAR PROYECCIÓN DE LA DEMANDA EN BIGQUERY
-                    ####################################################################
-                    logging.info(f"Cargando a Bigquery Proyección de Demanda - {self.p.clase_producto_log}")
-                    self.p.DataManager.cargar_datos_bigquery(df_final, self.p.PATH_PROYECCION_DEMANDA, self.p.PROJECT_EXE, if_exists = 'append')
-
-                ####################################################################
-                # 1.A2.A6 - VERIFICAR EXISTENCIA DE TABLA DE MONITOREO
-                ####################################################################
-                logging.info(f"Verificando existencia de tabla de monitoreo de Modelo de Proyección de la Demanda - {self.p.clase_producto_log}")
-                tabla_monitoreo_existe = self.p.verificar_tabla(self.p.sql_monitoreo_validation)
-
-                if tabla_monitoreo_existe:
-                    logging.info(f"SE ENCONTRÓ TABLA DE MONITOREO del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
-
-                    ####################################################################
-                    # 1.A2.A7.A1 - VERIFICAR EXISTENCIA DE DATOS DEL MES DE MONITOREO
-                    ####################################################################
-                    logging.info(f"Verificando existencia de Datos de Monitoreo del Mes respecto a Demanda - {self.p.clase_producto_log}")
-                    monitoreo_mes_existe = self.p.verificar_resultados_tabla(self.p.sql_monitoreo_mes_validation)
-
-                else:
-                    ####################################################################
-                    # 1.A2.A7.B1 - INFORMANDO QUE NO EXISTE TABLA DE MONITOREO
-                    ####################################################################
-                    logging.info(f"NO EXISTE AÚN TABLA DE MONITOREO del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
-                    
-                    ####################################################################
-                    # 1.A2.A7.B2 - CREANDO TABLA PARTICIONADA DE MONITOREO
-                    ####################################################################
-                    logging.info(f"CREANDO Tabla Particionada de Monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
-                    self.p.DataManager.crear_tabla_particionada(
-                        nueva_tabla = self.p.PATH_MONITOREO,
-                        df_schema = df_muestra_monitoreo,
-                        columna_particionada = self.p.COLUMNA_PERIODO_MONITOREO
-                    )
-                    monitoreo_mes_existe = False
-                    logging.info(f"Tabla Particionada CREADA de Monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
-
-                if monitoreo_mes_existe:
-                    ####################################################################
-                    # 1.A2.A8.A1 - INFORMAR QUE YA EXISTE DATOS DE MONITOREO DEL MES Y NO SE CARGARÁ NADA
-                    ####################################################################
-                    logging.info(f"YA EXISTE Datos del Mes de Monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
-                    logging.info(f"No se cargarán Datos del Mes de Monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}, porque ya existen")
-
-                else:
-                    ####################################################################
-                    # 1.A2.A8.B1 - INFORMAR QUE NO EXISTEN DATOS DE MONITOREO DEL MES
-                    ####################################################################
-                    logging.info(f"NO EXISTEN AÚN Datos del Mes de Monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
-                    
-                    ####################################################################
-                    # 1.A2.A8.B2 - OBTENER DATOS DE MONITOREO DEL MES
-                    ####################################################################
-                    logging.info(f"Obteniendo Datos del Mes de Monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
-                    df_input_monitoreable = pandas_gbq.read_gbq(self.p.sql_input_monitoreable, project_id=self.p.PROJECT_EXE)
-                    df_proyeccion_monitoreable = pandas_gbq.read_gbq(self.p.sql_proyeccion_monitoreable, project_id=self.p.PROJECT_EXE)
-                    
-                    df_input_procesado = self.p.PreManager.procesar_datos_para_planificacion(
-                        df_input_monitoreable,
-                        date_col = self.p.COLUMNA_FECHA_CONSUMO_DEMANDA,
-                        val_cols = [self.p.COLUMNA_CONSUMO_DEMANDA],
-                        group_cols = identificadores,
-                        filters = {
-                            "CLASIFICACION": ["CEMENTO"],
-                            "CODSOCIEDAD": ["6012", "6052"]
-                        },
-                        group_by_month = True,
-                        complete_months = True,
-                        num_meses = self.p.ventana_historico
-                    )
-                    df_monitoreo = self.p.monitorear_modelo(df_proyeccion_monitoreable, df_input_procesado, identificadores, self.p.mes_col)
-
-                    ####################################################################
-                    # 1.A2.A8.B3 - CARGAR DATOS DE MONITOREO DEL MES EN BIGQUERY
-                    ####################################################################
-                    if not df_monitoreo.empty:
-                        logging.info(f"Agregando Información de Periodo al Dataframe de Monitoreo - {self.p.clase_producto_log}")
-                        df_monitoreo_final = self.p.PreManager.agregar_columnas_periodo(df_monitoreo)
-                        
-                        logging.info(f"Cargando a Bigquery Monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
-                        self.p.DataManager.cargar_datos_bigquery(df_monitoreo_final, self.p.PATH_MONITOREO, self.p.PROJECT_EXE, if_exists = 'append')
-                    else:
-                        logging.info(f"No se pudo calcular data de monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
-            else:
-                ####################################################################
-                # 1.A2.B1 - INFORMANDO QUE NO SE ENCONTRÓ TABLA DE SKU ANALIZADOS
-                ####################################################################
-                logging.info(f"NO SE ENCONTRÓ Sheet de Excel con los datos Analizados en el Desarrollo respecto a Demanda Histórica - {self.p.clase_producto_log}")
-                logging.info(f"NO SE PROCEDERÁ con la Proyección de Demanda - {self.p.clase_producto_log}, por falta de datos analizados")
-        else:
-            ####################################################################
-            # 1.B1 - INFORMANDO QUE NO SE ENCONTRÓ INPUT DE DEMANDA
-            ####################################################################
-            logging.info(f"NO SE ENCONTRÓ INPUT con los datos de Demanda Histórica - {self.p.clase_producto_log}")
-            logging.info(f"NO SE PROCEDERÁ con la Proyección de Demanda - {self.p.clase_producto_log}, por falta de tabla input")
-
-        ####################################################################
-        # 2 - TERMINANDO TRABAJO / JOB DE PLANIFICACIÓN
-        ####################################################################
-        logging.info(f"Trabajo de Planificación de la Demanda - {self.p.clase_producto_log}")
\ No newline at end of file
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : 07_simulateforecast
+ARCHIVOS  DESTINO  : ---
+ARCHIVOS  FUENTES  : ---
+OBJETIVO           : Definir procesos para simular la proyección en una fecha específica
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene procesos para simular la proyección en una fecha específica
+"""
+
+# Librerías Propias
+from classes._14_checkpoints import SesionPuntosControl
+from classes._15_instrumentation import sin_instrumentacion
+
+# Librerías Básicas
+import hashlib
+import logging
+import json
+import time
+
+from types import SimpleNamespace
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+
+# Librerías para Datos
+import pandas as pd
+
+# IDENTIFICADORES DE SKU, DE ALMACÉN Y LOS QUE USA EL MODELO
+IDENTIFICADORES = ['CLASIFICACION', 'CODSOCIEDAD', 'CODCENTRO', 'CODMATERIAL', 'CODUNIDADMEDIDABASE']
+IDENTIFICADORES_ALMACEN = ['CLASIFICACION', 'CODSOCIEDAD', 'CODCENTRO']
+IDENTIFICADORES_ENTRENAMIENTO = ['CODSOCIEDAD', 'CODCENTRO', 'CODMATERIAL', 'CODUNIDADMEDIDABASE']
+
+# VERSIÓN DEL CÓDIGO DE PREPARACIÓN Y SEGMENTACIÓN (INCREMENTAR AL CAMBIARLO PARA INVALIDAR LA CACHÉ DE RESULTADOS)
+VERSION_PREPARACION = 1
+
+# ATRIBUTOS DEL PLANIFICADOR QUE NECESITA UN PROCESO DEL BACKFILL PARALELO (ADEMÁS DEL GESTOR DE PROYECCIÓN)
+ATRIBUTOS_CONTEXTO_PROCESO = [
+    "clase_producto_log", "PreManager", "mes_col", "COLUMNA_FECHA_CONSUMO_DEMANDA", "COLUMNA_CONSUMO_DEMANDA",
+    "ventana_historico", "ventana_segmentacion", "ventanas_segmentacion_adicional",
+    "abc_umb_inf", "abc_umb_sup", "xyz_umb_inf", "xyz_umb_sup", "fsn_umb_inf", "fsn_umb_sup"
+]
+
+class GestorSimulacion:
+    """Clase para gestionar una simulación de proyección mensual en una fecha dada."""
+
+    def __init__(self, self_planificador):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Gestor de Simulación de la Proyección...")
+
+        self.p = self_planificador
+
+    ###################################################################################
+    # FUNCIÓN PARA AJUSTAR LA QUERY A LA FECHA QUE SE DESEA
+    ###################################################################################
+    def ajustar_queries(self, fecha):
+        """
+        Función para ajustar las queries a la fecha deseada.
+        """
+        simulated_date_obj = fecha
+        simulated_date_str = simulated_date_obj.strftime('%Y-%m-%d')
+        simulated_first_day_of_prev_month_obj = simulated_date_obj.replace(day=1) - relativedelta(months=1)
+        simulated_first_day_of_prev_month_str = simulated_first_day_of_prev_month_obj.strftime('%Y-%m-%d') # Ej: '2024-02-01'
+
+        today = fecha
+        
+        hoy = today
+        mes_anterior = hoy - relativedelta(months=1)
+        mes_anterior_primer_dia = mes_anterior.replace(day = 1).strftime('%Y-%m-%d')
+
+        self.p.MODEL_VERSION = "v" + today.strftime("%Y%m")
+
+        self.p.fecha_base = datetime.strptime(simulated_date_str, '%Y-%m-%d')
+        self.p.PreManager.fecha_base = self.p.fecha_base
+
+        # QUERYS
+        self.p.sql_planificacion_demanda_validation = f"""
+            SELECT 
+                {self.p.COLUMNAS_CONSUMO_DEMANDA_QUERY}
+            FROM `{self.p.PATH_CONSUMO_DEMANDA}`
+            WHERE CLASIFICACION = '{self.p.clase_producto}'
+            LIMIT 1
+        """
+
+        self.p.sql_planificacion_demanda = f"""
+            WITH 
+            ULTIMO_PERIODO AS (
+                SELECT
+                    DATE('{simulated_first_day_of_prev_month_str}') AS ultimo_mes_inicio
+            )
+            
+            SELECT 
+                {self.p.COLUMNAS_CONSUMO_DEMANDA_QUERY}
+            FROM `{self.p.PATH_CONSUMO_DEMANDA}` AS t, ULTIMO_PERIODO AS p
+            WHERE 
+                DATE_TRUNC({self.p.COLUMNA_FECHA_CONSUMO_DEMANDA}, MONTH) >= DATE_SUB(p.ultimo_mes_inicio, INTERVAL {str(self.p.ventana_historico)} MONTH)
+                AND DATE_TRUNC({self.p.COLUMNA_FECHA_CONSUMO_DEMANDA}, MONTH) <= p.ultimo_mes_inicio -- El último mes completo es ultimo_mes_inicio
+                AND CLASIFICACION = '{self.p.clase_producto}'
+        """
+
+        self.p.sql_proyeccion_demanda_validation = f"""
+            SELECT 1
+            FROM `{self.p.PATH_PROYECCION_DEMANDA}`
+            LIMIT 1
+        """
+
+        self.p.sql_proyeccion_demanda_mes_validation = f"""
+            SELECT 1
+            FROM `{self.p.PATH_PROYECCION_DEMANDA}`
+            WHERE {self.p.COLUMNA_PERIODO_OUTPUT} = CAST(FORMAT_DATE('%Y%m', DATE('{simulated_date_str}')) AS INT64)
+                AND CLASIFICACION = '{self.p.clase_producto}'
+            LIMIT 1
+        """
+
+        self.p.sql_proyeccion_demanda = f"""
+            SELECT *
+            FROM `{self.p.PATH_PROYECCION_DEMANDA}`
+            WHERE {self.p.COLUMNA_PERIODO_OUTPUT} = CAST(FORMAT_DATE('%Y%m', DATE('{simulated_date_str}')) AS INT64)
+                AND CLASIFICACION = '{self.p.clase_producto}'
+        """
+
+        self.p.sql_monitoreo_validation = f"""
+            SELECT 1
+            FROM `{self.p.PATH_MONITOREO}`
+            LIMIT 1
+        """
+
+        self.p.sql_monitoreo_mes_validation = f"""
+            SELECT 1
+            FROM `{self.p.PATH_MONITOREO}`
+            WHERE {self.p.COLUMNA_PERIODO_MONITOREO} = CAST(FORMAT_DATE('%Y%m', DATE('{simulated_date_str}')) AS INT64)
+                AND CLASIFICACION = '{self.p.clase_producto}'
+            LIMIT 1
+        """
+
+        self.p.sql_monitoreo = f"""
+            SELECT *
+            FROM `{self.p.PATH_MONITOREO}`
+            WHERE {self.p.COLUMNA_PERIODO_MONITOREO} = CAST(FORMAT_DATE('%Y%m', DATE('{simulated_date_str}')) AS INT64)
+                AND CLASIFICACION = '{self.p.clase_producto}'
+        """
+
+        self.p.sql_proyeccion_monitoreable = f"""
+            SELECT t.*
+            FROM `{self.p.PATH_PROYECCION_DEMANDA}` AS t
+            WHERE t.CLASIFICACION = '{self.p.clase_producto}'
+                AND t.{self.p.COLUMNA_PERIODO_OUTPUT} = (
+                    SELECT t1.{self.p.COLUMNA_PERIODO_OUTPUT}
+                    FROM `{self.p.PATH_PROYECCION_DEMANDA}` AS t1
+                    WHERE 
+                        DATE_TRUNC(PARSE_DATE('%Y-%m-%d', t1.{self.p.COLUMNA_FECHA_CONSUMO_DEMANDA}), MONTH) >= DATE_SUB(DATE('{simulated_first_day_of_prev_month_str}'), INTERVAL 24 MONTH)
+                    GROUP BY t1.{self.p.COLUMNA_PERIODO_OUTPUT}
+                    HAVING
+                        MAX(DATE_TRUNC(PARSE_DATE('%Y-%m-%d', t1.{self.p.COLUMNA_FECHA_CONSUMO_DEMANDA}), MONTH)) = DATE('{simulated_first_day_of_prev_month_str}')
+                    LIMIT 1
+                )
+        """
+
+        # FILTROS PARA LECTURAS ARROW (EQUIVALENTES A LAS QUERIES DE LECTURA DE TABLAS)
+        primer_dia_mes_simulado = simulated_date_obj.replace(day=1).date()
+        self.p.filtros_planificacion_demanda = [
+            (self.p.COLUMNA_FECHA_CONSUMO_DEMANDA, ">=", (simulated_first_day_of_prev_month_obj - relativedelta(months=self.p.ventana_historico)).date()),
+            (self.p.COLUMNA_FECHA_CONSUMO_DEMANDA, "<", primer_dia_mes_simulado),
+            ("CLASIFICACION", "=", self.p.clase_producto)
+        ]
+
+        self.p.filtros_proyeccion_demanda = [
+            (self.p.COLUMNA_PERIODO_OUTPUT, "=", int(simulated_date_obj.strftime('%Y%m'))),
+            ("CLASIFICACION", "=", self.p.clase_producto)
+        ]
+
+        self.p.filtros_input_monitoreable = [
+            (self.p.COLUMNA_FECHA_CONSUMO_DEMANDA, ">=", primer_dia_mes_simulado - relativedelta(months=self.p.num_meses_proyeccion)),
+            (self.p.COLUMNA_FECHA_CONSUMO_DEMANDA, "<", primer_dia_mes_simulado),
+            ("CLASIFICACION", "=", self.p.clase_producto)
+        ]
+
+        self.p.sql_input_monitoreable = f"""
+            SELECT {self.p.COLUMNAS_CONSUMO_DEMANDA_QUERY}
+            FROM `{self.p.PATH_CONSUMO_DEMANDA}`
+            WHERE 
+                DATE_TRUNC(FECHA, MONTH) BETWEEN 
+                    DATE_SUB(DATE_TRUNC(DATE('{simulated_date_str}'), MONTH), INTERVAL {self.p.num_meses_proyeccion} MONTH)
+                    AND DATE_SUB(DATE_TRUNC(DATE('{simulated_date_str}'), MONTH), INTERVAL 1 MONTH)
+                AND CLASIFICACION = '{self.p.clase_producto}'
+        """
+
+    ###################################################################################
+    # FUNCIÓN PARA LEER UNA SOLA VEZ LO QUE NO DEPENDE DEL MES SIMULADO
+    ###################################################################################
+    def leer_una_vez(self, almacen_historico, clave, funcion_lectura):
+        """
+        Función para reutilizar, durante un backfill, las lecturas que son iguales para todos los meses simulados.
+        """
+        if almacen_historico is None:
+            return funcion_lectura()
+        return almacen_historico.obtener_o_leer(clave, funcion_lectura)
+
+    ###################################################################################
+    # FUNCIÓN PARA LEER EL INPUT DE DEMANDA CON LOS FILTROS DEL MES SIMULADO
+    ###################################################################################
+    def leer_consumo_demanda(self, filtros, almacen_historico):
+        """
+        Función para leer el input de demanda con los filtros del mes: de BigQuery, o como corte del histórico en memoria
+        durante un backfill.
+        """
+        if almacen_historico is None:
+            return self.p.DataManager.leer_tabla_arrow(
+                self.p.PATH_CONSUMO_DEMANDA,
+                columnas = self.p.COLUMNAS_CONSUMO_DEMANDA,
+                filtros = filtros
+            )
+        return almacen_historico.obtener_tabla(filtros)
+
+    ###################################################################################
+    # FUNCIÓN PARA VERIFICAR LOS INSUMOS DEL MES Y OBTENER LOS ESQUEMAS DE LOS OUTPUTS
+    ###################################################################################
+    def verificar_insumos(self, almacen_historico = None):
+        """
+        Función para verificar el input de demanda y el Sheet de SKUs analizados, y obtener los SKUs analizados y las
+        muestras con los esquemas de los outputs. Retorna None si falta algún insumo.
+        """
+        ####################################################################
+        # 1 - VERIFICANDO EXISTENCIA DEL INPUT DE DEMANDA
+        ####################################################################
+        logging.info(f"Verificando existencia de input con los datos de Demanda Histórica - {self.p.clase_producto_log}")
+        tabla_planificacion_demanda_existe = self.leer_una_vez(almacen_historico, "tabla_planificacion_demanda_existe", lambda: self.p.DataManager.verificar_tabla(self.p.sql_planificacion_demanda_validation))        
+
+        if not tabla_planificacion_demanda_existe:
+            ####################################################################
+            # 1.B1 - INFORMANDO QUE NO SE ENCONTRÓ INPUT DE DEMANDA
+            ####################################################################
+            logging.info(f"NO SE ENCONTRÓ INPUT con los datos de Demanda Histórica - {self.p.clase_producto_log}")
+            logging.info(f"NO SE PROCEDERÁ con la Proyección de Demanda - {self.p.clase_producto_log}, por falta de tabla input")
+            return None
+
+        ####################################################################
+        # 1.A1 - VERIFICANDO EXISTENCIA DE TABLA DE SKU ANALIZADOS DURANTE EL DESARROLLO DEL PROYECTO
+        ####################################################################
+        logging.info(f"SE ENCONTRÓ INPUT con los datos de Demanda Histórica - {self.p.clase_producto_log}")
+
+        logging.info(f"Verificando existencia de Sheet de Excel con los datos Analizados en el Desarrollo respecto a Demanda Histórica - {self.p.clase_producto_log}")
+        tabla_sku_analizados_existe = self.leer_una_vez(almacen_historico, "tabla_sku_analizados_existe", lambda: self.p.DataManager.verificar_archivo_gcs(self.p.BUCKET_SKU_ANALIZADOS, self.p.FILE_PATH_SKU_ANALIZADOS))
+
+        if not tabla_sku_analizados_existe:
+            ####################################################################
+            # 1.A2.B1 - INFORMANDO QUE NO SE ENCONTRÓ TABLA DE SKU ANALIZADOS
+            ####################################################################
+            logging.info(f"NO SE ENCONTRÓ Sheet de Excel con los datos Analizados en el Desarrollo respecto a Demanda Histórica - {self.p.clase_producto_log}")
+            logging.info(f"NO SE PROCEDERÁ con la Proyección de Demanda - {self.p.clase_producto_log}, por falta de datos analizados")
+            return None
+
+        logging.info(f"SE ENCONTRÓ Sheet de Excel con los datos Analizados en el Desarrollo respecto a Demanda Histórica - {self.p.clase_producto_log}")
+
+        ####################################################################
+        # 1.A2.A1 - OBTENIENDO LOS SKU ANALIZADOS DURANTE EL DESARROLLO DEL PROYECTO
+        ####################################################################
+        logging.info(f"Obteniendo en Dataframe el Sheet de Excel con los datos Analizados en el Desarrollo respecto a Demanda Histórica - {self.p.clase_producto_log}")
+        df_sku = self.leer_una_vez(almacen_historico, "df_sku", lambda: self.p.DataManager.obtener_sku_analizados(self.p.BUCKET_SKU_ANALIZADOS, self.p.FILE_PATH_SKU_ANALIZADOS, self.p.SHEET_SKU_ANALIZADOS))
+
+        ####################################################################
+        # 1.A2.A2 - OBTENIENDO MUESTRAS CON LOS ESQUEMAS DE LOS OUTPUTS
+        ####################################################################
+        logging.info(f"Obteniendo dataframes de prueba para obtener esquemas de las tablas OUTPUT de Proyección y Monitoreo")
+        df_muestra_input = self.leer_una_vez(almacen_historico, "df_muestra_input", lambda: self.p.DataManager.leer_query_arrow(self.p.sql_planificacion_demanda_validation))
+
+        return {
+            "df_sku": df_sku,
+            "df_muestra_output": self.p.PreManager.transformar_a_output(df_muestra_input),
+            "df_muestra_monitoreo": self.p.PreManager.transformar_a_monitoreo(df_muestra_input)
+        }
+
+    ###################################################################################
+    # FUNCIÓN PARA VERIFICAR SI YA EXISTE LA PROYECCIÓN DEL MES
+    ###################################################################################
+    def verificar_proyeccion_mes(self, df_muestra_output):
+        """
+        Función para verificar (o crear) la tabla output de proyección y si ya tiene la proyección del mes.
+        """
+        ####################################################################
+        # 1.A2.A3 - VERIFICANDO EXISTENCIA DE LA TABLA OUTPUT DE PROYECCIÓN
+        ####################################################################
+        logging.info(f"Verificando existencia de tabla output de Proyección de la Demanda - {self.p.clase_producto_log}")
+        tabla_proyeccion_demanda_existe = self.p.DataManager.verificar_tabla(self.p.sql_proyeccion_demanda_validation)
+
+        if tabla_proyeccion_demanda_existe and self.p.SOBRESCRIBIR_PARTICIONES:
+            ####################################################################
+            # 1.A2.A4.A1 - SE REEMPLAZAN LAS FILAS DE LA CLASE EN EL MES, SIN VERIFICAR SI YA EXISTEN
+            ####################################################################
+            logging.info(f"SE ENCONTRÓ TABLA OUTPUT de Proyección de Demanda Histórica - {self.p.clase_producto_log}, se reemplazarán las filas de la clase en el mes")
+            proyeccion_mes_existe = False
+
+        elif tabla_proyeccion_demanda_existe:
+            logging.info(f"SE ENCONTRÓ TABLA OUTPUT de Proyección de Demanda Histórica - {self.p.clase_producto_log}")
+
+            ####################################################################
+            # 1.A2.A4.A1 - VERIFICANDO EXISTENCIA DE LA PROYECCIÓN DEL MES EN LA TABLA OUTPUT
+            ####################################################################
+            logging.info(f"Verificando existencia de la Proyección del Mes en Output de Demanda - {self.p.clase_producto_log}")
+            proyeccion_mes_existe = self.p.DataManager.verificar_resultados_tabla(self.p.sql_proyeccion_demanda_mes_validation)
+
+        else:
+            ####################################################################
+            # 1.A2.A4.B1 - INFORMANDO QUE NO EXISTE TABLA OUTPUT DE PROYECCIÓN
+            ####################################################################
+            logging.info(f"NO EXISTE AÚN TABLA OUTPUT de Proyección de Demanda - {self.p.clase_producto_log}")
+            
+            ####################################################################
+            # 1.A2.A4.B2 - CREANDO TABLA PARTICIONADA PARA PROYECCIÓN
+            ####################################################################
+            logging.info(f"CREANDO Tabla Particionada de Proyección de Demanda - {self.p.clase_producto_log}")
+            self.p.DataManager.crear_tabla_particionada(
+                nueva_tabla = self.p.PATH_PROYECCION_DEMANDA,
+                df_schema = df_muestra_output,
+                columna_particionada = self.p.COLUMNA_PERIODO_OUTPUT
+            )
+            proyeccion_mes_existe = False
+            logging.info(f"Tabla Particionada CREADA de Proyección de Demanda - {self.p.clase_producto_log}")
+
+        if proyeccion_mes_existe:
+            logging.info(f"YA EXISTE Proyección del Mes de Demanda - {self.p.clase_producto_log}")
+            logging.info(f"No se ejecutará Proyección del Mes de Demanda - {self.p.clase_producto_log}, porque ya existe")
+        else:
+            ####################################################################
+            # 1.A2.A5.B1 - INFORMANDO QUE NO EXISTE LA PROYECCIÓN DEL MES RESPECTO A LA DEMANDA
+            ####################################################################
+            logging.info(f"NO EXISTE AÚN Proyección del Mes de Demanda - {self.p.clase_producto_log}")
+        return proyeccion_mes_existe
+
+    ###################################################################################
+    # FUNCIÓN PARA PROCESAR EL HISTÓRICO DEL MES
+    ###################################################################################
+    def procesar_historico_mes(self, df_36_meses_demanda):
+        """
+        Función para filtrar, agrupar por mes y completar los meses del histórico de demanda del mes.
+        """
+        return self.p.PreManager.procesar_datos_para_planificacion(
+            df_36_meses_demanda,
+            date_col = self.p.COLUMNA_FECHA_CONSUMO_DEMANDA,
+            val_cols = [self.p.COLUMNA_CONSUMO_DEMANDA],
+            group_cols = IDENTIFICADORES,
+            filters = {
+                "CLASIFICACION": ["CEMENTO"],
+                "CODSOCIEDAD": ["6012", "6052"]
+            },
+            group_by_month = True,
+            complete_months = True,
+            num_meses = self.p.ventana_historico
+        )
+
+    ###################################################################################
+    # FUNCIÓN PARA SEPARAR LOS SKUS CONOCIDOS Y DESCONOCIDOS DEL MES
+    ###################################################################################
+    def separar_conocidos_mes(self, df_procesado, df_sku):
+        """
+        Función para separar los SKUs del mes en conocidos activos, desconocidos activos y conocidos inactivos.
+        """
+        # OBTENER SKUS CONOCIDOS A PROYECTAR, DESCONOCIDOS A PROYECTAR, CONOCIDOS QUE NO SE PROYECTARÁN
+        df_ca, df_da, df_ci = self.p.PreManager.obtener_skus_conocidos_desconocidos(df_procesado, df_sku, IDENTIFICADORES)
+        return {"df_ca": df_ca, "df_da": df_da, "df_ci": df_ci}
+
+    ###################################################################################
+    # FUNCIÓN PARA SEGMENTAR LOS SKUS DEL MES EN PROYECTABLES Y NO PROYECTABLES
+    ###################################################################################
+    def segmentar_mes(self, df_procesado):
+        """
+        Función para segmentar (ABC, XYZ, FSN) los SKUs del mes y separarlos en proyectables y no proyectables con modelo.
+        """
+        # OBTENER SKUS QUE SON PROYECTABLES CON MODELO, NO PROYECTABLES CON MODELO
+        df_sp, df_np = self.p.PreManager.obtener_skus_proyectables(
+            df_procesado,
+            self.p.ventana_segmentacion,
+            mes_col = self.p.mes_col,
+            val_col = self.p.COLUMNA_CONSUMO_DEMANDA,
+            group_cols_mes = IDENTIFICADORES + [self.p.mes_col],
+            group_cols_product = IDENTIFICADORES,
+            group_cols_warehouse = IDENTIFICADORES_ALMACEN,
+            prefix_str = "",
+            abc_umb = (self.p.abc_umb_inf, self.p.abc_umb_sup),
+            xyz_umb = (self.p.xyz_umb_inf, self.p.xyz_umb_sup),
+            fsn_umb = (self.p.fsn_umb_inf, self.p.fsn_umb_sup),
+            condiciones_proyectables = {
+                "CODUNIDADMEDIDABASE": ["BLS"]
+            },
+            segmentos_proyectables = {
+                "ABC": ["A", "B", "C"],
+                "XYZ": ["X", "Y", "Z"],
+                "FSN": ["F", "S"]
+            },
+            ventanas_adicionales = self.p.ventanas_segmentacion_adicional
+        )
+        return {"df_sp": df_sp, "df_np": df_np}
+
+    ###################################################################################
+    # FUNCIÓN PARA PREPARAR Y SEGMENTAR LOS DATOS DEL MES
+    ###################################################################################
+    def preparar_datos_mes(self, df_36_meses_demanda, df_sku):
+        """
+        Función para procesar el histórico del mes y separar los SKUs en conocidos / desconocidos y proyectables / no
+        proyectables. No lee ni escribe en BigQuery, por lo que puede ejecutarse en un proceso del backfill paralelo.
+        """
+        df_procesado = self.procesar_historico_mes(df_36_meses_demanda)
+        return {**self.separar_conocidos_mes(df_procesado, df_sku), **self.segmentar_mes(df_procesado)}
+
+    ###################################################################################
+    # FUNCIÓN PARA CALCULAR LA HUELLA DEL INPUT DEL MES
+    ###################################################################################
+    def calcular_huella_entrada(self, fecha_simulacion, df_sku, version_input):
+        """
+        Función para calcular la huella del input del mes (parámetros de preparación y segmentación, versión del
+        modelo, versión de la tabla de demanda y contenido de los SKUs analizados). Si cambia cualquiera de ellos,
+        los puntos de control del mes no se reutilizan.
+        """
+        parametros = {atributo: getattr(self.p, atributo, None) for atributo in ATRIBUTOS_CONTEXTO_PROCESO if atributo != "PreManager"}
+        parametros.update({
+            "fecha_simulacion": fecha_simulacion.strftime("%Y-%m-%d"),
+            "MODEL_VERSION": self.p.MODEL_VERSION,
+            "version_input": version_input,
+            "sku_analizados": int(pd.util.hash_pandas_object(df_sku, index = False).sum())
+        })
+        return hashlib.sha256(json.dumps(parametros, sort_keys = True, default = str).encode()).hexdigest()[:16]
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER LA VERSIÓN DE LA TABLA INPUT DE DEMANDA
+    ###################################################################################
+    def obtener_version_input(self, almacen_historico = None):
+        """
+        Función para obtener la versión (fecha de modificación y filas) de la tabla input de demanda, una sola vez por
+        backfill.
+        """
+        return self.leer_una_vez(almacen_historico, "version_input", lambda: self.p.DataManager.obtener_version_tabla(self.p.PATH_CONSUMO_DEMANDA))
+
+    ###################################################################################
+    # FUNCIONES PARA MEMORIZAR LA PREPARACIÓN Y LA SEGMENTACIÓN DEL MES
+    ###################################################################################
+    def obtener_partes_preparacion(self, version_input):
+        """
+        Función para obtener lo que define el resultado de la preparación: versión de la tabla, query del mes y
+        parámetros. VERSION_PREPARACION se incrementa cuando cambia el código de la preparación o la segmentación.
+        """
+        return [
+            VERSION_PREPARACION,
+            version_input,
+            self.p.sql_planificacion_demanda,
+            self.p.filtros_planificacion_demanda,
+            self.p.COLUMNAS_CONSUMO_DEMANDA,
+            self.p.COLUMNA_FECHA_CONSUMO_DEMANDA,
+            self.p.COLUMNA_CONSUMO_DEMANDA,
+            self.p.ventana_historico
+        ]
+
+    def obtener_partes_segmentacion(self, version_input):
+        return self.obtener_partes_preparacion(version_input) + [
+            self.p.mes_col,
+            self.p.ventana_segmentacion,
+            self.p.ventanas_segmentacion_adicional,
+            (self.p.abc_umb_inf, self.p.abc_umb_sup),
+            (self.p.xyz_umb_inf, self.p.xyz_umb_sup),
+            (self.p.fsn_umb_inf, self.p.fsn_umb_sup)
+        ]
+
+    def memorizar_etapa(self, etapa, partes, funcion):
+        """
+        Función para obtener la salida de una etapa de la caché de resultados en disco o calcularla (sin caché
+        configurada, siempre se calcula).
+        """
+        cache = getattr(self.p, "StageCache", None)
+        if cache is None:
+            return funcion()
+        return cache.memorizar(etapa, partes, funcion)
+
+    ###################################################################################
+    # FUNCIÓN PARA PROYECTAR SIN MODELO LOS SKUS NO PROYECTABLES DEL MES
+    ###################################################################################
+    def proyectar_simple_mes(self, datos):
+        """
+        Función para calcular las proyecciones sin modelo (media móvil y cero) de los SKUs no proyectables del mes.
+        """
+        if datos["df_np"].empty:
+            return []
+        return self.p.ForecastManager.proyectar_demanda_sin_modelo(
+            datos["df_sp"],
+            datos["df_np"],
+            datos["df_ca"],
+            datos["df_ci"],
+            datos["df_da"],
+            id_skus = IDENTIFICADORES_ENTRENAMIENTO,
+            mes_col = self.p.mes_col,
+            val_col = self.p.COLUMNA_CONSUMO_DEMANDA
+        )
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER (O ENTRENAR) EL MODELO DE LA VERSIÓN DEL MES
+    ###################################################################################
+    def obtener_modelo_mes(self, df_sp):
+        """
+        Función para obtener el modelo de la versión del mes (MODEL_VERSION) del registro o, si no existe, entrenarlo
+        con los SKUs proyectables del mes.
+        """
+        ####################################################################
+        # 1.A2.A5.B3 - VERIFICAR SI EXISTE EL MODELO ACTUALIZADO DE PROYECCIÓN
+        ####################################################################
+        logging.info(f"Verificando si ya existe el Modelo Actualizado del Mes de Proyección de Demanda - {self.p.clase_producto_log}")
+        modelo_mes_existe, versiones = self.p.ModelManager.verificar_modelo(self.p.MODEL_NAME, self.p.MODEL_VERSION_LABEL, self.p.MODEL_VERSION, self.p.MODEL_PROJECT, self.p.MODEL_REGION)
+
+        modelo_actual = None
+        if modelo_mes_existe:
+            logging.info(f"YA EXISTE Modelo Actualizado del Mes para Proyección de Demanda - {self.p.clase_producto_log}")
+            
+            ####################################################################
+            # 1.A2.A5.B4.A1 - SI EXISTE, OBTENER EL MODELO ACTUALIZADO
+            ####################################################################
+            logging.info(f"Obteniendo Modelo Actualizado del Mes para Proyección de Demanda - {self.p.clase_producto_log}")
+            modelo_actual = self.p.ModelManager.obtener_modelo(self.p.MODEL_NAME, self.p.MODEL_VERSION_LABEL, self.p.MODEL_VERSION, self.p.MODEL_PROJECT, self.p.MODEL_REGION)
+        else:
+            logging.info(f"NO EXISTE Modelo Actualizado del Mes para Proyección de Demanda - {self.p.clase_producto_log}")
+
+            ####################################################################
+            # 1.A2.A5.B4.B1 - SI NO EXISTE, ACTUALIZAR MODELO CON LA DATA ACTUAL
+            ####################################################################
+            if not df_sp.empty:
+                logging.info(f"Actualizando Modelo con Histórico del Mes para Proyección de Demanda - {self.p.clase_producto_log}")
+                modelo_actual = self.p.ModelManager.actualizar_modelo(
+                    df_sp,
+                    id_skus = IDENTIFICADORES_ENTRENAMIENTO,
+                    mes_col = self.p.mes_col, 
+                    val_col = self.p.COLUMNA_CONSUMO_DEMANDA,
+                    prefix_str = "",
+                    versiones = versiones, 
+                    model_name = self.p.MODEL_NAME, 
+                    version_label = self.p.MODEL_VERSION_LABEL, 
+                    version_model = self.p.MODEL_VERSION, 
+                    project_id = self.p.MODEL_PROJECT, 
+                    region = self.p.MODEL_REGION, 
+                    uri_gcs = self.p.MODEL_URI_GCS_GENERAL, 
+                    prefix_gcs = self.p.MODEL_PREFIX_GCS
+                )
+        return modelo_actual
+
+    ###################################################################################
+    # FUNCIÓN PARA PROYECTAR EL MES CON EL MODELO
+    ###################################################################################
+    def proyectar_mes(self, datos, modelo_actual, proyecciones_simples = None):
+        """
+        Función para proyectar los 18 meses siguientes (con modelo y, si no se recibieron ya calculadas, sin modelo) y
+        agregar el periodo. Retorna None si el mes no tiene SKUs (por ejemplo, el fragmento de una tarea sin almacenes).
+        """
+        if datos["df_sp"].empty and datos["df_np"].empty:
+            return None
+
+        ####################################################################
+        # 1.A2.A5.B5 - EJECUTAR PROYECCIÓN DE LA DEMANDA CON EL MODELO ACTUALIZADO
+        ####################################################################
+        logging.info(f"Ejecutando Proyección del Mes de la Demanda - {self.p.clase_producto_log}, por los 18 meses siguientes")
+        df_proyeccion_demanda_18_meses = self.p.ForecastManager.proyectar_demanda(
+            df_proyectable = datos["df_sp"], 
+            df_no_proyectable = datos["df_np"], 
+            df_conocidos_activos = datos["df_ca"],
+            df_conocidos_inactivos = datos["df_ci"],
+            df_desconocidos = datos["df_da"],
+            id_skus = IDENTIFICADORES_ENTRENAMIENTO,
+            mes_col = self.p.mes_col,
+            val_col = self.p.COLUMNA_CONSUMO_DEMANDA,
+            modelo = modelo_actual,
+            proyecciones_simples = proyecciones_simples,
+            version_modelo = self.p.MODEL_VERSION
+        )
+
+        logging.info(f"Agregando Información de Periodo al Dataframe de Proyección - {self.p.clase_producto_log}")
+        return self.p.PreManager.agregar_columnas_periodo(df_proyeccion_demanda_18_meses)
+
+    ###################################################################################
+    # FUNCIÓN PARA CARGAR LA PROYECCIÓN DEL MES EN BIGQUERY
+    ###################################################################################
+    def cargar_proyeccion_mes(self, df_final):
+        """
+        Función para cargar (reemplazando las filas de la clase en el mes) la proyección en la tabla output.
+        """
+        ####################################################################
+        # 1.A2.A5.B6 - CARGAR PROYECCIÓN DE LA DEMANDA EN BIGQUERY
+        ####################################################################
+        logging.info(f"Cargando a Bigquery Proyección de Demanda - {self.p.clase_producto_log}")
+        self.p.DataManager.cargar_particion_bigquery(df_final, self.p.PATH_PROYECCION_DEMANDA, self.p.COLUMNA_PERIODO_OUTPUT)
+
+    ###################################################################################
+    # FUNCIÓN PARA PROYECTAR EL MES Y CARGARLO EN BIGQUERY
+    ###################################################################################
+    def proyectar_y_cargar_mes(self, datos, modelo_actual, proyecciones_simples = None):
+        """
+        Función para proyectar el mes y cargar su partición en BigQuery.
+        """
+        df_final = self.proyectar_mes(datos, modelo_actual, proyecciones_simples)
+        if df_final is not None:
+            self.cargar_proyeccion_mes(df_final)
+        return df_final
+
+    ###################################################################################
+    # FUNCIÓN PARA CALCULAR Y CARGAR EL MONITOREO DEL MES
+    ###################################################################################
+    def monitorear_mes(self, df_muestra_monitoreo, almacen_historico = None):
+        """
+        Función para calcular el monitoreo del mes (proyección de hace 18 meses frente a la demanda real) y cargarlo.
+        Lee proyecciones de meses anteriores, por lo que en un backfill se ejecuta en orden de meses.
+        """
+        ####################################################################
+        # 1.A2.A6 - VERIFICAR EXISTENCIA DE TABLA DE MONITOREO
+        ####################################################################
+        logging.info(f"Verificando existencia de tabla de monitoreo de Modelo de Proyección de la Demanda - {self.p.clase_producto_log}")
+        tabla_monitoreo_existe = self.p.DataManager.verificar_tabla(self.p.sql_monitoreo_validation)
+
+        if tabla_monitoreo_existe and self.p.SOBRESCRIBIR_PARTICIONES:
+            ####################################################################
+            # 1.A2.A7.A1 - SE REEMPLAZAN LAS FILAS DE LA CLASE EN EL MES DE MONITOREO, SIN VERIFICAR SI YA EXISTEN
+            ####################################################################
+            logging.info(f"SE ENCONTRÓ TABLA DE MONITOREO del Modelo de Proyección de Demanda - {self.p.clase_producto_log}, se reemplazarán las filas de la clase en el mes")
+            monitoreo_mes_existe = False
+
+        elif tabla_monitoreo_existe:
+            logging.info(f"SE ENCONTRÓ TABLA DE MONITOREO del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
+
+            ####################################################################
+            # 1.A2.A7.A1 - VERIFICAR EXISTENCIA DE DATOS DEL MES DE MONITOREO
+            ####################################################################
+            logging.info(f"Verificando existencia de Datos de Monitoreo del Mes respecto a Demanda - {self.p.clase_producto_log}")
+            monitoreo_mes_existe = self.p.DataManager.verificar_resultados_tabla(self.p.sql_monitoreo_mes_validation)
+
+        else:
+            ####################################################################
+            # 1.A2.A7.B1 - INFORMANDO QUE NO EXISTE TABLA DE MONITOREO
+            ####################################################################
+            logging.info(f"NO EXISTE AÚN TABLA DE MONITOREO del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
+            
+            ####################################################################
+            # 1.A2.A7.B2 - CREANDO TABLA PARTICIONADA DE MONITOREO
+            ####################################################################
+            logging.info(f"CREANDO Tabla Particionada de Monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
+            self.p.DataManager.crear_tabla_particionada(
+                nueva_tabla = self.p.PATH_MONITOREO,
+                df_schema = df_muestra_monitoreo,
+                columna_particionada = self.p.COLUMNA_PERIODO_MONITOREO
+            )
+            monitoreo_mes_existe = False
+            logging.info(f"Tabla Particionada CREADA de Monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
+
+        if monitoreo_mes_existe:
+            ####################################################################
+            # 1.A2.A8.A1 - INFORMAR QUE YA EXISTE DATOS DE MONITOREO DEL MES Y NO SE CARGARÁ NADA
+            ####################################################################
+            logging.info(f"YA EXISTE Datos del Mes de Monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
+            logging.info(f"No se cargarán Datos del Mes de Monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}, porque ya existen")
+            return
+
+        ####################################################################
+        # 1.A2.A8.B1 - INFORMAR QUE NO EXISTEN DATOS DE MONITOREO DEL MES
+        ####################################################################
+        logging.info(f"NO EXISTEN AÚN Datos del Mes de Monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
+        
+        ####################################################################
+        # 1.A2.A8.B2 - OBTENER DATOS DE MONITOREO DEL MES
+        ####################################################################
+        logging.info(f"Obteniendo Datos del Mes de Monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
+        df_input_monitoreable = self.leer_consumo_demanda(self.p.filtros_input_monitoreable, almacen_historico)
+        df_proyeccion_monitoreable = self.p.DataManager.leer_query_arrow(self.p.sql_proyeccion_monitoreable)
+        
+        df_input_procesado = self.p.PreManager.procesar_datos_para_planificacion(
+            df_input_monitoreable,
+            date_col = self.p.COLUMNA_FECHA_CONSUMO_DEMANDA,
+            val_cols = [self.p.COLUMNA_CONSUMO_DEMANDA],
+            group_cols = IDENTIFICADORES,
+            filters = {
+                "CLASIFICACION": ["CEMENTO"],
+                "CODSOCIEDAD": ["6012", "6052"]
+            },
+            group_by_month = True,
+            complete_months = True,
+            num_meses = self.p.ventana_historico
+        )
+        df_monitoreo = self.p.MonitorManager.monitorear_modelo(df_proyeccion_monitoreable, df_input_procesado, IDENTIFICADORES, self.p.mes_col)
+
+        ####################################################################
+        # 1.A2.A8.B3 - CARGAR DATOS DE MONITOREO DEL MES EN BIGQUERY
+        ####################################################################
+        if not df_monitoreo.empty:
+            logging.info(f"Agregando Información de Periodo al Dataframe de Monitoreo - {self.p.clase_producto_log}")
+            df_monitoreo_final = self.p.PreManager.agregar_columnas_periodo(df_monitoreo)
+            
+            logging.info(f"Cargando a Bigquery Monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
+            self.p.DataManager.cargar_particion_bigquery(df_monitoreo_final, self.p.PATH_MONITOREO, self.p.COLUMNA_PERIODO_MONITOREO)
+        else:
+            logging.info(f"No se pudo calcular data de monitoreo del Modelo de Proyección de Demanda - {self.p.clase_producto_log}")
+
+    ###################################################################################
+    # FUNCIÓN PARA ABRIR LOS PUNTOS DE CONTROL DEL MES
+    ###################################################################################
+    def abrir_puntos_control(self, fecha_simulacion, df_sku, version_input):
+        """
+        Función para abrir la sesión de puntos de control del mes. Sin gestor de puntos de control (o deshabilitado)
+        la sesión solo reutiliza en memoria las salidas de las etapas.
+        """
+        gestor = getattr(self.p, "CheckpointManager", None)
+        if gestor is None or not gestor.habilitado:
+            return SesionPuntosControl(None, "", habilitado = False)
+        return gestor.abrir(self.p.clase_producto, fecha_simulacion, self.calcular_huella_entrada(fecha_simulacion, df_sku, version_input))
+
+    ###################################################################################
+    # FUNCIÓN PARA ARMAR EL CONTEXTO QUE NECESITA UN PROCESO DEL BACKFILL PARALELO
+    ###################################################################################
+    def crear_contexto_proceso(self):
+        """
+        Función para copiar del planificador solo lo que usan preparar_datos_mes y proyectar_simple_mes. Los clientes de
+        BigQuery / Cloud Storage y el gestor de modelos no se pueden enviar a otro proceso, por lo que no se incluyen; los
+        gestores se copian sin sus métodos instrumentados.
+        """
+        contexto = SimpleNamespace(**{atributo: getattr(self.p, atributo) for atributo in ATRIBUTOS_CONTEXTO_PROCESO})
+        contexto.PreManager = sin_instrumentacion(self.p.PreManager)
+        contexto.ForecastManager = sin_instrumentacion(self.p.ForecastManager)
+        contexto.ForecastManager.ModelManager = None
+        return contexto
+
+    ####################################################################
+    # LÓGICA PRINCIPAL POR FECHA
+    ####################################################################
+    def ejecutar_simulacion(self, fecha_simulacion, almacen_historico = None, monitorear = True):
+        logging.info(f"Iniciando Trabajo de Proyección de Demanda - {self.p.clase_producto_log} para la fecha {fecha_simulacion.strftime('%Y-%m-%d')}")
+        
+        ####################################################################
+        # 1 - AJUSTANDO QUERIES A FECHA DONDE SE DESEA HALLAR LA PLANIFICACIÓN
+        ####################################################################
+        logging.info(f"Ajustando Fechas de Queries para la Proyección de Demanda - {self.p.clase_producto_log}")
+        self.ajustar_queries(fecha_simulacion)
+
+        insumos = self.verificar_insumos(almacen_historico)
+
+        if insumos is not None:
+            version_input = self.obtener_version_input(almacen_historico)
+            puntos = self.abrir_puntos_control(fecha_simulacion, insumos["df_sku"], version_input)
+
+            # CADA ETAPA PIDE LA SALIDA DE LA ANTERIOR SOLO SI LA NECESITA: SI UNA EJECUCIÓN ANTERIOR DEL MES YA
+            # TERMINÓ LA CARGA, NO SE VUELVE A LEER, PREPARAR, SEGMENTAR, ENTRENAR NI PROYECTAR. LA PREPARACIÓN Y LA
+            # SEGMENTACIÓN, ADEMÁS, SE MEMORIZAN EN DISCO: SI LA TABLA, LA QUERY Y LOS PARÁMETROS NO CAMBIARON, NO SE LEE
+            def leer():
+                ####################################################################
+                # 1.A2.A5.B2 - OBTENER LOS DATOS HISTÓRICOS DEL INPUT PARA PROYECTAR
+                ####################################################################
+                logging.info(f"Obteniendo Data Input de Demanda - {self.p.clase_producto_log}, para proyección")
+                return {"df_36_meses_demanda": self.leer_consumo_demanda(self.p.filtros_planificacion_demanda, almacen_historico)}
+
+            def preparar():
+                return self.memorizar_etapa(
+                    "preparacion",
+                    self.obtener_partes_preparacion(version_input),
+                    lambda: {"df_procesado": self.procesar_historico_mes(puntos.ejecutar("lectura", leer, persistible = False)["df_36_meses_demanda"])}
+                )
+
+            def separar_conocidos():
+                return self.separar_conocidos_mes(puntos.ejecutar("preparacion", preparar)["df_procesado"], insumos["df_sku"])
+
+            def segmentar():
+                return self.memorizar_etapa(
+                    "segmentacion",
+                    self.obtener_partes_segmentacion(version_input),
+                    lambda: self.segmentar_mes(puntos.ejecutar("preparacion", preparar)["df_procesado"])
+                )
+
+            def obtener_modelo():
+                return {"modelo": self.obtener_modelo_mes(puntos.ejecutar("segmentacion", segmentar)["df_sp"])}
+
+            def proyectar():
+                datos = {**puntos.ejecutar("conocidos", separar_conocidos), **puntos.ejecutar("segmentacion", segmentar)}
+                df_final = self.proyectar_mes(datos, puntos.ejecutar("modelo", obtener_modelo, persistible = False)["modelo"])
+                return {} if df_final is None else {"df_final": df_final}
+
+            def cargar():
+                proyeccion = puntos.ejecutar("proyeccion", proyectar)
+                if "df_final" in proyeccion:
+                    self.cargar_proyeccion_mes(proyeccion["df_final"])
+
+            def monitorear_etapa():
+                self.monitorear_mes(insumos["df_muestra_monitoreo"], almacen_historico)
+
+            if puntos.completa("carga") or not self.verificar_proyeccion_mes(insumos["df_muestra_output"]):
+                puntos.ejecutar("carga", cargar)
+
+            if monitorear:
+                puntos.ejecutar("monitoreo", monitorear_etapa)
+
+            puntos.reportar()
+
+        ####################################################################
+        # 2 - TERMINANDO TRABAJO / JOB DE PLANIFICACIÓN
+        ####################################################################
+        logging.info(f"Trabajo de Planificación de la Demanda - {self.p.clase_producto_log}")
+
+###################################################################################
+# FUNCIÓN PARA PREPARAR UN MES DEL BACKFILL EN UN PROCESO DEL POOL
+###################################################################################
+def preparar_mes_en_proceso(contexto, df_36_meses_demanda, df_sku):
+    """
+    Función que ejecuta, en un proceso del pool del backfill paralelo, la preparación, la segmentación y las
+    proyecciones sin modelo de un mes. Devuelve los datos del mes, sus proyecciones simples y los segundos usados.
+    """
+    inicio = time.perf_counter()
+    simulacion = GestorSimulacion(contexto)
+    datos = simulacion.preparar_datos_mes(df_36_meses_demanda, df_sku)
+    proyecciones_simples = simulacion.proyectar_simple_mes(datos)
+    return datos, proyecciones_simples, time.perf_counter() - inicio
@@ -0,0 +1,136 @@
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : 08_skuregistry
+ARCHIVOS  DESTINO  : ---
+ARCHIVOS  FUENTES  : ---
+OBJETIVO           : Definir el registro de códigos enteros de SKU compartido por todo el flujo
+TIPO               : PY
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene el registro que asigna un código int32 estable a cada SKU
+"""
+
+# Librerías Básicas
+import logging
+
+# Librerías para Datos
+import pandas as pd
+import numpy as np
+
+# IDENTIFICADORES QUE DEFINEN UN SKU (ALMACÉN COMERCIAL - PRODUCTO - UNIDAD)
+IDENTIFICADORES_SKU = ["CLASIFICACION", "CODSOCIEDAD", "CODCENTRO", "CODMATERIAL", "CODUNIDADMEDIDABASE"]
+
+class RegistroSKU:
+    """Clase para asignar una sola vez por ejecución un código entero estable a cada SKU."""
+
+    def __init__(self, identificadores = IDENTIFICADORES_SKU, separador = "_"):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Registro de SKUs...")
+
+        self.identificadores = list(identificadores)
+        self.separador = separador
+
+        # TUPLAS DE LLAVES (COMO TEXTO) Y SU CÓDIGO, EN ORDEN DE REGISTRO
+        self.claves = []
+        self.codigo_por_clave = {}
+
+        # CACHÉ DE ITEM_ID (TEXTO) POR COMBINACIÓN DE COLUMNAS
+        self.item_ids_por_columnas = {}
+        self.codigo_por_item_id = {}
+
+    def __len__(self):
+        return len(self.claves)
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER EL CÓDIGO DE CADA FILA DE UN DATAFRAME
+    ###################################################################################
+    def codificar(self, df, registrar = True):
+        """
+        Función para obtener el código int32 del SKU de cada fila de un dataframe.
+        Las llaves se comparan como texto (igual que el antiguo astype(str) + '_'.join), pero la conversión a texto
+        solo se hace una vez por SKU distinto y no por fila. Los SKUs nuevos se registran salvo que registrar sea False,
+        en cuyo caso reciben el código -1.
+        """
+        if df.empty:
+            return np.empty(0, dtype = np.int32)
+
+        # FACTORIZAR LAS LLAVES DEL DATAFRAME (SOLO UNA VEZ POR SKU DISTINTO)
+        codigos_locales = df.groupby(self.identificadores, sort = False, dropna = False).ngroup().to_numpy()
+        num_locales = codigos_locales.max() + 1
+        primera_fila = np.empty(num_locales, dtype = np.int64)
+        primera_fila[codigos_locales[::-1]] = np.arange(len(codigos_locales))[::-1]
+
+        columnas_unicas = [df[col].to_numpy()[primera_fila] for col in self.identificadores]
+        claves_locales = [tuple(str(valor) for valor in clave) for clave in zip(*columnas_unicas)]
+
+        # TRADUCIR LOS SKUS LOCALES A CÓDIGOS GLOBALES, REGISTRANDO LOS NUEVOS
+        codigos_globales = np.empty(num_locales, dtype = np.int32)
+        for i, clave in enumerate(claves_locales):
+            codigo = self.codigo_por_clave.get(clave)
+            if codigo is None:
+                if registrar:
+                    codigo = len(self.claves)
+                    self.codigo_por_clave[clave] = codigo
+                    self.claves.append(clave)
+                else:
+                    codigo = -1
+            codigos_globales[i] = codigo
+
+        return codigos_globales[codigos_locales]
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER LAS LLAVES DE UNA LISTA DE CÓDIGOS
+    ###################################################################################
+    def decodificar(self, codigos):
+        """
+        Función para obtener un dataframe con las columnas identificadoras (como texto) de cada código.
+        """
+        claves = pd.DataFrame(self.claves, columns = self.identificadores, dtype = object)
+        return claves.take(np.asarray(codigos)).reset_index(drop = True)
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER EL ITEM_ID DE AUTOGLUON DE UNA LISTA DE CÓDIGOS
+    ###################################################################################
+    def obtener_item_ids(self, codigos, columnas):
+        """
+        Función para obtener el item_id (columnas unidas por el separador) de cada código. Solo se usa en la frontera
+        con AutoGluon; los textos se construyen una vez por SKU y se reutilizan.
+        """
+        columnas = tuple(columnas)
+        posiciones = [self.identificadores.index(col) for col in columnas]
+
+        # EXTENDER LA CACHÉ CON LOS SKUS REGISTRADOS DESDE LA ÚLTIMA LLAMADA
+        item_ids = self.item_ids_por_columnas.get(columnas, np.empty(0, dtype = object))
+        if len(item_ids) < len(self.claves):
+            nuevos = [self.separador.join(clave[p] for p in posiciones) for clave in self.claves[len(item_ids):]]
+            item_ids = np.concatenate([item_ids, np.array(nuevos, dtype = object)])
+            self.item_ids_por_columnas[columnas] = item_ids
+            self.codigo_por_item_id.pop(columnas, None)
+
+        return item_ids[np.asarray(codigos)]
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER EL CÓDIGO DE UNA LISTA DE ITEM_ID DE AUTOGLUON
+    ###################################################################################
+    def codificar_item_ids(self, item_ids, columnas):
+        """
+        Función para traducir item_id de AutoGluon a códigos de SKU (-1 si el item_id no está registrado).
+        """
+        columnas = tuple(columnas)
+        self.obtener_item_ids(np.empty(0, dtype = np.int64), columnas)
+
+        if columnas not in self.codigo_por_item_id:
+            item_ids_registrados = pd.Index(self.item_ids_por_columnas[columnas])
+            self.codigo_por_item_id[columnas] = pd.Series(np.arange(len(item_ids_registrados), dtype = np.int32), index = item_ids_registrados)
+            self.codigo_por_item_id[columnas] = self.codigo_por_item_id[columnas][~item_ids_registrados.duplicated()]
+
+        mapa = self.codigo_por_item_id[columnas]
+        posiciones = mapa.index.get_indexer(pd.Index(item_ids))
+        return np.where(posiciones >= 0, mapa.to_numpy()[posiciones], -1).astype(np.int32)
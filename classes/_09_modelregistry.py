@@ -0,0 +1,252 @@
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : 09_modelregistry
+ARCHIVOS  DESTINO  : ---
+ARCHIVOS  FUENTES  : ---
+OBJETIVO           : Definir el índice en caché de las versiones del registro de modelos
+TIPO               : PY
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene el índice de versiones de modelos (memoria y disco con TTL), el proveedor
+de Vertex AI Model Registry y un registro local para pruebas sin Vertex AI
+"""
+
+# Librerías Básicas
+import logging
+import json
+import time
+import os
+
+# Librerías de GCP
+from google.cloud import aiplatform
+
+class ProveedorRegistroVertex:
+    """Clase para consultar y registrar versiones de modelos en Vertex AI Model Registry."""
+
+    def __init__(self, serving_image = "gcr.io/deeplearning-platform-release/base-cpu"):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Proveedor del Registro de Modelos de Vertex AI...")
+
+        self.serving_image = serving_image
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER EL MODELO PADRE POR SU NOMBRE
+    ###################################################################################
+    def obtener_modelo_padre(self, model_name, project_id, region):
+        """
+        Función para obtener el resource name del modelo padre (None si no existe).
+        """
+        aiplatform.init(project = project_id, location = region)
+        models = aiplatform.Model.list(filter=f'display_name="{model_name}"')
+        return models[0].resource_name if models else None
+
+    ###################################################################################
+    # FUNCIÓN PARA LISTAR TODAS LAS VERSIONES DE UN MODELO CON SUS ETIQUETAS
+    ###################################################################################
+    def listar_versiones(self, model_name, project_id, region):
+        """
+        Función para listar las versiones de un modelo con sus etiquetas y URI en una sola llamada paginada
+        (list_model_versions devuelve el modelo completo de cada versión, sin instanciar cada una).
+        """
+        base_model = self.obtener_modelo_padre(model_name, project_id, region)
+        if base_model is None:
+            return {"modelo": None, "versiones": []}
+
+        cliente = aiplatform.gapic.ModelServiceClient(client_options = {"api_endpoint": f"{region}-aiplatform.googleapis.com"})
+        versiones = [
+            {
+                "version_id": version.version_id,
+                "labels": dict(version.labels),
+                "uri": version.artifact_uri
+            }
+            for version in cliente.list_model_versions(request = {"name": base_model})
+        ]
+        return {"modelo": base_model, "versiones": versiones}
+
+    ###################################################################################
+    # FUNCIÓN PARA REGISTRAR UNA NUEVA VERSIÓN DEL MODELO
+    ###################################################################################
+    def registrar_version(self, model_name, artifact_uri, version_label, version_model, project_id, region, version_aliases = [], version_description = None):
+        """
+        Función para registrar una versión del modelo (o el modelo por primera vez si aún no existe).
+        """
+        parent_model_name = self.obtener_modelo_padre(model_name, project_id, region)
+        aiplatform.Model.upload(
+            display_name = model_name,
+            artifact_uri = artifact_uri,
+            serving_container_image_uri = self.serving_image,
+            parent_model = parent_model_name,
+            is_default_version = True,
+            version_aliases = version_aliases,
+            version_description = version_description,
+            labels = {version_label: version_model},          # útil para filtrar en el registry
+            sync = True
+        )
+
+class RegistroModelosLocal:
+    """Clase que imita el registro de modelos sobre un archivo JSON local, para pruebas sin Vertex AI."""
+
+    def __init__(self, ruta):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Registro de Modelos Local...")
+
+        self.ruta = ruta
+        self.num_llamadas = 0
+
+    ###################################################################################
+    # FUNCIÓN PARA LEER EL REGISTRO LOCAL
+    ###################################################################################
+    def leer(self):
+        """
+        Función para leer el archivo JSON del registro local (vacío si aún no existe).
+        """
+        if not os.path.exists(self.ruta):
+            return {}
+        with open(self.ruta, "r") as f:
+            return json.load(f)
+
+    ###################################################################################
+    # FUNCIÓN PARA LISTAR TODAS LAS VERSIONES DE UN MODELO CON SUS ETIQUETAS
+    ###################################################################################
+    def listar_versiones(self, model_name, project_id, region):
+        """
+        Función para listar las versiones registradas localmente de un modelo.
+        """
+        self.num_llamadas += 1
+        return self.leer().get(model_name, {"modelo": None, "versiones": []})
+
+    ###################################################################################
+    # FUNCIÓN PARA REGISTRAR UNA NUEVA VERSIÓN DEL MODELO
+    ###################################################################################
+    def registrar_version(self, model_name, artifact_uri, version_label, version_model, project_id, region, version_aliases = [], version_description = None):
+        """
+        Función para registrar localmente una versión del modelo.
+        """
+        registro = self.leer()
+        modelo = registro.setdefault(model_name, {"modelo": f"projects/{project_id}/locations/{region}/models/{model_name}", "versiones": []})
+        modelo["versiones"].append({
+            "version_id": str(len(modelo["versiones"]) + 1),
+            "labels": {version_label: version_model},
+            "uri": artifact_uri
+        })
+        os.makedirs(os.path.dirname(os.path.abspath(self.ruta)), exist_ok = True)
+        with open(self.ruta, "w") as f:
+            json.dump(registro, f)
+
+class IndiceRegistroModelos:
+    """Clase para servir las consultas al registro de modelos desde una caché en memoria y en disco con TTL."""
+
+    def __init__(self, proveedor, ruta_cache = None, ttl_segundos = 3600):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Índice del Registro de Modelos...")
+
+        self.proveedor = proveedor
+        self.ruta_cache = ruta_cache
+        self.ttl_segundos = ttl_segundos
+        self.cache = {}
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER LA CLAVE DE UN MODELO EN LA CACHÉ
+    ###################################################################################
+    def clave(self, model_name, project_id, region):
+        """
+        Función para armar la clave "proyecto/región/modelo" con la que se guardan las versiones en la caché.
+        """
+        return f"{project_id}/{region}/{model_name}"
+
+    ###################################################################################
+    # FUNCIÓN PARA LEER Y ESCRIBIR LA CACHÉ EN DISCO
+    ###################################################################################
+    def leer_cache_disco(self):
+        """
+        Función para leer la caché en disco (vacía si no existe o está corrupta).
+        """
+        if not self.ruta_cache or not os.path.exists(self.ruta_cache):
+            return {}
+        try:
+            with open(self.ruta_cache, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def escribir_cache_disco(self, clave, entrada):
+        """
+        Función para guardar una entrada en la caché en disco (escritura atómica).
+        """
+        if not self.ruta_cache:
+            return
+        cache_disco = self.leer_cache_disco()
+        cache_disco[clave] = entrada
+        os.makedirs(os.path.dirname(os.path.abspath(self.ruta_cache)), exist_ok = True)
+        ruta_temporal = f"{self.ruta_cache}.{os.getpid()}.tmp"
+        with open(ruta_temporal, "w") as f:
+            json.dump(cache_disco, f)
+        os.replace(ruta_temporal, self.ruta_cache)
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER LAS VERSIONES DE UN MODELO
+    ###################################################################################
+    def obtener_versiones(self, model_name, project_id, region, refrescar = False):
+        """
+        Función para obtener las versiones de un modelo: primero de memoria, luego de disco y, si ambas están vencidas
+        o se pide refrescar, del registro (una sola llamada de listado).
+        """
+        clave = self.clave(model_name, project_id, region)
+        ahora = time.time()
+
+        if not refrescar:
+            entrada = self.cache.get(clave)
+            if entrada is None:
+                entrada = self.leer_cache_disco().get(clave)
+            if entrada is not None and ahora - entrada["guardado"] <= self.ttl_segundos:
+                self.cache[clave] = entrada
+                return entrada
+
+        logging.info(f"Listando versiones del registro de modelos para {model_name}...")
+        entrada = dict(self.proveedor.listar_versiones(model_name, project_id, region))
+        entrada["guardado"] = ahora
+        entrada["por_etiqueta"] = {
+            f"{etiqueta}={valor}": version
+            for version in entrada["versiones"]
+            for etiqueta, valor in (version.get("labels") or {}).items()
+        }
+        self.cache[clave] = entrada
+        self.escribir_cache_disco(clave, entrada)
+        return entrada
+
+    ###################################################################################
+    # FUNCIÓN PARA BUSCAR LA VERSIÓN CON UNA ETIQUETA
+    ###################################################################################
+    def buscar_version(self, model_name, version_label, version_model, project_id, region):
+        """
+        Función para buscar la versión del modelo con la etiqueta version_label = version_model.
+        Si no está en la caché se refresca una vez (otra ejecución pudo registrarla). Devuelve la versión (version_id,
+        labels, uri) o None, y la lista completa de versiones.
+        """
+        etiqueta = f"{version_label}={version_model}"
+        inicio = time.time()
+        entrada = self.obtener_versiones(model_name, project_id, region)
+        if etiqueta not in entrada["por_etiqueta"] and entrada["guardado"] < inicio:
+            entrada = self.obtener_versiones(model_name, project_id, region, refrescar = True)
+        return entrada["por_etiqueta"].get(etiqueta), entrada["versiones"]
+
+    ###################################################################################
+    # FUNCIÓN PARA REGISTRAR UNA VERSIÓN Y ACTUALIZAR EL ÍNDICE
+    ###################################################################################
+    def registrar_version(self, model_name, artifact_uri, version_label, version_model, project_id, region, version_aliases = [], version_description = None):
+        """
+        Función para registrar una versión en el registro y refrescar el índice de ese modelo.
+        """
+        self.proveedor.registrar_version(model_name, artifact_uri, version_label, version_model, project_id, region, version_aliases, version_description)
+        self.obtener_versiones(model_name, project_id, region, refrescar = True)
@@ -0,0 +1,228 @@
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : 10_artifactcache
+ARCHIVOS  DESTINO  : ---
+ARCHIVOS  FUENTES  : ---
+OBJETIVO           : Definir la caché local de artefactos de modelos direccionada por contenido
+TIPO               : PY
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene la caché persistente de artefactos de modelos, identificada por la versión y
+la generación / MD5 de cada blob, con desalojo LRU por tamaño, y la caché de resultados de etapas (DataFrames en
+Parquet identificados por la huella de su input)
+"""
+
+# Librerías Básicas
+import hashlib
+import logging
+import shutil
+import json
+import time
+import os
+
+# Librerías para Datos
+import pandas as pd
+
+class CacheArtefactosModelo:
+    """Clase para guardar en disco local los artefactos descargados de cada versión de modelo y reutilizarlos."""
+
+    # NOMBRES PARA EL LOG (LAS CLASES HIJAS LOS REDEFINEN)
+    NOMBRE_CACHE = "Caché de Artefactos de Modelos"
+    NOMBRE_ENTRADA = "de la caché de artefactos la versión"
+
+    def __init__(self, ruta_base, tamano_maximo_bytes = 1 * 1024 ** 3):
+        """
+        Inicializa la clase. En Cloud Run el directorio temporal está en memoria: lo que ocupa la caché cuenta contra
+        el límite de memoria del job, salvo que ruta_base sea un volumen montado.
+        """
+        logging.info(f"Inicializando la clase de {self.NOMBRE_CACHE}...")
+
+        self.ruta_base = ruta_base
+        self.tamano_maximo_bytes = tamano_maximo_bytes
+        self.ruta_indice = os.path.join(ruta_base, "indice.json")
+        os.makedirs(ruta_base, exist_ok = True)
+
+    ###################################################################################
+    # FUNCIÓN PARA LEER Y ESCRIBIR EL ÍNDICE DE LA CACHÉ
+    ###################################################################################
+    def leer_indice(self):
+        """
+        Función para leer el índice de entradas de la caché (huella -> versión, bytes, último uso).
+        """
+        if not os.path.exists(self.ruta_indice):
+            return {}
+        try:
+            with open(self.ruta_indice, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def escribir_indice(self, indice):
+        """
+        Función para guardar el índice de la caché (escritura atómica).
+        """
+        ruta_temporal = f"{self.ruta_indice}.{os.getpid()}.tmp"
+        with open(ruta_temporal, "w") as f:
+            json.dump(indice, f)
+        os.replace(ruta_temporal, self.ruta_indice)
+
+    ###################################################################################
+    # FUNCIÓN PARA CALCULAR LA HUELLA DE UNA VERSIÓN DE MODELO
+    ###################################################################################
+    def calcular_huella(self, version_model, blobs, prefix = ""):
+        """
+        Función para calcular la huella de los artefactos: versión del modelo más nombre relativo, generación y MD5 de
+        cada blob. Si algún blob se vuelve a subir cambia su generación y, con ella, la huella.
+        """
+        huella = hashlib.sha256(str(version_model).encode())
+        for blob in sorted(blobs, key = lambda b: b.name):
+            nombre_relativo = blob.name[len(prefix):].lstrip("/")
+            huella.update(f"|{nombre_relativo}:{blob.generation}:{blob.md5_hash}".encode())
+        return huella.hexdigest()
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER LA RUTA DE UNA ENTRADA DE LA CACHÉ
+    ###################################################################################
+    def obtener_ruta(self, huella):
+        """
+        Función para obtener la carpeta local de una huella (None si no está en caché). Marca la entrada como usada.
+        """
+        ruta = os.path.join(self.ruta_base, huella)
+        indice = self.leer_indice()
+        if huella not in indice or not os.path.isdir(ruta):
+            return None
+
+        indice[huella]["ultimo_uso"] = time.time()
+        self.escribir_indice(indice)
+        return ruta
+
+    ###################################################################################
+    # FUNCIÓN PARA GUARDAR UNA NUEVA ENTRADA EN LA CACHÉ
+    ###################################################################################
+    def guardar(self, huella, version_model, funcion_descarga):
+        """
+        Función para descargar los artefactos de una huella en la caché. funcion_descarga recibe la carpeta destino;
+        se descarga en una carpeta temporal que se renombra al terminar, para no dejar entradas a medias.
+        """
+        ruta = os.path.join(self.ruta_base, huella)
+        ruta_temporal = f"{ruta}.{os.getpid()}.tmp"
+        shutil.rmtree(ruta_temporal, ignore_errors = True)
+        os.makedirs(ruta_temporal)
+
+        try:
+            funcion_descarga(ruta_temporal)
+        except Exception:
+            shutil.rmtree(ruta_temporal, ignore_errors = True)
+            raise
+
+        shutil.rmtree(ruta, ignore_errors = True)
+        os.replace(ruta_temporal, ruta)
+
+        indice = self.leer_indice()
+        indice[huella] = {
+            "version": str(version_model),
+            "bytes": self.medir_carpeta(ruta),
+            "ultimo_uso": time.time()
+        }
+        indice = self.desalojar(indice, conservar = huella)
+        self.escribir_indice(indice)
+        return ruta
+
+    ###################################################################################
+    # FUNCIÓN PARA DESALOJAR LAS ENTRADAS MENOS USADAS HASTA RESPETAR EL TAMAÑO MÁXIMO
+    ###################################################################################
+    def desalojar(self, indice, conservar = None):
+        """
+        Función para borrar las entradas usadas hace más tiempo (LRU) hasta que la caché no supere el tamaño máximo.
+        """
+        total = sum(entrada["bytes"] for entrada in indice.values())
+        for huella in sorted(indice, key = lambda h: indice[h]["ultimo_uso"]):
+            if total <= self.tamano_maximo_bytes:
+                break
+            if huella == conservar:
+                continue
+            logging.info(f"Desalojando {self.NOMBRE_ENTRADA} {indice[huella]['version']} ({huella[:12]})")
+            shutil.rmtree(os.path.join(self.ruta_base, huella), ignore_errors = True)
+            total -= indice.pop(huella)["bytes"]
+        return indice
+
+    ###################################################################################
+    # FUNCIÓN PARA MEDIR EL TAMAÑO DE UNA CARPETA
+    ###################################################################################
+    def medir_carpeta(self, ruta):
+        """
+        Función para obtener los bytes que ocupan todos los archivos de una carpeta.
+        """
+        return sum(os.path.getsize(os.path.join(raiz, archivo)) for raiz, _, archivos in os.walk(ruta) for archivo in archivos)
+
+class CacheResultadosEtapas(CacheArtefactosModelo):
+    """Clase para memorizar en disco local los DataFrames que produce una etapa para una misma huella de input."""
+
+    NOMBRE_CACHE = "Caché de Resultados de Etapas"
+    NOMBRE_ENTRADA = "de la caché de resultados la etapa"
+
+    def __init__(self, ruta_base, tamano_maximo_bytes = 5 * 1024 ** 3):
+        """
+        Inicializa la clase. Usa el mismo índice y el mismo desalojo LRU por tamaño que la caché de artefactos.
+        """
+        super().__init__(ruta_base, tamano_maximo_bytes = tamano_maximo_bytes)
+
+        self.aciertos = 0
+        self.fallos = 0
+
+    ###################################################################################
+    # FUNCIÓN PARA CALCULAR LA HUELLA DE UNA ETAPA
+    ###################################################################################
+    def calcular_huella_etapa(self, etapa, partes):
+        """
+        Función para calcular la huella de una etapa a partir de las partes de su input (versión de la tabla, texto
+        de la query, parámetros...). Cualquier cambio en una parte da otra huella.
+        """
+        return hashlib.sha256(json.dumps([etapa, partes], sort_keys = True, default = str).encode()).hexdigest()
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER LA SALIDA DE UNA ETAPA DE LA CACHÉ O CALCULARLA
+    ###################################################################################
+    def memorizar(self, etapa, partes, funcion):
+        """
+        Función para obtener la salida de una etapa (diccionario de DataFrames): de la caché si ya se calculó para
+        la misma huella o ejecutando funcion() y guardando cada DataFrame como Parquet.
+        """
+        huella = self.calcular_huella_etapa(etapa, partes)
+        ruta = self.obtener_ruta(huella)
+        if ruta is not None:
+            try:
+                resultado = {
+                    archivo[:-len(".parquet")]: pd.read_parquet(os.path.join(ruta, archivo))
+                    for archivo in sorted(os.listdir(ruta)) if archivo.endswith(".parquet")
+                }
+                self.aciertos += 1
+                logging.info(f"Etapa '{etapa}' obtenida de la caché de resultados ({huella[:12]})")
+                return resultado
+            except (OSError, ValueError) as e:
+                logging.warning(f"No se pudo leer la etapa '{etapa}' de la caché de resultados ({huella[:12]}): {e}")
+
+        resultado = funcion()
+
+        def escribir(ruta_temporal):
+            for nombre, df in resultado.items():
+                df.to_parquet(os.path.join(ruta_temporal, f"{nombre}.parquet"), index = False)
+
+        self.guardar(huella, etapa, escribir)
+        self.fallos += 1
+        return resultado
+
+    ###################################################################################
+    # FUNCIÓN PARA REPORTAR LOS ACIERTOS Y FALLOS DE LA CACHÉ
+    ###################################################################################
+    def reportar(self):
+        """
+        Función para registrar en el log y retornar los aciertos y fallos de la caché de resultados de etapas.
+        """
+        logging.info(f"Caché de resultados de etapas: {self.aciertos} aciertos, {self.fallos} fallos")
+        return {"aciertos": self.aciertos, "fallos": self.fallos}
@@ -0,0 +1,276 @@
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : 11_gcstransfer
+ARCHIVOS  DESTINO  : ---
+ARCHIVOS  FUENTES  : ---
+OBJETIVO           : Definir las transferencias paralelas de archivos entre Cloud Storage y el disco local
+TIPO               : PY
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene el gestor de transferencias GCS (hilos acotados, descarga por partes de
+archivos grandes, reintentos con espera exponencial) y un cliente de Cloud Storage sobre el sistema de archivos local
+"""
+
+# Librerías Básicas
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import hashlib
+import logging
+import base64
+import shutil
+import time
+import os
+
+# Librerías de GCP
+from google.api_core import exceptions as google_exceptions
+
+# ERRORES TRANSITORIOS QUE JUSTIFICAN REINTENTAR UNA TRANSFERENCIA
+ERRORES_REINTENTABLES = (
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.TooManyRequests,
+    google_exceptions.InternalServerError,
+    ConnectionError,
+    TimeoutError
+)
+
+class GestorTransferenciaGCS:
+    """Clase para descargar y subir carpetas completas de Cloud Storage en paralelo."""
+
+    def __init__(self, cs_cliente, max_hilos = 8, tamano_chunk_mb = 32, reintentos = 3, espera_base = 1.0):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Gestor de Transferencias GCS...")
+
+        self.cs_cliente = cs_cliente
+        self.max_hilos = max_hilos
+        self.tamano_chunk = int(tamano_chunk_mb * 1024 ** 2)
+        self.reintentos = reintentos
+        self.espera_base = espera_base
+
+    ###################################################################################
+    # FUNCIÓN PARA EJECUTAR UNA OPERACIÓN CON REINTENTOS Y ESPERA EXPONENCIAL
+    ###################################################################################
+    def con_reintentos(self, operacion, descripcion):
+        """
+        Función para ejecutar una operación reintentando los errores transitorios con espera exponencial.
+        """
+        for intento in range(self.reintentos + 1):
+            try:
+                return operacion()
+            except ERRORES_REINTENTABLES as e:
+                if intento == self.reintentos:
+                    raise
+                espera = self.espera_base * 2 ** intento
+                logging.warning(f"Error transitorio en {descripcion} ({e}); reintento {intento + 1} en {espera:.1f} s")
+                time.sleep(espera)
+
+    ###################################################################################
+    # FUNCIÓN PARA DIVIDIR LA DESCARGA DE UN BLOB EN TAREAS (RANGOS SI ES GRANDE)
+    ###################################################################################
+    def preparar_descarga_blob(self, blob, ruta_local):
+        """
+        Función para dividir la descarga de un blob en tareas. Los blobs más grandes que el tamaño de chunk se reparten
+        en rangos que se escriben en su posición de un archivo ya reservado; cada rango se reintenta por separado.
+        """
+        os.makedirs(os.path.dirname(ruta_local) or ".", exist_ok = True)
+        tamano = blob.size or 0
+
+        if tamano <= self.tamano_chunk:
+            def descargar_completo():
+                self.con_reintentos(lambda: blob.download_to_filename(ruta_local), f"descarga de {blob.name}")
+                return tamano
+            return [descargar_completo]
+
+        # RESERVAR EL ARCHIVO PARA ESCRIBIR CADA RANGO EN SU POSICIÓN
+        with open(ruta_local, "wb") as f:
+            f.truncate(tamano)
+
+        def descargar_rango(inicio):
+            fin = min(inicio + self.tamano_chunk, tamano) - 1
+            contenido = self.con_reintentos(lambda: blob.download_as_bytes(start = inicio, end = fin), f"descarga de {blob.name} [{inicio}-{fin}]")
+            with open(ruta_local, "r+b") as f:
+                f.seek(inicio)
+                f.write(contenido)
+            return len(contenido)
+
+        return [lambda inicio = inicio: descargar_rango(inicio) for inicio in range(0, tamano, self.tamano_chunk)]
+
+    ###################################################################################
+    # FUNCIÓN PARA VERIFICAR EL MD5 DE UN ARCHIVO DESCARGADO POR PARTES
+    ###################################################################################
+    def verificar_md5(self, blob, ruta_local):
+        """
+        Función para verificar que el archivo armado por rangos tenga el mismo MD5 que el blob.
+        """
+        if not blob.md5_hash:
+            return
+        md5 = hashlib.md5()
+        with open(ruta_local, "rb") as f:
+            for bloque in iter(lambda: f.read(self.tamano_chunk), b""):
+                md5.update(bloque)
+        if base64.b64encode(md5.digest()).decode() != blob.md5_hash:
+            raise IOError(f"El MD5 de {blob.name} descargado por partes no coincide.")
+
+    ###################################################################################
+    # FUNCIÓN PARA DESCARGAR TODOS LOS BLOBS DE UN PREFIJO
+    ###################################################################################
+    def descargar_prefijo(self, gcs_uri, local_dir, blobs = None):
+        """
+        Función para descargar en paralelo todos los blobs bajo una URI gs://bucket/prefijo a una carpeta local.
+        Archivos completos y rangos de archivos grandes comparten un mismo pool de hilos acotado.
+        Devuelve las métricas de la transferencia (archivos, bytes, segundos, MB/s).
+        """
+        parsed_uri = urlparse(gcs_uri)
+        bucket_name, prefix = parsed_uri.netloc, parsed_uri.path.lstrip("/")
+
+        if blobs is None:
+            blobs = self.con_reintentos(lambda: list(self.cs_cliente.list_blobs(bucket_name, prefix=prefix)), f"listado de {gcs_uri}")
+        blobs = [blob for blob in blobs if not blob.name.endswith("/")]
+
+        inicio = time.perf_counter()
+        rutas = [os.path.join(local_dir, blob.name[len(prefix):].lstrip("/")) for blob in blobs]
+        tareas = [tarea for blob, ruta in zip(blobs, rutas) for tarea in self.preparar_descarga_blob(blob, ruta)]
+
+        with ThreadPoolExecutor(max_workers = self.max_hilos) as executor:
+            total_bytes = sum(executor.map(lambda tarea: tarea(), tareas))
+
+        for blob, ruta in zip(blobs, rutas):
+            if (blob.size or 0) > self.tamano_chunk:
+                self.verificar_md5(blob, ruta)
+        return self.reportar("Descarga", gcs_uri, len(blobs), total_bytes, time.perf_counter() - inicio)
+
+    ###################################################################################
+    # FUNCIÓN PARA SUBIR UNA CARPETA LOCAL A UN PREFIJO
+    ###################################################################################
+    def subir_carpeta(self, local_dir, gcs_uri):
+        """
+        Función para subir en paralelo todos los archivos de una carpeta local bajo una URI gs://bucket/prefijo.
+        Los archivos grandes se suben con carga reanudable por chunks. Devuelve las métricas de la transferencia.
+        """
+        parsed_uri = urlparse(gcs_uri)
+        bucket = self.cs_cliente.bucket(parsed_uri.netloc)
+        path_gcs_sin_bucket = parsed_uri.path.lstrip("/")
+
+        archivos = [os.path.join(root, file) for root, _, files in os.walk(local_dir) for file in files]
+
+        def subir(file_path):
+            relative_path = os.path.relpath(file_path, local_dir)
+            blob = bucket.blob(os.path.join(path_gcs_sin_bucket, relative_path))
+            tamano = os.path.getsize(file_path)
+            if tamano > self.tamano_chunk:
+                blob.chunk_size = self.tamano_chunk
+            self.con_reintentos(lambda: blob.upload_from_filename(file_path), f"subida de {relative_path}")
+            return tamano
+
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers = self.max_hilos) as executor:
+            total_bytes = sum(executor.map(subir, archivos))
+        return self.reportar("Subida", gcs_uri, len(archivos), total_bytes, time.perf_counter() - inicio)
+
+    def reportar(self, operacion, gcs_uri, archivos, total_bytes, segundos):
+        metricas = {
+            "archivos": archivos,
+            "bytes": total_bytes,
+            "segundos": round(segundos, 3),
+            "mb_por_segundo": round(total_bytes / 1024 ** 2 / segundos, 2) if segundos > 0 else None
+        }
+        logging.info(f"{operacion} {gcs_uri}: {archivos} archivos, {total_bytes / 1024 ** 2:.1f} MB en {segundos:.2f} s ({metricas['mb_por_segundo']} MB/s)")
+        return metricas
+
+class BlobLocal:
+    """Clase que imita un blob de Cloud Storage sobre un archivo local."""
+
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.chunk_size = None
+
+    @property
+    def ruta(self):
+        return os.path.join(self.bucket.ruta, self.name)
+
+    @property
+    def size(self):
+        return os.path.getsize(self.ruta) if os.path.exists(self.ruta) else None
+
+    @property
+    def generation(self):
+        return os.stat(self.ruta).st_mtime_ns if os.path.exists(self.ruta) else None
+
+    @property
+    def md5_hash(self):
+        if not os.path.exists(self.ruta):
+            return None
+        with open(self.ruta, "rb") as f:
+            return base64.b64encode(hashlib.md5(f.read()).digest()).decode()
+
+    def exists(self):
+        return os.path.isfile(self.ruta)
+
+    def reload(self):
+        if not self.exists():
+            raise google_exceptions.NotFound(f"No existe gs://{self.bucket.name}/{self.name}")
+
+    def download_as_bytes(self, start = None, end = None):
+        self.reload()
+        with open(self.ruta, "rb") as f:
+            if start is None:
+                return f.read()
+            f.seek(start)
+            return f.read(None if end is None else end - start + 1)
+
+    def download_to_filename(self, filename):
+        self.reload()
+        shutil.copyfile(self.ruta, filename)
+
+    def upload_from_filename(self, filename):
+        os.makedirs(os.path.dirname(self.ruta), exist_ok = True)
+        shutil.copyfile(filename, self.ruta)
+
+    def upload_from_string(self, data):
+        os.makedirs(os.path.dirname(self.ruta), exist_ok = True)
+        with open(self.ruta, "wb") as f:
+            f.write(data.encode() if isinstance(data, str) else data)
+
+    def delete(self):
+        self.reload()
+        os.remove(self.ruta)
+
+class BucketLocal:
+    """Clase que imita un bucket de Cloud Storage sobre una carpeta local."""
+
+    def __init__(self, ruta_base, name):
+        self.name = name
+        self.ruta = os.path.join(ruta_base, name)
+
+    def blob(self, blob_name):
+        return BlobLocal(self, blob_name)
+
+class ClienteStorageLocal:
+    """Clase que imita al cliente de Cloud Storage sobre el sistema de archivos local (un bucket por carpeta)."""
+
+    def __init__(self, ruta_base):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Cliente de Storage Local...")
+
+        self.ruta_base = ruta_base
+
+    def bucket(self, bucket_name):
+        return BucketLocal(self.ruta_base, bucket_name)
+
+    def list_blobs(self, bucket_name, prefix = ""):
+        bucket = self.bucket(bucket_name)
+        nombres = sorted(
+            os.path.relpath(os.path.join(root, file), bucket.ruta).replace(os.sep, "/")
+            for root, _, files in os.walk(bucket.ruta)
+            for file in files
+        )
+        return [bucket.blob(nombre) for nombre in nombres if nombre.startswith(prefix)]
@@ -0,0 +1,326 @@
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : 12_backfill
+ARCHIVOS  DESTINO  : ---
+ARCHIVOS  FUENTES  : Tablas en BigQuery
+OBJETIVO           : Definir el almacén en memoria del histórico y el planificador paralelo para simular varios meses (backfill)
+TIPO               : PY
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene el almacén columnar (Arrow) que lee una sola vez el rango de fechas de todos los
+meses simulados y sirve la ventana de cada mes como un corte sin copia, y el planificador que prepara los meses en un
+pool de procesos mientras el proceso principal entrena, proyecta y monitorea cada mes en orden
+"""
+
+# Librerías Propias
+from classes._07_simulateforecast import preparar_mes_en_proceso
+
+# Librerías Básicas
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import multiprocessing
+import datetime
+import logging
+import time
+
+# Librerías para Datos
+import numpy as np
+
+# ESTADOS CON LOS QUE TERMINA UN MES DEL BACKFILL
+ESTADOS_FINALES = ("terminado", "sin insumos", "error")
+
+class AlmacenHistoricoBackfill:
+    """Clase para leer una sola vez el histórico de todos los meses de un backfill y servir la ventana de cada mes."""
+
+    def __init__(self, gestor_datos, tabla, columnas, fecha_col):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Almacén del Histórico para Backfill...")
+
+        self.DataManager = gestor_datos
+        self.tabla = tabla
+        self.columnas = columnas
+        self.fecha_col = fecha_col
+
+        # TABLA ARROW ORDENADA POR FECHA Y SUS FECHAS COMO ARREGLO NUMPY (PARA BUSCAR LOS CORTES)
+        self.tabla_arrow = None
+        self.fechas = None
+        self.filtros_base = []
+        self.filas_servidas = 0
+
+        # LECTURAS QUE NO DEPENDEN DEL MES SIMULADO (SKUS ANALIZADOS, VERIFICACIONES, MUESTRAS)
+        self.cache_lecturas = {}
+
+    ###################################################################################
+    # FUNCIÓN PARA SEPARAR LOS FILTROS DE FECHA DEL RESTO
+    ###################################################################################
+    def separar_filtros(self, filtros):
+        """
+        Función para separar una lista de filtros en el rango de fechas [inicio, fin) y los demás filtros.
+        """
+        inicio, fin, otros = None, None, []
+        for columna, operador, valor in filtros:
+            if columna == self.fecha_col and operador.strip() == ">=":
+                inicio = valor if inicio is None else max(inicio, valor)
+            elif columna == self.fecha_col and operador.strip() == "<":
+                fin = valor if fin is None else min(fin, valor)
+            else:
+                otros.append((columna, operador.strip(), valor))
+
+        if inicio is None or fin is None:
+            raise ValueError(f"Los filtros deben acotar {self.fecha_col} con '>=' y '<': {filtros}")
+        return inicio, fin, otros
+
+    ###################################################################################
+    # FUNCIÓN PARA LEER UNA SOLA VEZ EL RANGO QUE CUBRE TODAS LAS LECTURAS DEL BACKFILL
+    ###################################################################################
+    def cargar(self, lista_filtros):
+        """
+        Función para leer de una sola vez la unión de los rangos de fecha de todas las lecturas del backfill (una lista
+        de listas de filtros, las mismas que arma ajustar_queries para cada mes). Todas deben compartir los filtros que
+        no son de fecha. La tabla se guarda en memoria en formato Arrow, ordenada por fecha.
+        """
+        rangos = [self.separar_filtros(filtros) for filtros in lista_filtros]
+        self.filtros_base = rangos[0][2]
+        if any(sorted(otros, key = str) != sorted(self.filtros_base, key = str) for _, _, otros in rangos):
+            raise ValueError("Todas las lecturas del backfill deben compartir los filtros que no son de fecha.")
+
+        inicio = min(rango[0] for rango in rangos)
+        fin = max(rango[1] for rango in rangos)
+        logging.info(f"Leyendo una sola vez el histórico del backfill de {self.tabla}: [{inicio}, {fin})")
+
+        tabla_arrow = self.DataManager.leer_tabla_arrow(
+            self.tabla,
+            columnas = self.columnas,
+            filtros = [(self.fecha_col, ">=", inicio), (self.fecha_col, "<", fin)] + self.filtros_base,
+            como_dataframe = False
+        )
+        self.tabla_arrow = tabla_arrow.sort_by(self.fecha_col)
+        self.fechas = self.tabla_arrow.column(self.fecha_col).to_numpy()
+        self.filas_servidas = 0
+        return self.tabla_arrow.num_rows
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER LA VENTANA DE UNA LECTURA COMO CORTE DE LA TABLA EN MEMORIA
+    ###################################################################################
+    def obtener_tabla(self, filtros, como_dataframe = True):
+        """
+        Función para obtener las filas que devolvería leer_tabla_arrow con estos filtros. Como la tabla está ordenada por
+        fecha, el rango [inicio, fin) es un corte contiguo (slice de Arrow, sin copia) ubicado con searchsorted.
+        """
+        if self.tabla_arrow is None:
+            raise ValueError("El almacén del backfill no se ha cargado.")
+
+        inicio, fin, otros = self.separar_filtros(filtros)
+        if sorted(otros, key = str) != sorted(self.filtros_base, key = str):
+            raise ValueError(f"Filtros no cubiertos por el almacén del backfill: {otros}")
+
+        desde, hasta = np.searchsorted(self.fechas, self.a_datetime64(inicio)), np.searchsorted(self.fechas, self.a_datetime64(fin))
+        corte = self.tabla_arrow.slice(desde, hasta - desde)
+        self.filas_servidas += corte.num_rows
+
+        return corte.to_pandas() if como_dataframe else corte
+
+    ###################################################################################
+    # FUNCIÓN PARA LLEVAR UNA FECHA DE FILTRO AL TIPO DE LA COLUMNA DE FECHAS
+    ###################################################################################
+    def a_datetime64(self, valor):
+        """
+        Función para convertir una fecha del filtro (date, datetime o texto) a la misma unidad que la columna de
+        fechas ordenada, para buscarla con searchsorted.
+        """
+        if isinstance(valor, datetime.datetime) or not isinstance(valor, datetime.date):
+            return np.datetime64(valor).astype(self.fechas.dtype)
+        return np.datetime64(valor, "D").astype(self.fechas.dtype)
+
+    ###################################################################################
+    # FUNCIÓN PARA REUTILIZAR LECTURAS QUE NO DEPENDEN DEL MES SIMULADO
+    ###################################################################################
+    def obtener_o_leer(self, clave, funcion_lectura):
+        """
+        Función para leer una sola vez (y luego reutilizar) un resultado que es igual para todos los meses simulados.
+        """
+        if clave not in self.cache_lecturas:
+            self.cache_lecturas[clave] = funcion_lectura()
+        return self.cache_lecturas[clave]
+
+    ###################################################################################
+    # FUNCIÓN PARA REPORTAR LAS FILAS LEÍDAS FRENTE A LAS SERVIDAS
+    ###################################################################################
+    def reportar(self):
+        """
+        Función para informar cuántas filas se leyeron de la fuente frente a las que se sirvieron desde memoria.
+        """
+        filas_leidas = self.tabla_arrow.num_rows if self.tabla_arrow is not None else 0
+        logging.info(f"Backfill: {filas_leidas} filas leídas una vez de {self.tabla}, {self.filas_servidas} filas servidas desde memoria")
+        return {"filas_leidas": filas_leidas, "filas_servidas": self.filas_servidas}
+
+###################################################################################
+# FUNCIÓN PARA CONFIGURAR EL LOGGING EN UN PROCESO DEL POOL DEL BACKFILL
+###################################################################################
+def inicializar_proceso_backfill():
+    """
+    Función para configurar el logging de cada proceso del pool (se inician con spawn, sin la configuración del principal).
+    """
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(processName)s - %(levelname)s - %(message)s')
+
+class PlanificadorBackfillParalelo:
+    """Clase para ejecutar un backfill preparando los meses en paralelo y entrenando / proyectando en orden."""
+
+    def __init__(self, gestor_simulacion, procesos = 2, al_terminar_mes = None, monitorear = True):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Planificador Paralelo del Backfill...")
+
+        self.SimulationManager = gestor_simulacion
+        self.procesos = procesos
+        self.al_terminar_mes = al_terminar_mes
+        self.monitorear = monitorear
+
+        # ESTADO DE CADA MES SIMULADO (YYYY-MM -> ESTADO, SEGUNDOS DE PREPARACIÓN, SEGUNDOS TOTALES, ERROR)
+        self.estados = {}
+        self.inicios = {}
+
+    ###################################################################################
+    # FUNCIÓN PARA REGISTRAR EL ESTADO DE UN MES
+    ###################################################################################
+    def marcar_estado(self, mes, estado, **detalle):
+        """
+        Función para registrar e informar el nuevo estado de un mes del backfill.
+        """
+        clave = mes.strftime("%Y-%m")
+        self.inicios.setdefault(clave, time.perf_counter())
+        self.estados.setdefault(clave, {}).update(detalle, estado = estado)
+        if estado in ESTADOS_FINALES:
+            self.estados[clave]["segundos_total"] = round(time.perf_counter() - self.inicios[clave], 2)
+        logging.info(f"Backfill {clave}: {estado}" + (f" ({detalle})" if detalle else ""))
+
+    ###################################################################################
+    # FUNCIÓN PARA ENVIAR AL POOL LA PREPARACIÓN DE UN MES
+    ###################################################################################
+    def enviar_mes(self, executor, contexto, mes, almacen_historico):
+        """
+        Función para ejecutar en el proceso principal lo que lee o escribe en BigQuery antes de preparar un mes
+        (queries, insumos, tabla output) y enviar al pool la preparación, segmentación y proyecciones sin modelo.
+        Devuelve (mes, insumos, puntos, futuro); futuro es None si el mes no necesita proyección o si una ejecución
+        anterior ya terminó su carga (punto de control).
+        """
+        sim = self.SimulationManager
+        self.marcar_estado(mes, "verificando")
+        try:
+            sim.ajustar_queries(mes)
+            insumos = sim.verificar_insumos(almacen_historico)
+            if insumos is None:
+                self.marcar_estado(mes, "sin insumos")
+                return mes, None, None, None
+
+            puntos = sim.abrir_puntos_control(mes, insumos["df_sku"], sim.obtener_version_input(almacen_historico))
+            if puntos.completa("carga"):
+                self.marcar_estado(mes, "carga retomada")
+                return mes, insumos, puntos, None
+            if sim.verificar_proyeccion_mes(insumos["df_muestra_output"]):
+                self.marcar_estado(mes, "proyección existente")
+                return mes, insumos, puntos, None
+
+            df_36_meses_demanda = sim.leer_consumo_demanda(sim.p.filtros_planificacion_demanda, almacen_historico)
+            futuro = executor.submit(preparar_mes_en_proceso, contexto, df_36_meses_demanda, insumos["df_sku"])
+            self.marcar_estado(mes, "preparando")
+            return mes, insumos, puntos, futuro
+        except Exception as e:
+            logging.exception(f"Falló la verificación del mes {mes.strftime('%Y-%m')} del backfill")
+            self.marcar_estado(mes, "error", error = str(e))
+            return mes, None, None, None
+
+    ###################################################################################
+    # FUNCIÓN PARA TERMINAR UN MES EN EL PROCESO PRINCIPAL
+    ###################################################################################
+    def terminar_mes(self, mes, insumos, puntos, futuro, almacen_historico):
+        """
+        Función para terminar un mes en el proceso principal: esperar su preparación, obtener o entrenar el modelo de
+        su versión, proyectar, cargar y monitorear. Los meses se terminan de uno en uno y en orden, de modo que el
+        entrenamiento e inferencia de cada versión no compiten entre sí y el monitoreo encuentra cargadas las
+        proyecciones de los meses anteriores. La carga y el monitoreo dejan su punto de control: al volver a ejecutar
+        el backfill, los meses que ya los terminaron no se vuelven a preparar, proyectar ni monitorear.
+        """
+        sim = self.SimulationManager
+        if insumos is None:
+            return
+        try:
+            sim.ajustar_queries(mes)
+            if futuro is not None:
+                def cargar():
+                    datos, proyecciones_simples, segundos = futuro.result()
+                    self.marcar_estado(mes, "preparado", segundos_preparacion = round(segundos, 2))
+
+                    modelo_actual = sim.obtener_modelo_mes(datos["df_sp"])
+                    sim.proyectar_y_cargar_mes(datos, modelo_actual, proyecciones_simples = proyecciones_simples)
+                    self.marcar_estado(mes, "proyectado")
+
+                puntos.ejecutar("carga", cargar)
+
+            if self.monitorear:
+                puntos.ejecutar("monitoreo", lambda: sim.monitorear_mes(insumos["df_muestra_monitoreo"], almacen_historico))
+            puntos.reportar()
+            self.marcar_estado(mes, "terminado")
+        except Exception as e:
+            logging.exception(f"Falló el mes {mes.strftime('%Y-%m')} del backfill")
+            self.marcar_estado(mes, "error", error = str(e))
+        finally:
+            if self.al_terminar_mes is not None:
+                self.al_terminar_mes(mes)
+
+    ###################################################################################
+    # FUNCIÓN PARA EJECUTAR EL BACKFILL
+    ###################################################################################
+    def ejecutar(self, meses, almacen_historico = None):
+        """
+        Función para simular todos los meses. Se mantienen en preparación a lo sumo procesos + 1 meses por delante del
+        que se está terminando (para acotar la memoria). Si algún mes falla, los demás continúan y al final se lanza
+        una excepción con los meses fallidos.
+        """
+        contexto = self.SimulationManager.crear_contexto_proceso()
+        meses_restantes = iter(meses)
+        en_curso = deque()
+
+        logging.info(f"Iniciando backfill paralelo de {len(meses)} meses con {self.procesos} procesos...")
+        with ProcessPoolExecutor(
+            max_workers = self.procesos,
+            mp_context = multiprocessing.get_context("spawn"),
+            initializer = inicializar_proceso_backfill
+        ) as executor:
+            for mes in meses_restantes:
+                en_curso.append(self.enviar_mes(executor, contexto, mes, almacen_historico))
+                if len(en_curso) > self.procesos:
+                    break
+
+            while en_curso:
+                mes, insumos, puntos, futuro = en_curso.popleft()
+                siguiente = next(meses_restantes, None)
+                if siguiente is not None:
+                    en_curso.append(self.enviar_mes(executor, contexto, siguiente, almacen_historico))
+                self.terminar_mes(mes, insumos, puntos, futuro, almacen_historico)
+
+        self.reportar()
+        fallidos = [clave for clave, estado in self.estados.items() if estado["estado"] == "error"]
+        if fallidos:
+            raise Exception(f"Fallaron los meses del backfill: {', '.join(fallidos)}")
+        return self.estados
+
+    ###################################################################################
+    # FUNCIÓN PARA REPORTAR EL ESTADO FINAL DE CADA MES
+    ###################################################################################
+    def reportar(self):
+        """
+        Función para informar el estado final de cada mes del backfill.
+        """
+        for clave, estado in self.estados.items():
+            logging.info(f"Backfill {clave}: {estado['estado']}, preparación {estado.get('segundos_preparacion', '-')} s, total {estado.get('segundos_total', '-')} s")
+        return self.estados
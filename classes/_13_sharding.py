@@ -0,0 +1,327 @@
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : 13_sharding
+ARCHIVOS  DESTINO  : Tablas en BigQuery, marcadores en Cloud Storage
+ARCHIVOS  FUENTES  : Tablas en BigQuery
+OBJETIVO           : Repartir el trabajo entre las tareas de un Cloud Run Job (CLOUD_RUN_TASK_INDEX / CLOUD_RUN_TASK_COUNT)
+TIPO               : PY
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene el gestor de fragmentos (asignación determinista de meses o almacenes a cada
+tarea y marcadores en Cloud Storage) y el planificador que ejecuta el fragmento de la tarea y, en la tarea 0
+(coordinadora), consolida las particiones, monitorea y confirma que todas las tareas terminaron
+"""
+
+# Librerías Básicas
+import hashlib
+import logging
+import json
+import time
+import io
+import os
+
+from datetime import datetime
+
+# Librerías para Datos
+import pandas as pd
+import numpy as np
+
+# MODOS DE FRAGMENTACIÓN: MESES DEL BACKFILL O PARTICIÓN HASH DE ALMACENES (SOCIEDAD, CENTRO)
+MODOS_FRAGMENTACION = ("meses", "almacenes")
+
+###################################################################################
+# FUNCIÓN PARA OBTENER EL ÍNDICE Y EL TOTAL DE TAREAS DEL CLOUD RUN JOB
+###################################################################################
+def obtener_tarea_cloud_run():
+    """
+    Función para leer el índice de la tarea, el número de tareas y el nombre de la ejecución que Cloud Run Jobs define
+    en cada contenedor (fuera de Cloud Run: tarea 0 de 1, ejecución "local").
+    """
+    indice = int(os.getenv("CLOUD_RUN_TASK_INDEX", "0"))
+    total = int(os.getenv("CLOUD_RUN_TASK_COUNT", "1"))
+    id_ejecucion = os.getenv("CLOUD_RUN_EXECUTION", "local")
+    return indice, total, id_ejecucion
+
+class GestorFragmentos:
+    """Clase para asignar a cada tarea su fragmento de trabajo y coordinar las tareas con marcadores en Cloud Storage."""
+
+    def __init__(self, cs_cliente, bucket_name, prefix_gcs, indice = 0, total = 1, id_ejecucion = "local", modo = "meses", columnas_almacen = ["CODSOCIEDAD", "CODCENTRO"], espera_maxima_seg = 3000, intervalo_sondeo_seg = 15):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Gestor de Fragmentos...")
+
+        if modo not in MODOS_FRAGMENTACION:
+            raise ValueError(f"Modo de fragmentación no soportado: {modo}. Opciones: {MODOS_FRAGMENTACION}")
+        if not 0 <= indice < total:
+            raise ValueError(f"Índice de tarea {indice} fuera del rango de {total} tareas.")
+
+        self.cs_cliente = cs_cliente
+        self.bucket_name = bucket_name
+        self.prefix_gcs = prefix_gcs.strip("/")
+        self.indice = indice
+        self.total = total
+        self.id_ejecucion = id_ejecucion
+        self.modo = modo
+        self.columnas_almacen = list(columnas_almacen)
+        self.espera_maxima_seg = espera_maxima_seg
+        self.intervalo_sondeo_seg = intervalo_sondeo_seg
+
+    ###################################################################################
+    # FUNCIÓN PARA SABER SI ESTA TAREA ES LA COORDINADORA
+    ###################################################################################
+    @property
+    def es_coordinador(self):
+        """
+        Función para saber si esta tarea es la coordinadora (la tarea 0), que espera a las demás y carga el resultado.
+        """
+        return self.indice == 0
+
+    ###################################################################################
+    # FUNCIÓN PARA ASIGNAR LOS MESES DEL BACKFILL A LA TAREA
+    ###################################################################################
+    def asignar_meses(self, meses):
+        """
+        Función para obtener los meses que le tocan a esta tarea (reparto circular, igual en todas las tareas).
+        """
+        return [mes for i, mes in enumerate(meses) if i % self.total == self.indice]
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER EL FRAGMENTO DE CADA FILA SEGÚN SU ALMACÉN
+    ###################################################################################
+    def obtener_fragmento_almacen(self, df):
+        """
+        Función para obtener el fragmento de cada fila: MD5 de (sociedad, centro) módulo el número de tareas.
+        El hash se calcula una sola vez por almacén distinto y no depende del proceso (a diferencia de hash()).
+        """
+        if df.empty:
+            return np.empty(0, dtype = np.int64)
+
+        codigos, almacenes = pd.MultiIndex.from_frame(df[self.columnas_almacen].astype(str)).factorize()
+        fragmentos = np.array([
+            int(hashlib.md5("|".join(almacen).encode()).hexdigest()[:16], 16) % self.total
+            for almacen in almacenes
+        ], dtype = np.int64)
+        return fragmentos[codigos]
+
+    ###################################################################################
+    # FUNCIÓN PARA QUEDARSE CON LAS FILAS DE LOS ALMACENES DE LA TAREA
+    ###################################################################################
+    def filtrar_almacenes(self, df):
+        """
+        Función para quedarse con las filas de los almacenes que le tocan a esta tarea.
+        """
+        return df[self.obtener_fragmento_almacen(df) == self.indice]
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER EL BLOB DE UN ARCHIVO DE LA EJECUCIÓN
+    ###################################################################################
+    def obtener_blob(self, nombre):
+        """
+        Función para obtener el blob de un archivo (marcador o parte) dentro del prefijo de la ejecución.
+        """
+        return self.cs_cliente.bucket(self.bucket_name).blob(f"{self.prefix_gcs}/{self.id_ejecucion}/{nombre}")
+
+    ###################################################################################
+    # FUNCIONES PARA ESCRIBIR Y ESPERAR MARCADORES EN CLOUD STORAGE
+    ###################################################################################
+
+    def marcar(self, nombre, **detalle):
+        """
+        Función para escribir el marcador de una etapa terminada por esta tarea (JSON con la tarea y el detalle).
+        """
+        contenido = {"indice": self.indice, "total": self.total, "modo": self.modo, "fecha": datetime.now().isoformat(), **detalle}
+        self.obtener_blob(f"{nombre}.json").upload_from_string(json.dumps(contenido, default = str))
+        logging.info(f"Marcador escrito: {nombre} ({detalle})")
+
+    def esperar_marcadores(self, nombres):
+        """
+        Función para esperar a que existan todos los marcadores (sondeando cada intervalo_sondeo_seg, hasta
+        espera_maxima_seg). Devuelve el contenido de cada marcador.
+        """
+        pendientes = list(nombres)
+        contenidos = {}
+        inicio = time.time()
+        while True:
+            for nombre in list(pendientes):
+                blob = self.obtener_blob(f"{nombre}.json")
+                if blob.exists():
+                    contenidos[nombre] = json.loads(blob.download_as_bytes())
+                    pendientes.remove(nombre)
+            if not pendientes:
+                return contenidos
+            if time.time() - inicio > self.espera_maxima_seg:
+                raise TimeoutError(f"Se agotó la espera de {self.espera_maxima_seg} s por los marcadores: {pendientes}")
+            logging.info(f"Esperando {len(pendientes)} marcadores de otras tareas: {pendientes[:5]}")
+            time.sleep(self.intervalo_sondeo_seg)
+
+    ###################################################################################
+    # FUNCIONES PARA GUARDAR Y LEER LAS PARTES DE UNA PARTICIÓN
+    ###################################################################################
+    def guardar_parte(self, nombre, df):
+        """
+        Función para guardar en Cloud Storage (Parquet) la parte de una partición calculada por esta tarea.
+        """
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index = False)
+        self.obtener_blob(f"{nombre}.parquet").upload_from_string(buffer.getvalue())
+
+    def leer_partes(self, nombres):
+        """
+        Función para leer y unir las partes de una partición guardadas por las tareas.
+        """
+        partes = [pd.read_parquet(io.BytesIO(self.obtener_blob(f"{nombre}.parquet").download_as_bytes())) for nombre in nombres]
+        return pd.concat(partes, ignore_index = True)
+
+class PlanificadorFragmentado:
+    """Clase para ejecutar el fragmento de trabajo de una tarea del Cloud Run Job y coordinar su finalización."""
+
+    def __init__(self, gestor_simulacion, gestor_fragmentos, ejecutar_meses, al_terminar_mes = None):
+        """
+        Inicializa la clase. ejecutar_meses(meses, monitorear) ejecuta una lista de meses completa (en secuencia o con
+        el backfill paralelo).
+        """
+        logging.info("Inicializando la clase de Planificador Fragmentado...")
+
+        self.SimulationManager = gestor_simulacion
+        self.ShardManager = gestor_fragmentos
+        self.ejecutar_meses = ejecutar_meses
+        self.al_terminar_mes = al_terminar_mes
+
+    ###################################################################################
+    # FUNCIÓN PARA EJECUTAR EL FRAGMENTO DE LA TAREA
+    ###################################################################################
+    def ejecutar(self, meses, almacen_historico = None):
+        """
+        Función para ejecutar el fragmento de esta tarea según el modo de fragmentación.
+        """
+        frag = self.ShardManager
+        logging.info(f"Tarea {frag.indice + 1}/{frag.total} de la ejecución {frag.id_ejecucion}, fragmentación por {frag.modo}")
+        if frag.modo == "meses":
+            return self.ejecutar_por_meses(meses, almacen_historico)
+        return self.ejecutar_por_almacenes(meses, almacen_historico)
+
+    ###################################################################################
+    # FUNCIÓN PARA EJECUTAR LOS MESES ASIGNADOS A LA TAREA
+    ###################################################################################
+    def ejecutar_por_meses(self, meses, almacen_historico = None):
+        """
+        Función para proyectar los meses asignados a esta tarea (cada mes escribe su propia partición). El monitoreo
+        de un mes lee proyecciones de meses anteriores, que pueden ser de otras tareas; por eso lo hace la tarea
+        coordinadora, en orden, cuando todas las tareas terminaron.
+        """
+        frag = self.ShardManager
+        meses_tarea = frag.asignar_meses(meses)
+        logging.info(f"Meses asignados a la tarea {frag.indice}: {[mes.strftime('%Y-%m') for mes in meses_tarea]}")
+
+        try:
+            self.ejecutar_meses(meses_tarea, monitorear = False)
+        except Exception as e:
+            frag.marcar(f"fragmento_{frag.indice}", estado = "error", error = str(e))
+            raise
+        frag.marcar(f"fragmento_{frag.indice}", estado = "terminado", meses = [mes.strftime("%Y-%m") for mes in meses_tarea])
+
+        if frag.es_coordinador:
+            self.coordinar([f"fragmento_{i}" for i in range(frag.total)])
+            self.monitorear_meses(meses, almacen_historico)
+            frag.marcar("completado", meses = [mes.strftime("%Y-%m") for mes in meses])
+
+    ###################################################################################
+    # FUNCIÓN PARA EJECUTAR TODOS LOS MESES SOBRE LOS ALMACENES DE LA TAREA
+    ###################################################################################
+    def ejecutar_por_almacenes(self, meses, almacen_historico = None):
+        """
+        Función para proyectar, mes a mes, los almacenes asignados a esta tarea. Cada tarea prepara todos los
+        almacenes y luego filtra los suyos: la ventana de meses se completa hasta el último mes con ventas de todo el
+        histórico, que un fragmento por sí solo puede no tener. El modelo de cada versión es global: lo obtiene o
+        entrena la coordinadora con todos los almacenes y las demás tareas esperan su marcador. Cada tarea guarda su parte del mes en Cloud Storage y la coordinadora carga la partición
+        completa y monitorea.
+        """
+        sim = self.SimulationManager
+        frag = self.ShardManager
+
+        for mes in meses:
+            sim.ajustar_queries(mes)
+            periodo = mes.strftime("%Y%m")
+            insumos = sim.verificar_insumos(almacen_historico)
+            if insumos is None:
+                continue
+
+            proyectar = not sim.verificar_proyeccion_mes(insumos["df_muestra_output"])
+            if proyectar:
+                marcador_modelo = f"modelo_{periodo}"
+                marcador_parte = f"proyeccion_{periodo}/fragmento_{frag.indice}"
+                modelo_publicado = False
+                try:
+                    df_36_meses_demanda = sim.leer_consumo_demanda(sim.p.filtros_planificacion_demanda, almacen_historico)
+
+                    # TODAS LAS TAREAS PREPARAN TODOS LOS ALMACENES (EL ÚLTIMO MES DE LA VENTANA ES GLOBAL) Y LUEGO FILTRAN
+                    datos = sim.preparar_datos_mes(df_36_meses_demanda, insumos["df_sku"])
+                    if frag.es_coordinador:
+                        modelo_actual = sim.obtener_modelo_mes(datos["df_sp"])
+                        frag.marcar(marcador_modelo, estado = "terminado", version = sim.p.MODEL_VERSION)
+                        modelo_publicado = True
+                    else:
+                        self.coordinar([marcador_modelo])
+                        modelo_actual = sim.obtener_modelo_mes(datos["df_sp"])
+                    datos = {nombre: frag.filtrar_almacenes(df) for nombre, df in datos.items()}
+
+                    df_parte = sim.proyectar_mes(datos, modelo_actual)
+                except Exception as e:
+                    # SI LA COORDINADORA FALLA ANTES DE PUBLICAR EL MODELO, LAS DEMÁS TAREAS NO DEBEN SEGUIR ESPERÁNDOLO
+                    if frag.es_coordinador and not modelo_publicado:
+                        frag.marcar(marcador_modelo, estado = "error", error = str(e))
+                    frag.marcar(marcador_parte, estado = "error", error = str(e))
+                    raise
+
+                filas = 0 if df_parte is None else len(df_parte)
+                if filas > 0:
+                    frag.guardar_parte(marcador_parte, df_parte)
+                frag.marcar(marcador_parte, estado = "terminado", filas = filas)
+
+            if frag.es_coordinador:
+                if proyectar:
+                    nombres = [f"proyeccion_{periodo}/fragmento_{i}" for i in range(frag.total)]
+                    marcadores = self.coordinar(nombres)
+                    nombres_con_filas = [nombre for nombre in nombres if marcadores[nombre].get("filas", 0) > 0]
+                    if nombres_con_filas:
+                        sim.cargar_proyeccion_mes(frag.leer_partes(nombres_con_filas))
+                sim.monitorear_mes(insumos["df_muestra_monitoreo"], almacen_historico)
+
+            if self.al_terminar_mes is not None:
+                self.al_terminar_mes(mes)
+
+        if frag.es_coordinador:
+            frag.marcar("completado", meses = [mes.strftime("%Y-%m") for mes in meses])
+
+    ###################################################################################
+    # FUNCIÓN PARA ESPERAR A LAS DEMÁS TAREAS
+    ###################################################################################
+    def coordinar(self, nombres):
+        """
+        Función para esperar los marcadores de otras tareas y fallar si alguna terminó con error.
+        """
+        marcadores = self.ShardManager.esperar_marcadores(nombres)
+        fallidos = [nombre for nombre, contenido in marcadores.items() if contenido.get("estado") == "error"]
+        if fallidos:
+            raise Exception(f"Tareas con error: {[(nombre, marcadores[nombre].get('error')) for nombre in fallidos]}")
+        return marcadores
+
+    ###################################################################################
+    # FUNCIÓN PARA MONITOREAR LOS MESES EN ORDEN (COORDINADORA)
+    ###################################################################################
+    def monitorear_meses(self, meses, almacen_historico = None):
+        """
+        Función para calcular y cargar el monitoreo de cada mes, en orden, una vez cargadas todas las proyecciones.
+        """
+        sim = self.SimulationManager
+        for mes in meses:
+            sim.ajustar_queries(mes)
+            insumos = sim.verificar_insumos(almacen_historico)
+            if insumos is not None:
+                sim.monitorear_mes(insumos["df_muestra_monitoreo"], almacen_historico)
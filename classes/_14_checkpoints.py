@@ -0,0 +1,167 @@
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : 14_checkpoints
+ARCHIVOS  DESTINO  : Parquet y marcadores en Cloud Storage
+ARCHIVOS  FUENTES  : Parquet y marcadores en Cloud Storage
+OBJETIVO           : Guardar la salida de cada etapa de la simulación para reanudar un mes desde la última etapa completa
+TIPO               : PY
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene el gestor de puntos de control: cada etapa de ejecutar_simulacion (lectura,
+preparación, conocidos, segmentación, modelo, proyección, carga y monitoreo) guarda sus DataFrames como Parquet bajo
+la fecha de simulación y la huella del input, y una nueva ejecución del mismo mes retoma la última etapa completa
+"""
+
+# Librerías Básicas
+import logging
+import json
+import io
+
+from datetime import datetime
+
+# Librerías para Datos
+import pandas as pd
+
+# ETAPAS DE LA SIMULACIÓN DE UN MES, EN ORDEN
+ETAPAS_SIMULACION = ["lectura", "preparacion", "conocidos", "segmentacion", "modelo", "proyeccion", "carga", "monitoreo"]
+
+# NOMBRE DEL MARCADOR QUE CONFIRMA QUE UNA ETAPA TERMINÓ (SE ESCRIBE DESPUÉS DE SUS PARQUET)
+MARCADOR_COMPLETO = "_COMPLETO.json"
+
+class GestorPuntosControl:
+    """Clase para abrir las sesiones de puntos de control de cada mes simulado en Cloud Storage."""
+
+    def __init__(self, cs_cliente, bucket_name, prefix_gcs, habilitado = True):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Gestor de Puntos de Control...")
+
+        self.cs_cliente = cs_cliente
+        self.bucket_name = bucket_name
+        self.prefix_gcs = prefix_gcs.strip("/")
+        self.habilitado = habilitado
+
+    ###################################################################################
+    # FUNCIÓN PARA ABRIR LA SESIÓN DE PUNTOS DE CONTROL DE UN MES
+    ###################################################################################
+    def abrir(self, clase_producto, fecha_simulacion, huella):
+        """
+        Función para abrir la sesión de un mes: sus puntos de control viven en
+        {prefix}/{clase_producto}/{YYYYMM}/{huella}/{etapa}/, así un cambio en el input o en los parámetros
+        (otra huella) nunca reutiliza etapas de una ejecución anterior.
+        """
+        prefix = f"{self.prefix_gcs}/{clase_producto}/{fecha_simulacion.strftime('%Y%m')}/{huella}"
+        return SesionPuntosControl(self, prefix, habilitado = self.habilitado)
+
+class SesionPuntosControl:
+    """Clase para ejecutar o retomar las etapas de un mes simulado."""
+
+    def __init__(self, gestor, prefix, habilitado = True):
+        """
+        Inicializa la clase. Lista una sola vez los blobs del mes para saber qué etapas ya terminaron.
+        """
+        self.gestor = gestor
+        self.prefix = prefix
+        self.habilitado = habilitado
+        self.resultados = {}
+        self.estados = {}
+        self.blobs = set()
+        if habilitado:
+            self.blobs = {
+                blob.name[len(prefix) + 1:]
+                for blob in gestor.cs_cliente.list_blobs(gestor.bucket_name, prefix = prefix + "/")
+            }
+            completas = [etapa for etapa in ETAPAS_SIMULACION if self.completa(etapa)]
+            if completas:
+                logging.info(f"Puntos de control encontrados en {prefix}: {completas}")
+
+    ###################################################################################
+    # FUNCIÓN PARA OBTENER EL BLOB DE UN ARCHIVO DE LOS PUNTOS DE CONTROL DEL MES
+    ###################################################################################
+    def obtener_blob(self, nombre):
+        """
+        Función para obtener el blob de un archivo dentro del prefijo de los puntos de control del mes.
+        """
+        return self.gestor.cs_cliente.bucket(self.gestor.bucket_name).blob(f"{self.prefix}/{nombre}")
+
+    ###################################################################################
+    # FUNCIÓN PARA SABER SI UNA ETAPA YA TERMINÓ EN UNA EJECUCIÓN ANTERIOR
+    ###################################################################################
+    def completa(self, etapa):
+        """
+        Función para saber si la etapa tiene su marcador de completa en el prefijo del mes.
+        """
+        return f"{etapa}/{MARCADOR_COMPLETO}" in self.blobs
+
+    ###################################################################################
+    # FUNCIONES PARA GUARDAR Y LEER LA SALIDA DE UNA ETAPA
+    ###################################################################################
+    def guardar(self, etapa, resultado):
+        """
+        Función para guardar los DataFrames de la salida de la etapa (uno por Parquet) y, al final, su marcador.
+        Los valores que no son DataFrames (por ejemplo, el modelo) no se guardan.
+        """
+        tablas = {nombre: valor for nombre, valor in resultado.items() if isinstance(valor, pd.DataFrame)}
+        for nombre, df in tablas.items():
+            buffer = io.BytesIO()
+            df.to_parquet(buffer, index = False)
+            self.obtener_blob(f"{etapa}/{nombre}.parquet").upload_from_string(buffer.getvalue())
+
+        contenido = {"etapa": etapa, "tablas": list(tablas), "filas": {nombre: len(df) for nombre, df in tablas.items()}, "fecha": datetime.now().isoformat()}
+        self.obtener_blob(f"{etapa}/{MARCADOR_COMPLETO}").upload_from_string(json.dumps(contenido))
+        self.blobs.add(f"{etapa}/{MARCADOR_COMPLETO}")
+
+    def leer(self, etapa):
+        """
+        Función para leer la salida guardada de una etapa completa.
+        """
+        contenido = json.loads(self.obtener_blob(f"{etapa}/{MARCADOR_COMPLETO}").download_as_bytes())
+        return {
+            nombre: pd.read_parquet(io.BytesIO(self.obtener_blob(f"{etapa}/{nombre}.parquet").download_as_bytes()))
+            for nombre in contenido["tablas"]
+        }
+
+    ###################################################################################
+    # FUNCIÓN PARA EJECUTAR (O RETOMAR) UNA ETAPA
+    ###################################################################################
+    def ejecutar(self, etapa, funcion, persistible = True):
+        """
+        Función para obtener la salida de una etapa (diccionario de DataFrames): de memoria si ya se usó en esta
+        ejecución, del punto de control si terminó en una ejecución anterior o ejecutando funcion() y guardándola.
+        Una etapa no persistible (el modelo o la lectura del histórico, que cuesta lo mismo volver a leer que subir) se
+        vuelve a ejecutar siempre que se necesite su salida; solo se guarda su marcador, que informa que terminó.
+        """
+        if etapa in self.resultados:
+            return self.resultados[etapa]
+
+        if self.habilitado and persistible and self.completa(etapa):
+            logging.info(f"Retomando etapa '{etapa}' desde el punto de control {self.prefix}")
+            resultado = self.leer(etapa)
+            self.estados[etapa] = "retomada"
+        else:
+            logging.info(f"Ejecutando etapa '{etapa}'")
+            resultado = funcion() or {}
+            if self.habilitado:
+                self.guardar(etapa, resultado if persistible else {})
+            self.estados[etapa] = "ejecutada"
+
+        self.resultados[etapa] = resultado
+        return resultado
+
+    ###################################################################################
+    # FUNCIÓN PARA REPORTAR LAS ETAPAS RETOMADAS Y EJECUTADAS
+    ###################################################################################
+    def reportar(self):
+        """
+        Función para registrar en el log y retornar el estado de cada etapa (retomada o ejecutada) del mes.
+        """
+        if self.habilitado:
+            omitidas = [etapa for etapa in ETAPAS_SIMULACION if etapa not in self.estados]
+            logging.info(f"Puntos de control {self.prefix}: {self.estados} (no requeridas: {omitidas})")
+        return dict(self.estados)
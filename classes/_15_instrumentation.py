@@ -0,0 +1,250 @@
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : 15_instrumentation
+ARCHIVOS  DESTINO  : Reporte JSON local, tabla de métricas de ejecución en BigQuery (opcional)
+ARCHIVOS  FUENTES  : ---
+OBJETIVO           : Medir tiempo, CPU, memoria y filas de cada método de los gestores durante una ejecución
+TIPO               : PY
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene el registro de métricas de la ejecución: un context manager y un decorador
+que miden tiempo de pared, tiempo de CPU, aumento del pico de RSS y filas de entrada / salida, la instrumentación de
+todos los métodos de los gestores (Gestor*) del planificador y el reporte agregado por método
+"""
+
+# Librerías Básicas
+import contextlib
+import threading
+import functools
+import resource
+import inspect
+import logging
+import json
+import copy
+import time
+import os
+
+from datetime import datetime
+
+# Librerías para Datos
+import pandas as pd
+import pyarrow as pa
+
+###################################################################################
+# FUNCIÓN PARA CONTAR LAS FILAS DE LOS ARGUMENTOS O DEL RESULTADO DE UN MÉTODO
+###################################################################################
+def contar_filas(valor, profundidad = 2):
+    """
+    Función para contar las filas de los DataFrames / tablas Arrow de un valor, incluidos los que vienen dentro de
+    listas, tuplas o diccionarios (hasta dos niveles, por ejemplo los datos del mes o (df_sp, df_np)).
+    """
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return len(valor)
+    if isinstance(valor, pa.Table):
+        return valor.num_rows
+    if profundidad > 0 and isinstance(valor, (list, tuple)):
+        return sum(contar_filas(v, profundidad - 1) for v in valor)
+    if profundidad > 0 and isinstance(valor, dict):
+        return sum(contar_filas(v, profundidad - 1) for v in valor.values())
+    return 0
+
+###################################################################################
+# FUNCIÓN PARA LEER EL PICO DE RSS DEL PROCESO
+###################################################################################
+def obtener_pico_rss_mb():
+    """
+    Función para obtener el pico de memoria residente del proceso en MB (ru_maxrss está en KB en Linux).
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+###################################################################################
+# FUNCIÓN PARA OBTENER UNA COPIA DE UN GESTOR SIN INSTRUMENTAR
+###################################################################################
+def sin_instrumentacion(objeto):
+    """
+    Función para obtener una copia superficial de un gestor sin los métodos instrumentados. Se usa para enviar un
+    gestor a otro proceso: las envolturas apuntan al objeto original y al registro, que no se pueden enviar.
+    """
+    copia = copy.copy(objeto)
+    for nombre, valor in list(vars(copia).items()):
+        if hasattr(valor, "metodo_original"):
+            delattr(copia, nombre)
+    return copia
+
+class RegistroMetricas:
+    """Clase para registrar las métricas de cada método medido durante una ejecución y reportarlas al terminar."""
+
+    def __init__(self, id_ejecucion = "local", habilitado = True):
+        """
+        Inicializa la clase.
+        """
+        logging.info("Inicializando la clase de Registro de Métricas...")
+
+        self.id_ejecucion = id_ejecucion
+        self.habilitado = habilitado
+        self.inicio = datetime.now()
+        self.llamadas = []
+        self.bloqueo = threading.Lock()
+        self.local = threading.local()
+
+    ###################################################################################
+    # CONTEXT MANAGER PARA MEDIR UN BLOQUE
+    ###################################################################################
+    @contextlib.contextmanager
+    def medir(self, nombre, filas_entrada = 0):
+        """
+        Context manager para medir un bloque: tiempo de pared, tiempo de CPU del proceso, aumento del pico de RSS y
+        filas. Los bloques anidados registran a su padre, y los segundos propios descuentan a los hijos. Las filas de
+        salida se indican con medicion["filas_salida"] dentro del bloque.
+        """
+        if not self.habilitado:
+            yield {}
+            return
+
+        pila = self.local.__dict__.setdefault("pila", [])
+        medicion = {
+            "nombre": nombre,
+            "padre": pila[-1]["nombre"] if pila else None,
+            "profundidad": len(pila),
+            "filas_entrada": filas_entrada,
+            "filas_salida": 0,
+            "segundos_hijos": 0.0,
+            "estado": "terminado"
+        }
+        pila.append(medicion)
+        inicio, inicio_cpu, inicio_rss = time.perf_counter(), time.process_time(), obtener_pico_rss_mb()
+        try:
+            yield medicion
+        except BaseException:
+            medicion["estado"] = "error"
+            raise
+        finally:
+            pila.pop()
+            segundos = time.perf_counter() - inicio
+            medicion.update({
+                "segundos": round(segundos, 4),
+                "segundos_propios": round(segundos - medicion.pop("segundos_hijos"), 4),
+                "segundos_cpu": round(time.process_time() - inicio_cpu, 4),
+                "aumento_pico_rss_mb": round(obtener_pico_rss_mb() - inicio_rss, 2)
+            })
+            if pila:
+                pila[-1]["segundos_hijos"] += segundos
+            with self.bloqueo:
+                self.llamadas.append(medicion)
+
+    ###################################################################################
+    # DECORADOR PARA MEDIR UNA FUNCIÓN O MÉTODO
+    ###################################################################################
+    def decorar(self, funcion, nombre = None):
+        """
+        Función para envolver una función de modo que cada llamada se mida, contando las filas de sus argumentos y
+        de su resultado. Se puede usar como decorador: @registro.decorar.
+        """
+        nombre = nombre or funcion.__qualname__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with self.medir(nombre, filas_entrada = contar_filas(list(args) + list(kwargs.values()), 1) if self.habilitado else 0) as medicion:
+                resultado = funcion(*args, **kwargs)
+                if self.habilitado:
+                    medicion["filas_salida"] = contar_filas(resultado)
+                return resultado
+
+        envoltura.metodo_original = funcion
+        return envoltura
+
+    ###################################################################################
+    # FUNCIÓN PARA INSTRUMENTAR TODOS LOS MÉTODOS PÚBLICOS DE UN OBJETO
+    ###################################################################################
+    def instrumentar(self, objeto, prefijo = None):
+        """
+        Función para reemplazar, solo en esta instancia, cada método público por su versión medida (también las
+        llamadas internas self.metodo(...), que quedan anidadas). No se instrumentan propiedades ni generadores.
+        """
+        prefijo = prefijo or type(objeto).__name__
+        metodos = []
+        for nombre, funcion in inspect.getmembers(type(objeto), predicate = inspect.isfunction):
+            if nombre.startswith("_") or inspect.isgeneratorfunction(funcion) or hasattr(vars(objeto).get(nombre), "metodo_original"):
+                continue
+            setattr(objeto, nombre, self.decorar(getattr(objeto, nombre), f"{prefijo}.{nombre}"))
+            metodos.append(nombre)
+        return metodos
+
+    def instrumentar_gestores(self, contenedor):
+        """
+        Función para instrumentar todos los atributos del planificador cuya clase empieza con "Gestor".
+        """
+        instrumentados = {
+            nombre: len(self.instrumentar(objeto, nombre))
+            for nombre, objeto in list(vars(contenedor).items())
+            if type(objeto).__name__.startswith("Gestor")
+        }
+        logging.info(f"Métodos instrumentados por gestor: {instrumentados}")
+        return instrumentados
+
+    ###################################################################################
+    # FUNCIONES PARA ARMAR Y GUARDAR EL REPORTE DE LA EJECUCIÓN
+    ###################################################################################
+    def obtener_resumen(self):
+        """
+        Función para agregar las llamadas por nombre: número de llamadas, errores, segundos totales y propios, CPU,
+        máximo aumento del pico de RSS y filas. Ordenado por segundos propios (dónde se fue realmente el tiempo).
+        """
+        if not self.llamadas:
+            return pd.DataFrame()
+        df = pd.DataFrame(self.llamadas)
+        df["errores"] = (df["estado"] == "error").astype(int)
+        resumen = df.groupby("nombre", as_index = False).agg(
+            llamadas = ("segundos", "size"),
+            errores = ("errores", "sum"),
+            segundos = ("segundos", "sum"),
+            segundos_propios = ("segundos_propios", "sum"),
+            segundos_cpu = ("segundos_cpu", "sum"),
+            aumento_pico_rss_mb = ("aumento_pico_rss_mb", "max"),
+            filas_entrada = ("filas_entrada", "sum"),
+            filas_salida = ("filas_salida", "sum")
+        )
+        return resumen.sort_values("segundos_propios", ascending = False).round(4).reset_index(drop = True)
+
+    def reportar(self, ruta_json = None):
+        """
+        Función para armar el reporte estructurado de la ejecución, registrarlo en el log y, si se indica, guardarlo
+        como JSON.
+        """
+        fin = datetime.now()
+        resumen = self.obtener_resumen()
+        reporte = {
+            "id_ejecucion": self.id_ejecucion,
+            "inicio": self.inicio.isoformat(),
+            "fin": fin.isoformat(),
+            "segundos": round((fin - self.inicio).total_seconds(), 3),
+            "pico_rss_mb": round(obtener_pico_rss_mb(), 2),
+            "resumen": resumen.to_dict(orient = "records"),
+            "llamadas": self.llamadas
+        }
+        logging.info(f"Métricas de la ejecución {self.id_ejecucion}: {json.dumps(reporte['resumen'][:15], default = str)}")
+
+        if ruta_json:
+            os.makedirs(os.path.dirname(os.path.abspath(ruta_json)), exist_ok = True)
+            with open(ruta_json, "w") as f:
+                json.dump(reporte, f, default = str, indent = 2)
+            logging.info(f"Reporte de métricas guardado en {ruta_json}")
+        return reporte
+
+    def obtener_tabla_metricas(self, **columnas_fijas):
+        """
+        Función para obtener el resumen con las columnas de la ejecución (id, fecha y las que se indiquen) en
+        mayúsculas, listo para cargarse en la tabla de métricas de BigQuery.
+        """
+        df = self.obtener_resumen()
+        df.columns = [columna.upper() for columna in df.columns]
+        df.insert(0, "FECHAEJECUCION", pd.Timestamp(self.inicio))
+        df.insert(0, "IDEJECUCION", self.id_ejecucion)
+        for columna, valor in columnas_fijas.items():
+            df[columna] = valor
+        return df
@@ -0,0 +1,417 @@
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : 16_localbackend
+ARCHIVOS  DESTINO  : Parquet en carpetas locales
+ARCHIVOS  FUENTES  : Parquet en carpetas locales
+OBJETIVO           : Ejecutar el job completo sin credenciales de GCP, sobre Parquet y carpetas locales
+TIPO               : PY
+OBSERVACION        : -
+SCHEDULER          : LOCAL
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene el backend de almacenamiento local: un cliente que imita la parte de
+bigquery.Client que usa GestorAlmacenDatos (queries, metadatos, creación de tablas particionadas y jobs de carga de
+Parquet) con DuckDB sobre las tablas Parquet de LectorArrowLocal, el traductor del SQL de BigQuery de ajustar_queries
+al dialecto de DuckDB y la creación de los clientes de BigQuery y Cloud Storage según el backend configurado
+"""
+
+# Librerías Propias
+from classes._01_managedbstorages import LectorArrowLocal
+from classes._11_gcstransfer import ClienteStorageLocal
+
+# Librerías Básicas
+import logging
+import json
+import shutil
+import uuid
+import re
+import os
+
+from datetime import datetime, timezone
+
+# Librerías para Datos
+import duckdb
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# Librerías de GCP
+from google.api_core import exceptions as google_exceptions
+from google.cloud import bigquery
+from google.cloud import storage
+
+# BACKENDS DE ALMACENAMIENTO DISPONIBLES
+BACKENDS_ALMACEN = ["gcp", "local"]
+
+# TIPOS DE BIGQUERY Y SU EQUIVALENTE ARROW (TIMESTAMP EN UTC, COMO LO ESCRIBE cargar_datos_bigquery_parquet)
+TIPOS_ARROW = {
+    "STRING": pa.string(),
+    "INT64": pa.int64(),
+    "INTEGER": pa.int64(),
+    "FLOAT64": pa.float64(),
+    "FLOAT": pa.float64(),
+    "BOOL": pa.bool_(),
+    "BOOLEAN": pa.bool_(),
+    "TIMESTAMP": pa.timestamp("us", tz = "UTC"),
+    "DATE": pa.date32()
+}
+
+# ARCHIVOS DE UNA TABLA LOCAL (LOS QUE EMPIEZAN CON "_" O "." NO LOS LEE LectorArrowLocal)
+ARCHIVO_ESQUEMA = "esquema.parquet"
+ARCHIVO_METADATOS = "_tabla.json"
+
+###################################################################################
+# FUNCIONES PARA TRADUCIR EL SQL DE BIGQUERY AL DIALECTO DE DUCKDB
+###################################################################################
+def separar_argumentos(sql, inicio):
+    """
+    Función para separar los argumentos de una llamada a función que empieza en sql[inicio] (justo después del
+    paréntesis), respetando paréntesis anidados y textos entre comillas. Retorna los argumentos y la posición siguiente
+    al paréntesis que cierra la llamada.
+    """
+    argumentos, actual, nivel, comilla = [], [], 0, None
+    for posicion in range(inicio, len(sql)):
+        caracter = sql[posicion]
+        if comilla:
+            comilla = None if caracter == comilla else comilla
+        elif caracter in ("'", '"'):
+            comilla = caracter
+        elif caracter == "(":
+            nivel += 1
+        elif caracter == ")":
+            if nivel == 0:
+                argumentos.append("".join(actual).strip())
+                return argumentos, posicion + 1
+            nivel -= 1
+        elif caracter == "," and nivel == 0:
+            argumentos.append("".join(actual).strip())
+            actual = []
+            continue
+        actual.append(caracter)
+    raise ValueError(f"Paréntesis sin cerrar en la query: {sql[max(inicio - 20, 0):inicio + 40]}")
+
+# FUNCIONES DE BIGQUERY QUE NO EXISTEN (O CAMBIAN EL ORDEN DE SUS ARGUMENTOS) EN DUCKDB
+FUNCIONES_BIGQUERY = {
+    "DATE_TRUNC": lambda a: f"DATE_TRUNC('{a[1].lower()}', {a[0]})",
+    "DATE_SUB": lambda a: f"({a[0]} - {a[1]})",
+    "DATE_ADD": lambda a: f"({a[0]} + {a[1]})",
+    "FORMAT_DATE": lambda a: f"STRFTIME({a[1]}, {a[0]})",
+    "PARSE_DATE": lambda a: f"CAST(STRPTIME(CAST({a[1]} AS VARCHAR), {a[0]}) AS DATE)",
+    "SAFE_CAST": lambda a: f"TRY_CAST({a[0]})",
+    "DATE": lambda a: f"CAST({a[0]} AS DATE)"
+}
+PATRON_FUNCIONES = re.compile(r"\b(" + "|".join(FUNCIONES_BIGQUERY) + r")\s*\(", re.IGNORECASE)
+
+def traducir_funciones(sql):
+    """
+    Función para reemplazar las funciones de BigQuery por su equivalente en DuckDB, empezando por las más internas.
+    """
+    partes, posicion = [], 0
+    while True:
+        coincidencia = PATRON_FUNCIONES.search(sql, posicion)
+        if coincidencia is None:
+            break
+        argumentos, fin = separar_argumentos(sql, coincidencia.end())
+        partes.append(sql[posicion:coincidencia.start()])
+        partes.append(FUNCIONES_BIGQUERY[coincidencia.group(1).upper()]([traducir_funciones(argumento) for argumento in argumentos]))
+        posicion = fin
+    partes.append(sql[posicion:])
+    return "".join(partes)
+
+def traducir_sql_bigquery(query, resolver_tabla):
+    """
+    Función para traducir una query de BigQuery (como las de ajustar_queries) al dialecto de DuckDB: cada tabla
+    `proyecto.dataset.tabla` se reemplaza por el nombre que retorna resolver_tabla, los tipos de CAST por los de DuckDB
+    y las funciones de fechas por sus equivalentes.
+    """
+    sql = re.sub(r"`([^`]+)`", lambda coincidencia: resolver_tabla(coincidencia.group(1)), query)
+    sql = re.sub(r"\bAS\s+INT64\b", "AS BIGINT", sql, flags = re.IGNORECASE)
+    sql = re.sub(r"\bAS\s+FLOAT64\b", "AS DOUBLE", sql, flags = re.IGNORECASE)
+    sql = re.sub(r"\bAS\s+STRING\b", "AS VARCHAR", sql, flags = re.IGNORECASE)
+    return traducir_funciones(sql)
+
+###################################################################################
+# FUNCIÓN PARA OBTENER EL TIPO DE BIGQUERY DE UN TIPO ARROW
+###################################################################################
+def obtener_tipo_bigquery(tipo):
+    if pa.types.is_integer(tipo):
+        return "INT64"
+    if pa.types.is_floating(tipo):
+        return "FLOAT64"
+    if pa.types.is_boolean(tipo):
+        return "BOOL"
+    if pa.types.is_timestamp(tipo):
+        return "TIMESTAMP"
+    if pa.types.is_date(tipo):
+        return "DATE"
+    return "STRING"
+
+class ResultadoQueryLocal:
+    """Clase que imita el resultado (RowIterator) y el job de una query de BigQuery sobre una tabla Arrow."""
+
+    def __init__(self, tabla_arrow):
+        self.tabla_arrow = tabla_arrow
+        self.total_rows = tabla_arrow.num_rows
+
+    def result(self):
+        return self
+
+    def __iter__(self):
+        return iter(self.tabla_arrow.to_pylist())
+
+    def to_arrow(self, bqstorage_client = None):
+        return self.tabla_arrow
+
+    def to_dataframe(self, bqstorage_client = None):
+        return self.tabla_arrow.to_pandas()
+
+class TablaLocal:
+    """Clase que imita los metadatos de una tabla de BigQuery (bigquery.Table) de una tabla Parquet local."""
+
+    def __init__(self, tabla, schema, num_rows, modified, columna_particion = None):
+        self.full_table_id = tabla
+        self.schema = schema
+        self.num_rows = num_rows
+        self.modified = modified
+        self.columna_particion = columna_particion
+
+class ClienteBigQueryLocal:
+    """Clase que imita al cliente de BigQuery con DuckDB sobre las tablas Parquet locales de LectorArrowLocal."""
+
+    # GestorAlmacenDatos EJECUTA LAS QUERIES CON ESTE CLIENTE AUNQUE TENGA UN LECTOR LOCAL
+    es_local = True
+
+    def __init__(self, ruta_base, project = "local"):
+        """
+        Inicializa la clase. Una tabla "proyecto.dataset.tabla" es la carpeta "ruta_base/proyecto/dataset/tabla" (la
+        misma que lee LectorArrowLocal); las particiones cargadas se guardan como un Parquet por partición.
+        """
+        logging.info("Inicializando la clase de Cliente de BigQuery Local...")
+
+        self.ruta_base = ruta_base
+        self.project = project
+        self.lector_local = LectorArrowLocal(ruta_base)
+
+    def obtener_ruta_tabla(self, tabla):
+        return os.path.join(self.ruta_base, *tabla.replace("`", "").split("$")[0].split("."))
+
+    def obtener_id_tabla(self, table):
+        return table if isinstance(table, str) else f"{table.project}.{table.dataset_id}.{table.table_id}"
+
+    def obtener_archivos_datos(self, ruta_tabla):
+        if not os.path.isdir(ruta_tabla):
+            return []
+        return sorted(
+            os.path.join(ruta_tabla, archivo) for archivo in os.listdir(ruta_tabla)
+            if archivo.endswith(".parquet") and archivo != ARCHIVO_ESQUEMA and not archivo.startswith((".", "_"))
+        )
+
+    def leer_metadatos(self, ruta_tabla):
+        ruta_metadatos = os.path.join(ruta_tabla, ARCHIVO_METADATOS)
+        if not os.path.exists(ruta_metadatos):
+            return {}
+        with open(ruta_metadatos) as f:
+            return json.load(f)
+
+    def escribir_parquet(self, tabla_arrow, ruta):
+        """
+        Función para escribir un Parquet de forma atómica (archivo oculto y renombrado), como una carga de BigQuery:
+        una lectura concurrente ve el archivo anterior o el nuevo completo.
+        """
+        ruta_temporal = os.path.join(os.path.dirname(ruta), f".{uuid.uuid4().hex}.tmp")
+        pq.write_table(tabla_arrow, ruta_temporal)
+        os.replace(ruta_temporal, ruta)
+
+    ###################################################################################
+    # FUNCIÓN PARA EJECUTAR UNA QUERY DE BIGQUERY CON DUCKDB
+    ###################################################################################
+    def query(self, query):
+        """
+        Función para ejecutar una query de BigQuery: se traduce al dialecto de DuckDB y cada tabla referenciada se
+        registra como el dataset Arrow de LectorArrowLocal (con los filtros empujados a los Parquet). Una tabla que no
+        existe lanza NotFound, igual que BigQuery. Las tablas destino de un DELETE o INSERT (por ejemplo, la transacción
+        de cargar_particion_bigquery) se copian a DuckDB y, si el script termina bien, se reescriben en sus Parquet.
+        """
+        conexion = duckdb.connect()
+        tablas = {}
+        tablas_dml = set(coincidencia.replace("`", "") for coincidencia in re.findall(r"\b(?:DELETE\s+FROM|INSERT\s+INTO)\s+`([^`]+)`", query, flags = re.IGNORECASE))
+
+        def registrar_tabla(tabla):
+            if tabla not in tablas:
+                tablas[tabla] = f"tabla_local_{len(tablas)}"
+                if tabla in tablas_dml:
+                    # LAS TABLAS QUE SE MODIFICAN SE MATERIALIZAN PARA QUE DUCKDB PUEDA ESCRIBIR EN ELLAS
+                    conexion.register(f"{tablas[tabla]}_origen", self.lector_local.obtener_dataset(tabla))
+                    conexion.execute(f"CREATE TABLE {tablas[tabla]} AS SELECT * FROM {tablas[tabla]}_origen")
+                else:
+                    conexion.register(tablas[tabla], self.lector_local.obtener_dataset(tabla))
+            return tablas[tabla]
+
+        try:
+            sql = traducir_sql_bigquery(query, registrar_tabla)
+            resultado = conexion.execute(sql).to_arrow_table()
+            for tabla in tablas_dml:
+                self.reescribir_tabla(tabla, conexion.execute(f"SELECT * FROM {tablas[tabla]}").to_arrow_table())
+            return ResultadoQueryLocal(resultado)
+        finally:
+            conexion.close()
+
+    def reescribir_tabla(self, tabla, tabla_arrow):
+        """
+        Función para reemplazar los Parquet de una tabla local por el resultado de un DELETE o INSERT: un archivo por
+        partición si la tabla está particionada y un solo archivo si no.
+        """
+        ruta_tabla = self.obtener_ruta_tabla(tabla)
+        tabla_arrow = tabla_arrow.cast(self.lector_local.obtener_dataset(tabla).schema)
+        archivos_anteriores = self.obtener_archivos_datos(ruta_tabla)
+
+        columna_particion = self.leer_metadatos(ruta_tabla).get("columna_particion")
+        archivos_nuevos = []
+        if columna_particion is not None:
+            for periodo in pc.unique(tabla_arrow[columna_particion]).to_pylist():
+                if periodo is None:
+                    continue
+                ruta_particion = os.path.join(ruta_tabla, f"particion_{periodo}.parquet")
+                self.escribir_parquet(tabla_arrow.filter(pc.equal(tabla_arrow[columna_particion], periodo)), ruta_particion)
+                archivos_nuevos.append(ruta_particion)
+            tabla_arrow = tabla_arrow.filter(pc.is_null(tabla_arrow[columna_particion]))
+
+        # LAS FILAS SIN PARTICIÓN (O TODA LA TABLA, SI NO ESTÁ PARTICIONADA) VAN EN UN SOLO ARCHIVO
+        if tabla_arrow.num_rows or not archivos_nuevos:
+            ruta_archivo = os.path.join(ruta_tabla, f"part-{uuid.uuid4().hex}.parquet")
+            self.escribir_parquet(tabla_arrow, ruta_archivo)
+            archivos_nuevos.append(ruta_archivo)
+
+        for archivo in archivos_anteriores:
+            if archivo not in archivos_nuevos:
+                os.remove(archivo)
+
+    def delete_table(self, table, not_found_ok = False):
+        """
+        Función para eliminar una tabla local (su carpeta completa).
+        """
+        ruta_tabla = self.obtener_ruta_tabla(self.obtener_id_tabla(table))
+        if not os.path.isdir(ruta_tabla):
+            if not_found_ok:
+                return
+            raise google_exceptions.NotFound(f"No existe la tabla local {self.obtener_id_tabla(table)}")
+        shutil.rmtree(ruta_tabla)
+
+    ###################################################################################
+    # FUNCIONES PARA LEER Y CREAR TABLAS
+    ###################################################################################
+    def get_table(self, table):
+        """
+        Función para obtener el esquema (bigquery.SchemaField), el número de filas y la fecha de modificación de una
+        tabla local.
+        """
+        tabla = self.obtener_id_tabla(table).replace("`", "")
+        dataset = self.lector_local.obtener_dataset(tabla)
+        archivos = list(dataset.files)
+        modificacion = max((os.stat(archivo).st_mtime for archivo in archivos), default = 0)
+        return TablaLocal(
+            tabla,
+            schema = [bigquery.SchemaField(campo.name, obtener_tipo_bigquery(campo.type)) for campo in dataset.schema],
+            num_rows = dataset.count_rows(),
+            modified = datetime.fromtimestamp(modificacion, tz = timezone.utc),
+            columna_particion = self.leer_metadatos(self.obtener_ruta_tabla(tabla)).get("columna_particion")
+        )
+
+    def create_table(self, table, exists_ok = False):
+        """
+        Función para crear una tabla vacía con el esquema indicado (un Parquet sin filas) y guardar su columna de
+        partición por rango, si tiene.
+        """
+        tabla = self.obtener_id_tabla(table)
+        ruta_tabla = self.obtener_ruta_tabla(tabla)
+        if os.path.exists(os.path.join(ruta_tabla, ARCHIVO_ESQUEMA)) or self.obtener_archivos_datos(ruta_tabla):
+            if exists_ok:
+                return self.get_table(tabla)
+            raise ValueError(f"Ya existe la tabla local {tabla}")
+
+        os.makedirs(ruta_tabla, exist_ok = True)
+        esquema = pa.schema([(campo.name, TIPOS_ARROW.get(campo.field_type, pa.string())) for campo in table.schema])
+        self.escribir_parquet(esquema.empty_table(), os.path.join(ruta_tabla, ARCHIVO_ESQUEMA))
+
+        particion = getattr(table, "range_partitioning", None)
+        with open(os.path.join(ruta_tabla, ARCHIVO_METADATOS), "w") as f:
+            json.dump({"columna_particion": particion.field if particion is not None else None}, f)
+
+        logging.info(f"Tabla local {tabla} creada en {ruta_tabla}")
+        return self.get_table(tabla)
+
+    ###################################################################################
+    # FUNCIÓN PARA CARGAR UN PARQUET EN UNA TABLA O EN UNA PARTICIÓN
+    ###################################################################################
+    def load_table_from_file(self, file_obj, destination, job_config = None):
+        """
+        Función para cargar un Parquet (job de carga) en una tabla local, con la disposición de escritura del job:
+        WRITE_APPEND agrega un archivo, WRITE_TRUNCATE reemplaza la tabla y WRITE_EMPTY falla si la tabla tiene filas.
+        Con el decorador "tabla$PERIODO" y WRITE_TRUNCATE, solo se reemplaza esa partición.
+        """
+        tabla, _, particion = destination.replace("`", "").partition("$")
+        ruta_tabla = self.obtener_ruta_tabla(tabla)
+        disposicion = getattr(job_config, "write_disposition", None) or "WRITE_APPEND"
+        tabla_arrow = pq.read_table(file_obj)
+
+        # AJUSTAR LOS TIPOS AL ESQUEMA DE LA TABLA EXISTENTE PARA QUE TODOS SUS PARQUET SE PUEDAN LEER JUNTOS
+        if os.path.isdir(ruta_tabla):
+            esquema = self.lector_local.obtener_dataset(tabla).schema
+            if set(esquema.names) == set(tabla_arrow.column_names):
+                tabla_arrow = tabla_arrow.select(esquema.names).cast(esquema)
+        os.makedirs(ruta_tabla, exist_ok = True)
+        archivos = self.obtener_archivos_datos(ruta_tabla)
+
+        if particion:
+            columna_particion = self.leer_metadatos(ruta_tabla).get("columna_particion")
+            if columna_particion is None:
+                raise ValueError(f"La tabla local {tabla} no está particionada; no se puede cargar la partición {particion}")
+            if disposicion != "WRITE_TRUNCATE":
+                raise ValueError("Las cargas a una partición local solo admiten WRITE_TRUNCATE")
+
+            # QUITAR LAS FILAS DEL PERIODO DE LOS DEMÁS ARCHIVOS (POR EJEMPLO, CARGAS APPEND ANTERIORES)
+            ruta_particion = os.path.join(ruta_tabla, f"particion_{particion}.parquet")
+            for archivo in archivos:
+                if archivo == ruta_particion:
+                    continue
+                tabla_archivo = pq.read_table(archivo)
+                mascara = pc.fill_null(pc.not_equal(tabla_archivo[columna_particion], int(particion)), True)
+                if not pc.all(mascara).as_py():
+                    self.escribir_parquet(tabla_archivo.filter(mascara), archivo)
+            self.escribir_parquet(tabla_arrow, ruta_particion)
+        else:
+            if disposicion == "WRITE_EMPTY" and any(pq.ParquetFile(archivo).metadata.num_rows for archivo in archivos):
+                raise ValueError(f"La tabla local {tabla} no está vacía")
+            if disposicion == "WRITE_TRUNCATE":
+                # LA TABLA QUEDA SOLO CON LOS DATOS (Y EL ESQUEMA) DE ESTA CARGA
+                for archivo in archivos + [os.path.join(ruta_tabla, ARCHIVO_ESQUEMA)]:
+                    if os.path.exists(archivo):
+                        os.remove(archivo)
+            self.escribir_parquet(tabla_arrow, os.path.join(ruta_tabla, f"part-{uuid.uuid4().hex}.parquet"))
+
+        logging.info(f"Carga local a {destination} ({disposicion}): {tabla_arrow.num_rows} filas")
+        return ResultadoQueryLocal(tabla_arrow.slice(0, 0))
+
+###################################################################################
+# FUNCIÓN PARA CREAR LOS CLIENTES DEL BACKEND DE ALMACENAMIENTO CONFIGURADO
+###################################################################################
+def crear_clientes_almacen(backend, ruta_local_arrow = "", ruta_storage_local = ""):
+    """
+    Función para crear los clientes de BigQuery y Cloud Storage del backend: "gcp" (clientes de Google; Cloud Storage
+    local si se indica ruta_storage_local) o "local" (DuckDB sobre ruta_local_arrow y carpetas en ruta_storage_local,
+    sin credenciales).
+    """
+    if backend not in BACKENDS_ALMACEN:
+        raise ValueError(f"Backend de almacenamiento no soportado: {backend}. Opciones: {BACKENDS_ALMACEN}")
+
+    if backend == "local":
+        if not ruta_local_arrow or not ruta_storage_local:
+            raise ValueError("El backend local necesita las rutas de las tablas y de Cloud Storage.")
+        logging.info(f"Backend de almacenamiento local: tablas en {ruta_local_arrow}, Cloud Storage en {ruta_storage_local}")
+        return ClienteBigQueryLocal(ruta_local_arrow), ClienteStorageLocal(ruta_storage_local)
+
+    cs_cliente = ClienteStorageLocal(ruta_storage_local) if ruta_storage_local else storage.Client()
+    return bigquery.Client(), cs_cliente
@@ -1,207 +1,388 @@
-"""_summary_.
-
-PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
-NOMBRE             : classes
-ARCHIVOS  DESTINO  : Tablas en BigQuery
-ARCHIVOS  FUENTES  : Tablas en BigQuery
-OBJETIVO           : Definir la clase Planificador Demanda PT Cemento
-TIPO               : PY
-OBSERVACION        : -
-SCHEDULER          : CLOUD RUN
-VERSION            : 1.0
-DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
-PROVEEDOR          : MINSAIT
-FECHA              : 10/12/2025
-DESCRIPCION        : Clase que contiene funciones para la planificación comercial de producto terminado (cemento).
-"""           
-
-# Librerías Propias
-from utils.utils import readJsonFile  
-from classes._01_managedbstorages import GestorAlmacenDatos
-from classes._02_preparedata import GestorPreparacionDatos
-from classes._04_managemodel import GestorModelo
-from classes._05_forecastmonthly import GestorProyeccion
-from classes._06_monitorforecast import GestorMonitoreo
-from classes._07_simulateforecast import GestorSimulacion
-
-# Librerías Básicas
-import tempfile
-import warnings
-import logging
-import shutil
-import sys
-import os
-
-import datetime
-from dateutil.relativedelta import relativedelta
-
-# Librerías de GCP
-from google.cloud import bigquery
-from google.cloud import storage
-
-# Configurar logging
-logging.basicConfig(level=logging.INFO,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
-warnings.filterwarnings("ignore")
-
-class PlanificadorDemandaPTCemento:
-    """Clase para la planificación de demanda de Producto Terminado - Cemento."""
-
-    def __init__(self):
-        """
-        Inicializa la clase con el proyecto, dataset de BigQuery y acceso a modelo de Machine Learning.
-        """
-        logging.info("Inicializando la clase PlanificadorDemandaPTCemento...")
-
-        self.bq_cliente = bigquery.Client()
-        self.cs_cliente = storage.Client()
-
-        # Leer parámetros del archivo JSON
-        parameters = readJsonFile('./config/parameters.json')
-        self.project_id_env = os.getenv("PROJECT_DDV_ID")
-        self.dataset_id = parameters['variables_generales']['DATASET_DDV_ID']
-        self.project_id_anl = os.getenv("PROJECT_ANL_ID")
-
-        ####################################################################
-        # CONSTANTES, VARIABLES Y QUERYS
-        ####################################################################
-        # CONSTANTES INFORMATIVAS
-        self.clase_producto_log = parameters['variables_informativas']['TIPO_PRODUCTO_LOG']
-        
-        # CONSTANTES DE TIPO DE PRODUCTO
-        self.clase_producto = parameters['variables_informativas']['TIPO_PRODUCTO_TABLA']
-        self.TIPO_MODELO_ML = parameters['variables_informativas']['TIPO_MODELO_ML']
-        self.TIPO_MODELO_SIMPLE = parameters['variables_informativas']['TIPO_MODELO_SIMPLE']
-        self.TIPO_MODELO_0 = parameters['variables_informativas']['TIPO_MODELO_0']
-
-        self.PROJECT_EXE = self.project_id_env #"pe-pacasmayo-cds-01anl-gcp-dev"
-
-        # VARIABLES DE TABLAS INPUTS EN BIGQUERY
-        self.PROJECT_ID = self.project_id_env #"pe-pacasmayo-cds-01ddv-gcp-prd"
-        self.DATASET = self.dataset_id #"cp_ddv_0400"
-
-        self.TABLE_CONSUMO_DEMANDA = parameters['variables_input_demanda_comercial']['TABLA']
-        self.COLUMNA_CONSUMO_DEMANDA = parameters['variables_input_demanda_comercial']['CANTIDAD']
-        self.COLUMNA_FECHA_CONSUMO_DEMANDA = parameters['variables_input_demanda_comercial']['FECHA']
-        self.INPUT_CLASIFICACION = parameters['variables_input_demanda_comercial']['CLASIFICACION']
-        self.INPUT_SOCIEDAD = parameters['variables_input_demanda_comercial']['SOCIEDAD']
-        self.INPUT_CENTRO = parameters['variables_input_demanda_comercial']['CENTRO']
-        self.INPUT_MATERIAL = parameters['variables_input_demanda_comercial']['MATERIAL']
-        self.INPUT_MEDIDA = parameters['variables_input_demanda_comercial']['MEDIDA']
-        self.INPUT_ULTIMO_CONSUMO = parameters['variables_input_demanda_comercial']['FECHA_ULTIMO_CONSUMO']
-
-        self.PATH_CONSUMO_DEMANDA = self.PROJECT_ID + "." + self.DATASET + "." + self.TABLE_CONSUMO_DEMANDA
-        self.COLUMNAS_CONSUMO_DEMANDA = [
-            self.INPUT_CLASIFICACION, 
-            self.INPUT_SOCIEDAD, 
-            self.INPUT_CENTRO, 
-            self.INPUT_MATERIAL, 
-            self.INPUT_MEDIDA, 
-            self.INPUT_ULTIMO_CONSUMO,
-            self.COLUMNA_FECHA_CONSUMO_DEMANDA, 
-            self.COLUMNA_CONSUMO_DEMANDA
-        ]
-        self.COLUMNAS_CONSUMO_DEMANDA_QUERY = ",\n\t".join(self.COLUMNAS_CONSUMO_DEMANDA)
-
-        # VARIABLES DE TABLAS INTERMEDIAS
-        self.mes_col = parameters['variables_generales']['COLUMNA_AGRUPACION_MES']
-
-        # VARIABLES DE ARCHIVOS INPUTS EN CLOUD STORAGE
-        self.CS_PROJECT = self.project_id_anl
-        self.BUCKET_SKU_ANALIZADOS = os.getenv("BUCKET_ANL_ID")
-        self.FILE_PATH_SKU_ANALIZADOS = parameters['variables_input_skus_analizados']['RUTA_ARCHIVO']
-        self.SHEET_SKU_ANALIZADOS = parameters['variables_input_skus_analizados']['HOJA_ARCHIVO']
-        self.PATH_SKU_ANALIZADOS = "gs://" + self.BUCKET_SKU_ANALIZADOS + "/" + self.FILE_PATH_SKU_ANALIZADOS
-
-        # VARIABLES DE MODELO EN VERTEX AI
-        self.MODEL_PROJECT = self.CS_PROJECT
-        self.MODEL_BUCKET_NAME_GCS = os.getenv("BUCKET_ANL_ID")
-        self.MODEL_REGION = parameters['variables_modelos_ml']['REGION']
-        self.MODEL_NAME = parameters['variables_modelos_ml']['NOMBRE']
-        self.MODEL_VERSION_LABEL = parameters['variables_modelos_ml']['IDENTIFICADOR_VERSION']
-        self.MODEL_PREFIX_GCS = parameters['variables_modelos_ml']['PREFIX_GCS'] 
-        self.MODEL_URI_GCS_GENERAL = "gs://" + self.MODEL_BUCKET_NAME_GCS + "/" + self.MODEL_PREFIX_GCS + "/"
-        self.MODEL_TEMP_PATH = os.path.join(tempfile.gettempdir(), "ag_model_temp")
-        os.makedirs(self.MODEL_TEMP_PATH, exist_ok=True)
-
-        # VARIABLES DE TABLAS OUTPUTS EN BIGQUERY
-        self.PROJECT_ID_OUTPUT = self.PROJECT_ID #"pe-pacasmayo-cds-01ddv-gcp-prd" #pe-pacasmayo-cds-01anl-gcp-dev
-        self.DATASET_OUTPUT = self.DATASET #"cp_ddv_0400"
-
-        self.TABLE_PROYECCION_DEMANDA = parameters['variables_output_proyeccion_demanda']['TABLA'] 
-        self.COLUMNA_PERIODO_OUTPUT = parameters['variables_output_proyeccion_demanda']['PERIODO'] 
-
-        self.TABLE_MONITOREO = parameters['variables_output_monitoreo_demanda']['TABLA'] 
-        self.COLUMNA_PERIODO_MONITOREO = parameters['variables_output_monitoreo_demanda']['PERIODO'] 
-
-        self.TABLA_PRE = self.PROJECT_ID_OUTPUT + "." + self.DATASET_OUTPUT + "."
-        self.PATH_PROYECCION_DEMANDA = self.TABLA_PRE + self.TABLE_PROYECCION_DEMANDA
-        self.PATH_MONITOREO = self.TABLA_PRE + self.TABLE_MONITOREO
- 
-        # VARIABLES DE RANGOS DE TIEMPO
-        self.ventana_segmentacion = parameters['variables_rangos_meses']['SEGMENTACION'] 
-        self.ventana_historico = parameters['variables_rangos_meses']['HISTORICO'] 
-        self.num_meses_proyeccion = parameters['variables_rangos_meses']['PROYECCION'] 
-        self.ventana_ventas = parameters['variables_rangos_meses']['VENTAS'] 
-
-        # VARIABLES - UMBRALES DE SEGMENTACION ABC - XYZ - FSN
-        self.abc_umb_inf = parameters['variables_umbrales_segmentacion']['ABC_INFERIOR'] 
-        self.abc_umb_sup = parameters['variables_umbrales_segmentacion']['ABC_SUPERIOR'] # C, B, A
-        self.xyz_umb_inf = parameters['variables_umbrales_segmentacion']['XYZ_INFERIOR'] 
-        self.xyz_umb_sup = parameters['variables_umbrales_segmentacion']['XYZ_SUPERIOR'] # X, Y, Z
-        self.fsn_umb_inf = parameters['variables_umbrales_segmentacion']['FSN_INFERIOR'] 
-        self.fsn_umb_sup = parameters['variables_umbrales_segmentacion']['FSN_SUPERIOR'] # N, S, F
-
-        # VARIABLES - UMBRALES DE SEGMENTACION RFM
-        self.r_umb_inf = parameters['variables_umbrales_segmentacion']['R_INFERIOR']
-        self.r_umb_sup = parameters['variables_umbrales_segmentacion']['R_SUPERIOR'] # 3, 2, 1
-        self.f_umb_inf = parameters['variables_umbrales_segmentacion']['F_INFERIOR']
-        self.f_umb_sup = parameters['variables_umbrales_segmentacion']['F_SUPERIOR'] # 1, 2, 3
-
-        # CONSTANTE DE CONFIGURACIÓN DE AUTOGLUON
-        self.MODELO_AUTOGLUON = parameters['variables_modelos_autogluon']['NOMBRE']
-        self.MODELO_AUTOGLUON_PATH = parameters['variables_modelos_autogluon']['RUTA_AUTOGLUON']
-        self.MODELO_AUTOGLUON_SUFFIX = parameters['variables_modelos_autogluon']['SUFIJO']
-        self.MODELO_AUTOGLUON_METRICA_EVALUACION = parameters['variables_modelos_autogluon']['METRICA_EVALUACION']
-        self.TIEMPO_ENTRENAMIENTO_MAXIMO = parameters['variables_modelos_autogluon']['TIEMPO_ENTRENAMIENTO_MAX']
-        self.CONFIGURACION_AUTOGLUON = {
-            self.MODELO_AUTOGLUON: [
-                {
-                    "model_path": self.MODELO_AUTOGLUON_PATH,
-                    "ag_args": {"name_suffix": self.MODELO_AUTOGLUON_SUFFIX}
-                }
-            ]
-        }
-        self.CONFIGURACION_AUTOGLUON_PREDICTOR = self.MODELO_AUTOGLUON + self.MODELO_AUTOGLUON_SUFFIX + "[" + self.MODELO_AUTOGLUON_PATH + "]"
-
-        logging.info("Clase inicializada correctamente.")
-
-        self.DataManager = GestorAlmacenDatos(self.bq_cliente, self.cs_cliente)
-        self.PreManager = GestorPreparacionDatos(self.COLUMNA_CONSUMO_DEMANDA)
-        self.ModelManager = GestorModelo(self.cs_cliente, self.ventana_segmentacion, self.num_meses_proyeccion, self.MODEL_TEMP_PATH)
-        self.ForecastManager = GestorProyeccion(self.COLUMNA_FECHA_CONSUMO_DEMANDA, self.num_meses_proyeccion, self.ventana_ventas, self.CONFIGURACION_AUTOGLUON_PREDICTOR, self.TIPO_MODELO_ML, self.TIPO_MODELO_SIMPLE, self.TIPO_MODELO_0, self.ModelManager)
-        self.MonitorManager = GestorMonitoreo(self.COLUMNA_CONSUMO_DEMANDA, self.COLUMNA_FECHA_CONSUMO_DEMANDA)
-        self.SimulationManager = GestorSimulacion(self)
-
-    ####################################################################
-    # LÓGICA PRINCIPAL DEL JOB
-    ####################################################################
-    def ejecutar(self):
-        if datetime.now() <= datetime(2025, 12, 11):
-            fecha_final_proyeccion = datetime.now()
-            fecha_inicial_proyeccion = fecha_final_proyeccion - relativedelta(months=self.num_meses_proyeccion)
-
-            rango_meses_simulacion = []
-            while fecha_inicial_proyeccion <= fecha_final_proyeccion:
-                rango_meses_simulacion.append(fecha_inicial_proyeccion)
-                fecha_inicial_proyeccion += relativedelta(months=1)
-
-            for mes in rango_meses_simulacion:
-                self.SimulationManager.ejecutar_simulacion(mes)
-                if os.path.exists(self.MODEL_TEMP_PATH):
-                    shutil.rmtree(self.MODEL_TEMP_PATH)
-        else:
-            self.SimulationManager.ejecutar_simulacion(datetime.now())
-
-        sys.exit(0)  # Finaliza el proceso y cierra Cloud Run
-        
\ No newline at end of file
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : classes
+ARCHIVOS  DESTINO  : Tablas en BigQuery
+ARCHIVOS  FUENTES  : Tablas en BigQuery
+OBJETIVO           : Definir la clase Planificador Demanda PT Cemento
+TIPO               : PY
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Clase que contiene funciones para la planificación comercial de producto terminado (cemento).
+"""           
+
+# Librerías Propias
+from utils.utils import readJsonFile, obtener_limite_cpu
+from classes._01_managedbstorages import GestorAlmacenDatos, LectorArrowLocal
+from classes._02_preparedata import GestorPreparacionDatos
+from classes._04_managemodel import GestorModelo
+from classes._05_forecastmonthly import GestorProyeccion
+from classes._06_monitorforecast import GestorMonitoreo
+from classes._07_simulateforecast import GestorSimulacion
+from classes._08_skuregistry import RegistroSKU
+from classes._09_modelregistry import IndiceRegistroModelos, ProveedorRegistroVertex, RegistroModelosLocal
+from classes._10_artifactcache import CacheArtefactosModelo, CacheResultadosEtapas
+from classes._11_gcstransfer import GestorTransferenciaGCS
+from classes._12_backfill import AlmacenHistoricoBackfill, PlanificadorBackfillParalelo
+from classes._13_sharding import GestorFragmentos, PlanificadorFragmentado, obtener_tarea_cloud_run
+from classes._14_checkpoints import GestorPuntosControl
+from classes._15_instrumentation import RegistroMetricas
+from classes._16_localbackend import crear_clientes_almacen
+
+# Librerías Básicas
+import tempfile
+import warnings
+import logging
+import shutil
+import sys
+import os
+
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+warnings.filterwarnings("ignore")
+
+class PlanificadorDemandaPTCemento:
+    """Clase para la planificación de demanda de Producto Terminado - Cemento."""
+
+    def __init__(self):
+        """
+        Inicializa la clase con el proyecto, dataset de BigQuery y acceso a modelo de Machine Learning.
+        """
+        logging.info("Inicializando la clase PlanificadorDemandaPTCemento...")
+
+        # Leer parámetros del archivo JSON
+        parameters = readJsonFile('./config/parameters.json')
+
+        # BACKEND DE ALMACENAMIENTO: "gcp" (BIGQUERY Y CLOUD STORAGE) O "local" (DUCKDB Y CARPETAS, SIN CREDENCIALES)
+        self.BACKEND_ALMACEN = parameters['variables_almacen_datos']['BACKEND']
+        self.RUTA_BACKEND_LOCAL = parameters['variables_almacen_datos']['RUTA_BACKEND_LOCAL']
+        valor_local = "local" if self.BACKEND_ALMACEN == "local" else None
+
+        self.project_id_env = os.getenv("PROJECT_DDV_ID", valor_local)
+        self.dataset_id = parameters['variables_generales']['DATASET_DDV_ID']
+        self.project_id_anl = os.getenv("PROJECT_ANL_ID", valor_local)
+
+        ####################################################################
+        # CONSTANTES, VARIABLES Y QUERYS
+        ####################################################################
+        # CONSTANTES INFORMATIVAS
+        self.clase_producto_log = parameters['variables_informativas']['TIPO_PRODUCTO_LOG']
+        
+        # CONSTANTES DE TIPO DE PRODUCTO
+        self.clase_producto = parameters['variables_informativas']['TIPO_PRODUCTO_TABLA']
+        self.TIPO_MODELO_ML = parameters['variables_informativas']['TIPO_MODELO_ML']
+        self.TIPO_MODELO_SIMPLE = parameters['variables_informativas']['TIPO_MODELO_SIMPLE']
+        self.TIPO_MODELO_0 = parameters['variables_informativas']['TIPO_MODELO_0']
+
+        self.PROJECT_EXE = self.project_id_env #"pe-pacasmayo-cds-01anl-gcp-dev"
+
+        # VARIABLES DE TABLAS INPUTS EN BIGQUERY
+        self.PROJECT_ID = self.project_id_env #"pe-pacasmayo-cds-01ddv-gcp-prd"
+        self.DATASET = self.dataset_id #"cp_ddv_0400"
+
+        self.TABLE_CONSUMO_DEMANDA = parameters['variables_input_demanda_comercial']['TABLA']
+        self.COLUMNA_CONSUMO_DEMANDA = parameters['variables_input_demanda_comercial']['CANTIDAD']
+        self.COLUMNA_FECHA_CONSUMO_DEMANDA = parameters['variables_input_demanda_comercial']['FECHA']
+        self.INPUT_CLASIFICACION = parameters['variables_input_demanda_comercial']['CLASIFICACION']
+        self.INPUT_SOCIEDAD = parameters['variables_input_demanda_comercial']['SOCIEDAD']
+        self.INPUT_CENTRO = parameters['variables_input_demanda_comercial']['CENTRO']
+        self.INPUT_MATERIAL = parameters['variables_input_demanda_comercial']['MATERIAL']
+        self.INPUT_MEDIDA = parameters['variables_input_demanda_comercial']['MEDIDA']
+        self.INPUT_ULTIMO_CONSUMO = parameters['variables_input_demanda_comercial']['FECHA_ULTIMO_CONSUMO']
+
+        self.PATH_CONSUMO_DEMANDA = self.PROJECT_ID + "." + self.DATASET + "." + self.TABLE_CONSUMO_DEMANDA
+        self.COLUMNAS_CONSUMO_DEMANDA = [
+            self.INPUT_CLASIFICACION, 
+            self.INPUT_SOCIEDAD, 
+            self.INPUT_CENTRO, 
+            self.INPUT_MATERIAL, 
+            self.INPUT_MEDIDA, 
+            self.INPUT_ULTIMO_CONSUMO,
+            self.COLUMNA_FECHA_CONSUMO_DEMANDA, 
+            self.COLUMNA_CONSUMO_DEMANDA
+        ]
+        self.COLUMNAS_CONSUMO_DEMANDA_QUERY = ",\n\t".join(self.COLUMNAS_CONSUMO_DEMANDA)
+
+        # VARIABLES DE TABLAS INTERMEDIAS
+        self.mes_col = parameters['variables_generales']['COLUMNA_AGRUPACION_MES']
+
+        # VARIABLES DE ARCHIVOS INPUTS EN CLOUD STORAGE
+        self.CS_PROJECT = self.project_id_anl
+        self.BUCKET_SKU_ANALIZADOS = os.getenv("BUCKET_ANL_ID", valor_local)
+        self.FILE_PATH_SKU_ANALIZADOS = parameters['variables_input_skus_analizados']['RUTA_ARCHIVO']
+        self.SHEET_SKU_ANALIZADOS = parameters['variables_input_skus_analizados']['HOJA_ARCHIVO']
+        self.PATH_SKU_ANALIZADOS = "gs://" + self.BUCKET_SKU_ANALIZADOS + "/" + self.FILE_PATH_SKU_ANALIZADOS
+
+        # VARIABLES DE MODELO EN VERTEX AI
+        self.MODEL_PROJECT = self.CS_PROJECT
+        self.MODEL_BUCKET_NAME_GCS = os.getenv("BUCKET_ANL_ID", valor_local)
+        self.MODEL_REGION = parameters['variables_modelos_ml']['REGION']
+        self.MODEL_NAME = parameters['variables_modelos_ml']['NOMBRE']
+        self.MODEL_VERSION_LABEL = parameters['variables_modelos_ml']['IDENTIFICADOR_VERSION']
+        self.MODEL_PREFIX_GCS = parameters['variables_modelos_ml']['PREFIX_GCS'] 
+        self.MODEL_URI_GCS_GENERAL = "gs://" + self.MODEL_BUCKET_NAME_GCS + "/" + self.MODEL_PREFIX_GCS + "/"
+        self.MODEL_TEMP_PATH = os.path.join(tempfile.gettempdir(), "ag_model_temp")
+        os.makedirs(self.MODEL_TEMP_PATH, exist_ok=True)
+
+        # VARIABLES DEL ÍNDICE EN CACHÉ DEL REGISTRO DE MODELOS (REGISTRO LOCAL OPCIONAL PARA PRUEBAS SIN VERTEX AI)
+        self.MODEL_RUTA_CACHE_REGISTRO = os.path.join(tempfile.gettempdir(), parameters['variables_modelos_ml']['RUTA_CACHE_REGISTRO'])
+        self.MODEL_TTL_CACHE_REGISTRO = parameters['variables_modelos_ml']['TTL_CACHE_REGISTRO']
+        self.MODEL_RUTA_REGISTRO_LOCAL = parameters['variables_modelos_ml']['RUTA_REGISTRO_LOCAL']
+
+        # VARIABLES DE LA CACHÉ PERSISTENTE DE ARTEFACTOS DE MODELOS (FUERA DE MODEL_TEMP_PATH, QUE SE BORRA CADA MES)
+        # CACHÉ DE ARTEFACTOS DESACTIVADA CON RUTA VACÍA; HABILITARLA SOLO CON LA RUTA ABSOLUTA DE UN VOLUMEN MONTADO
+        self.MODEL_RUTA_CACHE_ARTEFACTOS = parameters['variables_modelos_ml']['RUTA_CACHE_ARTEFACTOS']
+        self.MODEL_TAMANO_MAXIMO_CACHE_GB = parameters['variables_modelos_ml']['TAMANO_MAXIMO_CACHE_GB']
+
+        # VARIABLES DE TRANSFERENCIA PARALELA DE ARTEFACTOS CON CLOUD STORAGE
+        self.MODEL_HILOS_TRANSFERENCIA = parameters['variables_modelos_ml']['HILOS_TRANSFERENCIA']
+        self.MODEL_TAMANO_CHUNK_MB = parameters['variables_modelos_ml']['TAMANO_CHUNK_MB']
+        self.MODEL_REINTENTOS_TRANSFERENCIA = parameters['variables_modelos_ml']['REINTENTOS_TRANSFERENCIA']
+
+        # VARIABLES DE TABLAS OUTPUTS EN BIGQUERY
+        self.PROJECT_ID_OUTPUT = self.PROJECT_ID #"pe-pacasmayo-cds-01ddv-gcp-prd" #pe-pacasmayo-cds-01anl-gcp-dev
+        self.DATASET_OUTPUT = self.DATASET #"cp_ddv_0400"
+
+        self.TABLE_PROYECCION_DEMANDA = parameters['variables_output_proyeccion_demanda']['TABLA'] 
+        self.COLUMNA_PERIODO_OUTPUT = parameters['variables_output_proyeccion_demanda']['PERIODO'] 
+
+        self.TABLE_MONITOREO = parameters['variables_output_monitoreo_demanda']['TABLA'] 
+        self.COLUMNA_PERIODO_MONITOREO = parameters['variables_output_monitoreo_demanda']['PERIODO'] 
+
+        self.TABLA_PRE = self.PROJECT_ID_OUTPUT + "." + self.DATASET_OUTPUT + "."
+        self.PATH_PROYECCION_DEMANDA = self.TABLA_PRE + self.TABLE_PROYECCION_DEMANDA
+        self.PATH_MONITOREO = self.TABLA_PRE + self.TABLE_MONITOREO
+        self.SOBRESCRIBIR_PARTICIONES = parameters['variables_almacen_datos']['SOBRESCRIBIR_PARTICIONES']
+        self.REINTENTOS_TRANSACCION = parameters['variables_almacen_datos']['REINTENTOS_TRANSACCION']
+ 
+        # VARIABLES DE LECTURA DE DATOS (BIGQUERY STORAGE READ API / PARQUET LOCAL)
+        self.MAX_STREAMS_LECTURA = parameters['variables_almacen_datos']['MAX_STREAMS_LECTURA']
+        self.RUTA_LOCAL_ARROW = parameters['variables_almacen_datos']['RUTA_LOCAL_ARROW']
+        self.METODO_CARGA = parameters['variables_almacen_datos']['METODO_CARGA']
+
+        # CLOUD STORAGE SOBRE UNA CARPETA LOCAL (OPCIONAL, PARA PRUEBAS SIN GCP)
+        self.RUTA_STORAGE_LOCAL = parameters['variables_almacen_datos']['RUTA_STORAGE_LOCAL']
+
+        # CON EL BACKEND LOCAL, TABLAS, ARCHIVOS DE CLOUD STORAGE Y REGISTRO DE MODELOS VIVEN EN RUTA_BACKEND_LOCAL
+        if self.BACKEND_ALMACEN == "local":
+            self.RUTA_LOCAL_ARROW = self.RUTA_LOCAL_ARROW or self.RUTA_BACKEND_LOCAL
+            self.RUTA_STORAGE_LOCAL = self.RUTA_STORAGE_LOCAL or self.RUTA_BACKEND_LOCAL
+            self.MODEL_RUTA_REGISTRO_LOCAL = self.MODEL_RUTA_REGISTRO_LOCAL or os.path.join(self.RUTA_BACKEND_LOCAL, "registro_modelos")
+        self.bq_cliente, self.cs_cliente = crear_clientes_almacen(self.BACKEND_ALMACEN, self.RUTA_LOCAL_ARROW, self.RUTA_STORAGE_LOCAL)
+
+        # VARIABLES DEL BACKFILL (SIMULACIÓN DE VARIOS MESES)
+        self.HISTORICO_BACKFILL_EN_MEMORIA = parameters['variables_backfill']['HISTORICO_EN_MEMORIA']
+        self.PROCESOS_BACKFILL = parameters['variables_backfill']['PROCESOS_BACKFILL']
+
+        # VARIABLES DE FRAGMENTACIÓN ENTRE TAREAS DEL CLOUD RUN JOB
+        self.TAREA_INDICE, self.TAREA_TOTAL, self.ID_EJECUCION = obtener_tarea_cloud_run()
+        self.MODO_FRAGMENTACION = parameters['variables_fragmentacion']['MODO']
+        self.FRAGMENTOS_PREFIX_GCS = parameters['variables_fragmentacion']['PREFIX_GCS']
+        self.FRAGMENTOS_ESPERA_MAXIMA = parameters['variables_fragmentacion']['ESPERA_MAXIMA_SEG']
+        self.FRAGMENTOS_INTERVALO_SONDEO = parameters['variables_fragmentacion']['INTERVALO_SONDEO_SEG']
+
+        # VARIABLES DE PUNTOS DE CONTROL POR ETAPA (REANUDAR UN MES DESDE LA ÚLTIMA ETAPA COMPLETA)
+        self.PUNTOS_CONTROL_HABILITADO = parameters['variables_puntos_control']['HABILITADO']
+        self.PUNTOS_CONTROL_PREFIX_GCS = parameters['variables_puntos_control']['PREFIX_GCS']
+
+        # VARIABLES DE LA CACHÉ LOCAL DE RESULTADOS DE PREPARACIÓN Y SEGMENTACIÓN (VACÍO PARA DESACTIVARLA)
+        self.RUTA_CACHE_ETAPAS = parameters['variables_cache_etapas']['RUTA_CACHE']
+        self.TAMANO_MAXIMO_CACHE_ETAPAS_GB = parameters['variables_cache_etapas']['TAMANO_MAXIMO_CACHE_GB']
+
+        # VARIABLES DE MÉTRICAS DE LA EJECUCIÓN (TIEMPO, CPU, MEMORIA Y FILAS POR MÉTODO DE CADA GESTOR)
+        self.METRICAS_HABILITADO = parameters['variables_metricas_ejecucion']['HABILITADO']
+        self.RUTA_REPORTE_METRICAS = os.path.join(tempfile.gettempdir(), parameters['variables_metricas_ejecucion']['RUTA_REPORTE'])
+        self.TABLE_METRICAS = parameters['variables_metricas_ejecucion']['TABLA']
+        self.PATH_METRICAS = self.TABLA_PRE + self.TABLE_METRICAS if self.TABLE_METRICAS else None
+
+        # VARIABLES DE RANGOS DE TIEMPO
+        self.ventana_segmentacion = parameters['variables_rangos_meses']['SEGMENTACION'] 
+        self.ventanas_segmentacion_adicional = parameters['variables_rangos_meses']['SEGMENTACION_ADICIONAL'] 
+        self.ventana_historico = parameters['variables_rangos_meses']['HISTORICO'] 
+        self.num_meses_proyeccion = parameters['variables_rangos_meses']['PROYECCION'] 
+        self.ventana_ventas = parameters['variables_rangos_meses']['VENTAS'] 
+
+        # VARIABLES - UMBRALES DE SEGMENTACION ABC - XYZ - FSN
+        self.abc_umb_inf = parameters['variables_umbrales_segmentacion']['ABC_INFERIOR'] 
+        self.abc_umb_sup = parameters['variables_umbrales_segmentacion']['ABC_SUPERIOR'] # C, B, A
+        self.xyz_umb_inf = parameters['variables_umbrales_segmentacion']['XYZ_INFERIOR'] 
+        self.xyz_umb_sup = parameters['variables_umbrales_segmentacion']['XYZ_SUPERIOR'] # X, Y, Z
+        self.fsn_umb_inf = parameters['variables_umbrales_segmentacion']['FSN_INFERIOR'] 
+        self.fsn_umb_sup = parameters['variables_umbrales_segmentacion']['FSN_SUPERIOR'] # N, S, F
+
+        # VARIABLES - UMBRALES DE SEGMENTACION RFM
+        self.r_umb_inf = parameters['variables_umbrales_segmentacion']['R_INFERIOR']
+        self.r_umb_sup = parameters['variables_umbrales_segmentacion']['R_SUPERIOR'] # 3, 2, 1
+        self.f_umb_inf = parameters['variables_umbrales_segmentacion']['F_INFERIOR']
+        self.f_umb_sup = parameters['variables_umbrales_segmentacion']['F_SUPERIOR'] # 1, 2, 3
+
+        # CONSTANTE DE CONFIGURACIÓN DE AUTOGLUON
+        self.MODELO_AUTOGLUON = parameters['variables_modelos_autogluon']['NOMBRE']
+        self.MODELO_AUTOGLUON_PATH = parameters['variables_modelos_autogluon']['RUTA_AUTOGLUON']
+        self.MODELO_AUTOGLUON_SUFFIX = parameters['variables_modelos_autogluon']['SUFIJO']
+        self.MODELO_AUTOGLUON_METRICA_EVALUACION = parameters['variables_modelos_autogluon']['METRICA_EVALUACION']
+        self.TIEMPO_ENTRENAMIENTO_MAXIMO = parameters['variables_modelos_autogluon']['TIEMPO_ENTRENAMIENTO_MAX']
+        self.TAMANO_LOTE_INFERENCIA = parameters['variables_modelos_autogluon']['TAMANO_LOTE_INFERENCIA']
+        self.PROCESOS_INFERENCIA = parameters['variables_modelos_autogluon']['PROCESOS_INFERENCIA']
+        self.CONFIGURACION_AUTOGLUON = {
+            self.MODELO_AUTOGLUON: [
+                {
+                    "model_path": self.MODELO_AUTOGLUON_PATH,
+                    "ag_args": {"name_suffix": self.MODELO_AUTOGLUON_SUFFIX}
+                }
+            ]
+        }
+        self.CONFIGURACION_AUTOGLUON_PREDICTOR = self.MODELO_AUTOGLUON + self.MODELO_AUTOGLUON_SUFFIX + "[" + self.MODELO_AUTOGLUON_PATH + "]"
+
+        logging.info("Clase inicializada correctamente.")
+
+        self.SkuRegistry = RegistroSKU([self.INPUT_CLASIFICACION, self.INPUT_SOCIEDAD, self.INPUT_CENTRO, self.INPUT_MATERIAL, self.INPUT_MEDIDA])
+        self.ProveedorRegistro = RegistroModelosLocal(self.MODEL_RUTA_REGISTRO_LOCAL) if self.MODEL_RUTA_REGISTRO_LOCAL else ProveedorRegistroVertex()
+        self.IndiceRegistro = IndiceRegistroModelos(self.ProveedorRegistro, ruta_cache = self.MODEL_RUTA_CACHE_REGISTRO, ttl_segundos = self.MODEL_TTL_CACHE_REGISTRO)
+        self.CacheArtefactos = CacheArtefactosModelo(os.path.join(tempfile.gettempdir(), self.MODEL_RUTA_CACHE_ARTEFACTOS), tamano_maximo_bytes = int(self.MODEL_TAMANO_MAXIMO_CACHE_GB * 1024 ** 3)) if self.MODEL_RUTA_CACHE_ARTEFACTOS else None
+        self.TransferenciaGCS = GestorTransferenciaGCS(self.cs_cliente, max_hilos = self.MODEL_HILOS_TRANSFERENCIA, tamano_chunk_mb = self.MODEL_TAMANO_CHUNK_MB, reintentos = self.MODEL_REINTENTOS_TRANSFERENCIA)
+        self.StageCache = CacheResultadosEtapas(os.path.join(tempfile.gettempdir(), self.RUTA_CACHE_ETAPAS), tamano_maximo_bytes = int(self.TAMANO_MAXIMO_CACHE_ETAPAS_GB * 1024 ** 3)) if self.RUTA_CACHE_ETAPAS else None
+        self.LectorLocal = LectorArrowLocal(self.RUTA_LOCAL_ARROW) if self.RUTA_LOCAL_ARROW else None
+        self.DataManager = GestorAlmacenDatos(self.bq_cliente, self.cs_cliente, lector_local = self.LectorLocal, max_streams_lectura = self.MAX_STREAMS_LECTURA, metodo_carga = self.METODO_CARGA, reintentos_transaccion = self.REINTENTOS_TRANSACCION)
+        self.PreManager = GestorPreparacionDatos(self.COLUMNA_CONSUMO_DEMANDA, registro_sku = self.SkuRegistry)
+        self.ModelManager = GestorModelo(self.cs_cliente, self.ventana_segmentacion, self.num_meses_proyeccion, self.MODEL_TEMP_PATH, registro_sku = self.SkuRegistry, ventanas_adicionales = self.ventanas_segmentacion_adicional, indice_registro = self.IndiceRegistro, cache_artefactos = self.CacheArtefactos, transferencia_gcs = self.TransferenciaGCS, metrica_evaluacion = self.MODELO_AUTOGLUON_METRICA_EVALUACION, tiempo_entrenamiento_maximo = self.TIEMPO_ENTRENAMIENTO_MAXIMO, configuracion_autogluon = self.CONFIGURACION_AUTOGLUON)
+        self.ForecastManager = GestorProyeccion(self.COLUMNA_FECHA_CONSUMO_DEMANDA, self.num_meses_proyeccion, self.ventana_ventas, self.CONFIGURACION_AUTOGLUON_PREDICTOR, self.TIPO_MODELO_ML, self.TIPO_MODELO_SIMPLE, self.TIPO_MODELO_0, self.ModelManager, clase_producto = self.clase_producto, registro_sku = self.SkuRegistry, tamano_lote_inferencia = self.TAMANO_LOTE_INFERENCIA, procesos_inferencia = self.PROCESOS_INFERENCIA)
+        self.MonitorManager = GestorMonitoreo(self.COLUMNA_CONSUMO_DEMANDA, self.COLUMNA_FECHA_CONSUMO_DEMANDA)
+        self.SimulationManager = GestorSimulacion(self)
+        self.CheckpointManager = GestorPuntosControl(self.cs_cliente, self.MODEL_BUCKET_NAME_GCS, self.PUNTOS_CONTROL_PREFIX_GCS, habilitado = self.PUNTOS_CONTROL_HABILITADO)
+        self.ShardManager = GestorFragmentos(self.cs_cliente, self.MODEL_BUCKET_NAME_GCS, self.FRAGMENTOS_PREFIX_GCS, indice = self.TAREA_INDICE, total = self.TAREA_TOTAL, id_ejecucion = self.ID_EJECUCION, modo = self.MODO_FRAGMENTACION, columnas_almacen = [self.INPUT_SOCIEDAD, self.INPUT_CENTRO], espera_maxima_seg = self.FRAGMENTOS_ESPERA_MAXIMA, intervalo_sondeo_seg = self.FRAGMENTOS_INTERVALO_SONDEO) if self.TAREA_TOTAL > 1 else None
+
+        # INSTRUMENTAR TODOS LOS MÉTODOS DE LOS GESTORES (Gestor*) PARA EL REPORTE DE MÉTRICAS
+        self.Metricas = RegistroMetricas(id_ejecucion = f"{self.ID_EJECUCION}-{self.TAREA_INDICE}", habilitado = self.METRICAS_HABILITADO)
+        if self.METRICAS_HABILITADO:
+            self.Metricas.instrumentar_gestores(self)
+
+    ####################################################################
+    # PREPARAR EL HISTÓRICO EN MEMORIA PARA UN BACKFILL
+    ####################################################################
+    def preparar_almacen_backfill(self, meses, meses_monitoreo = None):
+        """
+        Función para leer una sola vez el input de demanda que necesitan todos los meses del backfill (histórico de
+        cada mes y el input de monitoreo de meses_monitoreo, por defecto los mismos meses). Retorna None si no hay
+        tabla input o no hay nada que leer, para que cada mes siga su flujo normal.
+        """
+        meses_monitoreo = meses if meses_monitoreo is None else meses_monitoreo
+        lista_filtros = []
+        for mes in meses:
+            self.SimulationManager.ajustar_queries(mes)
+            lista_filtros = lista_filtros + [self.filtros_planificacion_demanda]
+        for mes in meses_monitoreo:
+            self.SimulationManager.ajustar_queries(mes)
+            lista_filtros = lista_filtros + [self.filtros_input_monitoreable]
+
+        if not lista_filtros or not self.DataManager.verificar_tabla(self.sql_planificacion_demanda_validation):
+            return None
+
+        almacen_historico = AlmacenHistoricoBackfill(self.DataManager, self.PATH_CONSUMO_DEMANDA, self.COLUMNAS_CONSUMO_DEMANDA, self.COLUMNA_FECHA_CONSUMO_DEMANDA)
+        almacen_historico.cargar(lista_filtros)
+        return almacen_historico
+
+    ####################################################################
+    # BORRAR LA CARPETA TEMPORAL DEL MODELO ENTRE MESES
+    ####################################################################
+    def limpiar_modelo_temporal(self):
+        """
+        Función para borrar la carpeta temporal donde se descarga o entrena el modelo del mes.
+        """
+        if os.path.exists(self.MODEL_TEMP_PATH):
+            shutil.rmtree(self.MODEL_TEMP_PATH)
+
+    ####################################################################
+    # EJECUTAR UNA LISTA DE MESES (EN SECUENCIA O CON EL BACKFILL PARALELO)
+    ####################################################################
+    def ejecutar_meses(self, meses, almacen_historico = None, monitorear = True):
+        # SE DEJA UNA CPU PARA EL PROCESO PRINCIPAL (ENTRENAMIENTO E INFERENCIA)
+        procesos_backfill = min(self.PROCESOS_BACKFILL, obtener_limite_cpu() - 1, len(meses) - 1)
+
+        if procesos_backfill > 0:
+            # PREPARAR LOS MESES EN UN POOL DE PROCESOS; MODELO, PROYECCIÓN Y MONITOREO EN ORDEN EN ESTE PROCESO
+            PlanificadorBackfillParalelo(self.SimulationManager, procesos = procesos_backfill, al_terminar_mes = lambda mes: self.limpiar_modelo_temporal(), monitorear = monitorear).ejecutar(meses, almacen_historico = almacen_historico)
+        else:
+            for mes in meses:
+                self.SimulationManager.ejecutar_simulacion(mes, almacen_historico = almacen_historico, monitorear = monitorear)
+                self.limpiar_modelo_temporal()
+
+    ####################################################################
+    # EJECUTAR EL FRAGMENTO DE ESTA TAREA DEL CLOUD RUN JOB
+    ####################################################################
+    def ejecutar_fragmento(self, meses, en_memoria = False):
+        # CADA TAREA LEE SOLO EL HISTÓRICO DE SUS MESES; LA COORDINADORA, ADEMÁS, EL DE MONITOREO DE TODOS
+        meses_tarea = self.ShardManager.asignar_meses(meses) if self.MODO_FRAGMENTACION == "meses" else meses
+        meses_monitoreo = meses if self.ShardManager.es_coordinador else []
+        almacen_historico = self.preparar_almacen_backfill(meses_tarea, meses_monitoreo) if en_memoria else None
+
+        PlanificadorFragmentado(
+            self.SimulationManager,
+            self.ShardManager,
+            ejecutar_meses = lambda meses_fragmento, monitorear: self.ejecutar_meses(meses_fragmento, almacen_historico, monitorear = monitorear),
+            al_terminar_mes = lambda mes: self.limpiar_modelo_temporal()
+        ).ejecutar(meses, almacen_historico = almacen_historico)
+
+        if almacen_historico is not None:
+            almacen_historico.reportar()
+
+    ####################################################################
+    # REPORTAR LAS MÉTRICAS DE LA EJECUCIÓN (JSON Y, OPCIONALMENTE, BIGQUERY)
+    ####################################################################
+    def reportar_metricas(self):
+        """
+        Función para guardar el reporte de métricas de la ejecución y cargarlo en BigQuery si hay tabla configurada.
+        """
+        if not self.METRICAS_HABILITADO:
+            return None
+
+        reporte = self.Metricas.reportar(ruta_json = self.RUTA_REPORTE_METRICAS)
+        if self.PATH_METRICAS:
+            # UNA FALLA AL CARGAR LAS MÉTRICAS NO DEBE OCULTAR EL RESULTADO (O EL ERROR) DE LA EJECUCIÓN
+            try:
+                df_metricas = self.Metricas.obtener_tabla_metricas(CLASEPRODUCTO = self.clase_producto, TAREA = self.TAREA_INDICE)
+                self.DataManager.cargar_datos_bigquery_parquet(df_metricas, self.PATH_METRICAS, if_exists = "append")
+            except Exception as e:
+                logging.warning(f"No se pudieron cargar las métricas de la ejecución en {self.PATH_METRICAS}: {e}")
+        return reporte
+
+    ####################################################################
+    # LÓGICA PRINCIPAL DEL JOB
+    ####################################################################
+    def ejecutar(self):
+        try:
+            with self.Metricas.medir("PlanificadorDemandaPTCemento.ejecutar"):
+                if datetime.now() <= datetime(2025, 12, 11):
+                    fecha_final_proyeccion = datetime.now()
+                    fecha_inicial_proyeccion = fecha_final_proyeccion - relativedelta(months=self.num_meses_proyeccion)
+
+                    rango_meses_simulacion = []
+                    while fecha_inicial_proyeccion <= fecha_final_proyeccion:
+                        rango_meses_simulacion.append(fecha_inicial_proyeccion)
+                        fecha_inicial_proyeccion += relativedelta(months=1)
+
+                    if self.ShardManager is not None:
+                        self.ejecutar_fragmento(rango_meses_simulacion, en_memoria = self.HISTORICO_BACKFILL_EN_MEMORIA)
+                    else:
+                        almacen_historico = self.preparar_almacen_backfill(rango_meses_simulacion) if self.HISTORICO_BACKFILL_EN_MEMORIA else None
+                        self.ejecutar_meses(rango_meses_simulacion, almacen_historico)
+
+                        if almacen_historico is not None:
+                            almacen_historico.reportar()
+                elif self.ShardManager is not None:
+                    self.ejecutar_fragmento([datetime.now()])
+                else:
+                    self.SimulationManager.ejecutar_simulacion(datetime.now())
+        finally:
+            self.ForecastManager.cerrar_pool_inferencia()
+            self.reportar_metricas()
+
+        sys.exit(0)  # Finaliza el proceso y cierra Cloud Run
@@ -1,59 +1,133 @@
-"""_summary_.
-
-PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
-NOMBRE             : utils
-ARCHIVOS  DESTINO  : ---
-ARCHIVOS  FUENTES  : ---
-OBJETIVO           : Definir funciones que se usarán en la ejecución general.
-TIPO               : PY
-OBSERVACION        : -
-SCHEDULER          : CLOUD RUN
-VERSION            : 1.0
-DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
-PROVEEDOR          : MINSAIT
-FECHA              : 10/12/2025
-DESCRIPCION        : Paquete que contiene funciones necesarias que
-se utilizaran durante la ejecución.
-"""
-# seccion Imports
-import json
-import pandas as pd
-
-# seccion Funciones
-def readJsonFile(oriPathFileJson=""):
-    """Abre y carga archivo json.
-
-    :param oriPathFileJson: Ruta del archivo json, por defecto es vacío
-    :type oriPathFileJson: str, opcional
-    :raises Exception: Mensaje de error en caso no se pueda abrir el archivo.
-    :return: Archivo json
-    :rtype: json
-    """
-    try:
-        f = open(oriPathFileJson, "r")
-        data = json.loads(f.read())
-        return data
-    except Exception as e:
-        raise Exception(e)
-
-def convert_df_to_bq_schema(df):
-    """
-    Convierte los tipos de datos de las columnas de un DataFrame a sus similares en BigQuery.
-
-    :param df: DataFrame a convertir
-    :type df: pandas.DataFrame
-    :return: DataFrame con los tipos de datos convertidos
-    :rtype: pandas.DataFrame
-    """
-    for column in df.columns:
-        if pd.api.types.is_integer_dtype(df[column]):
-            df[column] = df[column].astype('Int64')
-        elif pd.api.types.is_float_dtype(df[column]):
-            df[column] = df[column].astype('float64')
-        elif pd.api.types.is_bool_dtype(df[column]):
-            df[column] = df[column].astype('bool')
-        elif pd.api.types.is_datetime64_any_dtype(df[column]):
-            df[column] = df[column].astype('datetime64[ns]')
-        else:
-            df[column] = df[column].astype('str')
-    return df
\ No newline at end of file
+"""_summary_.
+
+PROYECTO           : [PRJ-25-002] CDS - PLANIFICACIÓN DE LA DEMANDA
+NOMBRE             : utils
+ARCHIVOS  DESTINO  : ---
+ARCHIVOS  FUENTES  : ---
+OBJETIVO           : Definir funciones que se usarán en la ejecución general.
+TIPO               : PY
+OBSERVACION        : -
+SCHEDULER          : CLOUD RUN
+VERSION            : 1.0
+DESARROLLADOR      : SÁNCHEZ AGUILAR LUIS ÁNGEL
+PROVEEDOR          : MINSAIT
+FECHA              : 10/12/2025
+DESCRIPCION        : Paquete que contiene funciones necesarias que
+se utilizaran durante la ejecución.
+"""
+# seccion Imports
+import json
+import math
+import os
+import pandas as pd
+import numpy as np
+
+# seccion Funciones
+def readJsonFile(oriPathFileJson=""):
+    """Abre y carga archivo json.
+
+    :param oriPathFileJson: Ruta del archivo json, por defecto es vacío
+    :type oriPathFileJson: str, opcional
+    :raises Exception: Mensaje de error en caso no se pueda abrir el archivo.
+    :return: Archivo json
+    :rtype: json
+    """
+    try:
+        f = open(oriPathFileJson, "r")
+        data = json.loads(f.read())
+        return data
+    except Exception as e:
+        raise Exception(e)
+
+def convert_df_to_bq_schema(df):
+    """
+    Convierte los tipos de datos de las columnas de un DataFrame a sus similares en BigQuery.
+
+    :param df: DataFrame a convertir
+    :type df: pandas.DataFrame
+    :return: DataFrame con los tipos de datos convertidos
+    :rtype: pandas.DataFrame
+    """
+    for column in df.columns:
+        if pd.api.types.is_integer_dtype(df[column]):
+            df[column] = df[column].astype('Int64')
+        elif pd.api.types.is_float_dtype(df[column]):
+            df[column] = df[column].astype('float64')
+        elif pd.api.types.is_bool_dtype(df[column]):
+            df[column] = df[column].astype('bool')
+        elif pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = df[column].astype('datetime64[ns]')
+        else:
+            df[column] = df[column].astype('str')
+    return df
+
+def construir_matriz_sku_mes(df, group_cols, date_col, val_col):
+    """
+    Construye la matriz densa SKU x mes de una columna de valores.
+
+    Los SKUs quedan en el mismo orden que groupby(group_cols) y los meses en orden cronológico. Las celdas sin
+    registro quedan como NaN y se distinguen de los registros con valor NaN mediante la máscara de presencia.
+
+    :param df: DataFrame en formato largo (una fila por SKU y mes)
+    :type df: pandas.DataFrame
+    :param group_cols: Columnas que identifican al SKU
+    :type group_cols: list
+    :param date_col: Columna de fecha (mes)
+    :type date_col: str
+    :param val_col: Columna de valores
+    :type val_col: str
+    :return: Tupla (claves, fechas, matriz, presente, fila_sku, columna_mes) o None si hay SKU-mes duplicados.
+    fila_sku y columna_mes dan la celda de cada fila de df (-1 si la fila tiene llaves o fecha nulas).
+    :rtype: tuple
+    """
+    fila_sku = df.groupby(group_cols, sort = True).ngroup().to_numpy()
+    columna_mes, fechas = pd.factorize(df[date_col], sort = True)
+    validas = (fila_sku >= 0) & (columna_mes >= 0)
+
+    num_skus = int(fila_sku.max()) + 1 if len(fila_sku) else 0
+    num_meses = len(fechas)
+
+    # LA MATRIZ DENSA SOLO ES VÁLIDA SI CADA SKU TIENE COMO MÁXIMO UNA FILA POR MES
+    celdas = fila_sku[validas].astype(np.int64) * num_meses + columna_mes[validas]
+    if len(celdas) and np.bincount(celdas).max() > 1:
+        return None
+
+    matriz = np.full((num_skus, num_meses), np.nan)
+    matriz[fila_sku[validas], columna_mes[validas]] = df[val_col].to_numpy(dtype = np.float64)[validas]
+    presente = np.zeros((num_skus, num_meses), dtype = bool)
+    presente[fila_sku[validas], columna_mes[validas]] = True
+
+    # PRIMERA FILA DE CADA SKU PARA RECUPERAR SUS LLAVES CON SUS TIPOS ORIGINALES
+    posiciones = np.flatnonzero(validas)
+    primera_fila = np.empty(num_skus, dtype = np.int64)
+    primera_fila[fila_sku[posiciones][::-1]] = posiciones[::-1]
+    claves = df[group_cols].iloc[primera_fila].reset_index(drop = True)
+
+    return claves, fechas, matriz, presente, np.where(validas, fila_sku, -1), np.where(validas, columna_mes, -1)
+
+def obtener_limite_cpu():
+    """
+    Obtiene el número de CPUs disponibles para el contenedor: la cuota de cgroup (límite de CPU de Cloud Run) si existe,
+    si no las CPUs asignadas al proceso.
+
+    :return: Número de CPUs (al menos 1)
+    :rtype: int
+    """
+    for ruta in ["/sys/fs/cgroup/cpu.max", "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"]:
+        try:
+            with open(ruta, "r") as f:
+                valores = f.read().split()
+            if ruta.endswith("cpu.max"):
+                cuota, periodo = valores[0], valores[1]
+            else:
+                with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us", "r") as f:
+                    cuota, periodo = valores[0], f.read().strip()
+            if cuota not in ("max", "-1"):
+                return max(1, math.ceil(int(cuota) / int(periodo)))
+        except (OSError, ValueError, IndexError):
+            continue
+
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return max(1, os.cpu_count() or 1)